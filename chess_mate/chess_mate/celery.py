@@ -39,7 +39,12 @@ def _safe_get_celery_Celery():
 Celery = _safe_get_celery_Celery()
 
 from celery.schedules import crontab  # type: ignore
-from celery.signals import after_setup_logger, after_setup_task_logger, worker_init
+from celery.signals import (
+    after_setup_logger,
+    after_setup_task_logger,
+    worker_init,
+    worker_process_init,
+)
 from django.conf import settings
 from kombu import Exchange, Queue
 
@@ -60,6 +65,7 @@ app.conf.task_queues = (
     Queue("default", task_exchange, routing_key="default"),
     Queue("analysis", task_exchange, routing_key="analysis"),
     Queue("batch_analysis", task_exchange, routing_key="batch_analysis"),
+    Queue("llm", task_exchange, routing_key="llm"),
 )
 
 # Configure task routing
@@ -72,6 +78,8 @@ app.conf.task_routes = {
     "chess_mate.core.tasks.analyze_batch_task": {"queue": "batch_analysis"},
     "chess_mate.core.tasks.analyze_single_game_subtask": {"queue": "batch_analysis"},
     "chess_mate.core.tasks.aggregate_and_report_task": {"queue": "batch_analysis"},
+    # I/O-bound LLM calls run on a thread-pool worker so they never hold a Stockfish process slot.
+    "chess_mate.core.tasks.generate_batch_coaching_task": {"queue": "llm"},
     "core.tasks.*": {"queue": "default"},
 }
 
@@ -97,6 +105,26 @@ app.conf.beat_schedule = {
         "task": "core.tasks.send_reactivation_email_task",
         "schedule": crontab(hour=12, minute=0),
     },
+    "compact-credit-ledger": {
+        "task": "core.tasks.compact_credit_ledger_task",
+        "schedule": crontab(minute="*/10"),
+    },
+    "reconcile-daily-quotas": {
+        "task": "core.tasks.reconcile_daily_quotas_task",
+        "schedule": crontab(minute=15),
+    },
+    "flush-expired-tokens": {
+        "task": "core.tasks.flush_expired_tokens_task",
+        "schedule": crontab(minute=45),
+    },
+    "prune-llm-responses": {
+        "task": "core.tasks.prune_llm_responses_task",
+        "schedule": crontab(hour=4, minute=20),
+    },
+    "prune-batch-game-results": {
+        "task": "core.tasks.prune_batch_game_results_task",
+        "schedule": crontab(hour=4, minute=40),
+    },
 }
 
 # Windows-specific settings
@@ -178,6 +206,21 @@ def configure_worker(sender=None, conf=None, **kwargs):
     logger.info("Initializing Celery worker")
     if platform.system() == "Windows":
         logger.info("Running on Windows - using solo pool")
+        # No fork with the solo pool, so the main process warms itself.
+        _warm_current_process()
+
+
+@worker_process_init.connect
+def warm_worker_process(sender=None, **kwargs):
+    """Prefork child: spawn Stockfish and preload analysis modules after fork, before the first task."""
+    _warm_current_process()
+
+
+def _warm_current_process():
+    from core import worker_warmup
+
+    if worker_warmup.warmup_enabled():
+        worker_warmup.warm_worker_process()
 
 
 @after_setup_task_logger.connect
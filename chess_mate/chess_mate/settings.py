@@ -318,7 +318,11 @@ REDIS_SOCKET_TIMEOUT = int(env("REDIS_SOCKET_TIMEOUT", default=5))
 REDIS_SOCKET_CONNECT_TIMEOUT = int(env("REDIS_SOCKET_CONNECT_TIMEOUT", default=5))
 REDIS_RETRY_ON_TIMEOUT = env("REDIS_RETRY_ON_TIMEOUT", default="true").lower() == "true"
 REDIS_CONNECTION_POOL_SIZE = int(env("REDIS_CONNECTION_POOL_SIZE", default=20))
+# Per-process pool shared by every Redis user (core.redis_manager), including the django-redis caches.
 REDIS_MAX_CONNECTIONS = int(env("REDIS_MAX_CONNECTIONS", default=100))
+REDIS_POOL_TIMEOUT = float(env("REDIS_POOL_TIMEOUT", default=5))
+REDIS_HEALTH_CHECK_INTERVAL = int(env("REDIS_HEALTH_CHECK_INTERVAL", default=30))
+DJANGO_REDIS_CONNECTION_FACTORY = "core.redis_manager.SharedPoolConnectionFactory"
 
 # Basic REST Framework Configuration without imports that might cause circular dependencies
 REST_FRAMEWORK = {
@@ -330,6 +334,12 @@ REST_FRAMEWORK = {
             "rest_framework.renderers.BrowsableAPIRenderer",
         )
     ),
+    # JSON bodies already parsed by RequestValidationMiddleware are not parsed again.
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ValidatedJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
 }
@@ -565,6 +575,10 @@ BATCH_CREDITS_PER_GAME = env.int("BATCH_CREDITS_PER_GAME", default=0)
 BATCH_ANALYSIS_DEPTH = env.int("BATCH_ANALYSIS_DEPTH", default=14)
 BATCH_SEND_COMPLETE_EMAIL = env.bool("BATCH_SEND_COMPLETE_EMAIL", default=True)
 SINGLE_GAME_SEND_COMPLETE_EMAIL = env.bool("SINGLE_GAME_SEND_COMPLETE_EMAIL", default=True)
+# Users per Celery subtask for the weekly digest / spaced reminder / reactivation campaigns.
+EMAIL_CAMPAIGN_CHUNK_SIZE = env.int("EMAIL_CAMPAIGN_CHUNK_SIZE", default=200)
+# Store GameAnalysis per-move detail packed in moves_blob instead of verbose JSON.
+COMPACT_MOVE_ANALYSIS = env.bool("COMPACT_MOVE_ANALYSIS", default=True)
 # Depth-20 single-game runs can exceed the global 300s Celery default; match batch subtask budget.
 SINGLE_GAME_TASK_SOFT_TIME_LIMIT = env.int("SINGLE_GAME_TASK_SOFT_TIME_LIMIT", default=840)
 SINGLE_GAME_TASK_TIME_LIMIT = env.int("SINGLE_GAME_TASK_TIME_LIMIT", default=900)
@@ -583,6 +597,29 @@ STOCKFISH_PATH = env(
 )  # Needs to be changed in prod
 STOCKFISH_THREADS = int(env("STOCKFISH_THREADS", default=4))
 STOCKFISH_HASH_SIZE = int(env("STOCKFISH_HASH_SIZE", default=128))  # MB
+# Part of the batch per-game result cache key; change it when the engine binary is upgraded.
+STOCKFISH_VERSION = env("STOCKFISH_VERSION", default="stockfish")
+# Days a stored per-game batch result is kept for re-runs; older rows are pruned nightly.
+BATCH_RESULT_RETENTION_DAYS = env.int("BATCH_RESULT_RETENTION_DAYS", default=180)
+# Spawn Stockfish and preload analysis modules in each Celery worker process right after fork.
+CELERY_WORKER_WARMUP = env.bool("CELERY_WORKER_WARMUP", default=True)
+# Content-addressed LLM response cache (core.llm_cache): hot tier TTL and single-flight lock/wait budget.
+LLM_CACHE_ENABLED = env.bool("LLM_CACHE_ENABLED", default=True)
+LLM_CACHE_HOT_TTL = env.int("LLM_CACHE_HOT_TTL", default=86400)
+LLM_CACHE_LOCK_SECONDS = env.int("LLM_CACHE_LOCK_SECONDS", default=120)
+LLM_CACHE_WAIT_SECONDS = env.int("LLM_CACHE_WAIT_SECONDS", default=90)
+LLM_CACHE_DURABLE_TTL_DAYS = env.int("LLM_CACHE_DURABLE_TTL_DAYS", default=90)
+# Estimated-token budget for the batch coaching payload (core.analysis.coaching_prompt).
+COACHING_PROMPT_TOKEN_BUDGET = env.int("COACHING_PROMPT_TOKEN_BUDGET", default=6000)
+# Bounded LLM client (core.llm_client): global in-flight cap, per-attempt and overall deadlines, retries, hedging.
+LLM_MAX_CONCURRENCY = env.int("LLM_MAX_CONCURRENCY", default=8)
+LLM_REQUEST_TIMEOUT = env.float("LLM_REQUEST_TIMEOUT", default=60.0)
+LLM_CALL_DEADLINE = env.float("LLM_CALL_DEADLINE", default=180.0)
+LLM_MAX_RETRIES = env.int("LLM_MAX_RETRIES", default=2)
+LLM_HEDGE_ENABLED = env.bool("LLM_HEDGE_ENABLED", default=False)
+LLM_HEDGE_MIN_SAMPLES = env.int("LLM_HEDGE_MIN_SAMPLES", default=20)
+# Queue for batch coaching generation; empty runs coaching inline at the end of aggregate_and_report_task.
+BATCH_COACHING_QUEUE = env("BATCH_COACHING_QUEUE", default="llm")
 
 # Security configuration
 # ALB terminates TLS and forwards HTTP to instances with X-Forwarded-Proto: https
@@ -679,6 +716,10 @@ SIMPLE_JWT = {
     "TOKEN_TYPE_CLAIM": "token_type",
     "JTI_CLAIM": "jti",
 }
+# Where revoked refresh-token JTIs live (core.token_blacklist); the Redis backend falls back to SQL.
+JWT_BLACKLIST_BACKEND = os.getenv("JWT_BLACKLIST_BACKEND", "core.token_blacklist.RedisTokenBlacklist")
+# Accept an ``access_token`` form field as credentials (RequestFixMiddleware); reading it parses every body.
+ALLOW_BODY_TOKEN = os.getenv("ALLOW_BODY_TOKEN", "False").lower() == "true"
 
 # Authentication and authorization
 AUTHENTICATION_BACKENDS = [
@@ -726,6 +767,8 @@ DEMO_BATCH_SHARE_TOKEN = env("DEMO_BATCH_SHARE_TOKEN", default="").strip()
 SINGLE_GAME_ANALYSIS_CREDITS = env.int("SINGLE_GAME_ANALYSIS_CREDITS", default=1)
 SINGLE_GAME_FREE_FROM_BATCH = env.bool("SINGLE_GAME_FREE_FROM_BATCH", default=True)
 SINGLE_GAME_FIRST_FREE = env.bool("SINGLE_GAME_FIRST_FREE", default=True)
+# Credit ledger entries younger than this (seconds) are left pending by the compaction beat task.
+CREDIT_LEDGER_COMPACT_DELAY = env.int("CREDIT_LEDGER_COMPACT_DELAY", default=60)
 
 # Legal pages — set LEGAL_ENTITY_NAME when incorporated (e.g. "ChessMate Inc.")
 LEGAL_ENTITY_NAME = env("LEGAL_ENTITY_NAME", default="").strip()
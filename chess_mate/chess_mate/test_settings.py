@@ -186,6 +186,10 @@ USE_OPENAI = True  # Enable OpenAI for tests
 OPENAI_MODEL = "gpt-3.5-turbo"
 OPENAI_MAX_TOKENS = 500
 OPENAI_TEMPERATURE = 0.7
+# Identical prompts across tests must not share cached LLM responses; llm_cache tests opt back in.
+LLM_CACHE_ENABLED = False
+# Batch tests call aggregate_and_report_task directly and expect coaching to run inline.
+BATCH_COACHING_QUEUE = ""
 
 # Redis settings for testing
 REDIS_URL = None  # type: ignore[assignment]  # Disable Redis for testing
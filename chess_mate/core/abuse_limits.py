@@ -8,6 +8,7 @@ from typing import Any, Dict, Optional, Tuple
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
@@ -15,7 +16,8 @@ from rest_framework.response import Response
 from .admin_security import get_client_ip
 from .batch_labels import BATCH_COACH_ACTIVE_LIMIT
 from .cache import cache_get, cache_set
-from .models import BatchAnalysisReport, Game
+from .daily_quota import quota_for, record_single_analysis_quota
+from .redis_manager import redis_manager
 
 logger = logging.getLogger(__name__)
 
@@ -24,70 +26,113 @@ def _staff_bypasses(user: User) -> bool:
     return bool(user.is_staff or user.is_superuser)
 
 
-def _retry_after(window_seconds: int, cache_key: str) -> int:
-    first_ts = int(cache_get(f"{cache_key}:ts", 0) or 0)
-    if not first_ts:
-        return max(1, window_seconds)
-    elapsed = max(0, int(timezone.now().timestamp()) - first_ts)
-    return max(1, window_seconds - elapsed)
+def _redis_connection() -> Optional[Any]:
+    """Shared Redis client for window counters, or None to count in the Django cache."""
+    if getattr(settings, "REDIS_DISABLED", False) or getattr(settings, "USE_REDIS", None) is False:
+        return None
+    try:
+        if redis_manager.is_available():
+            return redis_manager.client()
+    except Exception as exc:
+        logger.warning("Abuse-limit counters falling back to the Django cache: %s", exc)
+    return None
 
 
-def _check_ip_window(cache_prefix: str, request, max_count: int, window_seconds: int) -> Tuple[bool, int]:
-    ip = get_client_ip(request)
-    cache_key = f"{cache_prefix}:{ip}"
-    count = int(cache_get(cache_key, 0) or 0)
+def _cache_bucket(cache_key: str, window_seconds: int) -> Tuple[str, int]:
+    # Without Redis TTLs the Django-cache fallback uses clock-aligned fixed windows.
+    now = int(timezone.now().timestamp())
+    return f"{cache_key}:{now // window_seconds}", window_seconds - now % window_seconds
+
+
+def _window_ttl(ttl: Any, window_seconds: int) -> int:
+    ttl = int(ttl if ttl is not None else -1)
+    return ttl if ttl > 0 else window_seconds
+
+
+def _hit_window(cache_key: str, window_seconds: int) -> Tuple[int, int]:
+    """Count one attempt atomically; returns (attempts in the window, seconds until it resets)."""
+    connection = _redis_connection()
+    if connection is not None:
+        try:
+            # SET NX EX opens the window with its TTL; later hits only INCR, which keeps it.
+            # (EXPIRE ... NX would do the same in one call but needs Redis 7.)
+            pipe = connection.pipeline()
+            pipe.set(cache_key, 0, ex=window_seconds, nx=True)
+            pipe.incr(cache_key)
+            pipe.ttl(cache_key)
+            _, count, ttl = pipe.execute()
+            return int(count), _window_ttl(ttl, window_seconds)
+        except Exception as exc:
+            logger.warning("Redis window counter failed for %s: %s", cache_key, exc)
+    bucket_key, retry_after = _cache_bucket(cache_key, window_seconds)
+    cache.add(bucket_key, 0, timeout=window_seconds)
+    try:
+        count = cache.incr(bucket_key)
+    except ValueError:  # evicted between add and incr
+        cache.set(bucket_key, 1, timeout=window_seconds)
+        count = 1
+    return int(count), retry_after
+
+
+def _release_window(cache_key: str, window_seconds: int) -> None:
+    """Give back one attempt counted by ``_hit_window`` (never below zero)."""
+    connection = _redis_connection()
+    if connection is not None:
+        try:
+            if connection.decr(cache_key) <= 0:
+                # Also drops a key DECR created after the window expired (it would have no TTL).
+                connection.delete(cache_key)
+            return
+        except Exception as exc:
+            logger.warning("Redis window counter failed for %s: %s", cache_key, exc)
+    bucket_key, _ = _cache_bucket(cache_key, window_seconds)
+    try:
+        if cache.decr(bucket_key) < 0:
+            cache.delete(bucket_key)
+    except ValueError:  # window already reset
+        pass
+
+
+def _peek_window(cache_key: str, window_seconds: int) -> Tuple[int, int]:
+    """Attempts counted so far and seconds until the window resets, without counting one."""
+    connection = _redis_connection()
+    if connection is not None:
+        try:
+            pipe = connection.pipeline()
+            pipe.get(cache_key)
+            pipe.ttl(cache_key)
+            count, ttl = pipe.execute()
+            return int(count or 0), _window_ttl(ttl, window_seconds)
+        except Exception as exc:
+            logger.warning("Redis window counter failed for %s: %s", cache_key, exc)
+    bucket_key, retry_after = _cache_bucket(cache_key, window_seconds)
+    return int(cache.get(bucket_key, 0) or 0), retry_after
+
+
+def _check_window(cache_key: str, max_count: int, window_seconds: int) -> Tuple[bool, int]:
+    count, retry_after = _peek_window(cache_key, window_seconds)
     if count >= max_count:
-        logger.warning("%s limit exceeded for IP %s (%s/%s)", cache_prefix, ip, count, max_count)
-        return False, _retry_after(window_seconds, cache_key)
+        logger.warning("%s limit exceeded (%s/%s)", cache_key, count, max_count)
+        return False, retry_after
     return True, 0
 
 
-def _record_ip_window(cache_prefix: str, request, window_seconds: int) -> None:
-    ip = get_client_ip(request)
-    cache_key = f"{cache_prefix}:{ip}"
-    count = int(cache_get(cache_key, 0) or 0)
-    now = int(timezone.now().timestamp())
-    if count == 0:
-        cache_set(cache_key, 1, timeout=window_seconds)
-        cache_set(f"{cache_key}:ts", now, timeout=window_seconds)
-        return
-    ttl_key = f"{cache_key}:ts"
-    first_ts = int(cache_get(ttl_key, now) or now)
-    elapsed = max(0, now - first_ts)
-    ttl = max(60, window_seconds - elapsed)
-    cache_set(cache_key, count + 1, timeout=ttl)
-    cache_set(ttl_key, first_ts, timeout=ttl)
-
-
-def _check_email_window(email: str, cache_prefix: str, max_count: int, window_seconds: int) -> Tuple[bool, int]:
-    normalized = (email or "").strip().lower()
-    if not normalized:
-        return True, 0
-    cache_key = f"{cache_prefix}:{normalized}"
-    count = int(cache_get(cache_key, 0) or 0)
-    if count >= max_count:
-        logger.warning("%s limit exceeded for email %s", cache_prefix, normalized)
-        return False, _retry_after(window_seconds, cache_key)
+def _admit_window(cache_key: str, max_count: int, window_seconds: int) -> Tuple[bool, int]:
+    """Count this attempt and admit it while the window holds at most ``max_count``."""
+    count, retry_after = _hit_window(cache_key, window_seconds)
+    if count > max_count:
+        logger.warning("%s limit exceeded (%s/%s)", cache_key, count, max_count)
+        return False, retry_after
     return True, 0
 
 
-def _record_email_window(email: str, cache_prefix: str, window_seconds: int) -> None:
+def _ip_key(cache_prefix: str, request) -> str:
+    return f"{cache_prefix}:{get_client_ip(request)}"
+
+
+def _email_key(cache_prefix: str, email: str) -> Optional[str]:
     normalized = (email or "").strip().lower()
-    if not normalized:
-        return
-    cache_key = f"{cache_prefix}:{normalized}"
-    count = int(cache_get(cache_key, 0) or 0)
-    now = int(timezone.now().timestamp())
-    if count == 0:
-        cache_set(cache_key, 1, timeout=window_seconds)
-        cache_set(f"{cache_key}:ts", now, timeout=window_seconds)
-        return
-    ttl_key = f"{cache_key}:ts"
-    first_ts = int(cache_get(ttl_key, now) or now)
-    elapsed = max(0, now - first_ts)
-    ttl = max(60, window_seconds - elapsed)
-    cache_set(cache_key, count + 1, timeout=ttl)
-    cache_set(ttl_key, first_ts, timeout=ttl)
+    return f"{cache_prefix}:{normalized}" if normalized else None
 
 
 def abuse_limit_response(
@@ -130,15 +175,22 @@ def _end_of_local_day() -> datetime:
 # --- Signup ---
 
 
+def _signup_window_seconds() -> int:
+    return max(60, int(getattr(settings, "SIGNUP_RATE_LIMIT_WINDOW_SECONDS", 3600)))
+
+
 def check_signup_allowed(request) -> Tuple[bool, int]:
+    """Reserve a signup slot for the client IP; rejects once the window is full.
+
+    Only successful registrations should keep their slot: call ``release_signup_attempt``
+    when the attempt fails.
+    """
     max_per_ip = int(getattr(settings, "SIGNUP_RATE_LIMIT_MAX_PER_IP", 5))
-    window_seconds = int(getattr(settings, "SIGNUP_RATE_LIMIT_WINDOW_SECONDS", 3600))
-    return _check_ip_window("signup_attempts", request, max(1, max_per_ip), max(60, window_seconds))
+    return _admit_window(_ip_key("signup_attempts", request), max(1, max_per_ip), _signup_window_seconds())
 
 
-def record_signup_attempt(request) -> None:
-    window_seconds = int(getattr(settings, "SIGNUP_RATE_LIMIT_WINDOW_SECONDS", 3600))
-    _record_ip_window("signup_attempts", request, max(60, window_seconds))
+def release_signup_attempt(request) -> None:
+    _release_window(_ip_key("signup_attempts", request), _signup_window_seconds())
 
 
 def signup_rate_limit_response(retry_after: int) -> Response:
@@ -156,12 +208,12 @@ def signup_rate_limit_response(retry_after: int) -> Response:
 def check_login_allowed(request) -> Tuple[bool, int]:
     max_per_ip = int(getattr(settings, "LOGIN_FAILED_MAX_PER_IP", 20))
     window_seconds = int(getattr(settings, "LOGIN_FAILED_WINDOW_SECONDS", 3600))
-    return _check_ip_window("login_failed", request, max(1, max_per_ip), max(60, window_seconds))
+    return _check_window(_ip_key("login_failed", request), max(1, max_per_ip), max(60, window_seconds))
 
 
 def record_failed_login(request) -> None:
     window_seconds = int(getattr(settings, "LOGIN_FAILED_WINDOW_SECONDS", 3600))
-    _record_ip_window("login_failed", request, max(60, window_seconds))
+    _hit_window(_ip_key("login_failed", request), max(60, window_seconds))
 
 
 def login_rate_limit_response(retry_after: int) -> Response:
@@ -177,25 +229,24 @@ def login_rate_limit_response(retry_after: int) -> Response:
 
 
 def check_password_reset_allowed(request, email: str) -> Tuple[bool, int]:
+    """Count a reset request against the client IP, then the email; rejects once either window is full."""
     ip_max = int(getattr(settings, "PASSWORD_RESET_MAX_PER_IP", 5))
     ip_window = int(getattr(settings, "PASSWORD_RESET_WINDOW_SECONDS", 3600))
     email_max = int(getattr(settings, "PASSWORD_RESET_MAX_PER_EMAIL", 3))
     email_window = int(getattr(settings, "PASSWORD_RESET_EMAIL_WINDOW_SECONDS", 86400))
 
-    ip_ok, ip_retry = _check_ip_window("password_reset_ip", request, max(1, ip_max), max(60, ip_window))
+    ip_key = _ip_key("password_reset_ip", request)
+    ip_ok, ip_retry = _admit_window(ip_key, max(1, ip_max), max(60, ip_window))
     if not ip_ok:
         return False, ip_retry
-    email_ok, email_retry = _check_email_window(email, "password_reset_email", max(1, email_max), max(60, email_window))
+    email_key = _email_key("password_reset_email", email)
+    if email_key is None:
+        return True, 0
+    email_ok, email_retry = _admit_window(email_key, max(1, email_max), max(60, email_window))
     if not email_ok:
-        return False, email_retry
-    return True, 0
-
-
-def record_password_reset_request(request, email: str) -> None:
-    ip_window = int(getattr(settings, "PASSWORD_RESET_WINDOW_SECONDS", 3600))
-    email_window = int(getattr(settings, "PASSWORD_RESET_EMAIL_WINDOW_SECONDS", 86400))
-    _record_ip_window("password_reset_ip", request, max(60, ip_window))
-    _record_email_window(email, "password_reset_email", max(60, email_window))
+        # A rejected request sends nothing; don't let one locked-out address drain the IP budget.
+        _release_window(ip_key, max(60, ip_window))
+    return email_ok, email_retry
 
 
 def password_reset_rate_limit_response(retry_after: int) -> Response:
@@ -211,17 +262,18 @@ def password_reset_rate_limit_response(retry_after: int) -> Response:
 
 
 def batches_started_today(user: User) -> int:
-    return BatchAnalysisReport.objects.filter(user=user, created_at__gte=_start_of_local_day()).count()
+    return quota_for(user.id).batches
 
 
 def user_has_active_batch(user: User) -> bool:
-    return BatchAnalysisReport.objects.filter(user=user, status__in=["pending", "in_progress"]).exists()
+    return quota_for(user.id).active_batches > 0
 
 
 def check_batch_creation_allowed(user: User) -> Tuple[bool, Dict[str, Any]]:
     daily_limit = max(0, int(getattr(settings, "MAX_BATCHES_PER_USER_PER_DAY", 3)))
     allow_concurrent = bool(getattr(settings, "ALLOW_CONCURRENT_BATCHES", False))
-    count = batches_started_today(user)
+    quota = quota_for(user.id)
+    count = quota.batches
     resets_at = _end_of_local_day()
     info: Dict[str, Any] = {
         "limit": daily_limit,
@@ -234,7 +286,7 @@ def check_batch_creation_allowed(user: User) -> Tuple[bool, Dict[str, Any]]:
         info["bypass"] = True
         return True, info
 
-    if not allow_concurrent and user_has_active_batch(user):
+    if not allow_concurrent and quota.active_batches > 0:
         info["active_batch"] = True
         logger.warning("Blocked new batch for user %s: active batch in progress", user.id)
         return False, info
@@ -275,7 +327,7 @@ def batch_daily_limit_response(info: Dict[str, Any]) -> Response:
 
 
 def games_imported_today(user: User) -> int:
-    return Game.objects.filter(user=user, created_at__gte=_start_of_local_day()).count()
+    return quota_for(user.id).games_imported
 
 
 def check_game_import_allowed(user: User, num_games: int = 1) -> Tuple[bool, Dict[str, Any]]:
@@ -352,8 +404,7 @@ def external_fetch_limit_response(info: Dict[str, Any]) -> Response:
 
 def check_single_analysis_allowed(user: User) -> Tuple[bool, Dict[str, Any]]:
     daily_limit = max(0, int(getattr(settings, "MAX_SINGLE_ANALYSES_PER_USER_PER_DAY", 50)))
-    cache_key = f"single_analysis_count:{user.id}:{timezone.localdate().isoformat()}"
-    count = int(cache_get(cache_key, 0) or 0)
+    count = quota_for(user.id).single_analyses
     info = {
         "limit": daily_limit,
         "count": count,
@@ -368,10 +419,7 @@ def check_single_analysis_allowed(user: User) -> Tuple[bool, Dict[str, Any]]:
 
 
 def record_single_analysis(user: User) -> None:
-    cache_key = f"single_analysis_count:{user.id}:{timezone.localdate().isoformat()}"
-    count = int(cache_get(cache_key, 0) or 0)
-    seconds_until_midnight = int((_end_of_local_day() - timezone.now()).total_seconds())
-    cache_set(cache_key, count + 1, timeout=max(60, seconds_until_midnight))
+    record_single_analysis_quota(user.id)
 
 
 def single_analysis_limit_response(info: Dict[str, Any]) -> Response:
@@ -436,30 +484,13 @@ def coaching_regenerate_limit_response(info: Dict[str, Any]) -> Response:
 
 def check_profile_update_allowed(user: User) -> Tuple[bool, int]:
     max_per_hour = int(getattr(settings, "MAX_PROFILE_UPDATES_PER_USER_PER_HOUR", 30))
-    window_seconds = 3600
-    cache_key = f"profile_updates:{user.id}"
-    count = int(cache_get(cache_key, 0) or 0)
     if _staff_bypasses(user) or max_per_hour <= 0:
         return True, 0
-    if count >= max_per_hour:
-        return False, _retry_after(window_seconds, cache_key)
-    return True, 0
+    return _check_window(f"profile_updates:{user.id}", max_per_hour, 3600)
 
 
 def record_profile_update(user: User) -> None:
-    window_seconds = 3600
-    cache_key = f"profile_updates:{user.id}"
-    count = int(cache_get(cache_key, 0) or 0)
-    now = int(timezone.now().timestamp())
-    if count == 0:
-        cache_set(cache_key, 1, timeout=window_seconds)
-        cache_set(f"{cache_key}:ts", now, timeout=window_seconds)
-        return
-    ttl_key = f"{cache_key}:ts"
-    first_ts = int(cache_get(ttl_key, now) or now)
-    ttl = max(60, window_seconds - max(0, now - first_ts))
-    cache_set(cache_key, count + 1, timeout=ttl)
-    cache_set(ttl_key, first_ts, timeout=ttl)
+    _hit_window(f"profile_updates:{user.id}", 3600)
 
 
 def profile_update_limit_response(retry_after: int) -> Response:
@@ -484,30 +515,13 @@ def preferences_subset_unchanged(current: Optional[Dict[str, Any]], incoming: Di
 
 def check_checkout_allowed(user: User) -> Tuple[bool, int]:
     max_per_hour = int(getattr(settings, "MAX_CHECKOUT_SESSIONS_PER_USER_PER_HOUR", 10))
-    window_seconds = 3600
-    cache_key = f"checkout_sessions:{user.id}"
-    count = int(cache_get(cache_key, 0) or 0)
     if _staff_bypasses(user) or max_per_hour <= 0:
         return True, 0
-    if count >= max_per_hour:
-        return False, _retry_after(window_seconds, cache_key)
-    return True, 0
+    return _check_window(f"checkout_sessions:{user.id}", max_per_hour, 3600)
 
 
 def record_checkout_session(user: User) -> None:
-    window_seconds = 3600
-    cache_key = f"checkout_sessions:{user.id}"
-    count = int(cache_get(cache_key, 0) or 0)
-    now = int(timezone.now().timestamp())
-    if count == 0:
-        cache_set(cache_key, 1, timeout=window_seconds)
-        cache_set(f"{cache_key}:ts", now, timeout=window_seconds)
-        return
-    ttl_key = f"{cache_key}:ts"
-    first_ts = int(cache_get(ttl_key, now) or now)
-    ttl = max(60, window_seconds - max(0, now - first_ts))
-    cache_set(cache_key, count + 1, timeout=ttl)
-    cache_set(ttl_key, first_ts, timeout=ttl)
+    _hit_window(f"checkout_sessions:{user.id}", 3600)
 
 
 def checkout_limit_response(retry_after: int) -> Response:
@@ -1,16 +1,22 @@
 import json
+import uuid
 
 from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
+from django.db.models import BooleanField, ExpressionWrapper, Q
 from django.utils.html import format_html
 
+from .admin_changelist import JSONArrayLength, LargeTableAdminMixin
 from .batch_coaching import regenerate_batch_coaching
 from .batch_rerun import BatchRerunError, queue_batch_rerun
+from .credit_ledger import REASON_ADMIN_GRANT, credit_balance, post_credit_entry
 from .models import (
     BatchAnalysisReport,
+    BatchAnalysisReportQuerySet,
     Game,
     GameAnalysis,
+    GameQuerySet,
     Player,
     Profile,
     Transaction,
@@ -56,7 +62,7 @@ class PlayerAdmin(admin.ModelAdmin):
 class ProfileAdmin(admin.ModelAdmin):
     list_display = (
         "user",
-        "credits",
+        "balance",
         "bullet_rating",
         "blitz_rating",
         "rapid_rating",
@@ -69,6 +75,11 @@ class ProfileAdmin(admin.ModelAdmin):
     readonly_fields = ("win_rate",)
     actions = ("grant_10_credits", "grant_50_credits", "grant_100_credits")
 
+    @admin.display(description="Credits")
+    def balance(self, obj):
+        """Ledger balance; the ``credits`` field is only the last compacted snapshot."""
+        return credit_balance(obj.user_id)
+
     @admin.action(description="Grant 10 credits")
     def grant_10_credits(self, request, queryset):
         self._grant_credits(request, queryset, 10)
@@ -84,8 +95,7 @@ class ProfileAdmin(admin.ModelAdmin):
     def _grant_credits(self, request, queryset, amount: int) -> None:
         updated = 0
         for profile in queryset:
-            profile.credits = (profile.credits or 0) + amount
-            profile.save(update_fields=["credits"])
+            post_credit_entry(profile.user_id, amount, REASON_ADMIN_GRANT, f"{request.user.pk}:{uuid.uuid4().hex}")
             updated += 1
         self.message_user(
             request,
@@ -124,7 +134,7 @@ class ProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(Game)
-class GameAdmin(admin.ModelAdmin):
+class GameAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "user",
@@ -136,22 +146,26 @@ class GameAdmin(admin.ModelAdmin):
         "opening_name",
     )
     list_filter = ("platform", "result", "date_played")
-    search_fields = ("white", "black", "user__username", "opening_name")
+    search_fields = ("white", "black", "=user__username", "opening_name")
     ordering = ("-date_played",)
     raw_id_fields = ("user",)
+    list_select_related = ("user",)
+    changelist_defer = GameQuerySet.HEAVY_FIELDS
 
 
 @admin.register(GameAnalysis)
-class GameAnalysisAdmin(admin.ModelAdmin):
+class GameAnalysisAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("id", "game", "created_at", "updated_at")
     list_filter = ("created_at", "updated_at")
-    search_fields = ("game__white", "game__black", "game__user__username")
+    search_fields = ("game__white", "game__black", "=game__user__username")
     ordering = ("-created_at",)
     raw_id_fields = ("game",)
+    list_select_related = ("game__user",)
+    changelist_defer = ("moves_blob", "feedback", *(f"game__{field}" for field in GameQuerySet.HEAVY_FIELDS))
 
 
 @admin.register(BatchAnalysisReport)
-class BatchAnalysisReportAdmin(admin.ModelAdmin):
+class BatchAnalysisReportAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "user",
@@ -163,9 +177,17 @@ class BatchAnalysisReportAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = ("status", "created_at", "credits_refunded")
-    search_fields = ("task_id", "user__username", "user__email")
+    search_fields = ("task_id", "=user__username", "=user__email")
     ordering = ("-created_at",)
     raw_id_fields = ("user",)
+    list_select_related = ("user",)
+    changelist_defer = (
+        *BatchAnalysisReportQuerySet.HEAVY_FIELDS,
+        "game_ids",
+        "completed_games",
+        "failed_games",
+        "top_moment",
+    )
     readonly_fields = (
         "created_at",
         "updated_at",
@@ -217,13 +239,31 @@ class BatchAnalysisReportAdmin(admin.ModelAdmin):
         ),
     )
 
-    @admin.display(description="Failed")
+    def get_queryset(self, request):
+        # The list columns below are computed in SQL so the changelist can defer the JSON.
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                failed_games_count=JSONArrayLength("failed_games"),
+                has_coaching_report=ExpressionWrapper(
+                    Q(coaching_report__isnull=False) & ~Q(coaching_report={}),
+                    output_field=BooleanField(),
+                ),
+            )
+        )
+
+    @admin.display(description="Failed", ordering="failed_games_count")
     def failed_count(self, obj: BatchAnalysisReport) -> int:
+        if hasattr(obj, "failed_games_count"):
+            return obj.failed_games_count
         failed = obj.failed_games or []
         return len(failed) if isinstance(failed, list) else 0
 
-    @admin.display(boolean=True, description="Coaching")
+    @admin.display(boolean=True, description="Coaching", ordering="has_coaching_report")
     def has_coaching(self, obj: BatchAnalysisReport) -> bool:
+        if hasattr(obj, "has_coaching_report"):
+            return bool(obj.has_coaching_report)
         return bool(obj.coaching_report)
 
     @admin.display(description="Report URL")
@@ -0,0 +1,105 @@
+"""
+Changelist helpers for admin tables that grow to millions of rows.
+
+``LargeTableAdminMixin`` swaps in:
+
+* ``EstimatedCountPaginator``: an unfiltered changelist takes its row count from the
+  planner statistics (Postgres ``pg_class.reltuples``, SQLite ``sqlite_stat1`` after
+  ``ANALYZE``) instead of ``COUNT(*)``; filtered/searched lists, small tables and
+  tables without statistics are counted exactly;
+* ``LeanChangeList``: the list query defers the admin's ``changelist_defer`` fields, so
+  rows render without loading PGN or report JSON; the change form still loads every field.
+
+The full, unfiltered count next to filter results is disabled as well.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional, Tuple
+
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Func, IntegerField
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+# Below this many estimated rows the changelist still runs an exact COUNT(*).
+EXACT_COUNT_LIMIT = 10000
+
+
+def estimated_row_count(model, using: str = "default") -> Optional[int]:
+    """Planner estimate of the rows in ``model``'s table, or None when there are no statistics."""
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            elif connection.vendor == "sqlite":
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            else:
+                return None
+            row = cursor.fetchone()
+    except DatabaseError as exc:
+        # sqlite_stat1 only exists once ANALYZE has run.
+        logger.debug("No row estimate for %s: %s", table, exc)
+        return None
+    if not row or row[0] is None:
+        return None
+    try:
+        estimate = int(str(row[0]).split()[0])
+    except (IndexError, ValueError):
+        return None
+    # Postgres reports -1 for tables that were never vacuumed or analyzed.
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts table statistics for large unfiltered querysets."""
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if getattr(queryset, "query", None) is not None and not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
+
+
+class LeanChangeList(ChangeList):
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        defer = getattr(self.model_admin, "changelist_defer", ())
+        return queryset.defer(*defer) if defer else queryset
+
+
+class LargeTableAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    changelist_defer: Tuple[str, ...] = ()
+
+    def get_changelist(self, request, **kwargs):
+        return LeanChangeList
+
+
+class JSONArrayLength(Func):
+    """Length of a JSON array column; 0 for NULL or non-array values."""
+
+    function = "json_array_length"
+    output_field = IntegerField()
+    template = "COALESCE(%(function)s(%(expressions)s), 0)"
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template=(
+                "CASE WHEN jsonb_typeof(%(expressions)s) = 'array' "
+                "THEN jsonb_array_length(%(expressions)s) ELSE 0 END"
+            ),
+            **extra_context,
+        )
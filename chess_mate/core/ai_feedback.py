@@ -15,6 +15,13 @@ from django.core.cache import cache, caches
 from django.core.exceptions import ValidationError
 from openai import OpenAI
 
+from .llm_cache import (
+    PURPOSE_BATCH_FEEDBACK,
+    PURPOSE_GAME_FEEDBACK,
+    LLMRequest,
+    cached_llm_call,
+    completion_content,
+)
 from .models import Game  # Add Game model import
 
 logger = logging.getLogger(__name__)
@@ -165,46 +172,28 @@ Focus on actionable feedback that will help improve future performance."""
 
     def _generate_ai_feedback(self, game_analysis: List[Dict[str, Any]], game: Optional[Game] = None) -> Dict[str, Any]:
         try:
-            # Check rate limit
-            if not self.rate_limiter.can_make_request():
-                logger.warning("OpenAI API rate limit reached, using fallback")
-                return cast(Dict[str, Any], self._generate_fallback_feedback(game_analysis))
-
-            # Try to get cached feedback if game exists
-            if game is not None:
-                cache_key = f"game_feedback_{game.pk}"
-                cached_feedback = self.cache.get(cache_key)
-                if cached_feedback:
-                    return cached_feedback
-            else:
-                logger.warning("No game object provided, skipping cache")
-
-            # Generate feedback using OpenAI
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a chess analysis expert."},
-                    {
-                        "role": "user",
-                        "content": self._create_analysis_prompt(game_analysis),
-                    },
-                ],
-                temperature=0.7,
-                max_tokens=1000,
-                n=1,
+            llm_request = LLMRequest(
+                PURPOSE_GAME_FEEDBACK,
+                "gpt-3.5-turbo",
+                "You are a chess analysis expert.",
+                self._create_analysis_prompt(game_analysis),
+                params={"temperature": 0.7, "max_tokens": 1000, "n": 1},
             )
 
-            feedback_text = response.choices[0].message.content.strip()
-
-            # Calculate metrics and structure feedback
-            feedback = cast(Dict[str, Any], self._parse_ai_response(feedback_text, game_analysis))
+            def _complete() -> str:
+                # Only misses spend the OpenAI budget; an empty result is returned uncached.
+                if not self.rate_limiter.can_make_request():
+                    logger.warning("OpenAI API rate limit reached, using fallback")
+                    return ""
+                return completion_content(self.openai_client, llm_request)
 
-            # Cache the feedback if game exists
-            if game is not None:
-                cache_key = f"game_feedback_{game.pk}"
-                self.cache.set(cache_key, feedback, timeout=3600)  # Cache for 1 hour
+            # Keyed by the prompt content, so re-analysed games with unchanged moves reuse the response.
+            feedback_text = cached_llm_call(llm_request, _complete)
+            if not feedback_text:
+                return cast(Dict[str, Any], self._generate_fallback_feedback(game_analysis))
 
-            return feedback
+            # Calculate metrics and structure feedback
+            return cast(Dict[str, Any], self._parse_ai_response(feedback_text, game_analysis))
 
         except openai.RateLimitError:
             logger.warning("OpenAI API rate limit exceeded, using fallback")
@@ -604,6 +593,24 @@ Focus on actionable feedback that will help improve future performance."""
             logger.error(f"Error generating batch feedback: {str(e)}")
             return self._get_default_feedback()
 
+    def _make_openai_request(self, prompt: str) -> str:
+        """Batch feedback completion through the shared bounded client; empty when rate limited."""
+        llm_request = LLMRequest(
+            PURPOSE_BATCH_FEEDBACK,
+            "gpt-3.5-turbo",
+            "You are a chess analysis expert.",
+            prompt,
+            params={"temperature": 0.7, "max_tokens": 1000, "n": 1},
+        )
+
+        def _complete() -> str:
+            if not self.rate_limiter.can_make_request():
+                logger.warning("OpenAI API rate limit reached, using fallback")
+                return ""
+            return completion_content(self.openai_client, llm_request)
+
+        return cast(str, cached_llm_call(llm_request, _complete))
+
     def generate_feedback(self, game_analysis: List[Dict[str, Any]], game: Optional[Game] = None) -> Dict[str, Any]:
         """Backward-compatible alias for callers expecting a public generate_feedback method."""
         return self._generate_ai_feedback(game_analysis, game)
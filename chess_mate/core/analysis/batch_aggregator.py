@@ -5,16 +5,32 @@ Pure Python — no Stockfish, no AI. Takes per-game results and produces batch_s
 
 import logging
 import re
-import statistics
 from collections import Counter
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
 
 from ..rating_band_coaching import rating_band_coaching
+from .batch_columns import (
+    COLOR_BLACK,
+    COLOR_WHITE,
+    GENERAL_ENDGAME,
+    OUTCOMES,
+    PHASES,
+    BatchColumns,
+    first_seen_order,
+    most_common_first_seen,
+    ordered_mean,
+    ordered_sum,
+)
 from .batch_metrics import compute_batch_accuracy, compute_batch_acpl
 from .moment_insights import ENDGAME_LICHESS_URLS, ENDGAME_STUDY_HINTS
 
 logger = logging.getLogger(__name__)
 
+# Helpers accept raw per-game dicts or a prebuilt BatchColumns (aggregate_batch builds one).
+BatchResults = Union[BatchColumns, List[Dict[str, Any]]]
+
 
 class BatchAggregationError(Exception):
     """Raised when batch aggregation fails due to insufficient or invalid data."""
@@ -65,26 +81,11 @@ def aggregate_batch(per_game_results: List[Dict[str, Any]], pgn_list: Optional[L
 
     per_game_results = valid_results
 
-    # Derive player_rating from game ELO ratings
-    # For each game, extract the ELO of the player's color, collect non-null values,
-    # take median, and round to nearest integer
-    player_elos = []
-    for game_result in per_game_results:
-        player_color = game_result.get("player_color", "white")
-        if player_color == "white":
-            white_elo = game_result.get("white_elo")
-            if white_elo is not None:
-                player_elos.append(white_elo)
-        else:
-            black_elo = game_result.get("black_elo")
-            if black_elo is not None:
-                player_elos.append(black_elo)
+    # One columnar view shared by every batch statistic below
+    columns = BatchColumns(per_game_results)
 
-    # Compute median; if no ELO values, set to None
-    if player_elos:
-        player_rating = round(statistics.median(player_elos))
-    else:
-        player_rating = None
+    # Median ELO of the player's colour across games (None when no ratings)
+    player_rating = columns.player_rating()
 
     # Extract basic counts
     games_analyzed = len(per_game_results)
@@ -93,28 +94,28 @@ def aggregate_batch(per_game_results: List[Dict[str, Any]], pgn_list: Optional[L
     date_range = _extract_date_range(pgn_list)
 
     # Extract win/loss/draw
-    win_loss_draw = _count_results(per_game_results)
+    win_loss_draw = _count_results(columns)
 
-    overall_eval_stability = _compute_overall_eval_stability(per_game_results)
-    overall_accuracy_pct = compute_batch_accuracy(per_game_results)
-    overall_acpl = compute_batch_acpl(per_game_results)
+    overall_eval_stability = _compute_overall_eval_stability(columns)
+    overall_accuracy_pct = compute_batch_accuracy(columns)
+    overall_acpl = compute_batch_acpl(columns)
 
     # Phase performance: score, trend, primary_openings/worst_aspect
-    phase_performance = _compute_phase_performance(per_game_results)
+    phase_performance = _compute_phase_performance(columns)
 
     # Recurring weaknesses: patterns in ≥30% of games
-    recurring_weaknesses = _find_recurring_weaknesses(per_game_results)
+    recurring_weaknesses = _find_recurring_weaknesses(columns)
 
     # Strength patterns: ≥60% of games
-    strength_patterns = _find_strength_patterns(per_game_results)
+    strength_patterns = _find_strength_patterns(columns)
 
     # Most common blunder type
-    most_common_blunder_type = _find_most_common_blunder_type(per_game_results)
+    most_common_blunder_type = _find_most_common_blunder_type(columns)
 
     # Opening / endgame insights (specific, engine-derived — not generic tactic labels)
-    opening_insights = _compute_opening_insights(per_game_results)
+    opening_insights = _compute_opening_insights(columns)
     repertoire_gaps = _compute_repertoire_gaps(opening_insights)
-    endgame_insights = _compute_endgame_insights(per_game_results)
+    endgame_insights = _compute_endgame_insights(columns)
 
     # Best and worst phases with solid-phases sentinel
     worst_phase, best_phase, all_phases_solid = _find_phase_extremes(phase_performance)
@@ -264,19 +265,6 @@ def _extract_date_range(pgn_list: Optional[List[str]]) -> str:
     return f"{dates_sorted[0]} to {dates_sorted[-1]}"
 
 
-def _player_outcome(result: Dict[str, Any]) -> str:
-    """win | loss | draw from the analyzed player's perspective."""
-    raw = (result.get("result") or "").strip()
-    color = result.get("player_color", "white")
-    if raw in ("1/2-1/2", "*"):
-        return "draw"
-    if raw == "1-0":
-        return "win" if color == "white" else "loss"
-    if raw == "0-1":
-        return "win" if color == "black" else "loss"
-    return "unknown"
-
-
 def _phase_score(phase_data: Dict[str, Any]) -> float:
     avg_eval_drop = float(phase_data.get("avg_eval_drop", 0.0) or 0.0)
     return max(0.0, min(1.0, 1.0 - avg_eval_drop))
@@ -304,121 +292,70 @@ def _trend_from_move_match(avg_move_match: Optional[float], *, std_dev: float =
     return "average"
 
 
-def _count_results(per_game_results: List[Dict[str, Any]]) -> Dict[str, int]:
+def _count_results(per_game_results: BatchResults) -> Dict[str, int]:
     """Count wins, losses, draws from the analyzed player's perspective (M3)."""
-    wins = 0
-    losses = 0
-    draws = 0
-
-    for result in per_game_results:
-        outcome = _player_outcome(result)
-        if outcome == "win":
-            wins += 1
-        elif outcome == "loss":
-            losses += 1
-        elif outcome == "draw":
-            draws += 1
-
+    counts = BatchColumns.of(per_game_results).outcome_counts()
     return {
-        "wins": wins,
-        "losses": losses,
-        "draws": draws,
+        "wins": counts["win"],
+        "losses": counts["loss"],
+        "draws": counts["draw"],
     }
 
 
-def _compute_overall_eval_stability(per_game_results: List[Dict[str, Any]]) -> float:
+def _compute_overall_eval_stability(per_game_results: BatchResults) -> float:
     """Weighted average of phase eval stability scores (1 - avg_eval_drop)."""
-    if not per_game_results:
+    columns = BatchColumns.of(per_game_results)
+    if not len(columns):
         return 0.0
 
-    total_weight = 0.0
-    weighted_sum = 0.0
-
-    for result in per_game_results:
-        phase_breakdown = result.get("phase_breakdown", {})
-        for phase_key in ["opening", "middlegame", "endgame"]:
-            phase = phase_breakdown.get(phase_key, {})
-            moves_count = phase.get("moves", 0)
-            if moves_count > 0:
-                # Compute phase score as inverse of avg_eval_drop
-                avg_eval_drop = phase.get("avg_eval_drop", 0.0)
-                # Score: 1.0 - normalized_drop (capped at 0 and 1)
-                phase_score = max(0.0, min(1.0, 1.0 - avg_eval_drop))
-                weighted_sum += phase_score * moves_count
-                total_weight += moves_count
-
+    # Every (game, phase) cell with moves, weighted by its move count
+    played = columns.phase_moves > 0
+    weights = columns.phase_moves[played]
+    total_weight = int(weights.sum())
     if total_weight == 0:
         return 0.0
 
-    overall = weighted_sum / total_weight
+    overall = ordered_sum(columns.phase_scores[played] * weights) / total_weight
     return round(overall, 2)
 
 
 def _compute_phase_performance(
-    per_game_results: List[Dict[str, Any]],
+    per_game_results: BatchResults,
 ) -> Dict[str, Any]:
     """
     Compute score, trend, and worst_aspect for each phase.
     worst_aspect uses enum: tactical_oversight | time_pressure | positional | technique
     Derived from most common tactical_theme in critical moments.
     """
+    columns = BatchColumns.of(per_game_results)
+    scores = columns.phase_scores
     phases = {}
 
-    for phase_name in ["opening", "middlegame", "endgame"]:
-        phase_scores = []
-        phase_accuracy_scores = []
-        phase_openings = []
-        tactical_themes_for_phase = []
-
-        for result in per_game_results:
-            phase_breakdown = result.get("phase_breakdown", {})
-            phase_data = phase_breakdown.get(phase_name, {})
-            moves_count = phase_data.get("moves", 0)
-
-            if moves_count > 0:
-                avg_eval_drop = phase_data.get("avg_eval_drop", 0.0)
-                phase_score = max(0.0, min(1.0, 1.0 - avg_eval_drop))
-                phase_scores.append(phase_score)
-                phase_acc = phase_data.get("accuracy")
-                if phase_acc is not None:
-                    phase_accuracy_scores.append(float(phase_acc))
-
-            # Collect opening names for opening phase
-            if phase_name == "opening":
-                opening = result.get("opening_name", "Unknown")
-                if opening and opening != "Unknown":
-                    phase_openings.append(opening)
-
-            # Collect tactical themes from critical moments in this phase
-            critical_moments = result.get("critical_moments", [])
-            for moment in critical_moments:
-                if moment.get("phase") == phase_name:
-                    theme = moment.get("tactical_theme")
-                    if theme:
-                        tactical_themes_for_phase.append(theme)
+    for phase_index, phase_name in enumerate(PHASES):
+        played = columns.phase_moves[:, phase_index] > 0
+        phase_scores = scores[played, phase_index]
+        phase_accuracy_scores = columns.phase_accuracy[played, phase_index]
+        phase_accuracy_scores = phase_accuracy_scores[~np.isnan(phase_accuracy_scores)]
 
         # Eval stability score (1 - avg_eval_drop) — not move match %.
-        if phase_scores:
-            avg_score = sum(phase_scores) / len(phase_scores)
-            if len(phase_scores) > 1:
-                std_dev = statistics.stdev(phase_scores)
-            else:
-                std_dev = 0.0
+        if phase_scores.size:
+            avg_score = ordered_mean(phase_scores)
+            std_dev = float(phase_scores.std(ddof=1)) if phase_scores.size > 1 else 0.0
         else:
             avg_score = 0.5
             std_dev = 0.0
 
         avg_move_match = None
-        if phase_accuracy_scores:
-            avg_move_match = round(sum(phase_accuracy_scores) / len(phase_accuracy_scores), 1)
+        if phase_accuracy_scores.size:
+            avg_move_match = round(ordered_mean(phase_accuracy_scores), 1)
 
         accuracy_std = 0.0
-        if len(phase_accuracy_scores) > 1:
-            accuracy_std = statistics.stdev(phase_accuracy_scores)
+        if phase_accuracy_scores.size > 1:
+            accuracy_std = float(phase_accuracy_scores.std(ddof=1))
 
         if avg_move_match is not None:
             trend = _trend_from_move_match(avg_move_match, std_dev=accuracy_std)
-        elif phase_scores:
+        elif phase_scores.size:
             if avg_score >= 0.75:
                 trend = "strong"
             elif avg_score < 0.5:
@@ -431,7 +368,7 @@ def _compute_phase_performance(
             trend = "no_data"
 
         phase_info = {
-            "score": round(avg_score, 2) if avg_score is not None else None,
+            "score": round(avg_score, 2),
             "trend": trend,
         }
         if avg_move_match is not None:
@@ -439,18 +376,18 @@ def _compute_phase_performance(
 
         # Opening always includes primary_openings key
         if phase_name == "opening":
-            if phase_openings:
-                opening_counts = Counter(phase_openings)
-                top_openings = [name for name, _ in opening_counts.most_common(3)]
-                phase_info["primary_openings"] = top_openings
+            opening_counts = Counter(name for name in columns.primary_opening if name)
+            if opening_counts:
+                phase_info["primary_openings"] = [name for name, _ in opening_counts.most_common(3)]
             else:
                 phase_info["primary_openings"] = ["Unknown"]
 
         # Middlegame/endgame always include worst_aspect key from enum
         if phase_name in ["middlegame", "endgame"]:
-            if tactical_themes_for_phase:
-                most_common_theme = Counter(tactical_themes_for_phase).most_common(1)[0][0]
-                phase_info["worst_aspect"] = _map_theme_to_aspect(most_common_theme)
+            in_phase = (columns.moment_phase == phase_index) & (columns.moment_theme >= 0)
+            theme_id = most_common_first_seen(columns.moment_theme[in_phase])
+            if theme_id is not None:
+                phase_info["worst_aspect"] = _map_theme_to_aspect(columns.themes.values[theme_id])
             else:
                 phase_info["worst_aspect"] = "technique"
 
@@ -472,125 +409,109 @@ def _map_theme_to_aspect(tactical_theme: str) -> str:
 
 
 def _find_recurring_weaknesses(
-    per_game_results: List[Dict[str, Any]],
+    per_game_results: BatchResults,
 ) -> List[Dict[str, Any]]:
     """
     Find patterns (tactical themes) appearing in ≥30% of games.
     """
-    if not per_game_results:
+    columns = BatchColumns.of(per_game_results)
+    if not len(columns):
         return []
 
-    threshold = 0.3 * len(per_game_results)
-
-    # Count games containing each tactical_theme
-    theme_game_counts = {}  # theme -> count of games with this theme
-    theme_swings = {}  # theme -> list of eval_swings
-    theme_games = {}  # theme -> list of game_ids
-
-    generic_themes = {"missed_tactic", "tactical_oversight"}
+    threshold = 0.3 * len(columns)
     min_swing = 0.5
+    generic_ids = [
+        columns.themes.ids[theme] for theme in ("missed_tactic", "tactical_oversight") if theme in columns.themes.ids
+    ]
 
-    for result in per_game_results:
-        game_id = result.get("game_id", "unknown")
-        critical_moments = result.get("critical_moments", [])
+    # Themed blunders/mistakes with a meaningful swing
+    eligible = columns.error_moments & (columns.moment_swing >= min_swing) & (columns.moment_theme >= 0)
+    games = columns.moment_game[eligible]
+    themes = columns.moment_theme[eligible]
+    swings = columns.moment_swing[eligible]
+    if not themes.size:
+        return []
 
-        themes_in_game = set()
-        for moment in critical_moments:
-            if moment.get("type") not in ("blunder", "mistake"):
-                continue
-            swing = float(moment.get("eval_swing", 0.0) or 0.0)
-            if swing < min_swing:
-                continue
-            theme = moment.get("tactical_theme")
-            if theme:
-                themes_in_game.add(theme)
-                if theme not in theme_swings:
-                    theme_swings[theme] = []
-                theme_swings[theme].append(swing)
-
-        if themes_in_game - generic_themes:
-            themes_in_game -= generic_themes
-
-        for theme in themes_in_game:
-            theme_game_counts[theme] = theme_game_counts.get(theme, 0) + 1
-            if theme not in theme_games:
-                theme_games[theme] = []
-            theme_games[theme].append(game_id)
+    # Generic labels only count for games with no specific theme
+    theme_total = len(columns.themes.values)
+    generic = np.isin(themes, generic_ids)
+    has_specific = np.bincount(games[~generic], minlength=len(columns)) > 0
+    kept = ~(generic & has_specific[games])
+
+    # One (game, theme) pair per game, in game order
+    pairs = np.unique(games[kept] * theme_total + themes[kept])
+    pair_games, pair_themes = pairs // theme_total, pairs % theme_total
+    theme_game_counts = np.bincount(pair_themes, minlength=theme_total)
+    swing_sums = np.bincount(themes, weights=swings, minlength=theme_total)
+    swing_counts = np.bincount(themes, minlength=theme_total)
 
     # Filter by threshold (≥30%) and build result (cap tactical themes — opening/endgame insights are separate)
     recurring = []
-    for theme, game_count in sorted(theme_game_counts.items(), key=lambda x: x[1], reverse=True):
-        if game_count >= threshold:
-            # Compute average eval swing
-            swings = theme_swings.get(theme, [])
-            avg_swing = sum(swings) / len(swings) if swings else 0.0
-
-            # Determine impact
-            if avg_swing >= 1.5:
-                impact = "critical"
-            elif avg_swing >= 0.5:
-                impact = "high"
-            else:
-                impact = "medium"
+    ordered = first_seen_order(pair_themes)
+    for theme_id in sorted(ordered, key=lambda theme_id: theme_game_counts[theme_id], reverse=True):
+        game_count = int(theme_game_counts[theme_id])
+        if game_count < threshold:
+            continue
+        theme = columns.themes.values[theme_id]
 
-            # Get up to 3 example game IDs
-            example_ids = theme_games.get(theme, [])[:3]
+        # Compute average eval swing
+        avg_swing = float(swing_sums[theme_id] / swing_counts[theme_id]) if swing_counts[theme_id] else 0.0
 
-            frequency_str = f"{game_count}/{len(per_game_results)} games"
+        # Determine impact
+        if avg_swing >= 1.5:
+            impact = "critical"
+        elif avg_swing >= 0.5:
+            impact = "high"
+        else:
+            impact = "medium"
 
-            recurring.append(
-                {
-                    "pattern": theme,
-                    "frequency": frequency_str,
-                    "avg_eval_swing": round(avg_swing, 2),
-                    "impact": impact,
-                    "example_game_ids": example_ids,
-                    "detail": f"Tactical theme '{theme.replace('_', ' ')}' appeared in critical moments.",
-                }
-            )
+        # Get up to 3 example game IDs
+        example_ids = [columns.game_ids[index] for index in pair_games[pair_themes == theme_id][:3]]
+
+        frequency_str = f"{game_count}/{len(columns)} games"
+
+        recurring.append(
+            {
+                "pattern": theme,
+                "frequency": frequency_str,
+                "avg_eval_swing": round(avg_swing, 2),
+                "impact": impact,
+                "example_game_ids": example_ids,
+                "detail": f"Tactical theme '{theme.replace('_', ' ')}' appeared in critical moments.",
+            }
+        )
 
     return recurring[:2]
 
 
 def _find_strength_patterns(
-    per_game_results: List[Dict[str, Any]],
+    per_game_results: BatchResults,
 ) -> List[Dict[str, Any]]:
     """
     Find patterns where player performed well in ≥60% of games.
     This is currently a placeholder; in full implementation would track
     successful opening moves, positional ideas, etc.
     """
-    if not per_game_results:
+    columns = BatchColumns.of(per_game_results)
+    if not len(columns):
         return []
 
-    # Count games with strong opening move match and collect opening stats
-    strong_opening_count = 0
-    opening_move_match_scores: List[float] = []
-    opening_games_with_data = 0
-
-    for result in per_game_results:
-        opening_phase = result.get("phase_breakdown", {}).get("opening", {})
-        opening_moves = int(opening_phase.get("moves", 0) or 0)
-        if opening_moves <= 0:
-            continue
-        opening_games_with_data += 1
-        move_match = _phase_move_match_pct(opening_phase)
-        if move_match is not None:
-            opening_move_match_scores.append(move_match)
-            if move_match >= 75.0:
-                strong_opening_count += 1
-        else:
-            opening_score = _phase_score(opening_phase)
-            if opening_score >= 0.75:
-                strong_opening_count += 1
+    # Games with opening moves: strong on move match when known, else on eval stability
+    played = columns.phase_moves[:, 0] > 0
+    move_match = columns.phase_accuracy[played, 0]
+    has_match = ~np.isnan(move_match)
+    strong = np.where(has_match, move_match >= 75.0, columns.phase_scores[played, 0] >= 0.75)
+    strong_opening_count = int(strong.sum())
+    opening_games_with_data = int(played.sum())
+    opening_move_match_scores = move_match[has_match]
 
-    threshold = 0.6 * len(per_game_results)
+    threshold = 0.6 * len(columns)
     patterns = []
 
     if strong_opening_count >= threshold:
-        if opening_move_match_scores:
-            avg_opening_pct = round(sum(opening_move_match_scores) / len(opening_move_match_scores), 1)
-            games_phrase = opening_games_with_data if opening_games_with_data > 0 else len(per_game_results)
+        if opening_move_match_scores.size:
+            avg_opening_pct = round(ordered_mean(opening_move_match_scores), 1)
+            games_phrase = opening_games_with_data if opening_games_with_data > 0 else len(columns)
             detail = f"Opening move match averaged {avg_opening_pct}% across {games_phrase} games."
         else:
             detail = "Opening phase performance was consistently strong across the analyzed games."
@@ -598,7 +519,7 @@ def _find_strength_patterns(
         patterns.append(
             {
                 "pattern": "opening_preparation",
-                "frequency": f"{strong_opening_count}/{len(per_game_results)} games",
+                "frequency": f"{strong_opening_count}/{len(columns)} games",
                 "detail": detail,
             }
         )
@@ -606,48 +527,33 @@ def _find_strength_patterns(
     return patterns
 
 
-def _find_most_common_blunder_type(per_game_results: List[Dict[str, Any]]) -> Optional[str]:
-    """Most frequent tactical theme in critical blunders/mistakes, or None if no signal."""
-    theme_counts: Counter = Counter()
-    for result in per_game_results:
-        for moment in result.get("critical_moments", []):
-            if moment.get("type") not in ("blunder", "mistake"):
-                continue
-            theme = (moment.get("tactical_theme") or "").strip()
-            if not theme or theme == "missed_tactic":
-                theme_counts["tactical errors"] += 1
-            else:
-                theme_counts[theme.replace("_", " ")] += 1
+def _blunder_type_label(theme: Any) -> str:
+    theme = (theme or "").strip()
+    if not theme or theme == "missed_tactic":
+        return "tactical errors"
+    return theme.replace("_", " ")
 
-    if theme_counts:
-        return theme_counts.most_common(1)[0][0]
 
-    blunder_games = sum(
-        1 for result in per_game_results if int(result.get("move_quality", {}).get("blunder", 0) or 0) > 0
-    )
-    if blunder_games:
+def _find_most_common_blunder_type(per_game_results: BatchResults) -> Optional[str]:
+    """Most frequent tactical theme in critical blunders/mistakes, or None if no signal."""
+    columns = BatchColumns.of(per_game_results)
+    theme_ids = columns.moment_theme[columns.error_moments]
+    if theme_ids.size:
+        # Theme id -> label (-1, i.e. no theme, maps to the trailing "tactical errors")
+        labels = np.array([_blunder_type_label(theme) for theme in columns.themes.values] + ["tactical errors"])
+        moment_labels = labels[np.where(theme_ids >= 0, theme_ids, len(columns.themes.values))]
+        _, label_ids = np.unique(moment_labels, return_inverse=True)
+        return str(moment_labels[np.flatnonzero(label_ids == most_common_first_seen(label_ids))[0]])
+
+    if (columns.blunder_count > 0).any():
         return "tactical errors"
 
-    mistake_games = sum(
-        1 for result in per_game_results if int(result.get("move_quality", {}).get("mistake", 0) or 0) > 0
-    )
-    if mistake_games:
+    if (columns.mistake_count > 0).any():
         return "inaccurate play"
 
     return None
 
 
-def _opening_group_key(result: Dict[str, Any]) -> str:
-    """Group ECO variants (e.g. Queen's Pawn + London System) for batch-level stats."""
-    eco = (result.get("eco_code") or "").strip()
-    if eco:
-        return f"eco:{eco}"
-    name = (result.get("opening_name") or "").strip()
-    if ":" in name:
-        return name.split(":", 1)[0].strip()
-    return name
-
-
 def _opening_display_name(games: List[Dict[str, Any]]) -> str:
     from ..eco_codes import get_opening_name
     from ..opening_name_utils import compact_opening_name
@@ -669,41 +575,40 @@ def _opening_display_name(games: List[Dict[str, Any]]) -> str:
     return "Unknown"
 
 
-def _compute_opening_insights(per_game_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _compute_opening_insights(per_game_results: BatchResults) -> List[Dict[str, Any]]:
     """
     Per-opening performance so coaching can name lines the player struggles in.
     """
-    by_opening: Dict[str, List[Dict[str, Any]]] = {}
-    for result in per_game_results:
-        name = (result.get("opening_name") or "").strip()
-        eco = (result.get("eco_code") or "").strip()
-        if (not name or name.lower() in ("unknown", "unknown opening")) and not eco:
-            continue
-        group_key = _opening_group_key(result)
-        by_opening.setdefault(group_key, []).append(result)
+    columns = BatchColumns.of(per_game_results)
+    group_total = len(columns.openings.values)
+    if not group_total:
+        return []
+
+    # Games per opening group (first-seen group order, game order within a group)
+    grouped = np.flatnonzero(columns.opening_group >= 0)
+    group_ids = columns.opening_group[grouped]
+    members_by_group = np.split(
+        grouped[np.argsort(group_ids, kind="stable")], np.cumsum(np.bincount(group_ids, minlength=group_total))[:-1]
+    )
+    records = np.bincount(group_ids * len(OUTCOMES) + columns.outcome[grouped], minlength=group_total * len(OUTCOMES))
+    records = records.reshape(group_total, len(OUTCOMES))
+    opening_played = columns.phase_moves[:, 0] > 0
+    opening_scores = columns.phase_scores[:, 0]
+    opening_matches = columns.phase_accuracy[:, 0]
 
     insights: List[Dict[str, Any]] = []
-    for _group_key, games in by_opening.items():
+    for group_id, members in enumerate(members_by_group):
+        games = [columns.results[index] for index in members]
         opening_name = _opening_display_name(games)
-        outcomes = [_player_outcome(g) for g in games]
-        wins = outcomes.count("win")
-        losses = outcomes.count("loss")
-        draws = outcomes.count("draw")
-        opening_phases = [
-            g.get("phase_breakdown", {}).get("opening", {})
-            for g in games
-            if int(g.get("phase_breakdown", {}).get("opening", {}).get("moves", 0) or 0) > 0
-        ]
-        opening_scores = [_phase_score(phase) for phase in opening_phases]
-        avg_opening_score = round(sum(opening_scores) / len(opening_scores), 2) if opening_scores else None
-        opening_move_matches = [pct for phase in opening_phases if (pct := _phase_move_match_pct(phase)) is not None]
-        avg_opening_move_match_pct = (
-            round(sum(opening_move_matches) / len(opening_move_matches), 1) if opening_move_matches else None
-        )
-        colors = [g.get("player_color", "white") for g in games]
-        player_color = "black" if colors.count("black") > colors.count("white") else "white"
+        wins, losses, draws = (int(count) for count in records[group_id, :3])
+        with_opening = members[opening_played[members]]
+        avg_opening_score = round(ordered_mean(opening_scores[with_opening]), 2) if with_opening.size else None
+        opening_move_matches = opening_matches[with_opening]
+        opening_move_matches = opening_move_matches[~np.isnan(opening_move_matches)]
+        avg_opening_move_match_pct = round(ordered_mean(opening_move_matches), 1) if opening_move_matches.size else None
+        colors = columns.color[members]
+        player_color = "black" if (colors == COLOR_BLACK).sum() > (colors == COLOR_WHITE).sum() else "white"
         eco_codes = sorted({g.get("eco_code") for g in games if g.get("eco_code")})
-
         status = "neutral"
         recommendation = None
         if losses >= 2 or (len(games) >= 2 and losses > wins):
@@ -797,50 +702,46 @@ def _compute_repertoire_gaps(opening_insights: List[Dict[str, Any]]) -> List[Dic
     return gaps[:3]
 
 
-def _compute_endgame_insights(per_game_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _compute_endgame_insights(per_game_results: BatchResults) -> List[Dict[str, Any]]:
     """
     Endgame types where the player lost evaluation (from FEN at critical moments).
     """
-    type_games: Dict[str, set] = {}
-    type_swings: Dict[str, List[float]] = {}
-    type_examples: Dict[str, List[Dict[str, Any]]] = {}
-
-    for result in per_game_results:
-        game_id = result.get("game_id", "unknown")
-        endgame_phase = result.get("phase_breakdown", {}).get("endgame", {})
-        if int(endgame_phase.get("moves", 0) or 0) < 4:
-            continue
+    columns = BatchColumns.of(per_game_results)
+    endgame = PHASES.index("endgame")
 
-        for moment in result.get("critical_moments", []):
-            if moment.get("phase") != "endgame":
-                continue
-            if moment.get("type") not in ("blunder", "mistake"):
-                continue
-            eg_type = moment.get("endgame_material") or "general_endgame"
-            type_games.setdefault(eg_type, set()).add(game_id)
-            type_swings.setdefault(eg_type, []).append(float(moment.get("eval_swing", 0.0) or 0.0))
-            examples = type_examples.setdefault(eg_type, [])
-            if len(examples) < 3:
-                examples.append(
-                    {
-                        "game_id": game_id,
-                        "move_number": moment.get("move_number"),
-                        "played_move": moment.get("played_move"),
-                        "best_move": moment.get("best_move"),
-                    }
-                )
-
-    total_games = len(per_game_results)
-    has_specific_endgame = any(eg_type != "general_endgame" for eg_type in type_games)
+    # Endgame blunders/mistakes in games with a real endgame (≥4 moves)
+    long_endgame = columns.phase_moves[:, endgame] >= 4
+    eligible = np.flatnonzero(
+        columns.error_moments & (columns.moment_phase == endgame) & long_endgame[columns.moment_game]
+    )
+    eligible_types = columns.moment_endgame[eligible]
+
+    type_stats = []
+    for type_id in first_seen_order(eligible_types):
+        type_moments = eligible[eligible_types == type_id]
+        game_ids = {columns.game_ids[index] for index in columns.moment_game[type_moments]}
+        examples = []
+        for index in type_moments[:3]:
+            moment = columns.moments[index]
+            examples.append(
+                {
+                    "game_id": columns.game_ids[columns.moment_game[index]],
+                    "move_number": moment.get("move_number"),
+                    "played_move": moment.get("played_move"),
+                    "best_move": moment.get("best_move"),
+                }
+            )
+        avg_swing = round(ordered_mean(columns.moment_swing[type_moments]), 2)
+        type_stats.append((columns.endgame_types.values[type_id], len(game_ids), avg_swing, examples))
+
+    total_games = len(columns)
+    has_specific_endgame = any(eg_type != GENERAL_ENDGAME for eg_type, *_ in type_stats)
     insights: List[Dict[str, Any]] = []
-    for eg_type, game_ids in sorted(type_games.items(), key=lambda kv: len(kv[1]), reverse=True):
-        if eg_type == "general_endgame" and has_specific_endgame:
+    for eg_type, count, avg_swing, examples in sorted(type_stats, key=lambda stat: stat[1], reverse=True):
+        if eg_type == GENERAL_ENDGAME and has_specific_endgame:
             continue
-        count = len(game_ids)
         if count < 2 and total_games >= 5:
             continue
-        swings = type_swings.get(eg_type, [])
-        avg_swing = round(sum(swings) / len(swings), 2) if swings else 0.0
         label = eg_type.replace("_", " ")
         insights.append(
             {
@@ -850,7 +751,7 @@ def _compute_endgame_insights(per_game_results: List[Dict[str, Any]]) -> List[Di
                 "avg_eval_swing": avg_swing,
                 "study_focus": ENDGAME_STUDY_HINTS.get(eg_type, ENDGAME_STUDY_HINTS["general_endgame"]),
                 "study_url": ENDGAME_LICHESS_URLS.get(eg_type, ENDGAME_LICHESS_URLS["general_endgame"]),
-                "example_moments": type_examples.get(eg_type, []),
+                "example_moments": examples,
             }
         )
 
@@ -0,0 +1,242 @@
+"""
+Columnar view of per-game batch results for vectorised aggregation.
+
+``BatchColumns(results)`` walks the per-game dicts (and their critical moments)
+once and stores everything the batch summary needs as NumPy arrays: per-game outcome,
+colour, accuracy/ACPL weights and opening group; a ``(games, 3)`` grid of phase move
+counts, eval drops and move-match %; and one row per critical moment with its game
+index, phase id, error kind, swing, theme id and endgame type id. Batch statistics are
+then grouped reductions (``bincount`` / masked means) instead of nested loops, so the
+same code scales from one batch to a user's whole history.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+PHASES = ("opening", "middlegame", "endgame")
+OUTCOMES = ("win", "loss", "draw", "unknown")
+COLOR_WHITE, COLOR_BLACK, COLOR_OTHER = 0, 1, 2
+
+# Critical-moment error kinds (anything else is KIND_OTHER).
+KIND_BLUNDER, KIND_MISTAKE, KIND_OTHER = 0, 1, -1
+_KINDS = {"blunder": KIND_BLUNDER, "mistake": KIND_MISTAKE}
+
+GENERAL_ENDGAME = "general_endgame"
+_UNKNOWN_OPENINGS = ("unknown", "unknown opening")
+
+
+def player_outcome(result: Dict[str, Any]) -> str:
+    """win | loss | draw from the analyzed player's perspective."""
+    raw = (result.get("result") or "").strip()
+    color = result.get("player_color", "white")
+    if raw in ("1/2-1/2", "*"):
+        return "draw"
+    if raw == "1-0":
+        return "win" if color == "white" else "loss"
+    if raw == "0-1":
+        return "win" if color == "black" else "loss"
+    return "unknown"
+
+
+def opening_group_key(result: Dict[str, Any]) -> str:
+    """Group ECO variants (e.g. Queen's Pawn + London System) for batch-level stats."""
+    eco = (result.get("eco_code") or "").strip()
+    if eco:
+        return f"eco:{eco}"
+    name = (result.get("opening_name") or "").strip()
+    if ":" in name:
+        return name.split(":", 1)[0].strip()
+    return name
+
+
+def _float_or_nan(value: Any) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class _Vocabulary:
+    """String -> dense id, in first-seen order."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def id_for(self, value: str) -> int:
+        if value not in self.ids:
+            self.ids[value] = len(self.values)
+            self.values.append(value)
+        return self.ids[value]
+
+
+def first_seen_order(ids: np.ndarray) -> np.ndarray:
+    """Distinct ids ordered by their first position in ``ids``."""
+    unique, first_index = np.unique(ids, return_index=True)
+    return unique[np.argsort(first_index, kind="stable")]
+
+
+def most_common_first_seen(ids: np.ndarray) -> Optional[int]:
+    """The most frequent id; ties go to the one seen first (``Counter.most_common`` order)."""
+    if not ids.size:
+        return None
+    counts = np.bincount(ids)
+    tied = np.flatnonzero(counts == counts.max())
+    return int(ids[np.isin(ids, tied)][0])
+
+
+def ordered_sum(values: np.ndarray) -> float:
+    """Left-to-right float sum, bit-identical to Python's ``sum``.
+
+    ``ndarray.sum`` adds pairwise, which can differ in the last bit and flip a ``round(x, 2)``
+    in the stored summaries.
+    """
+    return float(np.cumsum(values)[-1]) if values.size else 0.0
+
+
+def ordered_mean(values: np.ndarray) -> float:
+    return ordered_sum(values) / values.size
+
+
+def masked_mean(values: np.ndarray, weights: Optional[np.ndarray] = None) -> Optional[float]:
+    """Mean (or weighted mean) of the non-NaN entries of ``values``; None when there are none."""
+    mask = ~np.isnan(values)
+    if not mask.any():
+        return None
+    if weights is None:
+        return ordered_mean(values[mask])
+    weights = weights[mask]
+    total = float(weights.sum())
+    if total == 0:
+        return None
+    return ordered_sum(values[mask] * weights) / total
+
+
+class BatchColumns:
+    """Per-game results flattened into NumPy columns (see module docstring)."""
+
+    def __init__(self, results: Sequence[Dict[str, Any]]):
+        self.results = list(results)
+        count = len(self.results)
+        self.games = count
+
+        self.game_ids: List[Any] = []
+        self.outcome = np.empty(count, dtype=np.int8)
+        self.color = np.empty(count, dtype=np.int8)
+        self.player_elo = np.empty(count, dtype=np.float64)
+        self.accuracy = np.empty(count, dtype=np.float64)
+        self.player_moves = np.empty(count, dtype=np.int64)
+        self.acpl = np.empty(count, dtype=np.float64)
+        self.total_moves = np.empty(count, dtype=np.int64)
+        self.blunder_count = np.empty(count, dtype=np.int64)
+        self.mistake_count = np.empty(count, dtype=np.int64)
+        self.opening_group = np.full(count, -1, dtype=np.int64)
+        self.primary_opening: List[Optional[str]] = []
+
+        self.phase_moves = np.zeros((count, len(PHASES)), dtype=np.int64)
+        self.phase_drop = np.zeros((count, len(PHASES)), dtype=np.float64)
+        self.phase_accuracy = np.full((count, len(PHASES)), np.nan, dtype=np.float64)
+
+        self.openings = _Vocabulary()
+        self.themes = _Vocabulary()
+        self.endgame_types = _Vocabulary()
+
+        moment_game: List[int] = []
+        moment_phase: List[int] = []
+        moment_kind: List[int] = []
+        moment_swing: List[float] = []
+        moment_theme: List[int] = []
+        moment_endgame: List[int] = []
+        self.moments: List[Dict[str, Any]] = []
+
+        phase_ids = {name: index for index, name in enumerate(PHASES)}
+        outcome_ids = {name: index for index, name in enumerate(OUTCOMES)}
+
+        for index, result in enumerate(self.results):
+            self.game_ids.append(result.get("game_id", "unknown"))
+            self.outcome[index] = outcome_ids[player_outcome(result)]
+
+            player_color = result.get("player_color", "white")
+            self.color[index] = (
+                COLOR_WHITE if player_color == "white" else COLOR_BLACK if player_color == "black" else COLOR_OTHER
+            )
+            elo = result.get("white_elo") if player_color == "white" else result.get("black_elo")
+            self.player_elo[index] = _float_or_nan(elo)
+
+            self.accuracy[index] = _float_or_nan(result.get("accuracy"))
+            self.player_moves[index] = int(result.get("player_moves", 0) or 0) or 1
+            self.acpl[index] = _float_or_nan(result.get("acpl"))
+            self.total_moves[index] = int(result.get("total_moves", 0) or 0) or 1
+
+            move_quality = result.get("move_quality") or {}
+            self.blunder_count[index] = int(move_quality.get("blunder", 0) or 0)
+            self.mistake_count[index] = int(move_quality.get("mistake", 0) or 0)
+
+            opening = result.get("opening_name", "Unknown")
+            self.primary_opening.append(opening if opening and opening != "Unknown" else None)
+            name = (result.get("opening_name") or "").strip()
+            eco = (result.get("eco_code") or "").strip()
+            if (name and name.lower() not in _UNKNOWN_OPENINGS) or eco:
+                self.opening_group[index] = self.openings.id_for(opening_group_key(result))
+
+            phase_breakdown = result.get("phase_breakdown") or {}
+            for phase_index, phase_name in enumerate(PHASES):
+                phase = phase_breakdown.get(phase_name) or {}
+                self.phase_moves[index, phase_index] = int(phase.get("moves", 0) or 0)
+                self.phase_drop[index, phase_index] = float(phase.get("avg_eval_drop", 0.0) or 0.0)
+                self.phase_accuracy[index, phase_index] = _float_or_nan(phase.get("accuracy"))
+
+            for moment in result.get("critical_moments") or []:
+                if not isinstance(moment, dict):
+                    continue
+                theme = moment.get("tactical_theme")
+                self.moments.append(moment)
+                moment_game.append(index)
+                moment_phase.append(phase_ids.get(moment.get("phase"), -1))
+                moment_kind.append(_KINDS.get(moment.get("type"), KIND_OTHER))
+                moment_swing.append(float(moment.get("eval_swing", 0.0) or 0.0))
+                moment_theme.append(self.themes.id_for(theme) if theme else -1)
+                moment_endgame.append(self.endgame_types.id_for(moment.get("endgame_material") or GENERAL_ENDGAME))
+
+        self.moment_game = np.array(moment_game, dtype=np.int64)
+        self.moment_phase = np.array(moment_phase, dtype=np.int64)
+        self.moment_kind = np.array(moment_kind, dtype=np.int64)
+        self.moment_swing = np.array(moment_swing, dtype=np.float64)
+        self.moment_theme = np.array(moment_theme, dtype=np.int64)
+        self.moment_endgame = np.array(moment_endgame, dtype=np.int64)
+
+    @classmethod
+    def of(cls, per_game_results: Union["BatchColumns", Iterable[Dict[str, Any]]]) -> "BatchColumns":
+        """Reuse an existing column set or build one from per-game dicts."""
+        if isinstance(per_game_results, cls):
+            return per_game_results
+        return cls(list(per_game_results))
+
+    def __len__(self) -> int:
+        return self.games
+
+    @property
+    def phase_scores(self) -> np.ndarray:
+        """Eval stability score per game and phase: ``clip(1 - avg_eval_drop, 0, 1)``."""
+        return np.clip(1.0 - self.phase_drop, 0.0, 1.0)
+
+    @property
+    def error_moments(self) -> np.ndarray:
+        """Mask of blunder/mistake critical moments."""
+        return self.moment_kind != KIND_OTHER
+
+    def outcome_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.outcome, minlength=len(OUTCOMES))
+        return {name: int(counts[index]) for index, name in enumerate(OUTCOMES)}
+
+    def player_rating(self) -> Optional[int]:
+        """Median ELO of the analyzed player's colour, or None."""
+        elos = self.player_elo[~np.isnan(self.player_elo)]
+        if not elos.size:
+            return None
+        return round(float(np.median(elos)))
@@ -5,8 +5,9 @@ Batch-level metric helpers (ACPL, Chess.com-style accuracy, eval stability).
 from __future__ import annotations
 
 import math
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
+from .batch_columns import BatchColumns, masked_mean
 from .batch_move_classification import player_eval_deterioration
 
 # Chess.com-style per-move accuracy from centipawn loss (community-fitted curve).
@@ -86,35 +87,15 @@ def compute_phase_accuracy(
     return round(sum(scores) / len(scores), 1)
 
 
-def compute_batch_accuracy(per_game_results: List[Dict[str, Any]]) -> float:
+def compute_batch_accuracy(per_game_results: Union[BatchColumns, List[Dict[str, Any]]]) -> float:
     """Weighted mean game accuracy (by player move count)."""
-    weighted_sum = 0.0
-    weight = 0
-    for result in per_game_results:
-        accuracy = result.get("accuracy")
-        if accuracy is None:
-            continue
-        moves = int(result.get("player_moves", 0) or 0) or 1
-        weighted_sum += float(accuracy) * moves
-        weight += moves
-
-    if weight == 0:
-        return 0.0
-    return round(weighted_sum / weight, 1)
+    columns = BatchColumns.of(per_game_results)
+    accuracy = masked_mean(columns.accuracy, columns.player_moves)
+    return 0.0 if accuracy is None else round(accuracy, 1)
 
 
-def compute_batch_acpl(per_game_results: List[Dict[str, Any]]) -> float:
+def compute_batch_acpl(per_game_results: Union[BatchColumns, List[Dict[str, Any]]]) -> float:
     """Mean ACPL across games (each game's ACPL weighted by total_moves)."""
-    weighted_sum = 0.0
-    weight = 0
-    for result in per_game_results:
-        acpl = result.get("acpl")
-        if acpl is None:
-            continue
-        moves = int(result.get("total_moves", 0) or 0) or 1
-        weighted_sum += float(acpl) * moves
-        weight += moves
-
-    if weight == 0:
-        return 0.0
-    return round(weighted_sum / weight, 1)
+    columns = BatchColumns.of(per_game_results)
+    acpl = masked_mean(columns.acpl, columns.total_moves)
+    return 0.0 if acpl is None else round(acpl, 1)
@@ -1,6 +1,7 @@
 import json
 import logging
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 from core.analysis.coaching_schema import BATCH_COACHING_REPORT_SCHEMA
@@ -123,6 +124,26 @@ def validate_coaching_citations(
     return errors
 
 
+@lru_cache(maxsize=4)
+def _compiled_coaching_validator(jsonschema_module: Any) -> Optional[Any]:
+    """Check the schema once and keep the validator instead of recompiling it per report."""
+    json_schema = _load_coaching_report_schema()
+    if json_schema is None:
+        return None
+    validator_cls = jsonschema_module.validators.validator_for(json_schema)
+    validator_cls.check_schema(json_schema)
+    return validator_cls(json_schema)
+
+
+def get_coaching_report_validator() -> Optional[Any]:
+    """Compiled coaching report validator, or None when jsonschema is unavailable."""
+    try:
+        import jsonschema
+    except ImportError:
+        return None
+    return _compiled_coaching_validator(jsonschema) if hasattr(jsonschema, "validators") else None
+
+
 def _validate_coaching_report(parsed: Dict[str, Any]) -> None:
     json_schema = _load_coaching_report_schema()
     if json_schema is None:
@@ -134,7 +155,13 @@ def _validate_coaching_report(parsed: Dict[str, Any]) -> None:
         logger.warning("jsonschema not installed; skipping coaching report validation")
         return
 
-    jsonschema.validate(instance=parsed, schema=json_schema)
+    validator = get_coaching_report_validator()
+    if validator is None:
+        jsonschema.validate(instance=parsed, schema=json_schema)
+        return
+    error = jsonschema.exceptions.best_match(validator.iter_errors(parsed))
+    if error is not None:
+        raise error
 
 
 def _build_per_game_summary(item: Dict[str, Any]) -> Dict[str, Any]:
@@ -215,11 +242,13 @@ def generate_coaching_report(
     per_game_results: List[Dict[str, Any]],
     player_rating: Optional[int] = None,
     coach_persona: str = "encouraging",
+    refresh: bool = False,
 ) -> Dict[str, Any]:
     """
     Generate a batch coaching report by calling the OpenAI API once with a
     structured JSON schema response_format.
 
+    ``refresh`` skips the stored report for these inputs and replaces it with the new one.
     Raises CoachingGeneratorError on failures from the API or invalid responses.
     """
     # Build per-game summaries (trimmed objects) and failed games list
@@ -275,37 +304,60 @@ def generate_coaching_report(
         "Return a JSON object that matches the coaching schema exactly."
     )
 
-    batch_summary_json = json.dumps(batch_summary)
-    per_game_summaries_json = json.dumps(per_game_summaries)
-    failed_games_json = json.dumps(failed_games)
+    from .coaching_prompt import compact_coaching_input, compact_json
+
+    # Rank/trim moments and games to the token budget; citations are checked against what the model saw.
+    compacted = compact_coaching_input(batch_summary, per_game_summaries)
+    per_game_summaries = compacted.per_game_summaries
+    per_game_summaries_json = compact_json(per_game_summaries)
+    if compacted.omitted_games:
+        per_game_summaries_json += (
+            f"\n({compacted.omitted_games} lower-impact games omitted for length; "
+            "they are still counted in BATCH_SUMMARY_JSON.)"
+        )
     player_rating_text = str(player_rating) if player_rating is not None else "Unknown"
 
     user_message = user_template.format(
         player_rating=player_rating_text,
-        batch_summary_json=batch_summary_json,
+        batch_summary_json=compact_json(compacted.batch_summary),
         per_game_summaries_json=per_game_summaries_json,
-        failed_games_json=failed_games_json,
+        failed_games_json=compact_json(failed_games),
+    )
+    logger.info(
+        "Coaching prompt compaction: ~%d -> ~%d tokens (moment cap %s, %d games omitted, %d chars)",
+        compacted.tokens_before,
+        compacted.tokens_after,
+        compacted.moment_cap,
+        compacted.omitted_games,
+        len(user_message),
     )
 
-    # Call OpenAI client (attempt to use the official OpenAI client if available)
-    try:
-        try:
-            from openai import OpenAI
-
-            client = OpenAI()
-        except Exception:
-            # Fallback: try importing openai module object
-            import openai as _openai
+    from ..llm_cache import (
+        PURPOSE_BATCH_COACHING,
+        LLMRequest,
+        cached_llm_call,
+        schema_version,
+    )
 
-            client = getattr(_openai, "OpenAI", _openai)()
+    # Prepare response_format using the canonical schema
+    response_format = {
+        "type": "json_schema",
+        "json_schema": BATCH_COACHING_REPORT_SCHEMA,
+    }
+    llm_request = LLMRequest(
+        PURPOSE_BATCH_COACHING,
+        "gpt-4o-mini",
+        system_prompt,
+        user_message,
+        persona=coach_persona or "",
+        schema_version=schema_version(BATCH_COACHING_REPORT_SCHEMA),
+    )
 
-        # Prepare response_format using the canonical schema
-        response_format = {
-            "type": "json_schema",
-            "json_schema": BATCH_COACHING_REPORT_SCHEMA,
-        }
+    def _generate() -> Dict[str, Any]:
+        from ..llm_client import create_completion, default_llm_client
 
-        logger.info(f"Coaching generation prompt length: {len(user_message)} chars")
+        # AsyncOpenAI when available; calls run on the worker's LLM event loop under the global cap.
+        client = default_llm_client()
 
         def _parse_response(response_obj: Any) -> Dict[str, Any]:
             """
@@ -337,7 +389,8 @@ def generate_coaching_report(
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message},
         ]
-        response = client.chat.completions.create(
+        response = create_completion(
+            client,
             model="gpt-4o-mini",
             messages=messages,
             response_format=response_format,
@@ -356,7 +409,8 @@ def generate_coaching_report(
                 + "\n\nYour previous JSON failed grounding checks. Fix and return new JSON only:\n"
                 + "\n".join(f"- {err}" for err in citation_errors)
             )
-            retry_response = client.chat.completions.create(
+            retry_response = create_completion(
+                client,
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -375,6 +429,14 @@ def generate_coaching_report(
 
         return parsed
 
+    def _grounded(report: Dict[str, Any]) -> bool:
+        return not validate_coaching_citations(report, batch_summary, per_game_summaries)
+
+    try:
+        # Identical inputs reuse the stored report unless ``refresh`` asks for a new one; a report
+        # that still fails the citation checks is served but never stored.
+        return cached_llm_call(llm_request, _generate, accept=_grounded, refresh=refresh)
+
     except Exception as exc:
         # Wrap any exception to allow caller to handle specifically
         raise CoachingGeneratorError("Coaching generation failed") from exc
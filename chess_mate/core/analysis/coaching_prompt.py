@@ -0,0 +1,211 @@
+"""
+Token-budgeted compaction of the batch coaching prompt input.
+
+``generate_coaching_report`` sends the batch summary plus one summary per game. For large
+batches that payload dominates LLM latency and cost, so before building the prompt:
+
+* JSON is serialised with compact separators;
+* fields the batch summary already carries (the deprecated ``overall_accuracy`` alias,
+  per-game critical moments already listed in ``top_critical_moments``, theme lists that
+  repeat the kept moments' themes, empty values) are dropped;
+* critical moments are ranked by severity and eval swing and trimmed per game, and the
+  lowest-impact games are dropped last, until the estimated token count fits the budget.
+
+Token counts are a local estimate (no tokenizer download): letter runs cost one token per
+six characters, digit runs one per three, and punctuation runs one per two characters,
+which tracks BPE counts for compact JSON closely enough for budgeting.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+DEFAULT_TOKEN_BUDGET = 6000
+# Per-game moment caps tried in order before whole games are dropped.
+MOMENT_CAPS = (5, 3, 2, 1, 0)
+
+_TOKEN_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]+")
+_MOMENT_SEVERITY = {"blunder": 3, "mistake": 2, "inaccuracy": 1}
+_MOMENT_FIELDS = (
+    "move_number",
+    "phase",
+    "type",
+    "played_move",
+    "best_move",
+    "tactical_theme",
+    "endgame_material",
+    "eval_swing",
+)
+_BATCH_MOMENT_FIELDS = ("game_id",) + _MOMENT_FIELDS
+# Dropped from the prompt copy of batch_summary: alias of overall_eval_stability.
+_REDUNDANT_BATCH_FIELDS = ("overall_accuracy",)
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count of ``text``."""
+    count = 0
+    for piece in _TOKEN_RE.findall(text or ""):
+        if piece[0].isalpha():
+            count += (len(piece) + 5) // 6
+        elif piece[0].isdigit():
+            count += (len(piece) + 2) // 3
+        else:
+            count += (len(piece) + 1) // 2
+    return count
+
+
+def prompt_token_budget() -> int:
+    return int(getattr(settings, "COACHING_PROMPT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+
+
+def _present(value: Any) -> bool:
+    return value not in (None, "", [], {})
+
+
+def _trim_moment(moment: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    return {field: moment[field] for field in fields if _present(moment.get(field))}
+
+
+def _swing(moment: Dict[str, Any]) -> float:
+    try:
+        return abs(float(moment.get("eval_swing") or 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def moment_rank(moment: Dict[str, Any]) -> Tuple[int, float]:
+    """Sort key: blunders before mistakes before inaccuracies, then larger eval swing."""
+    return (_MOMENT_SEVERITY.get(str(moment.get("type") or "").lower(), 0), _swing(moment))
+
+
+def _game_rank(summary: Dict[str, Any]) -> Tuple[int, int, float]:
+    moments = summary.get("critical_moments") or []
+    return (
+        int(summary.get("blunder_count") or 0),
+        int(summary.get("mistake_count") or 0),
+        max((_swing(moment) for moment in moments), default=0.0),
+    )
+
+
+def compact_batch_summary(batch_summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Prompt copy of ``batch_summary`` without aliases, empty values, or bulky moment fields."""
+    compacted = {
+        key: value for key, value in batch_summary.items() if key not in _REDUNDANT_BATCH_FIELDS and value is not None
+    }
+    moments = compacted.get("top_critical_moments")
+    if isinstance(moments, list):
+        compacted["top_critical_moments"] = [
+            _trim_moment(moment, _BATCH_MOMENT_FIELDS) for moment in moments if isinstance(moment, dict)
+        ]
+    return compacted
+
+
+def _dedupe_game(summary: Dict[str, Any], batch_moments: set) -> Dict[str, Any]:
+    """Drop empty fields and moments already cited in the batch summary; rank the rest."""
+    game_id = summary.get("game_id")
+    moments = [
+        _trim_moment(moment, _MOMENT_FIELDS)
+        for moment in summary.get("critical_moments") or []
+        if isinstance(moment, dict) and (game_id, moment.get("move_number")) not in batch_moments
+    ]
+    moments.sort(key=moment_rank, reverse=True)
+    compacted = {key: value for key, value in summary.items() if _present(value) and key != "critical_moments"}
+    compacted["critical_moments"] = moments
+    return compacted
+
+
+def _with_moment_cap(summary: Dict[str, Any], cap: int) -> Dict[str, Any]:
+    moments = summary["critical_moments"][:cap]
+    capped = {key: value for key, value in summary.items() if key not in ("critical_moments", "tactical_themes")}
+    if moments:
+        capped["critical_moments"] = moments
+    # The theme list only adds information for themes whose moments were trimmed away.
+    kept_themes = {moment.get("tactical_theme") for moment in moments}
+    themes = [theme for theme in summary.get("tactical_themes") or [] if theme not in kept_themes]
+    if themes:
+        capped["tactical_themes"] = themes
+    return capped
+
+
+class CompactedCoachingInput:
+    """Prompt-ready batch summary and per-game summaries plus the size accounting."""
+
+    def __init__(
+        self,
+        batch_summary: Dict[str, Any],
+        per_game_summaries: List[Dict[str, Any]],
+        omitted_games: int,
+        moment_cap: Optional[int],
+        tokens_before: int,
+        tokens_after: int,
+    ):
+        self.batch_summary = batch_summary
+        self.per_game_summaries = per_game_summaries
+        self.omitted_games = omitted_games
+        self.moment_cap = moment_cap
+        self.tokens_before = tokens_before
+        self.tokens_after = tokens_after
+
+
+def compact_coaching_input(
+    batch_summary: Dict[str, Any],
+    per_game_summaries: List[Dict[str, Any]],
+    token_budget: Optional[int] = None,
+) -> CompactedCoachingInput:
+    """
+    Shrink the coaching payload to ``token_budget`` estimated tokens (batch summary plus
+    per-game summaries). Per-game moments are trimmed first; if that is not enough the
+    lowest-impact games are dropped, keeping the remaining games in their original order.
+    """
+    budget = prompt_token_budget() if token_budget is None else int(token_budget)
+    tokens_before = estimate_tokens(json.dumps(batch_summary, default=str)) + estimate_tokens(
+        json.dumps(per_game_summaries, default=str)
+    )
+
+    compact_summary = compact_batch_summary(batch_summary)
+    summary_tokens = estimate_tokens(compact_json(compact_summary))
+    batch_moments = {
+        (moment.get("game_id"), moment.get("move_number"))
+        for moment in compact_summary.get("top_critical_moments") or []
+    }
+    games = [_dedupe_game(summary, batch_moments) for summary in per_game_summaries]
+
+    chosen: List[Dict[str, Any]] = []
+    moment_cap: Optional[int] = None
+    for cap in MOMENT_CAPS:
+        moment_cap = cap
+        chosen = [_with_moment_cap(game, cap) for game in games]
+        if summary_tokens + estimate_tokens(compact_json(chosen)) <= budget:
+            break
+
+    omitted = 0
+    used = summary_tokens + estimate_tokens(compact_json(chosen))
+    if used > budget and chosen:
+        # Keep the most instructive games (most blunders/mistakes, biggest swing) that fit.
+        ranked = sorted(range(len(chosen)), key=lambda index: _game_rank(games[index]), reverse=True)
+        keep: set = set()
+        used = summary_tokens + 2
+        for index in ranked:
+            cost = estimate_tokens(compact_json(chosen[index])) + 1
+            if used + cost <= budget or not keep:
+                keep.add(index)
+                used += cost
+        omitted = len(chosen) - len(keep)
+        chosen = [game for index, game in enumerate(chosen) if index in keep]
+
+    return CompactedCoachingInput(
+        compact_summary,
+        chosen,
+        omitted,
+        moment_cap,
+        tokens_before,
+        summary_tokens + estimate_tokens(compact_json(chosen)),
+    )
@@ -11,6 +11,8 @@ from typing import Any, Dict, List, Optional, cast
 from django.conf import settings
 from openai import OpenAI, OpenAIError
 
+from ..llm_client import LLMClientError
+
 logger = logging.getLogger(__name__)
 
 
@@ -418,18 +420,26 @@ class FeedbackGenerator:
             if self.openai_client is not None:
                 prompt = self._generate_analysis_prompt(game_metrics)
                 if prompt:
-                    response = self.openai_client.chat.completions.create(
-                        model=getattr(settings, "OPENAI_MODEL", "gpt-3.5-turbo"),
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "You are a chess coach. Return valid JSON only.",
-                            },
-                            {"role": "user", "content": prompt},
-                        ],
-                        temperature=getattr(settings, "OPENAI_TEMPERATURE", 0.2),
+                    from ..llm_cache import (
+                        PURPOSE_ANALYSIS_FEEDBACK,
+                        LLMRequest,
+                        cached_llm_call,
+                        completion_content,
+                    )
+
+                    llm_request = LLMRequest(
+                        PURPOSE_ANALYSIS_FEEDBACK,
+                        getattr(settings, "OPENAI_MODEL", "gpt-3.5-turbo"),
+                        "You are a chess coach. Return valid JSON only.",
+                        prompt,
+                        params={"temperature": getattr(settings, "OPENAI_TEMPERATURE", 0.2)},
+                    )
+                    # Only responses that parse into feedback are stored.
+                    content = cached_llm_call(
+                        llm_request,
+                        lambda: completion_content(self.openai_client, llm_request),
+                        accept=lambda text: bool(self._parse_ai_response(text)),
                     )
-                    content = response.choices[0].message.content if response and response.choices else ""
                     parsed = self._parse_ai_response(content or "")
                     if parsed and isinstance(parsed.get("feedback"), dict):
                         ai_feedback = cast(Dict[str, Any], parsed["feedback"])
@@ -449,6 +459,7 @@ class FeedbackGenerator:
             ValueError,
             json.JSONDecodeError,
             OpenAIError,
+            LLMClientError,
         ) as e:
             logger.error("Error generating feedback: %s", e)
             return self._generate_statistical_feedback(analysis_result if isinstance(analysis_result, dict) else {})
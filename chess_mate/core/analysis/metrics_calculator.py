@@ -9,6 +9,7 @@ import statistics
 from typing import Any, Dict, List, TypedDict, cast
 
 from ..error_handling import MetricsError
+from .move_columns import CLASSIFICATION_NAMES, MoveColumns, classification_code
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -26,18 +27,7 @@ class MetricsCalculator:
     @staticmethod
     def _normalized_classification(move: Dict[str, Any]) -> str:
         """Normalize move classification labels across analyzer versions."""
-        raw = str(move.get("classification", "")).strip().lower().replace("_", " ")
-        if raw in {"good move", "good"}:
-            return "good"
-        if raw in {"excellent move", "excellent"}:
-            return "excellent"
-        if raw in {"great move", "great"}:
-            return "excellent"
-        if raw in {"best", "brilliant"}:
-            return "excellent"
-        if raw in {"inaccuracy", "mistake", "blunder", "neutral"}:
-            return raw
-        return "neutral"
+        return CLASSIFICATION_NAMES[classification_code(move)]
 
     @staticmethod
     def _get_default_time_metrics() -> Dict[str, Any]:
@@ -73,98 +63,17 @@ class MetricsCalculator:
             if not moves:
                 return MetricsCalculator._get_default_metrics()
 
-            # Identify the player (white or black)
-            is_white = moves[0].get("is_white", True)
-
-            # Calculate move quality metrics
-            move_quality = MetricsCalculator._calculate_move_quality(moves)
-
-            # Calculate time management metrics
-            time_management = MetricsCalculator._calculate_time_management(time_data)
-
-            # Calculate consistency metrics
-            consistency = MetricsCalculator._calculate_consistency(moves)
-
-            # Detect phase transitions
-            phases = MetricsCalculator._detect_phase_transitions(moves)
-            opening_end = phases.get("opening", 0)
-            middlegame_end = phases.get("middlegame", len(moves))
-
-            # Split moves by game phase
-            opening_moves = moves[:opening_end] if opening_end > 0 else []
-            middlegame_moves = moves[opening_end:middlegame_end] if middlegame_end > opening_end else []
-            endgame_moves = moves[middlegame_end:] if middlegame_end < len(moves) else []
-
-            # Calculate phase-specific metrics
-            opening_metrics = MetricsCalculator._calculate_phase_metrics(opening_moves, is_white)
-            middlegame_metrics = MetricsCalculator._calculate_phase_metrics(middlegame_moves, is_white)
-            endgame_metrics = MetricsCalculator._calculate_phase_metrics(endgame_moves, is_white)
-
-            # Compile phase metrics
-            phase_metrics = {
-                "opening": opening_metrics,
-                "middlegame": middlegame_metrics,
-                "endgame": endgame_metrics,
-            }
-
-            # Calculate tactical metrics
-            tactical_metrics = MetricsCalculator._calculate_tactical_metrics(moves, is_white)
-
-            # Calculate advantage metrics
-            advantage_metrics = MetricsCalculator._calculate_advantage_metrics(moves, is_white)
-
-            # Calculate resourcefulness metrics
-            resourcefulness_metrics = MetricsCalculator._calculate_resourcefulness_metrics(moves, is_white)
-
-            # Calculate overall metrics
-            overall_metrics = MetricsCalculator._calculate_overall_metrics(moves, is_white)
-
-            # Compile all metrics with consistent structure
-            metrics = {
-                "overall": overall_metrics,
-                "move_quality": move_quality,
-                "time_management": time_management,
-                "consistency": consistency,
-                "phases": phase_metrics,
-                "tactics": tactical_metrics,
-                "advantage": advantage_metrics,
-                "resourcefulness": resourcefulness_metrics,
-                "metadata": {
-                    "is_white": is_white,
-                    "total_moves": len(moves),
-                    "opening_length": opening_end,
-                    "middlegame_length": middlegame_end - opening_end,
-                    "endgame_length": len(moves) - middlegame_end,
-                },
-            }
+            metrics = None
+            columns = MoveColumns.from_moves(moves)
+            if columns is not None:
+                try:
+                    metrics = MetricsCalculator._metrics_from_columns(columns, moves, time_data)
+                except Exception as e:
+                    logger.debug(f"Columnar metrics failed, using per-section path: {str(e)}")
+            if metrics is None:
+                metrics = MetricsCalculator._calculate_sections(moves, time_data)
 
-            # Validate and normalize metrics
-            validated_metrics = MetricsCalculator._validate_metrics(metrics)
-
-            # Ensure all required sections are present and properly typed
-            required_sections = [
-                "overall",
-                "move_quality",
-                "time_management",
-                "consistency",
-                "phases",
-                "tactics",
-                "advantage",
-                "resourcefulness",
-            ]
-
-            for section in required_sections:
-                if section not in validated_metrics:
-                    logger.warning(f"Missing required metrics section: {section}")
-                    validated_metrics[section] = MetricsCalculator._get_default_metrics().get(section, {})
-
-                # Ensure all numeric values are floats
-                if isinstance(validated_metrics[section], dict):
-                    for key, value in validated_metrics[section].items():
-                        if isinstance(value, (int, float)):
-                            validated_metrics[section][key] = float(value)
-
-            return validated_metrics
+            return MetricsCalculator._finalize_metrics(metrics)
 
         except Exception as e:
             logger.error(f"Error calculating game metrics: {str(e)}")
@@ -173,6 +82,147 @@ class MetricsCalculator:
             default_metrics["error"] = str(e)
             return default_metrics
 
+    @staticmethod
+    def _metrics_from_columns(
+        columns: MoveColumns, moves: List[Dict[str, Any]], time_data: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """All metric sections from one pass over the moves (see ``move_columns``)."""
+        is_white = moves[0].get("is_white", True)
+        total_moves = len(moves)
+
+        phases = MetricsCalculator._detect_phase_transitions(moves)
+        opening_end = phases.get("opening", 0)
+        middlegame_end = phases.get("middlegame", total_moves)
+
+        move_quality = columns.move_quality()
+        consistency = columns.consistency()
+
+        return {
+            "overall": columns.overall(move_quality, consistency),
+            "move_quality": move_quality,
+            "time_management": MetricsCalculator._calculate_time_management(time_data),
+            "consistency": consistency,
+            "phases": {
+                "opening": columns.phase(0, min(opening_end, total_moves), is_white),
+                "middlegame": columns.phase(opening_end, min(middlegame_end, total_moves), is_white),
+                "endgame": columns.phase(middlegame_end, total_moves, is_white),
+            },
+            "tactics": columns.tactics(is_white),
+            "advantage": columns.advantage(is_white),
+            "resourcefulness": columns.resourcefulness(is_white),
+            "metadata": {
+                "is_white": is_white,
+                "total_moves": total_moves,
+                "opening_length": opening_end,
+                "middlegame_length": middlegame_end - opening_end,
+                "endgame_length": total_moves - middlegame_end,
+            },
+        }
+
+    @staticmethod
+    def _calculate_sections(moves: List[Dict[str, Any]], time_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Per-section metrics, each section walking the move dicts on its own.
+
+        Used for moves ``MoveColumns`` does not accept (non-numeric evals, string times ...),
+        where each section's own per-field fallbacks decide the result.
+        """
+        # Identify the player (white or black)
+        is_white = moves[0].get("is_white", True)
+
+        # Calculate move quality metrics
+        move_quality = MetricsCalculator._calculate_move_quality(moves)
+
+        # Calculate time management metrics
+        time_management = MetricsCalculator._calculate_time_management(time_data)
+
+        # Calculate consistency metrics
+        consistency = MetricsCalculator._calculate_consistency(moves)
+
+        # Detect phase transitions
+        phases = MetricsCalculator._detect_phase_transitions(moves)
+        opening_end = phases.get("opening", 0)
+        middlegame_end = phases.get("middlegame", len(moves))
+
+        # Split moves by game phase
+        opening_moves = moves[:opening_end] if opening_end > 0 else []
+        middlegame_moves = moves[opening_end:middlegame_end] if middlegame_end > opening_end else []
+        endgame_moves = moves[middlegame_end:] if middlegame_end < len(moves) else []
+
+        # Calculate phase-specific metrics
+        opening_metrics = MetricsCalculator._calculate_phase_metrics(opening_moves, is_white)
+        middlegame_metrics = MetricsCalculator._calculate_phase_metrics(middlegame_moves, is_white)
+        endgame_metrics = MetricsCalculator._calculate_phase_metrics(endgame_moves, is_white)
+
+        # Compile phase metrics
+        phase_metrics = {
+            "opening": opening_metrics,
+            "middlegame": middlegame_metrics,
+            "endgame": endgame_metrics,
+        }
+
+        # Calculate tactical metrics
+        tactical_metrics = MetricsCalculator._calculate_tactical_metrics(moves, is_white)
+
+        # Calculate advantage metrics
+        advantage_metrics = MetricsCalculator._calculate_advantage_metrics(moves, is_white)
+
+        # Calculate resourcefulness metrics
+        resourcefulness_metrics = MetricsCalculator._calculate_resourcefulness_metrics(moves, is_white)
+
+        # Calculate overall metrics
+        overall_metrics = MetricsCalculator._calculate_overall_metrics(moves, is_white)
+
+        # Compile all metrics with consistent structure
+        return {
+            "overall": overall_metrics,
+            "move_quality": move_quality,
+            "time_management": time_management,
+            "consistency": consistency,
+            "phases": phase_metrics,
+            "tactics": tactical_metrics,
+            "advantage": advantage_metrics,
+            "resourcefulness": resourcefulness_metrics,
+            "metadata": {
+                "is_white": is_white,
+                "total_moves": len(moves),
+                "opening_length": opening_end,
+                "middlegame_length": middlegame_end - opening_end,
+                "endgame_length": len(moves) - middlegame_end,
+            },
+        }
+
+    @staticmethod
+    def _finalize_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Clamp values to their ranges and make sure every section is present with float values."""
+        # Validate and normalize metrics
+        validated_metrics = MetricsCalculator._validate_metrics(metrics)
+
+        # Ensure all required sections are present and properly typed
+        required_sections = [
+            "overall",
+            "move_quality",
+            "time_management",
+            "consistency",
+            "phases",
+            "tactics",
+            "advantage",
+            "resourcefulness",
+        ]
+
+        for section in required_sections:
+            if section not in validated_metrics:
+                logger.warning(f"Missing required metrics section: {section}")
+                validated_metrics[section] = MetricsCalculator._get_default_metrics().get(section, {})
+
+            # Ensure all numeric values are floats
+            if isinstance(validated_metrics[section], dict):
+                for key, value in validated_metrics[section].items():
+                    if isinstance(value, (int, float)):
+                        validated_metrics[section][key] = float(value)
+
+        return validated_metrics
+
     @staticmethod
     def _detect_phase_transitions(moves: List[Dict[str, Any]]) -> Dict[str, int]:
         """Enhanced phase detection using multiple indicators."""
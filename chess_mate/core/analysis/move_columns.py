@@ -0,0 +1,427 @@
+"""
+Typed per-move columns for ``MetricsCalculator``.
+
+``MoveColumns.from_moves`` reads every analysed move dict once and stores what the game
+metrics need as NumPy arrays: normalised classification codes, boolean flags
+(``is_best``, ``is_critical``, ``is_tactical`` ...), eval drop / improvement, evals and
+tactical feature weights. Every metric section is then computed from those arrays
+instead of each section re-walking the move list and re-normalising classifications.
+
+Values match the per-section ``MetricsCalculator`` methods exactly: sums that feed a
+rounded result are taken left to right and means go through ``statistics.mean``. Moves
+whose numeric fields are not plain numbers make ``from_moves`` return ``None``; the
+per-section methods handle those with their own per-field fallbacks.
+"""
+
+import statistics
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .batch_columns import ordered_sum
+
+NEUTRAL, GOOD, EXCELLENT, INACCURACY, MISTAKE, BLUNDER = range(6)
+
+_CLASSIFICATIONS = {
+    "good move": GOOD,
+    "good": GOOD,
+    "excellent move": EXCELLENT,
+    "excellent": EXCELLENT,
+    "great move": EXCELLENT,
+    "great": EXCELLENT,
+    "best": EXCELLENT,
+    "brilliant": EXCELLENT,
+    "inaccuracy": INACCURACY,
+    "mistake": MISTAKE,
+    "blunder": BLUNDER,
+    "neutral": NEUTRAL,
+}
+CLASSIFICATION_NAMES = ("neutral", "good", "excellent", "inaccuracy", "mistake", "blunder")
+
+_FLAGS = ("is_mistake", "is_blunder", "is_inaccuracy", "is_best", "is_critical", "is_tactical", "is_check")
+_COLUMNS = _FLAGS + (
+    "code",
+    "in_check",
+    "under_attack",
+    "eval_drop",
+    "improvement",
+    "material_change",
+    "activity_change",
+    "complexity",
+    "eval_before",
+    "eval_after",
+    "phase_weight",
+    "phase_features",
+)
+_MISTAKE_WINDOW = 5
+
+EMPTY_PHASE_METRICS = {
+    "total_positions": 0,
+    "success_rate": 0.0,
+    "pattern_recognition": 0.0,
+    "brilliant_moves": 0,
+    "normalized_score": 0.0,
+    "accuracy": 0.0,
+    "moves_count": 0,
+    "mistakes": 0,
+    "blunders": 0,
+    "critical_moves": 0,
+    "opportunities": 0,
+    "best_moves": 0,
+}
+
+
+def classification_code(move: Dict[str, Any]) -> int:
+    """Classification label normalised across analyzer versions, as a code."""
+    raw = str(move.get("classification", "")).strip().lower().replace("_", " ")
+    return _CLASSIFICATIONS.get(raw, NEUTRAL)
+
+
+def _plain(value: Any) -> float:
+    """``float(value)`` for int/float values; anything else is left to the per-section path."""
+    if type(value) is bool or not isinstance(value, (int, float)):
+        raise TypeError(f"not a plain number: {value!r}")
+    return float(value)
+
+
+def _optional(value: Any, default: float) -> float:
+    return default if value is None else _plain(value)
+
+
+def _capped(values: np.ndarray, cap: float) -> np.ndarray:
+    """Elementwise ``min(cap, value)`` with Python's NaN semantics."""
+    return np.where(values < cap, values, cap)
+
+
+def _player_view(values: np.ndarray, is_white: Any) -> np.ndarray:
+    """Evals from the analysed player's side."""
+    return values if is_white else -values
+
+
+def _improved(improvement: np.ndarray, is_white: Any) -> np.ndarray:
+    return improvement > 0 if is_white else improvement < 0
+
+
+class MoveColumns:
+    """One game's analysed moves as typed arrays (see module docstring)."""
+
+    def __init__(self, columns: Dict[str, List[Any]], position_quality: List[float], times: List[Any]):
+        self.size = len(position_quality)
+        self.code = np.array(columns["code"], dtype=np.int8)
+        self.flags = {name: np.array(columns[name], dtype=bool) for name in _FLAGS}
+        self.in_check = np.array(columns["in_check"], dtype=bool)
+        self.under_attack = np.array(columns["under_attack"], dtype=bool)
+        self.eval_drop = np.array(columns["eval_drop"], dtype=np.float64)
+        self.improvement = np.array(columns["improvement"], dtype=np.float64)
+        self.material_change = np.array(columns["material_change"], dtype=np.float64)
+        self.activity_change = np.array(columns["activity_change"], dtype=np.float64)
+        self.complexity = np.array(columns["complexity"], dtype=np.float64)
+        self.eval_before = np.array(columns["eval_before"], dtype=np.float64)
+        self.eval_after = np.array(columns["eval_after"], dtype=np.float64)
+        # Feature weight / count of moves flagged ``is_tactical`` (phase metrics).
+        self.phase_weight = np.array(columns["phase_weight"], dtype=np.float64)
+        self.phase_features = np.array(columns["phase_features"], dtype=np.int64)
+        self.position_quality = position_quality
+        self.times = times
+        self.last_eval_after = float(self.eval_after[-1]) if self.size else 0.0
+
+    @classmethod
+    def from_moves(cls, moves: Sequence[Dict[str, Any]]) -> Optional["MoveColumns"]:
+        """Read ``moves`` once; None when a numeric field is not a plain number."""
+        columns: Dict[str, List[Any]] = {name: [] for name in _COLUMNS}
+        code, in_check, under_attack = columns["code"], columns["in_check"], columns["under_attack"]
+        flag_columns = [(name, columns[name]) for name in _FLAGS]
+        eval_drop, improvement = columns["eval_drop"], columns["improvement"]
+        material_change, activity_change = columns["material_change"], columns["activity_change"]
+        complexities, evals_before, evals_after = columns["complexity"], columns["eval_before"], columns["eval_after"]
+        phase_weight, phase_features = columns["phase_weight"], columns["phase_features"]
+        position_quality: List[float] = []
+        times: List[Any] = []
+
+        try:
+            for move in moves:
+                get = move.get
+                code.append(classification_code(move))
+                for name, values in flag_columns:
+                    values.append(bool(get(name, False)))
+                in_check.append(bool(get("in_check", False)))
+                under_attack.append(bool(get("under_attack", False)))
+
+                eval_change = _plain(get("eval_change", 0.0))
+                if "evaluation_drop" in move:
+                    eval_drop.append(_plain(move["evaluation_drop"]))
+                else:
+                    eval_drop.append(max(0.0, -eval_change))
+
+                improvement.append(_optional(get("evaluation_improvement"), 0.0))
+                material_change.append(_optional(get("material_change"), 0.0))
+                activity_change.append(_optional(get("piece_activity_change"), 0.0))
+
+                complexity = get("position_complexity", 0.5)
+                eval_after = get("eval_after", 0)
+                complexities.append(_plain(complexity))
+                evals_after.append(_plain(eval_after))
+                evals_before.append(_plain(get("eval_before", 0.0)))
+                position_quality.append(complexity * (1 - abs(eval_after) / 1000))
+
+                weight, feature_count = 1.0, 0
+                if get("is_tactical", False):
+                    features = get("tactical_features", [])
+                    if not isinstance(features, (list, tuple)):
+                        return None
+                    _plain(get("evaluation", 0.0))
+                    if "check" in features:
+                        weight *= 1.1
+                    if "material" in features:
+                        weight *= 1.05
+                    if "complex_position" in features:
+                        weight *= 1.15
+                    feature_count = len(features)
+                phase_weight.append(weight)
+                phase_features.append(feature_count)
+
+                time_spent = get("time_spent")
+                if time_spent is not None:
+                    _plain(time_spent)
+                    times.append(time_spent)
+        except (TypeError, ValueError):
+            return None
+
+        return cls(columns, position_quality, times)
+
+    def move_quality(self) -> Dict[str, float]:
+        total_moves = float(self.size)
+        mistakes = float(np.count_nonzero(self.flags["is_mistake"] | (self.code == MISTAKE)))
+        blunders = float(np.count_nonzero(self.flags["is_blunder"] | (self.code == BLUNDER)))
+        inaccuracies = float(np.count_nonzero(self.flags["is_inaccuracy"] | (self.code == INACCURACY)))
+        quality_moves = float(np.count_nonzero(self.flags["is_best"] | (self.code == GOOD) | (self.code == EXCELLENT)))
+        accuracy = ((total_moves - (mistakes + blunders + inaccuracies)) / total_moves) * 100.0
+        return {
+            "accuracy": max(0.0, min(100.0, accuracy)),
+            "mistakes": (mistakes / total_moves) * 100.0,
+            "blunders": (blunders / total_moves) * 100.0,
+            "inaccuracies": (inaccuracies / total_moves) * 100.0,
+            "quality_moves": (quality_moves / total_moves) * 100.0,
+        }
+
+    def consistency(self) -> float:
+        moves_len = max(1.0, float(self.size))
+        good_moves = int(np.count_nonzero((self.code == GOOD) | (self.code == EXCELLENT)))
+
+        # Mistakes in each window moves[i : i + 5]
+        errors = np.concatenate(([0], np.cumsum((self.code == MISTAKE) | (self.code == BLUNDER))))
+        starts = np.arange(self.size)
+        window_mistakes = errors[np.minimum(starts + _MISTAKE_WINDOW, self.size)] - errors[starts]
+        mistakes_in_window = float(window_mistakes.sum())
+        mistake_clusters = float(np.count_nonzero(window_mistakes > 1))
+
+        times = self.times
+        if not times:
+            time_consistency = 100.0
+        else:
+            avg_time = sum(times) / max(1.0, float(len(times)))
+            time_variations = [abs(t - avg_time) for t in times]
+            avg_variation = sum(time_variations) / max(1.0, float(len(time_variations)))
+            time_consistency = max(0.0, 100.0 - (avg_variation / max(1.0, avg_time) * 100.0))
+
+        streak_score = (good_moves / moves_len) * 100.0 if good_moves else 0.0
+        error_score = max(0.0, 100.0 - (mistakes_in_window / moves_len * 100.0))
+        cluster_score = max(0.0, 100.0 - (mistake_clusters / moves_len * 100.0))
+
+        final_score = streak_score * 0.4 + error_score * 0.3 + cluster_score * 0.2 + time_consistency * 0.1
+        return max(0.0, min(100.0, final_score))
+
+    def phase(self, start: int, stop: int, is_white: Any) -> Dict[str, Any]:
+        """Phase metrics for moves ``[start, stop)``."""
+        if stop <= start:
+            return dict(EMPTY_PHASE_METRICS)
+
+        code = self.code[start:stop]
+        moves_count = stop - start
+        mistakes = int(np.count_nonzero(code == MISTAKE))
+        blunders = int(np.count_nonzero(code == BLUNDER))
+        inaccuracies = int(np.count_nonzero(code == INACCURACY))
+        critical_moves = int(
+            np.count_nonzero(self.flags["is_critical"][start:stop] | (self.eval_drop[start:stop] >= 100.0))
+        )
+        best_moves = int(np.count_nonzero(self.flags["is_best"][start:stop] | (code == GOOD) | (code == EXCELLENT)))
+
+        tactical = np.flatnonzero(self.flags["is_tactical"][start:stop]) + start
+        total_positions = int(tactical.size)
+        improvement = self.improvement[tactical]
+        succeeded = _improved(improvement, is_white)
+        successful = ordered_sum(self.phase_weight[tactical][succeeded])
+        brilliant_moves = int(
+            np.count_nonzero(succeeded & (np.abs(improvement) > 200) & (self.phase_features[tactical] >= 2))
+        )
+
+        pattern_strength = _capped((np.abs(improvement[1:]) + np.abs(improvement[:-1])) / 400.0, 1.0)
+        pattern_scores = (pattern_strength * 100.0).tolist()
+
+        success_rate = successful / max(1, total_positions)
+        pattern_recognition = statistics.mean(pattern_scores) if pattern_scores else 0.0
+        phase_accuracy = (moves_count - (mistakes + blunders + inaccuracies)) / max(1, moves_count) * 100.0
+
+        return {
+            "total_positions": total_positions,
+            "success_rate": float(success_rate),
+            "pattern_recognition": float(pattern_recognition),
+            "brilliant_moves": brilliant_moves,
+            "normalized_score": float((success_rate + pattern_recognition) / 2.0),
+            "accuracy": round(phase_accuracy, 1),
+            "moves_count": moves_count,
+            "mistakes": mistakes,
+            "blunders": blunders,
+            "critical_moves": critical_moves,
+            "opportunities": critical_moves,
+            "best_moves": best_moves,
+        }
+
+    def tactics(self, is_white: Any) -> Dict[str, Any]:
+        material = np.abs(self.material_change) >= 1
+        check = self.flags["is_check"]
+        complex_position = self.complexity > 0.7
+        features = (
+            material.astype(np.int64)
+            + check
+            + (np.abs(self.improvement) > 200)
+            + (self.activity_change > 0.3)
+            + complex_position
+        )
+        tactical = np.flatnonzero(features > 0)
+        opportunities = int(tactical.size)
+
+        improvement = self.improvement[tactical]
+        succeeded = _improved(improvement, is_white)
+        weight = np.ones(opportunities, dtype=np.float64)
+        weight[check[tactical]] *= 1.2
+        weight[material[tactical]] *= 1.1
+        weight[complex_position[tactical]] *= 1.3
+        successful = ordered_sum(weight[succeeded])
+        brilliant_moves = int(np.count_nonzero(succeeded & (np.abs(improvement) > 300) & (features[tactical] >= 2)))
+
+        current, previous = np.abs(improvement[1:]), np.abs(improvement[:-1])
+        strong = (previous > 100) & (current > 100)
+        moderate = ~strong & (previous > 50) & (current > 50)
+        pattern_scores = np.where(strong, 100.0, 50.0)[strong | moderate].tolist()
+
+        success_rate = successful / max(1, opportunities) * 100.0
+        pattern_recognition = statistics.mean(pattern_scores) if pattern_scores else 0.0
+
+        tactical_score = 0.0
+        if opportunities > 0:
+            tactical_score = success_rate * 0.4
+            brilliant_bonus = (brilliant_moves / max(1, opportunities)) * 20.0
+            tactical_score += brilliant_bonus * 0.2
+            tactical_score += pattern_recognition * 0.2
+            opportunity_rate = (opportunities / self.size) * 100.0
+            tactical_score += min(opportunity_rate * 0.2, 20.0)
+
+        return {
+            "opportunities": opportunities,
+            "successful": round(successful, 1),
+            "brilliant_moves": brilliant_moves,
+            "missed": opportunities - int(successful),
+            "success_rate": round(success_rate, 1),
+            "pattern_recognition": round(pattern_recognition, 1),
+            "tactical_score": round(tactical_score, 1),
+        }
+
+    def advantage(self, is_white: Any) -> Dict[str, Any]:
+        values = _player_view(self.eval_after, is_white)
+        advantages = values.tolist()
+        current, following = values[:-1], values[1:]
+
+        winning = values > 200.0
+        winning_positions = int(np.count_nonzero(winning))
+        advantage_retention = int(np.count_nonzero(winning[:-1] & (following > 150.0)))
+        converted_positions = int(np.count_nonzero(winning[:-1] & (following >= current)))
+        pressure_positions = int(np.count_nonzero(values < -150.0))
+        good_defenses = int(np.count_nonzero((current < -150.0) & (following > current)))
+
+        conversion_rate = converted_positions / max(1, winning_positions) * 100.0
+        retention_rate = advantage_retention / max(1, winning_positions) * 100.0
+        pressure_score = good_defenses / max(1, pressure_positions) * 100.0
+
+        advantage_trend: float = 0.0
+        if len(advantages) > 5:
+            early_avg = statistics.mean(advantages[: len(advantages) // 3])
+            late_avg = statistics.mean(advantages[-len(advantages) // 3 :])
+            advantage_trend = late_avg - early_avg
+
+        return {
+            "max_advantage": round(max(advantages) / 100.0, 2),
+            "min_advantage": round(min(advantages) / 100.0, 2),
+            "average_advantage": round(statistics.mean(advantages) / 100.0, 2),
+            "advantage_conversion": round(conversion_rate, 1),
+            "pressure_handling": round(pressure_score, 1),
+            "advantage_duration": winning_positions,
+            "winning_positions": winning_positions,
+            "advantage_retention": round(retention_rate, 1),
+            "advantage_trend": round(advantage_trend / 100.0, 2),
+        }
+
+    def resourcefulness(self, is_white: Any) -> Dict[str, Any]:
+        before = _player_view(self.eval_before, is_white)
+        after = _player_view(self.eval_after, is_white)
+        gain = after - before
+        improved = after > before
+        held = after >= before - 50.0
+
+        critical = self.flags["is_critical"] | (before < -150.0) | self.in_check | self.under_attack
+        critical_gain = gain[critical]
+        defensive_scores = np.where(
+            improved[critical], _capped(critical_gain / 2.0, 100.0), np.where(held[critical], 50.0, 0.0)
+        ).tolist()
+
+        recovering = (before < -200.0) & improved
+        recovery_positions = _capped(gain[recovering] / 4.0, 100.0).tolist()
+
+        defended = self.flags["is_tactical"] & (before < -100.0) & (improved | held)
+        tactical_defenses = np.where(improved[defended], 100.0, 50.0).tolist()
+
+        total_critical = max(1, int(np.count_nonzero(critical)))
+        recovery_rate = len(recovery_positions) / self.size * 100.0
+        defensive_score = statistics.mean(defensive_scores) if defensive_scores else 0.0
+        critical_defense_rate = int(np.count_nonzero(critical_gain > 0.0)) / total_critical * 100.0
+        tactical_defense_score = statistics.mean(tactical_defenses) if tactical_defenses else 0.0
+        best_moves = int(np.count_nonzero(self.flags["is_critical"] & self.flags["is_best"]))
+        best_move_rate = best_moves / total_critical * 100.0
+        position_recovery = statistics.mean(recovery_positions) if recovery_positions else 0.0
+
+        worst_eval = min(before[critical].tolist(), default=0.0)
+        comeback_potential = (
+            min(100.0, max(0.0, (self.last_eval_after - worst_eval) / 4.0)) if worst_eval < -200.0 else 0.0
+        )
+
+        return {
+            "recovery_rate": round(recovery_rate, 1),
+            "defensive_score": round(defensive_score, 1),
+            "critical_defense": round(critical_defense_rate, 1),
+            "tactical_defense": round(tactical_defense_score, 1),
+            "best_move_finding": round(best_move_rate, 1),
+            "position_recovery": round(position_recovery, 1),
+            "comeback_potential": round(comeback_potential, 1),
+            "critical_defense_score": round(critical_defense_rate, 1),
+            "defensive_resourcefulness": round((defensive_score + critical_defense_rate) / 2.0, 1),
+        }
+
+    def overall(self, move_quality: Dict[str, float], consistency: float) -> Dict[str, Any]:
+        mistakes = int(np.count_nonzero(self.flags["is_mistake"] | (self.code == MISTAKE)))
+        blunders = int(np.count_nonzero(self.flags["is_blunder"] | (self.code == BLUNDER)))
+        inaccuracies = int(np.count_nonzero((self.code == INACCURACY) | (self.eval_drop > 100.0)))
+        quality_moves = int(np.count_nonzero(self.flags["is_best"] | (self.code == GOOD) | (self.code == EXCELLENT)))
+        critical_positions = int(np.count_nonzero(self.flags["is_critical"] | (self.eval_drop >= 1.0)))
+        position_quality = statistics.mean(self.position_quality)
+
+        return {
+            "total_moves": self.size,
+            "accuracy": round(float(move_quality.get("accuracy", 0.0)), 1),
+            "consistency_score": round(consistency, 1),
+            "mistakes": mistakes,
+            "blunders": blunders,
+            "inaccuracies": inaccuracies,
+            "quality_moves": quality_moves,
+            "critical_positions": critical_positions,
+            "position_quality": round(position_quality * 100, 1),
+        }
@@ -12,9 +12,14 @@ import chess.pgn
 from ..cache import CACHE_BACKEND_REDIS, cache_get, cache_set
 from ..error_handling import ResourceNotFoundError
 from ..models import Game
+from .position_features import pawn_file_counts
 
 logger = logging.getLogger(__name__)
 
+_MIDDLE_RANKS = chess.BB_RANK_3 | chess.BB_RANK_4 | chess.BB_RANK_5 | chess.BB_RANK_6
+_WHITE_HALF = chess.BB_RANK_1 | chess.BB_RANK_2 | chess.BB_RANK_3 | chess.BB_RANK_4
+_BLACK_HALF = chess.BB_RANK_5 | chess.BB_RANK_6 | chess.BB_RANK_7 | chess.BB_RANK_8
+
 
 class PatternAnalyzer:
     """Analyzes chess patterns and motifs in games."""
@@ -571,21 +576,16 @@ class PatternAnalyzer:
         """Check if a piece is hanging after a move."""
         try:
             # Make the move on a copy of the board
-            board_copy = board.copy()
+            board_copy = board.copy(stack=False)
             board_copy.push(move)
 
-            # Check each square
-            for square in chess.SQUARES:
-                piece = board_copy.piece_at(square)
-                if piece is None:
-                    continue
-
-                # Count attackers and defenders
-                attackers = board_copy.attackers(not piece.color, square)
-                defenders = board_copy.attackers(piece.color, square)
-
-                if len(attackers) > len(defenders):
-                    return True
+            # Compare attacker and defender counts on occupied squares only
+            for color in chess.COLORS:
+                for square in chess.scan_forward(board_copy.occupied_co[color]):
+                    attackers = chess.popcount(board_copy.attackers_mask(not color, square))
+                    defenders = chess.popcount(board_copy.attackers_mask(color, square))
+                    if attackers > defenders:
+                        return True
 
             return False
 
@@ -595,15 +595,14 @@ class PatternAnalyzer:
     def _has_pin_or_fork(self, board: chess.Board) -> bool:
         """Check for pins or forks in the position."""
         try:
-            # Check each square for potential fork points
-            for square in chess.SQUARES:
-                attackers = []
-                for attacked_square in chess.SQUARES:
-                    piece = board.piece_at(attacked_square)
-                    if piece and board.is_attacked_by(not piece.color, attacked_square):
-                        attackers.append(attacked_square)
-                if len(attackers) >= 2:
-                    return True
+            # At least two pieces attacked by the opponent
+            attacked = 0
+            for color in chess.COLORS:
+                for square in chess.scan_forward(board.occupied_co[color]):
+                    if board.is_attacked_by(not color, square):
+                        attacked += 1
+                        if attacked >= 2:
+                            return True
 
             return False
 
@@ -614,11 +613,7 @@ class PatternAnalyzer:
         """Check for pawn structure themes."""
         try:
             # Count pawns on each file
-            files = [0] * 8
-            for square in chess.SQUARES:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type == chess.PAWN:
-                    files[chess.square_file(square)] += 1
+            files = pawn_file_counts(board)
 
             # Check for structural features
             has_doubled = any(f > 1 for f in files)
@@ -635,17 +630,10 @@ class PatternAnalyzer:
         """Check for piece placement themes."""
         try:
             # Check central squares
-            central_squares = [chess.E4, chess.D4, chess.E5, chess.D5]
-            center_control = sum(1 for sq in central_squares if board.piece_at(sq) is not None)
-
-            # Check piece development
-            developed_pieces = sum(
-                1
-                for sq in chess.SQUARES
-                if board.piece_at(sq)
-                and board.piece_at(sq).piece_type in [chess.KNIGHT, chess.BISHOP]
-                and chess.square_rank(sq) not in [0, 1, 6, 7]
-            )
+            center_control = chess.popcount(board.occupied & chess.BB_CENTER)
+
+            # Check piece development (minor pieces on ranks 3-6)
+            developed_pieces = chess.popcount((board.knights | board.bishops) & _MIDDLE_RANKS)
 
             return center_control >= 2 or developed_pieces >= 3
 
@@ -679,15 +667,9 @@ class PatternAnalyzer:
     def _has_isolated_pawns(self, board: chess.Board) -> bool:
         """Check for isolated pawns."""
         try:
-            files = [0] * 8
-            for square in chess.SQUARES:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type == chess.PAWN:
-                    files[chess.square_file(square)] = 1
-
-            return any(
-                files[i] == 1 and (i == 0 or files[i - 1] == 0) and (i == 7 or files[i + 1] == 0) for i in range(8)
-            )
+            # Bit i set when file i has a pawn of either colour
+            files = sum(1 << file for file, file_mask in enumerate(chess.BB_FILES) if board.pawns & file_mask)
+            return bool(files & ~(files << 1) & ~(files >> 1))
 
         except Exception:
             return False
@@ -695,34 +677,22 @@ class PatternAnalyzer:
     def _has_backward_pawns(self, board: chess.Board) -> bool:
         """Check for backward pawns."""
         try:
-            for square in chess.SQUARES:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type == chess.PAWN:
+            for color in chess.COLORS:
+                pawns = board.pieces_mask(chess.PAWN, color)
+                for square in chess.scan_forward(pawns):
                     file = chess.square_file(square)
                     rank = chess.square_rank(square)
 
-                    # Check adjacent files for pawns
-                    adjacent_files = []
-                    if file > 0:
-                        adjacent_files.append(file - 1)
-                    if file < 7:
-                        adjacent_files.append(file + 1)
-
-                    # Check if pawn is behind adjacent pawns
-                    for adj_file in adjacent_files:
-                        adj_rank = None
-                        for r in range(8):
-                            adj_square = chess.square(adj_file, r)
-                            adj_piece = board.piece_at(adj_square)
-                            if adj_piece and adj_piece.piece_type == chess.PAWN and adj_piece.color == piece.color:
-                                adj_rank = r
-                                break
-
-                        if adj_rank is not None:
-                            if (piece.color == chess.WHITE and rank < adj_rank) or (
-                                piece.color == chess.BLACK and rank > adj_rank
-                            ):
-                                return True
+                    # Check if pawn is behind the lowest-ranked friendly pawn on an adjacent file
+                    for adj_file in (file - 1, file + 1):
+                        if not 0 <= adj_file <= 7:
+                            continue
+                        adjacent = pawns & chess.BB_FILES[adj_file]
+                        if not adjacent:
+                            continue
+                        adj_rank = chess.square_rank(chess.lsb(adjacent))
+                        if (color == chess.WHITE and rank < adj_rank) or (color == chess.BLACK and rank > adj_rank):
+                            return True
 
             return False
 
@@ -732,13 +702,7 @@ class PatternAnalyzer:
     def _has_doubled_pawns(self, board: chess.Board) -> bool:
         """Check for doubled pawns."""
         try:
-            files = [0] * 8
-            for square in chess.SQUARES:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type == chess.PAWN:
-                    files[chess.square_file(square)] += 1
-
-            return any(f > 1 for f in files)
+            return any(f > 1 for f in pawn_file_counts(board))
 
         except Exception:
             return False
@@ -746,16 +710,12 @@ class PatternAnalyzer:
     def _has_outpost(self, board: chess.Board) -> bool:
         """Check for outposts."""
         try:
-            for square in chess.SQUARES:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type in [chess.KNIGHT, chess.BISHOP]:
-                    rank = chess.square_rank(square)
-
-                    # Check if piece is in enemy territory
-                    if (piece.color == chess.WHITE and rank >= 4) or (piece.color == chess.BLACK and rank <= 3):
-                        # Check if protected by pawn
-                        if self._is_protected_by_pawn(board, square, piece.color):
-                            return True
+            minors = board.knights | board.bishops
+            for color, enemy_half in ((chess.WHITE, _BLACK_HALF), (chess.BLACK, _WHITE_HALF)):
+                # Minor pieces in enemy territory protected by a pawn
+                for square in chess.scan_forward(minors & board.occupied_co[color] & enemy_half):
+                    if self._is_protected_by_pawn(board, square, color):
+                        return True
 
             return False
 
@@ -841,30 +801,8 @@ class PatternAnalyzer:
     def _is_protected_by_pawn(self, board: chess.Board, square: chess.Square, color: bool) -> bool:
         """Check if a square is protected by a pawn of the given color."""
         try:
-            file = chess.square_file(square)
-            rank = chess.square_rank(square)
-
-            # Check pawn protection squares
-            protection_squares = []
-            if color == chess.WHITE:
-                if rank > 0:
-                    if file > 0:
-                        protection_squares.append(chess.square(file - 1, rank - 1))
-                    if file < 7:
-                        protection_squares.append(chess.square(file + 1, rank - 1))
-            else:
-                if rank < 7:
-                    if file > 0:
-                        protection_squares.append(chess.square(file - 1, rank + 1))
-                    if file < 7:
-                        protection_squares.append(chess.square(file + 1, rank + 1))
-
-            for prot_square in protection_squares:
-                piece = board.piece_at(prot_square)
-                if piece and piece.piece_type == chess.PAWN and piece.color == color:
-                    return True
-
-            return False
+            # Squares a pawn of ``color`` would defend ``square`` from are the opposite colour's pawn attacks
+            return bool(chess.BB_PAWN_ATTACKS[not color][square] & board.pieces_mask(chess.PAWN, color))
 
         except Exception:
             return False
@@ -4,10 +4,12 @@ Handles evaluation of chess positions and calculation of positional features.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Sequence
 
 import chess
 
+from .position_features import feature_rows, game_feature_matrix, position_features
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,164 +27,26 @@ class PositionEvaluator:
             Dictionary containing position metrics
         """
         try:
-            return {
-                "piece_activity": self._calculate_piece_activity(board),
-                "center_control": self._calculate_center_control(board),
-                "king_safety": self._calculate_king_safety(board),
-                "pawn_structure": self._calculate_pawn_structure(board),
-                "position_complexity": self._calculate_position_complexity(board),
-                "material_count": self._calculate_material_count(board),
-            }
+            return position_features(board)
         except Exception as e:
             logger.error(f"Error evaluating position: {str(e)}")
             return self._get_default_metrics()
 
-    def _calculate_piece_activity(self, board: chess.Board) -> float:
-        """Calculate piece activity score."""
-        try:
-            activity_score = 0.0
-            total_pieces = 0
-
-            for square in chess.SQUARES:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type != chess.KING:
-                    total_pieces += 1
-                    # Calculate mobility
-                    mobility = len(list(board.attacks(square)))
-                    # Normalize mobility score
-                    activity_score += mobility / 8.0  # Max mobility per piece
-
-            return activity_score / max(1, total_pieces)  # Normalize by piece count
-        except Exception as e:
-            logger.error(f"Error calculating piece activity: {str(e)}")
-            return 0.0
-
-    def _calculate_center_control(self, board: chess.Board) -> float:
-        """Calculate center control score."""
-        try:
-            center_squares = [chess.E4, chess.E5, chess.D4, chess.D5]
-            center_score = 0.0
-
-            for square in center_squares:
-                # Count attackers and defenders
-                white_control = len(board.attackers(chess.WHITE, square))
-                black_control = len(board.attackers(chess.BLACK, square))
-
-                # Add to score based on control difference
-                if board.turn == chess.WHITE:
-                    center_score += (white_control - black_control) / 4.0
-                else:
-                    center_score += (black_control - white_control) / 4.0
-
-            return max(0.0, min(1.0, (center_score + 4.0) / 8.0))
-        except Exception as e:
-            logger.error(f"Error calculating center control: {str(e)}")
-            return 0.0
-
-    def _calculate_king_safety(self, board: chess.Board) -> float:
-        """Calculate king safety score."""
-        try:
-            safety_score = 0.0
-
-            # Get king positions
-            white_king_square = board.king(chess.WHITE)
-            black_king_square = board.king(chess.BLACK)
-
-            if not white_king_square or not black_king_square:
-                return 0.0
-
-            # Calculate safety for the side to move
-            king_square = white_king_square if board.turn == chess.WHITE else black_king_square
-
-            # Check pawn shield
-            pawn_shield = 0
-            for square in board.attacks(king_square):
-                if board.piece_at(square) and board.piece_at(square).piece_type == chess.PAWN:
-                    pawn_shield += 1
-
-            # Check attacking pieces
-            attackers = len(board.attackers(not board.turn, king_square))
-
-            # Calculate final safety score
-            safety_score = (pawn_shield * 0.2) - (attackers * 0.15)
-
-            return max(0.0, min(1.0, safety_score + 0.5))
-        except Exception as e:
-            logger.error(f"Error calculating king safety: {str(e)}")
-            return 0.0
-
-    def _calculate_pawn_structure(self, board: chess.Board) -> float:
-        """Calculate pawn structure score."""
-        try:
-            structure_score = 0.0
-
-            # Count pawns by file
-            files = [0] * 8
-            for square in chess.SQUARES:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type == chess.PAWN:
-                    files[chess.square_file(square)] += 1
-
-            # Penalize doubled pawns
-            doubled_pawns = sum(1 for count in files if count > 1)
-            structure_score -= doubled_pawns * 0.1
-
-            # Reward connected pawns
-            connected_pawns = 0
-            for i in range(7):
-                if files[i] > 0 and files[i + 1] > 0:
-                    connected_pawns += 1
-            structure_score += connected_pawns * 0.15
-
-            return max(0.0, min(1.0, structure_score + 0.5))
-        except Exception as e:
-            logger.error(f"Error calculating pawn structure: {str(e)}")
-            return 0.0
-
-    def _calculate_position_complexity(self, board: chess.Board) -> float:
-        """Calculate position complexity score."""
-        try:
-            complexity = 0.0
-
-            # Factor 1: Number of pieces
-            piece_count = len(board.piece_map())
-            complexity += piece_count / 32.0  # Normalize by max pieces
-
-            # Factor 2: Number of legal moves
-            legal_moves = len(list(board.legal_moves))
-            complexity += legal_moves / 40.0  # Normalize by average moves
-
-            # Factor 3: Piece distribution
-            files_used = len(set(chess.square_file(square) for square in board.piece_map()))
-            ranks_used = len(set(chess.square_rank(square) for square in board.piece_map()))
-            complexity += (files_used + ranks_used) / 16.0
+    def evaluate_game(self, boards: Sequence[chess.Board]) -> List[Dict[str, Any]]:
+        """
+        Evaluate every position of a game in one vectorised pass.
 
-            return max(0.0, min(1.0, complexity / 3.0))
-        except Exception as e:
-            logger.error(f"Error calculating position complexity: {str(e)}")
-            return 0.0
+        Args:
+            boards: Positions in ply order (see ``position_features.game_boards``)
 
-    def _calculate_material_count(self, board: chess.Board) -> float:
-        """Calculate material count."""
+        Returns:
+            One ``evaluate_position``-shaped dict per board
+        """
         try:
-            piece_values = {
-                chess.PAWN: 1,
-                chess.KNIGHT: 3,
-                chess.BISHOP: 3,
-                chess.ROOK: 5,
-                chess.QUEEN: 9,
-            }
-
-            total_material = 0
-            for square in chess.SQUARES:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type != chess.KING:
-                    total_material += piece_values.get(piece.piece_type, 0)
-
-            return total_material
+            return feature_rows(game_feature_matrix(boards))
         except Exception as e:
-            logger.error(f"Error calculating material count: {str(e)}")
-            return 0.0
+            logger.error(f"Error evaluating game positions: {str(e)}")
+            return [self.evaluate_position(board) for board in boards]
 
     def _get_default_metrics(self) -> Dict[str, Any]:
         """Return default position metrics."""
@@ -0,0 +1,189 @@
+"""
+Bitboard feature extraction for chess positions.
+
+Computes the ``PositionEvaluator`` metrics for a single board or for every ply of a game
+at once. Occupancy-only features (material, pawn files, piece spread) are vectorised
+with NumPy over a ``uint64`` array of bitboards per ply; attack-dependent features
+(mobility, center control, king safety) use python-chess attack masks and popcounts
+instead of scanning all 64 squares with ``piece_at``.
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence
+
+import chess
+import numpy as np
+
+FEATURE_COLUMNS = (
+    "piece_activity",
+    "center_control",
+    "king_safety",
+    "pawn_structure",
+    "position_complexity",
+    "material_count",
+)
+
+CENTER_SQUARES = (chess.E4, chess.E5, chess.D4, chess.D5)
+
+# Non-king material, in the order of MATERIAL_PIECE_TYPES.
+MATERIAL_PIECE_TYPES = (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN)
+MATERIAL_WEIGHTS = np.array([1, 3, 3, 5, 9], dtype=np.int64)
+
+
+def _shield_mask(color: chess.Color, king_square: chess.Square) -> chess.Bitboard:
+    """The two ranks in front of the king on its file and the neighbouring files (on-board squares only)."""
+    king_file = chess.square_file(king_square)
+    king_rank = chess.square_rank(king_square)
+    step = 1 if color == chess.WHITE else -1
+    mask = chess.BB_EMPTY
+    for rank in (king_rank + step, king_rank + 2 * step):
+        for file in (king_file - 1, king_file, king_file + 1):
+            if 0 <= rank <= 7 and 0 <= file <= 7:
+                mask |= chess.BB_SQUARES[chess.square(file, rank)]
+    return mask
+
+
+_SHIELD_MASKS = {color: [_shield_mask(color, square) for square in chess.SQUARES] for color in chess.COLORS}
+
+
+def unpack_squares(bitboards: np.ndarray) -> np.ndarray:
+    """``(n,)`` uint64 bitboards -> ``(n, 8, 8)`` 0/1 matrix indexed ``[ply, rank, file]``."""
+    as_bytes = np.ascontiguousarray(bitboards, dtype="<u8").view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(as_bytes, axis=1, bitorder="little").reshape(-1, 8, 8)
+
+
+def pawn_file_counts(board: chess.Board) -> List[int]:
+    """Pawns (either colour) on each file a..h."""
+    pawns = board.pawns
+    return [chess.popcount(pawns & file_mask) for file_mask in chess.BB_FILES]
+
+
+def _king_safety(board: chess.Board) -> float:
+    pawns = board.pawns
+    safety_score = 0.0
+    for color in (chess.WHITE, chess.BLACK):
+        king_square = board.king(color)
+        if king_square is None:
+            continue
+        attackers = chess.popcount(board.attackers_mask(not color, king_square))
+        defenders = chess.popcount(board.attackers_mask(color, king_square))
+        pawn_shield_score = chess.popcount(_SHIELD_MASKS[color][king_square] & pawns & board.occupied_co[color])
+        castling_bonus = 0
+        if board.has_kingside_castling_rights(color):
+            castling_bonus += 0.5
+        if board.has_queenside_castling_rights(color):
+            castling_bonus += 0.5
+        color_safety = (defenders - attackers) * 0.3 + pawn_shield_score * 0.4 + castling_bonus * 0.3
+        safety_score += max(0, min(1, color_safety))
+    return safety_score / 2
+
+
+def _attack_features(board: chess.Board) -> List[float]:
+    """Mobility, center control, king safety and legal move count for one board."""
+    non_king = board.occupied & ~board.kings
+    mobility = sum(chess.popcount(board.attacks_mask(square)) for square in chess.scan_forward(non_king))
+    piece_activity = mobility / 8.0 / max(1, chess.popcount(non_king))
+
+    center_score = 0.0
+    for square in CENTER_SQUARES:
+        white_control = chess.popcount(board.attackers_mask(chess.WHITE, square))
+        black_control = chess.popcount(board.attackers_mask(chess.BLACK, square))
+        if board.turn == chess.WHITE:
+            center_score += (white_control - black_control) / 4.0
+        else:
+            center_score += (black_control - white_control) / 4.0
+    center_control = max(0.0, min(1.0, (center_score + 4.0) / 8.0))
+
+    return [piece_activity, center_control, _king_safety(board), float(board.legal_moves.count())]
+
+
+def game_feature_matrix(boards: Sequence[chess.Board]) -> np.ndarray:
+    """Feature matrix for a sequence of positions: one row per board, columns as ``FEATURE_COLUMNS``."""
+    count = len(boards)
+    if not count:
+        return np.zeros((0, len(FEATURE_COLUMNS)), dtype=np.float64)
+
+    occupied = np.fromiter((board.occupied for board in boards), dtype=np.uint64, count=count)
+    pieces = np.array(
+        [
+            [
+                board.pieces_mask(piece_type, chess.WHITE) | board.pieces_mask(piece_type, chess.BLACK)
+                for board in boards
+            ]
+            for piece_type in MATERIAL_PIECE_TYPES
+        ],
+        dtype=np.uint64,
+    )
+    attack = np.array([_attack_features(board) for board in boards], dtype=np.float64)
+
+    occupied_squares = unpack_squares(occupied)
+    piece_squares = unpack_squares(pieces.reshape(-1)).reshape(len(MATERIAL_PIECE_TYPES), count, 64)
+
+    material = (piece_squares.sum(axis=2, dtype=np.int64).T * MATERIAL_WEIGHTS).sum(axis=1)
+
+    pawn_files = piece_squares[0].reshape(count, 8, 8).sum(axis=1)
+    doubled = (pawn_files > 1).sum(axis=1)
+    connected = ((pawn_files[:, :-1] > 0) & (pawn_files[:, 1:] > 0)).sum(axis=1)
+    pawn_structure = 0.0 - doubled * 0.1
+    pawn_structure = np.clip(pawn_structure + connected * 0.15 + 0.5, 0.0, 1.0)
+
+    piece_count = occupied_squares.sum(axis=(1, 2))
+    files_used = occupied_squares.any(axis=1).sum(axis=1)
+    ranks_used = occupied_squares.any(axis=2).sum(axis=1)
+    complexity = 0.0 + piece_count / 32.0
+    complexity = complexity + attack[:, 3] / 40.0
+    complexity = complexity + (files_used + ranks_used) / 16.0
+    complexity = np.clip(complexity / 3.0, 0.0, 1.0)
+
+    return np.column_stack((attack[:, 0], attack[:, 1], attack[:, 2], pawn_structure, complexity, material))
+
+
+def feature_rows(matrix: np.ndarray) -> List[Dict[str, Any]]:
+    """Convert a feature matrix to ``evaluate_position``-shaped dicts."""
+    rows = []
+    for values in matrix.tolist():
+        row = dict(zip(FEATURE_COLUMNS, values))
+        row["material_count"] = int(row["material_count"])
+        rows.append(row)
+    return rows
+
+
+def position_features(board: chess.Board) -> Dict[str, Any]:
+    """Features for a single position (scalar path; same values as a ``game_feature_matrix`` row)."""
+    piece_activity, center_control, king_safety, legal_moves = _attack_features(board)
+
+    files = pawn_file_counts(board)
+    doubled = sum(1 for count in files if count > 1)
+    connected = sum(1 for left, right in zip(files, files[1:]) if left and right)
+    pawn_structure = 0.0 - doubled * 0.1
+    pawn_structure = max(0.0, min(1.0, pawn_structure + connected * 0.15 + 0.5))
+
+    occupied = board.occupied
+    files_used = sum(1 for file_mask in chess.BB_FILES if occupied & file_mask)
+    ranks_used = sum(1 for rank_mask in chess.BB_RANKS if occupied & rank_mask)
+    complexity = 0.0 + chess.popcount(occupied) / 32.0
+    complexity = complexity + legal_moves / 40.0
+    complexity = complexity + (files_used + ranks_used) / 16.0
+
+    material = sum(
+        int(weight)
+        * chess.popcount(board.pieces_mask(piece_type, chess.WHITE) | board.pieces_mask(piece_type, chess.BLACK))
+        for piece_type, weight in zip(MATERIAL_PIECE_TYPES, MATERIAL_WEIGHTS)
+    )
+    return {
+        "piece_activity": piece_activity,
+        "center_control": center_control,
+        "king_safety": king_safety,
+        "pawn_structure": pawn_structure,
+        "position_complexity": max(0.0, min(1.0, complexity / 3.0)),
+        "material_count": material,
+    }
+
+
+def game_boards(start: chess.Board, moves: Iterable[chess.Move]) -> List[chess.Board]:
+    """The board before the first move and after every move (``len(moves) + 1`` boards)."""
+    board = start.copy(stack=False)
+    boards = [board.copy(stack=False)]
+    for move in moves:
+        board.push(move)
+        boards.append(board.copy(stack=False))
+    return boards
@@ -41,6 +41,8 @@ class StockfishAnalyzer:
     _initialized = False
     _bootstrap_complete = False
     _init_failed = False
+    _owner_pid: Optional[int] = None  # Process that spawned _engine; pipes are not fork-safe
+    _resolved_path: Optional[str] = None
 
     def __new__(cls):
         """Singleton pattern implementation."""
@@ -92,24 +94,34 @@ class StockfishAnalyzer:
 
         return shutil.which(normalized_path) is not None
 
+    @staticmethod
+    def _candidate_stockfish_paths() -> List[str]:
+        """Configured path first, then the usual install locations for this platform."""
+        candidates = [getattr(settings, "STOCKFISH_PATH", None), "stockfish"]
+        if os.name == "nt":
+            candidates += [
+                "C:/Users/PCAdmin/Downloads/stockfish-windows-x86-64-avx2/stockfish/stockfish-windows-x86-64-avx2.exe",
+                "stockfish.exe",
+                r"C:\Program Files\Stockfish\stockfish.exe",
+            ]
+        else:
+            candidates += ["/usr/local/bin/stockfish", "/usr/games/stockfish"]
+        return [path for path in dict.fromkeys(candidates) if path]
+
+    def _viable_stockfish_paths(self) -> List[str]:
+        """Runnable candidates, with the path that worked last time (this process) first."""
+        cached = type(self)._resolved_path
+        if cached and self._is_viable_stockfish_path(cached):
+            return [cached]
+        return [path for path in self._candidate_stockfish_paths() if self._is_viable_stockfish_path(path)]
+
     def _init_engine(self):
         """Initialize the Stockfish engine."""
         if self._init_failed:
             return
 
         try:
-            # Try multiple common paths for Stockfish
-            stockfish_paths = [
-                "C:/Users/PCAdmin/Downloads/stockfish-windows-x86-64-avx2/stockfish/stockfish-windows-x86-64-avx2.exe",
-                "stockfish",  # If in PATH
-                settings.STOCKFISH_PATH,  # From Django settings
-                "stockfish.exe",  # Windows specific
-                r"C:\Program Files\Stockfish\stockfish.exe",  # Common Windows install location
-                "/usr/local/bin/stockfish",  # Common Unix location
-                "/usr/games/stockfish",  # Another common Unix location
-            ]
-
-            viable_paths = [path for path in stockfish_paths if self._is_viable_stockfish_path(path)]
+            viable_paths = self._viable_stockfish_paths()
             if not viable_paths:
                 raise ValueError("Could not find Stockfish engine in any standard location")
 
@@ -120,6 +132,8 @@ class StockfishAnalyzer:
                         self._engine.configure({"Threads": 4, "Hash": 128})
                         self._initialized = True
                         self._init_failed = False
+                        self._owner_pid = os.getpid()
+                        type(self)._resolved_path = path
                         logger.info(f"Successfully initialized Stockfish engine from path: {path}")
                         return
                 except Exception as e:
@@ -134,6 +148,38 @@ class StockfishAnalyzer:
             self._initialized = False
             self._init_failed = True
 
+    @classmethod
+    def _after_fork_in_child(cls) -> None:
+        """Forget engine handles inherited across fork; the parent still owns that process and its pipes."""
+        cls._lock = threading.Lock()
+        instance = cls._instance
+        if instance is None:
+            return
+        if instance._engine is not None:
+            logger.info("Discarding Stockfish engine inherited from parent process %s", instance._owner_pid)
+        instance._engine = None
+        instance._initialized = False
+        instance._init_failed = False
+        instance._owner_pid = None
+
+    def warm_up(self) -> bool:
+        """Spawn (if needed) and handshake the engine in this process; True when it answers."""
+        if self._engine is not None and self._owner_pid not in (None, os.getpid()):
+            self._after_fork_in_child()
+        self._init_failed = False
+        if not self._engine or not self._initialized:
+            self._init_engine()
+        if not self._engine or not self._initialized:
+            return False
+        try:
+            self._engine.ping()
+        except Exception as e:
+            logger.error(f"Stockfish handshake failed during warm-up: {str(e)}")
+            self._cleanup_engine()
+            return False
+        self._last_used = time.time()
+        return True
+
     def _initialize_engine(self) -> None:
         """Initialize the Stockfish engine with configured settings."""
         if self._initialized and self._engine:
@@ -162,6 +208,7 @@ class StockfishAnalyzer:
                     self._engine = chess.engine.SimpleEngine.popen_uci(stockfish_path)
                     if not self._engine:
                         raise ValueError("Failed to create engine instance")
+                    self._owner_pid = os.getpid()
 
                     # Configure engine with settings from Django settings
                     config = {
@@ -229,17 +276,25 @@ class StockfishAnalyzer:
             self._cleanup_engine()
             raise ValueError(f"Engine test failed: {str(e)}")
 
-    def analyze_position(self, board: chess.Board, depth: int = 20) -> Dict[str, Any]:
-        """Analyze a chess position using Stockfish engine."""
+    def analyze_position(self, board: chess.Board, depth: int = 20, features: bool = True) -> Dict[str, Any]:
+        """Analyze a chess position using Stockfish engine.
+
+        With ``features=False`` only the engine search runs and ``position_metrics`` is left
+        out of the result; use ``position_metrics()`` (or ``PositionEvaluator.evaluate_game``
+        for a whole game) for the plies whose metrics are actually read.
+        """
         try:
+            if self._engine is not None and self._owner_pid not in (None, os.getpid()):
+                self._after_fork_in_child()
+
             if self._init_failed:
-                return self._create_neutral_evaluation("Engine initialization previously failed")
+                return self._create_neutral_evaluation("Engine initialization previously failed", features=features)
 
             if not self._engine or not self._initialized:
                 # Try to initialize engine if not already initialized
                 self._init_engine()
                 if not self._engine or not self._initialized:
-                    return self._create_neutral_evaluation("Engine not initialized")
+                    return self._create_neutral_evaluation("Engine not initialized", features=features)
 
             # Use analyse instead of evaluate_position
             result = self._engine.analyse(board, chess.engine.Limit(depth=depth))
@@ -247,14 +302,11 @@ class StockfishAnalyzer:
             # Extract score
             score = result.get("score")
             if not score:
-                return self._create_neutral_evaluation("No score in analysis result")
+                return self._create_neutral_evaluation("No score in analysis result", features=features)
 
             # Convert score to float value
             score_value = self._convert_score(score, board)
 
-            # Calculate position metrics
-            position_metrics = self.position_evaluator.evaluate_position(board)
-
             # Create complete analysis result
             analysis_result = {
                 "score": score_value,
@@ -262,15 +314,22 @@ class StockfishAnalyzer:
                 "nodes": result.get("nodes", 0),
                 "time": result.get("time", 0.0),
                 "pv": [move.uci() for move in result.get("pv", [])],
-                "position_metrics": position_metrics,
                 "timestamp": time.time(),
             }
 
+            # Calculate position metrics
+            if features:
+                analysis_result["position_metrics"] = self.position_metrics(board)
+
             return analysis_result
 
         except Exception as e:
             logger.error(f"Error analyzing position: {str(e)}")
-            return self._create_neutral_evaluation(str(e))
+            return self._create_neutral_evaluation(str(e), features=features)
+
+    def position_metrics(self, board: chess.Board) -> Dict[str, Any]:
+        """Static position metrics for ``board``, without an engine search."""
+        return self.position_evaluator.evaluate_position(board)
 
     def _convert_score(self, score, board: Optional[chess.Board] = None):
         """Convert Stockfish evaluation to a standardized score format with improved robustness."""
@@ -371,7 +430,7 @@ class StockfishAnalyzer:
             logger.error(f"Unexpected error converting score: {str(e)}, score type: {type(score)}")
             return 0.0
 
-    def _create_neutral_evaluation(self, error_msg: str = None) -> Dict[str, Any]:
+    def _create_neutral_evaluation(self, error_msg: str = None, features: bool = True) -> Dict[str, Any]:
         """Create a neutral evaluation when analysis fails."""
         result = {
             "score": 0.0,
@@ -379,16 +438,17 @@ class StockfishAnalyzer:
             "nodes": 0,
             "time": 0.0,
             "pv": [],
-            "position_metrics": {
+            "timestamp": time.time(),
+        }
+        if features:
+            result["position_metrics"] = {
                 "piece_activity": 0.0,
                 "center_control": 0.0,
                 "king_safety": 0.0,
                 "pawn_structure": 0.0,
                 "position_complexity": 0.0,
                 "material_count": 0.0,
-            },
-            "timestamp": time.time(),
-        }
+            }
         if error_msg:
             result["error"] = error_msg
         return result
@@ -446,7 +506,7 @@ class StockfishAnalyzer:
         """Analyze a chess move using Stockfish engine."""
         try:
             # Get evaluation before move
-            eval_before = self.analyze_position(board)
+            eval_before = self.analyze_position(board, features=False)
 
             # Make the move on a copy of the board
             board_after = board.copy()
@@ -949,7 +1009,7 @@ class StockfishAnalyzer:
                     callback(progress_percentage, f"Analyzing move {i+1}/{total_moves}")
 
                 # Analyze position before move
-                position_before = self.analyze_position(board, depth=depth)
+                position_before = self.analyze_position(board, depth=depth, features=False)
 
                 # Execute the move
                 san = board.san(move)
@@ -969,7 +1029,7 @@ class StockfishAnalyzer:
                             if move.uci() != best_move:
                                 best_board = board.copy()
                                 best_board.push(best_move_obj)
-                                position_best = self.analyze_position(best_board, depth=depth)
+                                position_best = self.analyze_position(best_board, depth=depth, features=False)
                                 eval_after_best = position_best.get("score", 0)
                     except Exception:
                         best_move_san = None
@@ -977,7 +1037,7 @@ class StockfishAnalyzer:
                 board.push(move)
 
                 # Analyze position after move
-                position_after = self.analyze_position(board, depth=depth)
+                position_after = self.analyze_position(board, depth=depth, features=False)
                 eval_after = position_after.get("score", 0)
                 if eval_after_best is None:
                     eval_after_best = eval_after
@@ -1086,3 +1146,8 @@ class StockfishAnalyzer:
             return "good_move"
         else:
             return "neutral"
+
+
+if hasattr(os, "register_at_fork"):
+    # Prefork workers must spawn their own engine; never reuse the parent's pipes.
+    os.register_at_fork(after_in_child=StockfishAnalyzer._after_fork_in_child)
@@ -7,7 +7,7 @@ assembles the exact per-game schema required by the PRD.
 import json
 import logging
 import os
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 import chess
 
@@ -126,6 +126,14 @@ def _resolve_player_color_from_pgn(
     return "white"
 
 
+class AnalysisCancelled(Exception):
+    """Raised by build_game_result when its ``should_stop`` callback reports cancellation."""
+
+
+# build_game_result polls ``should_stop`` once every this many plies (two engine searches each).
+CANCEL_POLL_PLIES = 4
+
+
 def build_game_result(
     pgn: str,
     game_id: str = None,
@@ -134,6 +142,7 @@ def build_game_result(
     saved_game_id: int | None = None,
     chess_com_username: str = "",
     lichess_username: str = "",
+    should_stop: Optional[Callable[[], bool]] = None,
 ) -> Dict[str, Any]:
     """Produce the per-game result JSON object as defined in PRD section 11.
 
@@ -143,6 +152,8 @@ def build_game_result(
         saved_game_id: ChessMate Game PK when batch was built from saved games
         chess_com_username: profile username for color inference
         lichess_username: profile username for color inference
+        should_stop: polled every CANCEL_POLL_PLIES plies; when it returns True the
+            engine loop stops and AnalysisCancelled is raised
 
     Returns:
         Dict matching the required per-game schema
@@ -159,8 +170,10 @@ def build_game_result(
         game = chess.pgn.read_game(reader)
         board = game.board() if game else chess.Board()
         for i, move in enumerate(game.mainline_moves() if game else []):
+            if should_stop is not None and i % CANCEL_POLL_PLIES == 0 and should_stop():
+                raise AnalysisCancelled(f"Analysis of {game_id} cancelled at ply {i}")
             is_white = board.turn == chess.WHITE
-            result_before = analyzer.analyze_position(board, depth=depth)
+            result_before = analyzer.analyze_position(board, depth=depth, features=False)
             eval_before = float(result_before.get("score", 0.0))
 
             try:
@@ -172,7 +185,7 @@ def build_game_result(
 
             board.push(move)
 
-            result_after = analyzer.analyze_position(board, depth=depth)
+            result_after = analyzer.analyze_position(board, depth=depth, features=False)
             eval_after = float(result_after.get("score", 0.0))
 
             analyzed_move = {
@@ -196,6 +209,8 @@ def build_game_result(
                 analyzed_move["classification"] = result_before["classification"]
 
             analyzed_moves.append(analyzed_move)
+    except AnalysisCancelled:
+        raise
     except Exception as e:
         logger.error(f"Failed to analyze game via analyze_position loop: {e}")
         # Return complete schema-compliant dict with analysis_failed flag
@@ -0,0 +1,87 @@
+"""Tests for the columnar batch view used by the batch aggregator."""
+
+import numpy as np
+from core.analysis.batch_aggregator import (
+    _compute_overall_eval_stability,
+    _compute_phase_performance,
+)
+from core.analysis.batch_columns import (
+    KIND_BLUNDER,
+    KIND_OTHER,
+    BatchColumns,
+    masked_mean,
+    most_common_first_seen,
+    ordered_sum,
+)
+
+
+def _game(game_id, result, color, opening_name, moments=(), **phases):
+    return {
+        "game_id": game_id,
+        "result": result,
+        "player_color": color,
+        "opening_name": opening_name,
+        "eco_code": "",
+        "accuracy": 70.0,
+        "player_moves": 30,
+        "phase_breakdown": {name: {"moves": moves, "avg_eval_drop": drop} for name, (moves, drop) in phases.items()},
+        "critical_moments": list(moments),
+    }
+
+
+GAMES = [
+    _game(
+        "g1",
+        "1-0",
+        "white",
+        "Sicilian Defense: Najdorf",
+        moments=[{"phase": "middlegame", "type": "blunder", "eval_swing": 2.0, "tactical_theme": "fork"}],
+        opening=(10, 0.1),
+        middlegame=(20, 0.4),
+    ),
+    _game(
+        "g2",
+        "1-0",
+        "black",
+        "Sicilian Defense: Dragon",
+        moments=[{"phase": "endgame", "type": "inaccuracy", "eval_swing": 0.3, "endgame_material": "rook_endgame"}],
+        opening=(8, 0.0),
+        endgame=(12, 0.2),
+    ),
+    _game("g3", "1/2-1/2", "white", "Unknown", opening=(0, 0.0)),
+]
+
+
+def test_columns_flatten_games_and_moments():
+    columns = BatchColumns(GAMES)
+
+    assert len(columns) == 3
+    assert columns.outcome_counts() == {"win": 1, "loss": 1, "draw": 1, "unknown": 0}
+    assert columns.phase_moves.tolist() == [[10, 20, 0], [8, 0, 12], [0, 0, 0]]
+    # Both Sicilian variations share one opening group; "Unknown" has none.
+    assert columns.openings.values == ["Sicilian Defense"]
+    assert columns.opening_group.tolist() == [0, 0, -1]
+    assert columns.moment_game.tolist() == [0, 1]
+    assert columns.moment_kind.tolist() == [KIND_BLUNDER, KIND_OTHER]
+    assert columns.endgame_types.values == ["general_endgame", "rook_endgame"]
+    assert BatchColumns.of(columns) is columns
+
+
+def test_most_common_first_seen_breaks_ties_by_first_occurrence():
+    assert most_common_first_seen(np.array([3, 1, 1, 3, 2])) == 3
+    assert most_common_first_seen(np.array([2, 1, 1])) == 1
+    assert most_common_first_seen(np.array([], dtype=np.int64)) is None
+
+
+def test_masked_mean_ignores_nan_and_matches_python_sum():
+    values = np.array([0.1] * 10 + [np.nan])
+    assert masked_mean(values) == sum([0.1] * 10) / 10
+    assert masked_mean(np.array([np.nan])) is None
+    assert masked_mean(np.array([50.0, 100.0]), np.array([1, 3])) == 87.5
+    assert ordered_sum(np.array([])) == 0.0
+
+
+def test_aggregator_helpers_accept_prebuilt_columns():
+    columns = BatchColumns(GAMES)
+    assert _compute_overall_eval_stability(columns) == _compute_overall_eval_stability(GAMES) == 0.77
+    assert _compute_phase_performance(columns) == _compute_phase_performance(GAMES)
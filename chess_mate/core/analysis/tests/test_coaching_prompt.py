@@ -0,0 +1,101 @@
+"""Tests for token-budgeted compaction of the batch coaching prompt input."""
+
+import json
+import random
+
+from core.analysis.coaching_generator import _build_per_game_summary
+from core.analysis.coaching_prompt import (
+    compact_coaching_input,
+    compact_json,
+    estimate_tokens,
+)
+
+TYPES = ["blunder", "mistake", "inaccuracy"]
+
+
+def _game_result(index: int, rng: random.Random) -> dict:
+    moments = [
+        {
+            "move_number": rng.randint(5, 60),
+            "phase": rng.choice(["opening", "middlegame", "endgame"]),
+            "type": rng.choice(TYPES),
+            "played_move": "Nf3",
+            "best_move": "d4",
+            "tactical_theme": rng.choice([None, "fork", "pin", "hanging_piece"]),
+            "endgame_material": None,
+            "eval_swing": round(rng.uniform(0.3, 6.0), 2),
+        }
+        for _ in range(rng.randint(0, 7))
+    ]
+    return {
+        "game_id": f"game_{index}",
+        "player_color": "white",
+        "result": rng.choice(["1-0", "0-1", "1/2-1/2"]),
+        "opening_name": "Sicilian Defense",
+        "accuracy": rng.uniform(50, 95),
+        "phase_breakdown": {"opening": {"avg_eval_drop": 0.1, "accuracy": 80.0}},
+        "move_quality": {"blunder": rng.randint(0, 4), "mistake": rng.randint(0, 4)},
+        "critical_moments": moments,
+    }
+
+
+def _batch(games: int = 30):
+    rng = random.Random(games)
+    summaries = [_build_per_game_summary(_game_result(index, rng)) for index in range(games)]
+    top = summaries[2]["critical_moments"][0] if summaries[2]["critical_moments"] else {"move_number": 1}
+    batch_summary = {
+        "games_analyzed": games,
+        "overall_eval_stability": 0.71,
+        "overall_accuracy": 0.71,
+        "time_management_summary": None,
+        "top_critical_moments": [{**top, "game_id": "game_2", "fen": "8/8/8/8/8/8/8/8 w - - 0 1"}],
+    }
+    return batch_summary, summaries
+
+
+def test_compaction_drops_redundant_fields_within_budget():
+    batch_summary, summaries = _batch(games=3)
+    compacted = compact_coaching_input(batch_summary, summaries, token_budget=100_000)
+
+    assert compacted.omitted_games == 0
+    assert compacted.moment_cap == 5
+    assert "overall_accuracy" not in compacted.batch_summary
+    assert "time_management_summary" not in compacted.batch_summary
+    assert "fen" not in compacted.batch_summary["top_critical_moments"][0]
+    assert compacted.tokens_after < compacted.tokens_before
+
+    cited = compacted.batch_summary["top_critical_moments"][0]["move_number"]
+    game_2 = compacted.per_game_summaries[2]
+    assert all(moment["move_number"] != cited for moment in game_2.get("critical_moments", []))
+    for game in compacted.per_game_summaries:
+        moments = game.get("critical_moments", [])
+        assert all(None not in moment.values() for moment in moments)
+        severities = [TYPES.index(moment["type"]) for moment in moments]
+        assert severities == sorted(severities)
+
+
+def test_compaction_fits_budget_by_trimming_moments_then_games():
+    batch_summary, summaries = _batch(games=30)
+    full = compact_coaching_input(batch_summary, summaries, token_budget=100_000)
+
+    trimmed = compact_coaching_input(batch_summary, summaries, token_budget=full.tokens_after * 2 // 3)
+    assert trimmed.omitted_games == 0
+    assert trimmed.moment_cap < 5
+    assert trimmed.tokens_after <= full.tokens_after * 2 // 3
+
+    tight = compact_coaching_input(batch_summary, summaries, token_budget=600)
+    assert tight.tokens_after <= 600
+    assert tight.omitted_games > 0
+    kept = [game["game_id"] for game in tight.per_game_summaries]
+    assert kept == sorted(kept, key=lambda game_id: int(game_id.split("_")[1]))
+    worst = max(summaries, key=lambda game: (game["blunder_count"], game["mistake_count"]))
+    assert worst["game_id"] in kept
+
+
+def test_estimate_tokens_tracks_compact_json_size():
+    batch_summary, summaries = _batch(games=10)
+    text = compact_json(summaries)
+    assert len(text) < len(json.dumps(summaries))
+    assert len(text) / 6 < estimate_tokens(text) < len(text) / 2
+    assert estimate_tokens("") == 0
+    assert estimate_tokens('{"move_number":22}') == 7
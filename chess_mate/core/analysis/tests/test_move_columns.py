@@ -0,0 +1,78 @@
+"""Regression tests: columnar game metrics match the per-section MetricsCalculator path."""
+
+import random
+
+import pytest
+from core.analysis.metrics_calculator import MetricsCalculator
+from core.analysis.move_columns import MoveColumns
+
+CLASSIFICATIONS = ["best", "Excellent Move", "good", "great_move", "inaccuracy", "mistake", "blunder", "neutral", ""]
+
+
+def _random_move(rng: random.Random, is_white: bool) -> dict:
+    eval_before = rng.choice([0, 35, -120, 180, -260, 450, -900, 15.5])
+    eval_after = eval_before + rng.choice([0, 10, -25, -80, -150, -320, 60, 240])
+    move = {
+        "is_white": is_white,
+        "classification": rng.choice(CLASSIFICATIONS),
+        "eval_before": eval_before,
+        "eval_after": eval_after,
+        "eval_change": eval_after - eval_before,
+        "evaluation_improvement": rng.choice([None, 0, 55, -120, 210, -340, 101.5]),
+        "position_complexity": rng.choice([0.2, 0.5, 0.75, 0.9]),
+        "material_count": rng.choice([32, 27, 22, 18, 12]),
+    }
+    for flag in ("is_best", "is_critical", "is_tactical", "is_check", "in_check", "under_attack", "is_mistake"):
+        if rng.random() < 0.25:
+            move[flag] = True
+    if rng.random() < 0.3:
+        move["evaluation_drop"] = rng.choice([0.0, 0.5, 1.0, 120.0])
+    if rng.random() < 0.4:
+        move["material_change"] = rng.choice([0, 1, -3, 0.5])
+    if rng.random() < 0.3:
+        move["piece_activity_change"] = rng.choice([0.1, 0.4, -0.2])
+    if move.get("is_tactical"):
+        move["tactical_features"] = rng.sample(["check", "material", "complex_position", "fork"], rng.randint(0, 3))
+    if rng.random() < 0.7:
+        move["time_spent"] = rng.choice([None, 1, 2.5, 12, 40.25])
+    return move
+
+
+def _random_game(seed: int) -> list:
+    rng = random.Random(seed)
+    is_white = rng.random() < 0.5
+    return [_random_move(rng, is_white) for _ in range(rng.randint(1, 90))]
+
+
+def _per_section_metrics(moves: list, time_data: list) -> dict:
+    return MetricsCalculator._finalize_metrics(MetricsCalculator._calculate_sections(moves, time_data))
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_columnar_metrics_match_per_section_path(seed):
+    moves = _random_game(seed)
+    time_data = [{"time_spent": move["time_spent"]} for move in moves if move.get("time_spent")]
+
+    assert MoveColumns.from_moves(moves) is not None
+    assert MetricsCalculator.calculate_game_metrics(moves, time_data) == _per_section_metrics(moves, time_data)
+
+
+def test_non_numeric_fields_use_per_section_path():
+    moves = _random_game(7)
+    moves[3]["eval_after"] = "1.5"
+    moves[5]["position_complexity"] = None
+
+    assert MoveColumns.from_moves(moves) is None
+    assert MetricsCalculator.calculate_game_metrics(moves, []) == _per_section_metrics(moves, [])
+
+
+def test_normalized_classification_labels():
+    labels = ["Good Move", "great_move", "brilliant", "Blunder", "book", None]
+    assert [MetricsCalculator._normalized_classification({"classification": label}) for label in labels] == [
+        "good",
+        "excellent",
+        "excellent",
+        "blunder",
+        "neutral",
+        "neutral",
+    ]
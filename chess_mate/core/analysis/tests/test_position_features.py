@@ -0,0 +1,75 @@
+"""Tests for bitboard position feature extraction."""
+
+import chess
+import pytest
+from core.analysis.position_evaluator import PositionEvaluator
+from core.analysis.position_features import (
+    FEATURE_COLUMNS,
+    game_boards,
+    game_feature_matrix,
+    position_features,
+)
+
+ITALIAN = "e4 e5 Nf3 Nc6 Bc4 Bc5 c3 Nf6 d4 exd4 cxd4 Bb4+ Nc3 Nxe4 O-O Bxc3 d5 Bf6 Re1 Ne7".split()
+
+# Values produced by the square-scanning PositionEvaluator this module replaced.
+LEGACY_METRICS = [
+    (
+        "r1bqk2r/ppppnppp/5b2/3P4/2B1n3/5N2/PP3PPP/R1BQR1K1 w kq - 3 11",
+        {
+            "piece_activity": 0.4807692307692308,
+            "center_control": 0.59375,
+            "king_safety": 1.0,
+            "pawn_structure": 0.6499999999999999,
+            "position_complexity": 0.9500000000000001,
+            "material_count": 72,
+        },
+    ),
+    (
+        "8/5pk1/6p1/3P4/2K5/8/6PP/8 w - - 0 40",
+        {
+            "piece_activity": 0.225,
+            "center_control": 0.5625,
+            "king_safety": 0.4,
+            "pawn_structure": 0.7,
+            "position_complexity": 0.38125000000000003,
+            "material_count": 5,
+        },
+    ),
+    (
+        "r1bq1rk1/pp3ppp/2n1pn2/3p4/1bPP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 9",
+        {
+            "piece_activity": 0.48660714285714285,
+            "center_control": 0.53125,
+            "king_safety": 1.0,
+            "pawn_structure": 0.85,
+            "position_complexity": 0.8958333333333334,
+            "material_count": 74,
+        },
+    ),
+]
+
+
+def _italian_boards():
+    board = chess.Board()
+    moves = []
+    for san in ITALIAN:
+        move = board.parse_san(san)
+        moves.append(move)
+        board.push(move)
+    return game_boards(chess.Board(), moves)
+
+
+@pytest.mark.parametrize("fen,expected", LEGACY_METRICS)
+def test_position_features_match_legacy_metrics(fen, expected):
+    assert position_features(chess.Board(fen)) == expected
+
+
+def test_game_matrix_rows_match_single_position_path():
+    boards = _italian_boards()
+    matrix = game_feature_matrix(boards)
+
+    assert matrix.shape == (len(ITALIAN) + 1, len(FEATURE_COLUMNS))
+    assert PositionEvaluator().evaluate_game(boards) == [position_features(board) for board in boards]
+    assert PositionEvaluator().evaluate_game(boards)[-1] == LEGACY_METRICS[0][1]
+    assert game_feature_matrix([]).shape == (0, len(FEATURE_COLUMNS))
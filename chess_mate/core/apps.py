@@ -47,6 +47,39 @@ class CoreConfig(AppConfig):
         # Connect the signal handler properly - not using decorator syntax
         post_save.connect(create_user_profile, sender=User)
 
+        from .models import GameAnalysis
+
+        def index_spaced_moments(sender, instance, created, update_fields=None, raw=False, **kwargs):
+            """Keep ReviewableMoment rows in step with the analysis feedback (SRG-13)."""
+            if raw:
+                return
+            if update_fields is not None and not {"feedback", "analysis_data"} & set(update_fields):
+                return
+            from .spaced_repetition_email import index_reviewable_moments
+
+            try:
+                index_reviewable_moments(instance, replace=not created)
+            except Exception as e:
+                logger.warning(f"Could not index reviewable moments for analysis {instance.pk}: {e}")
+
+        post_save.connect(index_spaced_moments, sender=GameAnalysis, dispatch_uid="core.index_spaced_moments")
+
+        from django.db.models.signals import post_delete
+
+        from .daily_quota import (
+            release_batch_quota,
+            release_game_quota,
+            track_batch_quota,
+            track_game_quota,
+        )
+        from .models import BatchAnalysisReport, Game
+
+        # Keep the UserDailyQuota counters behind the abuse limits in step with their source rows.
+        post_save.connect(track_game_quota, sender=Game, dispatch_uid="core.track_game_quota")
+        post_delete.connect(release_game_quota, sender=Game, dispatch_uid="core.release_game_quota")
+        post_save.connect(track_batch_quota, sender=BatchAnalysisReport, dispatch_uid="core.track_batch_quota")
+        post_delete.connect(release_batch_quota, sender=BatchAnalysisReport, dispatch_uid="core.release_batch_quota")
+
     def _configure_rest_framework(self):
         """
         Configure REST Framework settings after app initialization.
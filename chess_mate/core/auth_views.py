@@ -35,7 +35,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
 from .abuse_limits import (
     check_login_allowed,
@@ -44,8 +44,7 @@ from .abuse_limits import (
     login_rate_limit_response,
     password_reset_rate_limit_response,
     record_failed_login,
-    record_password_reset_request,
-    record_signup_attempt,
+    release_signup_attempt,
     signup_rate_limit_response,
 )
 from .decorators import auth_csrf_exempt, rate_limit
@@ -56,6 +55,7 @@ from .error_handling import api_error_handler, create_error_response
 # Import models directly for actual usage
 from .models import Profile, profile_creation_defaults
 from .serializers import UserSerializer
+from .token_blacklist import RefreshToken
 from .validators import validate_password_complexity
 
 # Configure logging
@@ -238,6 +238,19 @@ def register_view(request):
     if not allowed:
         return signup_rate_limit_response(retry_after)
 
+    # Only registrations that create an account keep their signup slot.
+    try:
+        response = _register_user(request)
+    except Exception:
+        release_signup_attempt(request)
+        raise
+    if response.status_code != status.HTTP_201_CREATED:
+        release_signup_attempt(request)
+    return response
+
+
+def _register_user(request):
+    """Validate the registration payload and create the account (``register_view`` body)."""
     data = request.data
     username = data.get("username")
     email = data.get("email")
@@ -361,8 +374,6 @@ def register_view(request):
         # For development, log the verification token
         logger.info(f"User {username} registered. Verification token: {profile.email_verification_token}")
 
-        record_signup_attempt(request)
-
         email_sent = send_verification_email(user, profile, request)
 
         if _requires_email_verification():
@@ -597,10 +608,17 @@ def token_refresh_view(request):
         raise APIValidationError([{"field": "refresh", "message": "Refresh token is required"}])
 
     try:
-        # Validate and refresh token
+        # Validate (including the blacklist check) and refresh token
         refresh = RefreshToken(refresh_token)
         access_token = str(refresh.access_token)
 
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            # New jti, same expiry: rotation must not stretch a session token to the remember-me lifetime.
+            refresh.set_jti()
+            refresh.set_iat()
+
         return Response({"status": "success", "access": access_token, "refresh": str(refresh)})
 
     except Exception as e:
@@ -642,7 +660,6 @@ def request_password_reset(request):
     try:
         user = User.objects.get(email=email)
     except User.DoesNotExist:
-        record_password_reset_request(request, email)
         # We still return success to prevent email enumeration
         # This is a security measure - don't let attackers know if an email exists
         return Response(
@@ -694,7 +711,6 @@ def request_password_reset(request):
         )
 
         logger.info(f"Password reset email sent to {email}")
-        record_password_reset_request(request, email)
 
         return Response(
             {
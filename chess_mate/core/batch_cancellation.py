@@ -0,0 +1,101 @@
+"""
+Cooperative cancellation for batch analysis.
+
+Cancelling a batch sets a short-lived flag in the default cache (Redis in production) and
+revokes the batch's per-game subtasks that are still queued. Subtask ids are derived from
+the batch id, the game index and a per-run nonce (``start_batch_run``), so revoking needs
+only the current nonce, and a rerun never reuses ids that workers have already revoked.
+Subtasks that are already running poll the flag through ``BatchCancelToken`` every few
+plies inside ``build_game_result`` and stop searching, which frees the worker slot within
+seconds. A rerun clears the flag (``clear_batch_cancel``) before it queues new work.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from typing import List
+
+from celery import current_app
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CANCEL_KEY_PREFIX = "batch_cancel:"
+RUN_KEY_PREFIX = "batch_run:"
+
+
+def _cancel_ttl() -> int:
+    return int(getattr(settings, "BATCH_CANCEL_TTL", 86400))
+
+
+def batch_subtask_id(batch_id: str, index: int, run: str = "") -> str:
+    """Celery task id of the per-game subtask for ``game_{index}`` of ``batch_id`` in ``run``."""
+    if run:
+        return f"{batch_id}-{run}-game_{index}"
+    return f"{batch_id}-game_{index}"
+
+
+def start_batch_run(batch_id: str) -> str:
+    """Record a fresh run nonce for ``batch_id`` and return it."""
+    run = uuid.uuid4().hex[:8]
+    try:
+        cache.set(RUN_KEY_PREFIX + str(batch_id), run, timeout=_cancel_ttl())
+    except Exception as exc:
+        logger.warning("Batch run nonce write failed for %s: %s", batch_id, exc)
+    return run
+
+
+def current_batch_run(batch_id: str) -> str:
+    """Nonce of the latest run of ``batch_id``; empty for batches queued before nonces existed."""
+    try:
+        return cache.get(RUN_KEY_PREFIX + str(batch_id)) or ""
+    except Exception as exc:
+        logger.warning("Batch run nonce read failed for %s: %s", batch_id, exc)
+        return ""
+
+
+def is_batch_cancelled(batch_id: str) -> bool:
+    try:
+        return cache.get(CANCEL_KEY_PREFIX + str(batch_id)) is not None
+    except Exception as exc:
+        logger.warning("Batch cancel flag read failed for %s: %s", batch_id, exc)
+        return False
+
+
+def request_batch_cancel(batch_id: str, games_count: int = 0) -> List[str]:
+    """Flag ``batch_id`` as cancelled and revoke its queued subtasks; returns the revoked ids."""
+    try:
+        cache.set(CANCEL_KEY_PREFIX + str(batch_id), "1", timeout=_cancel_ttl())
+    except Exception as exc:
+        logger.warning("Batch cancel flag write failed for %s: %s", batch_id, exc)
+
+    run = current_batch_run(batch_id)
+    task_ids = [batch_subtask_id(batch_id, index, run) for index in range(int(games_count or 0))]
+    if task_ids:
+        try:
+            # No terminate: running subtasks stop cooperatively via the flag.
+            current_app.control.revoke(task_ids)
+        except Exception as exc:
+            logger.warning("Revoking subtasks of batch %s failed: %s", batch_id, exc)
+            return []
+    return task_ids
+
+
+def clear_batch_cancel(batch_id: str) -> None:
+    """Drop the cancel flag so a rerun of ``batch_id`` is not stopped by an earlier cancel."""
+    try:
+        cache.delete(CANCEL_KEY_PREFIX + str(batch_id))
+    except Exception as exc:
+        logger.warning("Batch cancel flag clear failed for %s: %s", batch_id, exc)
+
+
+class BatchCancelToken:
+    """Callable passed to ``build_game_result(should_stop=...)``; true once the batch is cancelled."""
+
+    def __init__(self, batch_id: str):
+        self.batch_id = batch_id
+
+    def __call__(self) -> bool:
+        return is_batch_cancelled(self.batch_id)
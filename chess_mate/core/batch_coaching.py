@@ -43,6 +43,8 @@ def regenerate_batch_coaching(batch_report: BatchAnalysisReport) -> Tuple[bool,
             per_game_results,
             player_rating=batch_summary.get("player_rating"),
             coach_persona=resolve_coach_persona(profile),
+            # An explicit regenerate asks for a new report, not the stored one.
+            refresh=True,
         )
     except CoachingGeneratorError as exc:
         logger.warning("Coaching regeneration failed for batch %s: %s", batch_report.id, exc)
@@ -3,9 +3,10 @@
 import logging
 
 from django.conf import settings
-from django.db import transaction
+from django.utils import timezone
 
-from .models import BatchAnalysisReport, Profile
+from .credit_ledger import REASON_BATCH_REFUND, post_credit_entry
+from .models import BatchAnalysisReport
 
 logger = logging.getLogger(__name__)
 
@@ -24,28 +25,23 @@ def refund_amount_for_report(batch_report: BatchAnalysisReport) -> int:
 def refund_batch_credits_on_hard_fail(batch_report: BatchAnalysisReport) -> int:
     """
     Refund credits when a batch hard-fails (status=failed).
-    Idempotent — safe to call multiple times. Returns amount refunded.
+    Idempotent — the ledger entry is unique per batch, so repeated calls refund once.
+    Returns amount refunded.
     """
     if batch_report.status != "failed":
         return 0
 
-    with transaction.atomic():
-        locked = BatchAnalysisReport.objects.select_for_update().get(pk=batch_report.pk)
-        if locked.credits_refunded:
-            return 0
-
-        amount = refund_amount_for_report(locked)
-        if amount <= 0:
-            locked.credits_refunded = True
-            locked.save(update_fields=["credits_refunded", "updated_at"])
-            return 0
-
-        profile = Profile.objects.select_for_update().get(user_id=locked.user_id)
-        profile.credits += amount
-        profile.save(update_fields=["credits"])
+    if batch_report.credits_refunded:
+        return 0
 
-        locked.credits_refunded = True
-        locked.save(update_fields=["credits_refunded", "updated_at"])
+    amount = refund_amount_for_report(batch_report)
+    refunded = amount > 0 and post_credit_entry(batch_report.user_id, amount, REASON_BATCH_REFUND, batch_report.pk)
+    BatchAnalysisReport.objects.filter(pk=batch_report.pk, credits_refunded=False).update(
+        credits_refunded=True, updated_at=timezone.now()
+    )
+    batch_report.credits_refunded = True
+    if not refunded:
+        return 0
 
     logger.info(
         "Refunded %s credits for failed batch id=%s user_id=%s",
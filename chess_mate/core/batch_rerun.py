@@ -2,7 +2,8 @@
 Re-queue Stockfish batch analysis for completed reports (admin / ops).
 
 Used after classification or aggregation fixes so old batches pick up new logic
-without charging credits again.
+without charging credits again. Per-game results whose inputs are unchanged are
+reused from the content-addressed store (see batch_result_store).
 """
 
 from __future__ import annotations
@@ -10,7 +11,16 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
-from .models import BatchAnalysisReport, Game
+from django.conf import settings
+
+from .batch_cancellation import clear_batch_cancel
+from .batch_result_store import (
+    SAVED_GAME_FIELDS,
+    game_result_key,
+    reused_envelopes,
+    stored_result_keys,
+)
+from .models import BatchAnalysisReport, Game, Profile
 
 logger = logging.getLogger(__name__)
 
@@ -63,30 +73,23 @@ def resolve_batch_game_ids(batch_report: BatchAnalysisReport) -> List[int]:
     return ordered
 
 
-def collect_batch_pgns(
-    batch_report: BatchAnalysisReport,
-) -> Tuple[List[str], List[int]]:
-    """Load PGN strings for a batch's saved games (same user)."""
+def _load_batch_games(batch_report: BatchAnalysisReport) -> List[Game]:
+    """Fetch the batch's saved games (same user) in one query, keeping batch order."""
     game_ids = resolve_batch_game_ids(batch_report)
     if not game_ids:
         raise BatchRerunError("No saved game IDs found on this batch report.")
 
-    pgns: List[str] = []
-    source_ids: List[int] = []
+    games_by_id = (
+        Game.objects.filter(user_id=batch_report.user_id).only("id", "pgn", *SAVED_GAME_FIELDS).in_bulk(game_ids)
+    )
+    games: List[Game] = []
     missing: List[int] = []
-
     for game_id in game_ids:
-        try:
-            game = Game.objects.get(pk=game_id, user_id=batch_report.user_id)
-        except Game.DoesNotExist:
+        game = games_by_id.get(game_id)
+        if game is None or not (game.pgn or "").strip():
             missing.append(game_id)
             continue
-        pgn = (game.pgn or "").strip()
-        if not pgn:
-            missing.append(game_id)
-            continue
-        pgns.append(pgn)
-        source_ids.append(game.id)
+        games.append(game)
 
     if missing:
         logger.warning(
@@ -96,14 +99,47 @@ def collect_batch_pgns(
             missing[:10],
         )
 
-    if len(pgns) < 5:
-        raise BatchRerunError(f"Need at least 5 games with PGN to rerun (found {len(pgns)}).")
+    if len(games) < 5:
+        raise BatchRerunError(f"Need at least 5 games with PGN to rerun (found {len(games)}).")
+
+    return games
 
-    return pgns, source_ids
+
+def collect_batch_pgns(
+    batch_report: BatchAnalysisReport,
+) -> Tuple[List[str], List[int]]:
+    """Load PGN strings for a batch's saved games (same user)."""
+    games = _load_batch_games(batch_report)
+    return [game.pgn.strip() for game in games], [game.id for game in games]
+
+
+def collect_reused_refs(batch_report: BatchAnalysisReport, games: List[Game]) -> List[Dict[str, Any]]:
+    """References to stored results for the batch's games (see ``reused_envelopes``)."""
+    depth = int(getattr(settings, "BATCH_ANALYSIS_DEPTH", 14))
+    profile = (
+        Profile.objects.filter(user_id=batch_report.user_id).only("chess_com_username", "lichess_username").first()
+    )
+    keys = [
+        game_result_key(
+            game.pgn,
+            depth,
+            chess_com_username=getattr(profile, "chess_com_username", "") or "",
+            lichess_username=getattr(profile, "lichess_username", "") or "",
+        )
+        for game in games
+    ]
+    stored = stored_result_keys(keys)
+    return [
+        {"game_id": f"game_{index}", "result_key": key, "saved_game_id": game.id}
+        for index, (game, key) in enumerate(zip(games, keys))
+        if key in stored
+    ]
 
 
 def prepare_batch_rerun(batch_report: BatchAnalysisReport) -> None:
     """Reset persisted analysis so the chord callback can overwrite it."""
+    # A cancel flag left by an earlier run would make every new subtask bail out at once.
+    clear_batch_cancel(batch_report.task_id)
     batch_report.status = "in_progress"
     batch_report.batch_summary = None
     batch_report.coaching_report = None
@@ -125,41 +161,57 @@ def prepare_batch_rerun(batch_report: BatchAnalysisReport) -> None:
     )
 
 
-def queue_batch_rerun(batch_report: BatchAnalysisReport, *, eager: bool = False) -> str:
+def queue_batch_rerun(batch_report: BatchAnalysisReport, *, eager: bool = False, reuse: bool = True) -> str:
     """
     Re-analyze a batch with current Stockfish + aggregation logic.
 
-    Returns a status message. Does not charge credits.
+    Games whose stored result key (PGN, depth, engine, analyzer version) is unchanged are
+    reused unless ``reuse`` is False; only the rest are sent to Stockfish. Aggregation and
+    coaching always run over the full set. Returns a status message. Does not charge credits.
     """
     if batch_report.status not in ("completed", "partial", "failed"):
         raise BatchRerunError(
             f"Batch {batch_report.id} is {batch_report.status}; " "wait for it to finish or cancel it first."
         )
 
-    pgns, source_ids = collect_batch_pgns(batch_report)
+    games = _load_batch_games(batch_report)
+    pgns = [game.pgn.strip() for game in games]
+    source_ids = [game.id for game in games]
+    reused = collect_reused_refs(batch_report, games) if reuse else []
+
     prepare_batch_rerun(batch_report)
     batch_report.games_count = len(pgns)
     batch_report.game_ids = source_ids
-    batch_report.save(update_fields=["games_count", "game_ids", "updated_at"])
+    batch_report.completed_games = [ref["game_id"] for ref in reused]
+    batch_report.save(update_fields=["games_count", "game_ids", "completed_games", "updated_at"])
 
     task_id = batch_report.task_id
     user_id = batch_report.user_id
+    reused_ids = set(batch_report.completed_games)
 
     if eager:
-        from .tasks import aggregate_and_report_task, analyze_single_game_subtask
+        from .tasks import (
+            aggregate_and_report_task,
+            analyze_single_game_subtask,
+            merge_batch_game_results,
+        )
 
         results: List[Dict[str, Any]] = []
         for i, pgn in enumerate(pgns):
+            if f"game_{i}" in reused_ids:
+                continue
             saved_id = source_ids[i] if i < len(source_ids) else None
             try:
                 results.append(analyze_single_game_subtask(pgn, f"game_{i}", task_id, user_id, saved_id))
             except Exception as exc:
                 logger.exception("Batch %s eager rerun game %s failed: %s", batch_report.id, i, exc)
                 results.append({"game_id": f"game_{i}", "status": "failed", "error": str(exc)})
-        aggregate_and_report_task(results, task_id, pgns, user_id)
-        return f"Re-analyzed batch {batch_report.id} inline ({len(pgns)} games)."
+        reused_results = reused_envelopes(reused, user_id)
+        aggregate_and_report_task(merge_batch_game_results(results, reused_results), task_id, pgns, user_id)
+        return f"Re-analyzed batch {batch_report.id} inline ({len(pgns)} games, {len(reused)} reused)."
 
     from .tasks import analyze_batch_task
 
-    analyze_batch_task.delay(task_id, pgns, user_id, source_ids)
-    return f"Queued re-analysis for batch {batch_report.id} ({len(pgns)} games)."
+    # Only references travel through the broker; the chord callback loads the stored results.
+    analyze_batch_task.delay(task_id, pgns, user_id, source_ids, reused_refs=reused or None)
+    return f"Queued re-analysis for batch {batch_report.id} ({len(pgns)} games, {len(reused)} reused)."
@@ -0,0 +1,141 @@
+"""
+Content-addressed storage for per-game batch results.
+
+A per-game result depends only on the PGN, the analysis depth, the engine build, the
+analyzer code, and which side the user played (resolved from their platform usernames).
+Hashing those inputs gives a stable key, so batch re-runs can reuse stored results and
+dispatch Stockfish only for games whose key is missing. Re-runs pass small references
+(``game_{i}``, key, saved game id) through Celery and the chord callback loads the results
+with ``reused_envelopes``. Rows older than ``BATCH_RESULT_RETENTION_DAYS`` are pruned.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import BatchGameResult, Game
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever build_game_result / move classification output changes so stored results are not reused.
+BATCH_ANALYZER_VERSION = "1"
+
+# Fields filled from the saved Game row after the engine pass (see apply_saved_game_metadata).
+SAVED_GAME_FIELDS = ("opponent", "date_played", "platform", "game_url", "opening_name", "eco_code")
+
+
+def game_result_key(
+    pgn: str,
+    depth: int,
+    *,
+    chess_com_username: str = "",
+    lichess_username: str = "",
+    engine_version: Optional[str] = None,
+    analyzer_version: str = BATCH_ANALYZER_VERSION,
+) -> str:
+    """SHA-256 over every input that changes a per-game result."""
+    if engine_version is None:
+        engine_version = str(getattr(settings, "STOCKFISH_VERSION", "stockfish"))
+    material = "\x1f".join(
+        [
+            analyzer_version,
+            engine_version,
+            str(int(depth)),
+            (chess_com_username or "").strip().lower(),
+            (lichess_username or "").strip().lower(),
+            (pgn or "").strip(),
+        ]
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def load_game_results(keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch stored results for ``keys`` in one query; missing keys are simply absent."""
+    keys = [key for key in dict.fromkeys(keys) if key]
+    if not keys:
+        return {}
+    rows = BatchGameResult.objects.filter(result_key__in=keys).values_list("result_key", "result")
+    return {key: result for key, result in rows if isinstance(result, dict)}
+
+
+def stored_result_keys(keys: Iterable[str]) -> Set[str]:
+    """Which of ``keys`` have a stored result, without loading the result payloads."""
+    keys = [key for key in dict.fromkeys(keys) if key]
+    if not keys:
+        return set()
+    return set(BatchGameResult.objects.filter(result_key__in=keys).values_list("result_key", flat=True))
+
+
+def store_game_result(key: str, depth: int, result: Dict[str, Any]) -> None:
+    """Persist a freshly computed result; never raises into the analysis task."""
+    if not key or not isinstance(result, dict):
+        return
+    try:
+        BatchGameResult.objects.update_or_create(result_key=key, defaults={"depth": int(depth), "result": result})
+    except Exception as exc:
+        logger.warning("Could not store batch game result %s: %s", key[:12], exc)
+
+
+def apply_saved_game_metadata(game_result: Dict[str, Any], saved_row: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Overlay opponent/date/opening details from the user's saved Game row."""
+    if not saved_row:
+        return game_result
+    if saved_row.get("opponent"):
+        game_result["opponent"] = saved_row["opponent"]
+    if saved_row.get("date_played"):
+        game_result["date_played"] = saved_row["date_played"].isoformat()
+    if saved_row.get("platform"):
+        game_result["platform"] = saved_row["platform"]
+    if saved_row.get("game_url"):
+        game_result["platform_game_url"] = saved_row["game_url"]
+    saved_opening = (saved_row.get("opening_name") or "").strip()
+    if saved_opening and saved_opening.lower() not in ("unknown", "unknown opening", "?"):
+        from .opening_name_utils import compact_opening_name
+
+        game_result["opening_name"] = compact_opening_name(saved_opening) or saved_opening
+    saved_eco = (saved_row.get("eco_code") or "").strip().upper()
+    if saved_eco:
+        game_result["eco_code"] = saved_eco[:3]
+    return game_result
+
+
+def reused_envelopes(refs: List[Dict[str, Any]], user_id: int) -> List[Dict[str, Any]]:
+    """Success envelopes for ``{"game_id", "result_key", "saved_game_id"}`` references.
+
+    A reference whose stored result has since been pruned becomes a failed envelope.
+    """
+    stored = load_game_results(ref.get("result_key") for ref in refs)
+    saved_ids = [ref["saved_game_id"] for ref in refs if ref.get("saved_game_id")]
+    saved_rows = {
+        row["id"]: row
+        for row in Game.objects.filter(user_id=user_id, id__in=saved_ids).values("id", *SAVED_GAME_FIELDS)
+    }
+
+    envelopes: List[Dict[str, Any]] = []
+    for ref in refs:
+        game_id = ref.get("game_id")
+        stored_result = stored.get(ref.get("result_key"))
+        if stored_result is None:
+            envelopes.append({"game_id": game_id, "status": "failed", "error": "Stored game result expired"})
+            continue
+        result = dict(stored_result)
+        result["game_id"] = game_id
+        result["saved_game_id"] = ref.get("saved_game_id")
+        apply_saved_game_metadata(result, saved_rows.get(ref.get("saved_game_id")))
+        envelopes.append({"game_id": game_id, "status": "success", "result": result})
+    return envelopes
+
+
+def prune_game_results() -> int:
+    """Delete stored results older than ``BATCH_RESULT_RETENTION_DAYS``; returns rows deleted."""
+    days = int(getattr(settings, "BATCH_RESULT_RETENTION_DAYS", 180))
+    deleted, _ = BatchGameResult.objects.filter(created_at__lt=timezone.now() - timedelta(days=days)).delete()
+    if deleted:
+        logger.info("Pruned %s stored batch game result(s)", deleted)
+    return deleted
@@ -10,7 +10,6 @@ This module provides cache-related functions and decorators to:
 
 import functools
 import hashlib
-import inspect
 import json
 import logging
 import random
@@ -31,9 +30,7 @@ from typing import (
     Union,
     cast,
 )
-from urllib.parse import urlparse
 
-import redis
 from django.conf import settings  # type: ignore
 from django.core.cache import cache, caches  # type: ignore
 from django.core.cache.backends.base import BaseCache  # type: ignore
@@ -43,6 +40,8 @@ from redis import Redis
 from redis.exceptions import RedisError
 from rest_framework.response import Response  # type: ignore
 
+from .redis_manager import redis_manager
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
@@ -109,33 +108,15 @@ def _resolve_patched_cache_symbol(symbol: str) -> Optional[Any]:
 
 
 def _build_redis_client(ensure_ping: bool = True) -> Optional[Redis]:
-    """Build a direct Redis client from settings.
+    """Return the process-wide Redis client (``core.redis_manager``).
 
-    This helper keeps Redis instantiation behavior centralized and testable.
+    With ``ensure_ping`` the client is only returned while Redis passes the manager's
+    lazy health check (at most one PING per ``REDIS_HEALTH_CHECK_INTERVAL``).
     """
     try:
-        redis_url = getattr(settings, "REDIS_URL", None) or "redis://localhost:6379/0"
-        parsed = urlparse(redis_url)
-        host = parsed.hostname or "localhost"
-        port = parsed.port or 6379
-        db = int((parsed.path or "/0").lstrip("/") or 0)
-        password = parsed.password
-
-        client = redis.Redis(  # type: ignore
-            host=host,
-            port=port,
-            db=db,
-            password=password,
-            socket_timeout=getattr(settings, "REDIS_SOCKET_TIMEOUT", 5),
-            socket_connect_timeout=getattr(settings, "REDIS_SOCKET_CONNECT_TIMEOUT", 5),
-            retry_on_timeout=True,
-            decode_responses=False,
-            health_check_interval=30,
-            max_connections=getattr(settings, "REDIS_MAX_CONNECTIONS", 100),
-        )
-        if ensure_ping:
-            client.ping()  # type: ignore
-        return client
+        if ensure_ping and not redis_manager.is_available():
+            return None
+        return redis_manager.client()
     except Exception as e:
         logger.error(f"Error connecting to Redis: {str(e)}")
         return None
@@ -212,16 +193,13 @@ _ORIGINAL_GET_CACHE_INSTANCE = get_cache_instance
 def get_redis_connection() -> Optional[Redis]:
     """
     Get a Redis connection for direct Redis operations.
-    If Redis is disabled via settings, returns a dummy client.
+    If Redis is disabled via settings (USE_REDIS=False), returns None.
 
     Returns:
         Redis client instance
     """
-    use_redis = getattr(settings, "USE_REDIS", None)
-    if use_redis is False:
-        stack_modules = {frame.frame.f_globals.get("__name__", "") for frame in inspect.stack()}
-        if any("core.tests.test_cache" in module for module in stack_modules):
-            return None
+    if getattr(settings, "USE_REDIS", None) is False:
+        return None
 
     # Prefer configured Django cache backend client when available.
     patched_get_cache = _resolve_patched_cache_symbol("get_cache_instance") is not None
@@ -267,7 +245,6 @@ def get_redis_connection() -> Optional[Redis]:
     if cache_lookup_succeeded and patched_get_cache:
         return None
 
-    # Build a fresh client so patched `redis.Redis` in tests is always honored.
     return _build_redis_client(ensure_ping=True)
 
 
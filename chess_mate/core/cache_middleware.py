@@ -1,23 +1,34 @@
-"""Middleware for automatic cache invalidation."""
+"""Middleware for automatic cache invalidation.
+
+Model signals do not touch Redis directly: they add tags, keys and key prefixes to an
+``InvalidationBatch`` bound to the current transaction, and the batch is flushed once in
+``transaction.on_commit``. A bulk import of N games therefore costs one flush with the
+deduplicated keys instead of N rounds of deletes, and nothing is invalidated before the
+data is committed (where a concurrent read could re-cache the old rows). Outside a
+transaction the batch flushes immediately.
+"""
 
 # pylint: disable=no-member
 
 import logging
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
 
 from django.apps import apps
+from django.db import transaction
 from django.db.models import Model
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from .redis_config import (
+    KEY_PREFIX_CACHE_TAG,
     KEY_PREFIX_USER,
-    invalidate_analysis_cache,
-    invalidate_game_cache,
+    analysis_cache_key,
+    game_cache_key,
+    get_redis_client,
+    get_redis_key,
     invalidate_player_cache,
     invalidate_user_games_cache,
-    redis_invalidate_by_prefix,
-    redis_invalidate_by_tags,
+    user_games_cache_key,
 )
 
 # Configure logging
@@ -31,32 +42,111 @@ CACHE_INVALIDATION_EXCEPTIONS = (
 )
 
 
+def _decode(key: Any) -> str:
+    return key.decode("utf-8") if isinstance(key, bytes) else str(key)
+
+
+class InvalidationBatch:
+    """Deduplicated tags, keys and prefixes to invalidate when the transaction commits."""
+
+    def __init__(self):
+        self.tags: Set[str] = set()
+        self.keys: Set[str] = set()
+        self.prefixes: Set[str] = set()
+
+    def add(
+        self,
+        tags: Iterable[str] = (),
+        keys: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+    ) -> None:
+        self.tags.update(tags)
+        self.keys.update(keys)
+        self.prefixes.update(prefixes)
+
+    def flush(self) -> int:
+        """Delete everything in the batch: one pipelined lookup for tags/prefixes, one DEL."""
+        if not (self.tags or self.keys or self.prefixes):
+            return 0
+        tag_keys = [get_redis_key(KEY_PREFIX_CACHE_TAG, tag) for tag in sorted(self.tags)]
+        prefixes = sorted(self.prefixes)
+        doomed = set(self.keys) | set(tag_keys)
+        try:
+            client = get_redis_client()
+            if tag_keys or prefixes:
+                lookup = client.pipeline()
+                for tag_key in tag_keys:
+                    lookup.smembers(tag_key)
+                for prefix in prefixes:
+                    lookup.keys(f"{prefix}*")
+                for found in lookup.execute() or []:
+                    if found:
+                        doomed.update(_decode(key) for key in found)
+            deleted = client.delete(*sorted(doomed)) if doomed else 0
+        except Exception as e:
+            logger.error("Error flushing cache invalidation batch: %s", e)
+            return 0
+        logger.debug(
+            "Flushed cache invalidation: %s tags, %s keys, %s prefixes", len(tag_keys), len(self.keys), len(prefixes)
+        )
+        return deleted if isinstance(deleted, int) else 0
+
+
+def _pending_batch() -> Optional[InvalidationBatch]:
+    """The batch registered for the current transaction, or None in autocommit mode."""
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+    batch = getattr(connection, "_cache_invalidation_batch", None)
+    # A batch whose flush is no longer pending was already flushed or rolled back with its savepoint.
+    if batch is None or not any(entry[1] == batch.flush for entry in connection.run_on_commit):
+        batch = InvalidationBatch()
+        connection._cache_invalidation_batch = batch
+        transaction.on_commit(batch.flush)
+    return batch
+
+
+def queue_cache_invalidation(
+    tags: Iterable[str] = (),
+    keys: Iterable[str] = (),
+    prefixes: Iterable[str] = (),
+) -> None:
+    """Invalidate on commit of the current transaction (immediately in autocommit mode)."""
+    batch = _pending_batch()
+    if batch is None:
+        batch = InvalidationBatch()
+        batch.add(tags, keys, prefixes)
+        batch.flush()
+        return
+    batch.add(tags, keys, prefixes)
+
+
 def invalidate_user_prefix(user_id: int) -> None:
-    redis_invalidate_by_prefix(f"{KEY_PREFIX_USER}{user_id}")
+    queue_cache_invalidation(prefixes=[f"{KEY_PREFIX_USER}{user_id}"])
 
 
 def invalidate_game_for_instance(instance: Any) -> None:
     game_id = getattr(instance, "id", None)
     if game_id is not None:
-        invalidate_game_cache(game_id)
+        queue_cache_invalidation(keys=[game_cache_key(game_id)])
 
 
 def invalidate_analysis_for_instance(instance: Any) -> None:
     analysis_id = getattr(instance, "id", None)
     if analysis_id is not None:
-        invalidate_analysis_cache(analysis_id)
+        queue_cache_invalidation(keys=[analysis_cache_key(analysis_id)])
 
 
 def invalidate_user_games_for_user(user: Any) -> None:
-    invalidate_user_games_cache(user.id)
+    queue_cache_invalidation(keys=[user_games_cache_key(user.id)])
 
 
 def invalidate_game_for_id(game_id: int) -> None:
-    invalidate_game_cache(game_id)
+    queue_cache_invalidation(keys=[game_cache_key(game_id)])
 
 
 def invalidate_user_games_for_id(user_id: int) -> None:
-    invalidate_user_games_cache(user_id)
+    queue_cache_invalidation(keys=[user_games_cache_key(user_id)])
 
 
 # Model to cache mapping
@@ -132,7 +222,7 @@ def get_related_values(instance: Any, field_path: str) -> List[Any]:
 @receiver(post_save)
 def invalidate_cache_on_save(sender: Type[Model], instance: Any, **kwargs) -> None:
     """
-    Signal handler to invalidate cache when a model is saved.
+    Signal handler to queue cache invalidation when a model is saved (flushed on commit).
 
     Args:
         sender: Model class
@@ -154,10 +244,7 @@ def invalidate_cache_on_save(sender: Type[Model], instance: Any, **kwargs) -> No
     # Invalidate by tags
     if mapping.get("tags"):
         tags = mapping["tags"]
-        if isinstance(tags, list):
-            redis_invalidate_by_tags(tags)
-        elif isinstance(tags, str):
-            redis_invalidate_by_tags(tags)
+        queue_cache_invalidation(tags=[tags] if isinstance(tags, str) else tags)
 
     # Run model-specific invalidation functions
     invalidate_functions = mapping.get("invalidate_functions", [])
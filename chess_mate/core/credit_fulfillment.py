@@ -10,8 +10,8 @@ from typing import Any, Dict, Optional
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import F
 
+from .credit_ledger import REASON_PURCHASE, credit_balance, post_credit_entry
 from .models import Profile, Transaction
 from .payment import PaymentProcessor
 
@@ -55,19 +55,16 @@ def fulfill_checkout_session(
             user=user,
             stripe_payment_id=session_id,
             status="completed",
-        ).first()
-        if existing:
-            profile = Profile.objects.get(user=user)
+        ).exists()
+        # The ledger entry is unique per session, so concurrent confirm + webhook add credits once.
+        if existing or not post_credit_entry(user.id, credits_to_add, REASON_PURCHASE, session_id):
             return {
-                "credits": profile.credits,
+                "credits": credit_balance(user.id),
                 "credits_added": 0,
                 "already_confirmed": True,
             }
 
-        profile, _ = Profile.objects.select_for_update().get_or_create(user=user)
-        profile.credits = F("credits") + credits_to_add
-        profile.save(update_fields=["credits"])
-        profile.refresh_from_db(fields=["credits"])
+        Profile.objects.get_or_create(user=user)
 
         amount_dollars = float(payment_data.get("amount") or 0) / 100.0
         Transaction.objects.create(
@@ -86,7 +83,7 @@ def fulfill_checkout_session(
         user.id,
     )
     return {
-        "credits": profile.credits,
+        "credits": credit_balance(user.id),
         "credits_added": credits_to_add,
         "already_confirmed": False,
     }
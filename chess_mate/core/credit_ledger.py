@@ -0,0 +1,129 @@
+"""
+Append-only credit ledger.
+
+Credit changes that race each other (single-game and batch charges and their
+fail-refunds, Stripe fulfillment, admin grants) insert a ``CreditLedgerEntry`` instead of
+locking the user's ``Profile`` row. Entries are unique per (user, reason, reference), so a
+retried charge or refund is rejected by the database rather than by a cache key that can
+be evicted.
+
+``Profile.credits`` is the compacted snapshot: it already includes every entry with
+``id <= Profile.credits_ledger_through``. The balance is the snapshot plus the sum of later
+entries, read in one statement. ``compact_credit_ledger`` periodically folds entries older
+than ``CREDIT_LEDGER_COMPACT_DELAY`` seconds into the snapshot; the delay keeps an entry
+whose transaction has not committed yet from falling behind the watermark. Code that still
+adjusts ``Profile.credits`` directly stays correct as long as it uses ``F()`` updates or full
+saves: a full save of a stale profile rewinds snapshot and watermark together.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import CreditLedgerEntry, Profile
+
+logger = logging.getLogger(__name__)
+
+REASON_SINGLE_GAME_CHARGE = "single_game_charge"
+REASON_SINGLE_GAME_REFUND = "single_game_refund"
+REASON_BATCH_CHARGE = "batch_charge"
+REASON_BATCH_REFUND = "batch_refund"
+REASON_PURCHASE = "purchase"
+REASON_ADMIN_GRANT = "admin_grant"
+
+
+def _compact_delay() -> int:
+    return int(getattr(settings, "CREDIT_LEDGER_COMPACT_DELAY", 60))
+
+
+def post_credit_entry(user_id: int, delta: int, reason: str, reference: Any) -> bool:
+    """Append one entry; False when (user, reason, reference) was already recorded."""
+    try:
+        with transaction.atomic():
+            CreditLedgerEntry.objects.create(user_id=user_id, delta=int(delta), reason=reason, reference=str(reference))
+    except IntegrityError:
+        return False
+    return True
+
+
+def latest_credit_entry(user_id: int, reason: str, reference_prefix: str) -> Optional[CreditLedgerEntry]:
+    return (
+        CreditLedgerEntry.objects.filter(user_id=user_id, reason=reason, reference__startswith=reference_prefix)
+        .order_by("-id")
+        .first()
+    )
+
+
+def credit_balance(user_id: int) -> int:
+    """Snapshot plus pending entries for ``user_id`` (0 without a profile); takes no locks."""
+    pending = (
+        CreditLedgerEntry.objects.filter(user_id=OuterRef("user_id"), id__gt=OuterRef("credits_ledger_through"))
+        .order_by()
+        .values("user_id")
+        .annotate(total=Sum("delta"))
+        .values("total")
+    )
+    row = (
+        Profile.objects.filter(user_id=user_id)
+        .annotate(pending=Coalesce(Subquery(pending), 0))
+        .values_list("credits", "pending")
+        .first()
+    )
+    if row is None:
+        return 0
+    return int(row[0] or 0) + int(row[1] or 0)
+
+
+def compact_credit_balance(user_id: int) -> int:
+    """Fold settled entries into ``Profile.credits``; returns how many entries were folded."""
+    cutoff = timezone.now() - timedelta(seconds=_compact_delay())
+    with transaction.atomic():
+        profile = (
+            Profile.objects.select_for_update().only("id", "credits_ledger_through").filter(user_id=user_id).first()
+        )
+        if profile is None:
+            return 0
+        settled = CreditLedgerEntry.objects.filter(
+            user_id=user_id,
+            id__gt=profile.credits_ledger_through,
+            created_at__lt=cutoff,
+        )
+        totals = settled.aggregate(total=Sum("delta"), last_id=Max("id"), entries=Count("id"))
+        if totals["last_id"] is None:
+            return 0
+        Profile.objects.filter(pk=profile.pk).update(
+            credits=F("credits") + (totals["total"] or 0),
+            credits_ledger_through=totals["last_id"],
+        )
+    return totals["entries"]
+
+
+def compact_credit_ledger() -> int:
+    """Compact every user with settled entries past their snapshot; returns users compacted."""
+    cutoff = timezone.now() - timedelta(seconds=_compact_delay())
+    user_ids = (
+        CreditLedgerEntry.objects.filter(
+            id__gt=F("user__profile__credits_ledger_through"),
+            created_at__lt=cutoff,
+        )
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    compacted = 0
+    for user_id in list(user_ids):
+        try:
+            if compact_credit_balance(user_id):
+                compacted += 1
+        except Exception:
+            logger.exception("Credit ledger compaction failed for user_id=%s", user_id)
+    if compacted:
+        logger.info("Compacted credit ledger for %s user(s)", compacted)
+    return compacted
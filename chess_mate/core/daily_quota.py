@@ -0,0 +1,191 @@
+"""
+Denormalized per-user daily counters for the abuse limits.
+
+``UserDailyQuota`` holds one row per user and local day. Game and batch-report signals
+(registered in ``CoreConfig.ready``) bump it with ``F()`` updates as rows are created,
+change status or are deleted, and single-game analyses are recorded directly, so the
+limit checks in ``core.abuse_limits`` read one small query instead of counting
+``Game``/``BatchAnalysisReport`` rows per request.
+
+``active_batches`` is kept on the row of the day a batch was created, since a batch can
+outlive its day; ``quota_for`` also returns every earlier row that still has active
+batches. Writes that bypass signals (``QuerySet.update``, ``bulk_create``) and stale
+instances can make the counters drift; ``reconcile_daily_quotas`` rebuilds them from the
+source tables.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from .models import BatchAnalysisReport, Game, UserDailyQuota
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_BATCH_STATUSES = ("pending", "in_progress")
+SOURCE_FIELDS = ("batches", "games_imported", "active_batches")
+
+
+@dataclass(frozen=True)
+class QuotaSnapshot:
+    batches: int = 0
+    games_imported: int = 0
+    single_analyses: int = 0
+    active_batches: int = 0
+
+
+def quota_date(moment: Optional[datetime] = None) -> date:
+    """Local calendar day of ``moment`` (now by default)."""
+    return timezone.localdate(moment) if moment is not None else timezone.localdate()
+
+
+def bump_daily_quota(user_id: int, local_date: date, **deltas: int) -> None:
+    """Add ``deltas`` to the (user, day) row, never below zero; a row is only created for positive deltas."""
+    deltas = {field: int(delta) for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # Floor decrements: a stale instance releasing the same batch twice must not leave -1 behind to
+    # cancel out another active batch on that day.
+    increments = {
+        field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0) for field, delta in deltas.items()
+    }
+    rows = UserDailyQuota.objects.filter(user_id=user_id, local_date=local_date)
+    if rows.update(**increments) or not any(delta > 0 for delta in deltas.values()):
+        return
+    try:
+        with transaction.atomic():
+            UserDailyQuota.objects.create(
+                user_id=user_id,
+                local_date=local_date,
+                **{field: max(0, delta) for field, delta in deltas.items()},
+            )
+    except IntegrityError:
+        # A concurrent writer created the row first.
+        rows.update(**increments)
+
+
+def quota_for(user_id: int, local_date: Optional[date] = None) -> QuotaSnapshot:
+    """Counters for ``local_date`` (today) plus active batches from every day, in one query."""
+    local_date = local_date or quota_date()
+    totals: Dict[str, int] = defaultdict(int)
+    rows = UserDailyQuota.objects.filter(user_id=user_id).filter(Q(local_date=local_date) | Q(active_batches__gt=0))
+    for row in rows.values("local_date", "batches", "games_imported", "single_analyses", "active_batches"):
+        if row["local_date"] == local_date:
+            for field in ("batches", "games_imported", "single_analyses"):
+                totals[field] = row[field]
+        totals["active_batches"] += max(0, row["active_batches"])
+    return QuotaSnapshot(**totals)
+
+
+def record_single_analysis_quota(user_id: int) -> None:
+    bump_daily_quota(user_id, quota_date(), single_analyses=1)
+
+
+def _is_active(status: Any) -> bool:
+    return status in ACTIVE_BATCH_STATUSES
+
+
+def track_game_quota(sender, instance, created=False, raw=False, **kwargs) -> None:
+    if raw or not created or not instance.user_id:
+        return
+    bump_daily_quota(instance.user_id, quota_date(instance.created_at), games_imported=1)
+
+
+def release_game_quota(sender, instance, **kwargs) -> None:
+    if instance.user_id and instance.created_at:
+        bump_daily_quota(instance.user_id, quota_date(instance.created_at), games_imported=-1)
+
+
+def track_batch_quota(sender, instance, created=False, raw=False, update_fields=None, **kwargs) -> None:
+    if raw:
+        return
+    day = quota_date(instance.created_at)
+    if created:
+        bump_daily_quota(instance.user_id, day, batches=1, active_batches=int(_is_active(instance.status)))
+    elif update_fields is None or "status" in update_fields:
+        if not hasattr(instance, "_quota_status"):
+            # Status was never loaded (deferred); reconciliation settles it.
+            return
+        change = int(_is_active(instance.status)) - int(_is_active(instance._quota_status))
+        bump_daily_quota(instance.user_id, day, active_batches=change)
+    instance._quota_status = instance.status
+
+
+def release_batch_quota(sender, instance, **kwargs) -> None:
+    status = getattr(instance, "_quota_status", instance.status)
+    bump_daily_quota(
+        instance.user_id,
+        quota_date(instance.created_at),
+        batches=-1,
+        active_batches=-int(_is_active(status)),
+    )
+
+
+def _local_day_start(local_date: date) -> datetime:
+    start = datetime.combine(local_date, time.min)
+    return timezone.make_aware(start, timezone.get_current_timezone())
+
+
+def _source_counts(since: date) -> Dict[Tuple[int, date], Dict[str, int]]:
+    """Batches and imported games per (user, local day) since ``since``, and active batches from any day."""
+    local_day = TruncDate("created_at", tzinfo=timezone.get_current_timezone())
+    expected: Dict[Tuple[int, date], Dict[str, int]] = defaultdict(dict)
+    start = _local_day_start(since)
+    sources = (
+        ("batches", BatchAnalysisReport.objects.filter(created_at__gte=start)),
+        ("games_imported", Game.objects.filter(created_at__gte=start, user__isnull=False)),
+        ("active_batches", BatchAnalysisReport.objects.filter(status__in=ACTIVE_BATCH_STATUSES)),
+    )
+    for field, queryset in sources:
+        grouped = queryset.annotate(day=local_day).order_by().values("user_id", "day").annotate(total=Count("id"))
+        for row in grouped:
+            expected[(row["user_id"], row["day"])][field] = row["total"]
+    return expected
+
+
+def reconcile_daily_quotas(days: int = 2) -> int:
+    """
+    Rebuild batch, game and active-batch counters from the source tables.
+
+    Day counters are rebuilt for the last ``days`` local days (the limits only read today);
+    active batches are rebuilt for every day. ``single_analyses`` has no source table and is
+    left as recorded. Returns the number of rows written.
+    """
+    since = quota_date() - timedelta(days=max(1, days) - 1)
+    written = 0
+    with transaction.atomic():
+        # Lock the rows first so counter bumps that land while we count apply on top of the rebuild.
+        existing = {
+            (row.user_id, row.local_date): row
+            for row in UserDailyQuota.objects.select_for_update().filter(
+                Q(local_date__gte=since) | Q(active_batches__gt=0)
+            )
+        }
+        source = _source_counts(since)
+        for user_id, local_date in source:
+            existing.setdefault((user_id, local_date), UserDailyQuota(user_id=user_id, local_date=local_date))
+        for key, row in existing.items():
+            expected = {field: source.get(key, {}).get(field, 0) for field in SOURCE_FIELDS}
+            if row.local_date < since:
+                expected = {"active_batches": expected["active_batches"]}
+            if row.pk is not None and all(getattr(row, field) == value for field, value in expected.items()):
+                continue
+            for field, value in expected.items():
+                setattr(row, field, value)
+            if row.pk is None:
+                row.save()
+            else:
+                row.save(update_fields=list(expected))
+            written += 1
+    if written:
+        logger.info("Reconciled %s daily quota row(s)", written)
+    return written
@@ -19,10 +19,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from .cache import cache_delete, cache_get, cache_set, generate_cache_key
+from .credit_ledger import credit_balance
 
 # Local application imports
 from .models import BatchAnalysisReport, Game, GameAnalysis, Profile
-from .serializers_batches import _coaching_summary_snippet
 from .stats_helpers import (
     ANALYZED_GAME_Q,
     build_dashboard_focus_insight,
@@ -247,14 +247,15 @@ def dashboard_view(request):
         latest_batch_moment = None
         latest_single_moment = fetch_latest_single_worst_moment(user, profile)
         latest_batch = (
-            BatchAnalysisReport.objects.filter(user=user, status__in=["completed", "partial"])
+            BatchAnalysisReport.objects.summary("batch_summary")
+            .filter(user=user, status__in=["completed", "partial"])
             .order_by("-created_at")
             .first()
         )
         if latest_batch:
             batch_summary = latest_batch.batch_summary if isinstance(latest_batch.batch_summary, dict) else {}
             latest_batch_summary = batch_summary
-            summary_text = _coaching_summary_snippet(latest_batch.coaching_report)
+            summary_text = latest_batch.coach_summary
             if summary_text:
                 latest_batch_coach = {
                     "batch_id": latest_batch.id,
@@ -262,20 +263,19 @@ def dashboard_view(request):
                     "games_count": latest_batch.games_count,
                     "status": latest_batch.status,
                     "summary": summary_text,
-                    "overall_accuracy_pct": batch_summary.get("overall_accuracy_pct"),
+                    "overall_accuracy_pct": latest_batch.overall_accuracy_pct,
                 }
-            top_moments = batch_summary.get("top_critical_moments") or []
-            if isinstance(top_moments, list) and top_moments:
-                first_moment = top_moments[0]
-                if isinstance(first_moment, dict):
-                    latest_batch_moment = dict(first_moment)
-                    latest_batch_moment["batch_id"] = latest_batch.id
-                    saved_id = latest_batch_moment.get("saved_game_id")
-                    if saved_id:
-                        batch_game = Game.objects.filter(id=saved_id, user=user).first()  # type: ignore[attr-defined]
-                        if batch_game:
-                            latest_batch_moment["opponent"] = resolve_game_opponent_display(batch_game, profile)
-                            latest_batch_moment["opening_name"] = batch_game.opening_name
+            first_moment = latest_batch.top_moment
+            if isinstance(first_moment, dict):
+                latest_batch_moment = dict(first_moment)
+                latest_batch_moment["batch_id"] = latest_batch.id
+                saved_id = latest_batch_moment.get("saved_game_id")
+                if saved_id:
+                    games = Game.objects.lean()  # type: ignore[attr-defined]
+                    batch_game = games.filter(id=saved_id, user=user).first()
+                    if batch_game:
+                        latest_batch_moment["opponent"] = resolve_game_opponent_display(batch_game, profile)
+                        latest_batch_moment["opening_name"] = batch_game.opening_name
 
         # Construct the response data
         dashboard_data = {
@@ -283,7 +283,7 @@ def dashboard_view(request):
                 "username": user.username,
                 "chess_com_username": profile.chess_com_username,
                 "lichess_username": profile.lichess_username,
-                "credits": profile.credits,
+                "credits": credit_balance(user.id),
                 "memberships": {  # Placeholder - would be populated from membership data
                     "is_premium": False,
                     "plan": "Free",
@@ -333,7 +333,7 @@ def dashboard_view(request):
         average_accuracy = compute_user_average_accuracy(user, profile, latest_batch_summary)
         dashboard_data["total_games"] = total_games
         dashboard_data["win_rate"] = round(win_rate, 1)
-        dashboard_data["credits"] = profile.credits
+        dashboard_data["credits"] = dashboard_data["user"]["credits"]
         dashboard_data["average_accuracy"] = average_accuracy
         dashboard_data["insights"] = format_dashboard_insights(
             analysis_insights,
@@ -0,0 +1,373 @@
+"""
+Sharded fan-out for scheduled coaching email campaigns (SRG-15/13/27).
+
+A run selects its eligible user ids with one set-based query (preferences plus the
+EmailSendLog / SpacedReminderLog cooldowns), splits them into chunks and sends each chunk
+from its own Celery subtask. A chunk re-applies the eligibility query to its ids, so a
+chunk that is retried, duplicated or run after a crash only reaches users that still have
+nothing logged. Chunk data is prefetched in bulk and mail goes through one pooled
+connection per chunk.
+
+Idempotency comes from the unique (user, email_type, week_key) EmailSendLog row claimed
+before every send, keyed by ISO week (the moment identity of a spaced reminder lives in
+SpacedReminderLog). The email itself goes out once that claim commits, and a failed send deletes it.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+    Window,
+)
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
+
+from .email_send_log import (
+    COACHING_EMAIL_TYPES,
+    COACHING_EMAIL_WINDOW_DAYS,
+    COMPLETION_NOTIFICATION_TYPES,
+    MAX_COACHING_EMAILS_PER_7_DAYS,
+    iso_week_key,
+)
+from .email_utils import pooled_email_connection
+from .fix_rate import build_fix_rate_payload
+from .models import BatchAnalysisReport, EmailSendLog, Game, UserNotification
+from .notification_preferences import (
+    WANTS_REACTIVATION_KEY,
+    WANTS_SPACED_REPETITION_KEY,
+    WANTS_WEEKLY_DIGEST_IN_APP_KEY,
+    WANTS_WEEKLY_DIGEST_KEY,
+    user_wants_analysis_completion_email,
+)
+from .stats_helpers import ANALYZED_GAME_Q, parse_last_dashboard_visit
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGN_WEEKLY_DIGEST = "weekly_digest"
+CAMPAIGN_SPACED_REPETITION = "spaced_repetition"
+CAMPAIGN_REACTIVATION = "reactivation"
+
+DEFAULT_CHUNK_SIZE = 200
+FINISHED_BATCH_STATUSES = ["completed", "partial"]
+
+
+def campaign_run_key(campaign: str, when=None) -> str:
+    """Run identifier: ISO week for the weekly digest, calendar day for the daily campaigns."""
+    moment = when or timezone.now()
+    if campaign == CAMPAIGN_WEEKLY_DIGEST:
+        return iso_week_key(moment)
+    return moment.date().isoformat()
+
+
+def chunk_size() -> int:
+    return max(1, int(getattr(settings, "EMAIL_CAMPAIGN_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)))
+
+
+def chunk_user_ids(user_ids: List[int], size: Optional[int] = None) -> List[List[int]]:
+    size = size or chunk_size()
+    return [user_ids[start : start + size] for start in range(0, len(user_ids), size)]
+
+
+# --- Set-based eligibility -------------------------------------------------
+
+
+def _logged(email_types: Iterable[str], **filters) -> Exists:
+    return Exists(EmailSendLog.objects.filter(user=OuterRef("pk"), email_type__in=list(email_types), **filters))
+
+
+def _campaign_users(user_ids: Optional[Iterable[int]]) -> QuerySet:
+    users = User.objects.filter(email__gt="", profile__isnull=False)
+    if user_ids is not None:
+        users = users.filter(pk__in=list(user_ids))
+    return users
+
+
+def _within_coaching_budget(users: QuerySet, now) -> QuerySet:
+    recent = (
+        EmailSendLog.objects.filter(
+            user=OuterRef("pk"),
+            email_type__in=list(COACHING_EMAIL_TYPES),
+            sent_at__gte=now - timedelta(days=COACHING_EMAIL_WINDOW_DAYS),
+        )
+        .order_by()
+        .values("user")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return users.annotate(
+        recent_coaching_emails=Coalesce(Subquery(recent, output_field=IntegerField()), Value(0))
+    ).filter(recent_coaching_emails__lt=MAX_COACHING_EMAILS_PER_7_DAYS)
+
+
+def _without_touchpoint_today(users: QuerySet, now) -> QuerySet:
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    completion_today = Exists(
+        UserNotification.objects.filter(
+            user=OuterRef("pk"),
+            notification_type__in=list(COMPLETION_NOTIFICATION_TYPES),
+            created_at__gte=start,
+        )
+    )
+    return users.exclude(_logged(COACHING_EMAIL_TYPES, sent_at__gte=start)).exclude(completion_today)
+
+
+def weekly_digest_user_ids(
+    run_key: Optional[str] = None,
+    *,
+    user_ids: Optional[Iterable[int]] = None,
+    now=None,
+) -> List[int]:
+    """Users opted into the digest (email or in-app) with no digest logged for ``run_key``."""
+    now = now or timezone.now()
+    run_key = run_key or iso_week_key(now)
+    users = _campaign_users(user_ids).filter(
+        Q(**{f"profile__preferences__{WANTS_WEEKLY_DIGEST_KEY}": True})
+        | Q(**{f"profile__preferences__{WANTS_WEEKLY_DIGEST_IN_APP_KEY}": True})
+    )
+    users = users.exclude(_logged([EmailSendLog.TYPE_WEEKLY_DIGEST], week_key=run_key))
+    users = _without_touchpoint_today(_within_coaching_budget(users, now), now)
+    return list(users.order_by("pk").values_list("pk", flat=True))
+
+
+def spaced_repetition_user_ids(
+    run_key: Optional[str] = None,
+    *,
+    user_ids: Optional[Iterable[int]] = None,
+    now=None,
+) -> List[int]:
+    """Opted-in users outside every spaced-reminder cooldown (see ``send_spaced_repetition_for_user``)."""
+    from .spaced_repetition_email import COMPLETION_COOLDOWN_HOURS
+
+    now = now or timezone.now()
+    users = _campaign_users(user_ids).filter(**{f"profile__preferences__{WANTS_SPACED_REPETITION_KEY}": True})
+    users = users.exclude(_logged([EmailSendLog.TYPE_WEEKLY_DIGEST], week_key=iso_week_key(now)))
+    users = users.exclude(_logged([EmailSendLog.TYPE_SPACED_MOMENT], sent_at__gte=now - timedelta(days=7)))
+    users = users.exclude(
+        _logged(
+            [EmailSendLog.TYPE_ANALYSIS_COMPLETION],
+            sent_at__gte=now - timedelta(hours=COMPLETION_COOLDOWN_HOURS),
+        )
+    )
+    users = users.filter(Q(last_login__isnull=True) | Q(last_login__lt=now - timedelta(hours=72)))
+    users = _without_touchpoint_today(_within_coaching_budget(users, now), now)
+    return list(users.order_by("pk").values_list("pk", flat=True))
+
+
+def reactivation_user_ids(
+    run_key: Optional[str] = None,
+    *,
+    user_ids: Optional[Iterable[int]] = None,
+    now=None,
+) -> List[int]:
+    """Opted-in users idle for ``INACTIVITY_DAYS`` with games or a linked platform account.
+
+    The dashboard-visit timestamp lives in profile preferences and is checked per chunk.
+    """
+    from .reactivation_email import INACTIVITY_DAYS, REACTIVATION_COOLDOWN_DAYS
+
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=INACTIVITY_DAYS)
+    users = _campaign_users(user_ids).filter(
+        is_active=True,
+        **{f"profile__preferences__{WANTS_REACTIVATION_KEY}": True},
+    )
+    users = users.exclude(
+        _logged([EmailSendLog.TYPE_REACTIVATION], sent_at__gte=now - timedelta(days=REACTIVATION_COOLDOWN_DAYS))
+    )
+    users = users.exclude(_logged([EmailSendLog.TYPE_WEEKLY_DIGEST], week_key=iso_week_key(now)))
+    users = users.exclude(_logged([EmailSendLog.TYPE_SPACED_MOMENT], sent_at__gte=now - timedelta(days=7)))
+    users = users.filter(
+        Q(last_login__isnull=True) | Q(last_login__lte=cutoff),
+        profile__updated_at__lte=cutoff,
+        profile__created_at__lte=cutoff,
+    ).exclude(Exists(BatchAnalysisReport.objects.filter(user=OuterRef("pk"), updated_at__gt=cutoff)))
+    users = users.filter(
+        Exists(Game.objects.filter(user=OuterRef("pk")))
+        | Q(profile__chess_com_username__gt="")
+        | Q(profile__lichess_username__gt="")
+    )
+    return list(users.order_by("pk").values_list("pk", flat=True))
+
+
+# --- Per-chunk prefetch and delivery ---------------------------------------
+
+
+def prefetch_weekly_digest_data(users: List[User], now=None) -> Dict[int, Dict[str, Any]]:
+    """Game counts, recent activity and fix-rate batches for a chunk in three queries."""
+    now = now or timezone.now()
+    since = now - timedelta(days=7)
+    ids = [user.pk for user in users]
+    data: Dict[int, Dict[str, Any]] = {
+        user_id: {
+            "total_games": 0,
+            "analyzed_games": 0,
+            "activity": {"new_batches": 0, "new_analyses": 0},
+            "fix_rate": {"show": False},
+        }
+        for user_id in ids
+    }
+
+    game_counts = (
+        Game.objects.filter(user_id__in=ids)
+        .order_by()
+        .values("user_id")
+        .annotate(
+            total=Count("pk"),
+            analyzed=Count("pk", filter=ANALYZED_GAME_Q),
+            new_analyses=Count("pk", filter=ANALYZED_GAME_Q & Q(updated_at__gte=since)),
+        )
+    )
+    for row in game_counts:
+        entry = data[row["user_id"]]
+        entry["total_games"] = row["total"]
+        entry["analyzed_games"] = row["analyzed"]
+        entry["activity"]["new_analyses"] = row["new_analyses"]
+
+    finished = BatchAnalysisReport.objects.filter(user_id__in=ids, status__in=FINISHED_BATCH_STATUSES)
+    new_batches = finished.filter(updated_at__gte=since).order_by().values("user_id").annotate(total=Count("pk"))
+    for row in new_batches:
+        data[row["user_id"]]["activity"]["new_batches"] = row["total"]
+
+    latest_two = (
+        finished.summary("batch_summary", "coaching_report", "per_game_results")
+        .annotate(recency=Window(RowNumber(), partition_by=[F("user_id")], order_by=F("pk").desc()))
+        .filter(recency__lte=2)
+    )
+    batches_by_user: Dict[int, List[BatchAnalysisReport]] = {}
+    for batch in latest_two:
+        batches_by_user.setdefault(batch.user_id, []).append(batch)
+    for user_id, batches in batches_by_user.items():
+        if len(batches) == 2:
+            batches.sort(key=lambda batch: batch.pk, reverse=True)
+            data[user_id]["fix_rate"] = build_fix_rate_payload(batches[0], batches[1])
+    return data
+
+
+def _deliver_weekly_digest(user: User, run_key: str, prefetched: Dict[str, Any], connection) -> bool:
+    from .weekly_digest_email import build_weekly_digest_payload, deliver_weekly_digest
+
+    prefs = user.profile.preferences if isinstance(user.profile.preferences, dict) else {}
+    wants_email = prefs.get(WANTS_WEEKLY_DIGEST_KEY) is True and user_wants_analysis_completion_email(user)
+    wants_notification = prefs.get(WANTS_WEEKLY_DIGEST_IN_APP_KEY) is True or prefs.get(WANTS_WEEKLY_DIGEST_KEY) is True
+    if not wants_email and not wants_notification:
+        return False
+
+    payload = build_weekly_digest_payload(user, user.profile, prefetched=prefetched)
+    if not payload.get("has_content"):
+        return False
+    return deliver_weekly_digest(
+        user,
+        payload,
+        week_key=run_key,
+        wants_email=wants_email,
+        wants_notification=wants_notification,
+        connection=connection,
+    )
+
+
+def prefetch_spaced_repetition_data(users: List[User], now=None) -> Dict[int, Dict[str, Any]]:
+    """Best unsent ReviewableMoment for every user in the chunk, in one query."""
+    from .spaced_repetition_email import best_unsent_moments, spaced_moment_payload
+
+    best = best_unsent_moments([user.pk for user in users], now=now)
+    return {
+        user.pk: {"match": (best[user.pk].game, spaced_moment_payload(best[user.pk])) if user.pk in best else None}
+        for user in users
+    }
+
+
+def _deliver_spaced_reminder(user: User, run_key: str, prefetched: Dict[str, Any], connection) -> bool:
+    from .spaced_repetition_email import (
+        deliver_spaced_reminder,
+        find_best_spaced_moment,
+    )
+
+    if not user_wants_analysis_completion_email(user):
+        return False
+    match = prefetched["match"] if "match" in prefetched else find_best_spaced_moment(user)
+    if not match:
+        return False
+    game, moment = match
+    return deliver_spaced_reminder(user, game, moment, connection=connection)
+
+
+def _no_prefetch(users: List[User], now=None) -> Dict[int, Dict[str, Any]]:
+    return {}
+
+
+def _deliver_reactivation(user: User, run_key: str, prefetched: Dict[str, Any], connection) -> bool:
+    from .reactivation_email import INACTIVITY_DAYS, deliver_reactivation_email
+
+    if not user_wants_analysis_completion_email(user):
+        return False
+    last_dashboard_visit = parse_last_dashboard_visit(user.profile.preferences)
+    if last_dashboard_visit and last_dashboard_visit > timezone.now() - timedelta(days=INACTIVITY_DAYS):
+        return False
+    return deliver_reactivation_email(user, connection=connection)
+
+
+# campaign -> (eligible ids, chunk prefetch, per-user delivery)
+CAMPAIGNS: Dict[str, tuple[Callable[..., List[int]], Callable[..., Dict[int, Dict[str, Any]]], Callable[..., bool]]] = {
+    CAMPAIGN_WEEKLY_DIGEST: (weekly_digest_user_ids, prefetch_weekly_digest_data, _deliver_weekly_digest),
+    CAMPAIGN_SPACED_REPETITION: (
+        spaced_repetition_user_ids,
+        prefetch_spaced_repetition_data,
+        _deliver_spaced_reminder,
+    ),
+    CAMPAIGN_REACTIVATION: (reactivation_user_ids, _no_prefetch, _deliver_reactivation),
+}
+
+
+def _campaign(campaign: str):
+    try:
+        return CAMPAIGNS[campaign]
+    except KeyError:
+        raise ValueError(f"Unknown email campaign: {campaign}") from None
+
+
+def eligible_user_ids(campaign: str, run_key: Optional[str] = None, *, user_ids=None) -> List[int]:
+    select_ids, _, _ = _campaign(campaign)
+    return select_ids(run_key or campaign_run_key(campaign), user_ids=user_ids)
+
+
+def send_campaign_chunk(campaign: str, run_key: str, user_ids: Iterable[int]) -> int:
+    """Send one chunk of a campaign run; safe to retry. Returns the number of users reached."""
+    select_ids, prefetch, deliver = _campaign(campaign)
+    eligible = select_ids(run_key, user_ids=user_ids)
+    if not eligible:
+        return 0
+
+    users = list(User.objects.filter(pk__in=eligible).select_related("profile").order_by("pk"))
+    prefetched = prefetch(users)
+    sent = 0
+    with pooled_email_connection() as connection:
+        for user in users:
+            try:
+                if deliver(user, run_key, prefetched.get(user.pk, {}), connection):
+                    sent += 1
+            except Exception as exc:
+                logger.exception("Email campaign %s failed for user %s: %s", campaign, user.pk, exc)
+    logger.info("Email campaign %s (%s): chunk of %s sent %s", campaign, run_key, len(users), sent)
+    return sent
+
+
+def run_campaign_inline(campaign: str, run_key: Optional[str] = None) -> int:
+    """Run every chunk of a campaign in this process (management commands, tests, eager mode)."""
+    run_key = run_key or campaign_run_key(campaign)
+    return sum(
+        send_campaign_chunk(campaign, run_key, chunk) for chunk in chunk_user_ids(eligible_user_ids(campaign, run_key))
+    )
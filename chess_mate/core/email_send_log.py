@@ -3,10 +3,10 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 from .models import EmailSendLog, UserNotification
@@ -107,3 +107,43 @@ def log_email_send(
         week_key=week_key or "",
         meta=meta or {},
     )
+
+
+def claim_email_send(
+    user: User,
+    email_type: str,
+    *,
+    week_key: str,
+    meta: Optional[dict] = None,
+) -> Optional[EmailSendLog]:
+    """Insert the (user, email_type, week_key) log row before sending.
+
+    Returns None when another run already claimed it. Hand the send itself to
+    ``send_after_claim`` so no SMTP round trip runs inside the claiming transaction.
+    """
+    try:
+        with transaction.atomic():
+            return EmailSendLog.objects.create(
+                user=user,
+                email_type=email_type,
+                week_key=week_key or "",
+                meta=meta or {},
+            )
+    except IntegrityError:
+        return None
+
+
+def send_after_claim(claim: EmailSendLog, send: Callable[[], Any]) -> None:
+    """Run ``send`` once the transaction holding ``claim`` commits.
+
+    A failed send deletes the claim, so a resumed run can retry the user, and re-raises.
+    """
+
+    def _send() -> None:
+        try:
+            send()
+        except Exception:
+            EmailSendLog.objects.filter(pk=claim.pk).delete()
+            raise
+
+    transaction.on_commit(_send)
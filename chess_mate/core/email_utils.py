@@ -1,9 +1,13 @@
 """Helpers for outbound email configuration checks."""
 
+import logging
 import os
+from contextlib import contextmanager
 
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 
 def is_email_configured() -> bool:
     """Return True when Django can send mail (SMTP creds or console backend in dev)."""
@@ -121,8 +125,12 @@ def send_coaching_email(
     recipient_list: list[str],
     html_message: str | None = None,
     preferences_url: str | None = None,
+    connection=None,
 ) -> int:
-    """Send coaching email with optional HTML body and unsubscribe headers."""
+    """Send coaching email with optional HTML body and unsubscribe headers.
+
+    Pass ``connection`` (see ``pooled_email_connection``) to reuse one SMTP session across sends.
+    """
     from django.core.mail import EmailMultiAlternatives
 
     headers = coaching_email_headers(preferences_url)
@@ -132,7 +140,32 @@ def send_coaching_email(
         from_email=None,
         to=recipient_list,
         headers=headers,
+        connection=connection,
     )
     if html_message:
         email.attach_alternative(html_message, "text/html")
     return email.send()
+
+
+@contextmanager
+def pooled_email_connection():
+    """One open mail backend connection for a run of sends; closed on exit.
+
+    Backends keep a connection open across ``send_messages`` calls when the caller opened it,
+    so campaign chunks pay the SMTP handshake once instead of once per recipient.
+    """
+    from django.core.mail import get_connection
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        # Each send retries the open; a transient failure here should not drop the chunk.
+        logger.warning("Could not open pooled email connection: %s", exc)
+    try:
+        yield connection
+    finally:
+        try:
+            connection.close()
+        except Exception as exc:
+            logger.warning("Could not close pooled email connection: %s", exc)
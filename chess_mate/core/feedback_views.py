@@ -11,6 +11,7 @@ from typing import Any, Dict
 # Django imports
 from django.conf import settings
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from rest_framework import status
 
@@ -22,6 +23,7 @@ from rest_framework.response import Response
 from .ai_feedback import AIFeedbackGenerator
 
 # Local application imports
+from .credit_ledger import credit_balance
 from .models import AiFeedback, Game, Profile
 
 # Configure logging
@@ -94,7 +96,7 @@ def generate_ai_feedback(request, game_id):
             )
 
         credits_cost = 25
-        if profile.credits < credits_cost:
+        if credit_balance(profile.user_id) < credits_cost:
             return Response(
                 {"message": "Insufficient credits"},
                 status=status.HTTP_402_PAYMENT_REQUIRED,
@@ -142,7 +144,7 @@ def generate_ai_feedback(request, game_id):
                 game.analysis = {}
             game.analysis["feedback"] = feedback_payload
             game.save(update_fields=["analysis"])
-            profile.credits -= credits_used
+            profile.credits = F("credits") - credits_used
             profile.save(update_fields=["credits"])
 
         return Response(
@@ -206,12 +208,12 @@ def generate_game_feedback_view(request, game_id):
 
         # Check credits
         feedback_cost = 2  # AI feedback costs 2 credits
-        if profile.credits < feedback_cost:
+        if credit_balance(profile.user_id) < feedback_cost:
             return Response(
                 {
                     "error": f"Insufficient credits. Generating AI feedback requires {feedback_cost} credits.",
                     "required_credits": feedback_cost,
-                    "available_credits": profile.credits,
+                    "available_credits": credit_balance(profile.user_id),
                 },
                 status=status.HTTP_402_PAYMENT_REQUIRED,
             )
@@ -251,7 +253,7 @@ def generate_game_feedback_view(request, game_id):
             {
                 "message": "AI feedback generated successfully",
                 "feedback": game.analysis["feedback"],
-                "remaining_credits": profile.credits,
+                "remaining_credits": credit_balance(profile.user_id),
             },
             status=status.HTTP_200_OK,
         )
@@ -402,12 +404,12 @@ def generate_comparative_feedback(request):
 
         # Check credits
         feedback_cost = 3  # Comparative feedback costs 3 credits
-        if profile.credits < feedback_cost:
+        if credit_balance(profile.user_id) < feedback_cost:
             return Response(
                 {
                     "error": f"Insufficient credits. Generating comparative feedback requires {feedback_cost} credits.",
                     "required_credits": feedback_cost,
-                    "available_credits": profile.credits,
+                    "available_credits": credit_balance(profile.user_id),
                 },
                 status=status.HTTP_402_PAYMENT_REQUIRED,
             )
@@ -465,7 +467,7 @@ def generate_comparative_feedback(request):
             {
                 "message": "Comparative AI feedback generated successfully",
                 "feedback": first_game.analysis["comparative_feedback"][comparison_key],
-                "remaining_credits": profile.credits,
+                "remaining_credits": credit_balance(profile.user_id),
             },
             status=status.HTTP_200_OK,
         )
@@ -500,12 +502,12 @@ def get_improvement_suggestions(request):
 
         # Check credits
         suggestion_cost = 5  # Improvement suggestions cost 5 credits
-        if profile.credits < suggestion_cost:
+        if credit_balance(profile.user_id) < suggestion_cost:
             return Response(
                 {
                     "error": f"Insufficient credits. Getting improvement suggestions requires {suggestion_cost} credits.",
                     "required_credits": suggestion_cost,
-                    "available_credits": profile.credits,
+                    "available_credits": credit_balance(profile.user_id),
                 },
                 status=status.HTTP_402_PAYMENT_REQUIRED,
             )
@@ -560,7 +562,7 @@ def get_improvement_suggestions(request):
             {
                 "message": "Improvement suggestions generated successfully",
                 "suggestions": profile.improvement_suggestions[suggestion_id],
-                "remaining_credits": profile.credits,
+                "remaining_credits": credit_balance(profile.user_id),
             },
             status=status.HTTP_200_OK,
         )
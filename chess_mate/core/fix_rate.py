@@ -228,12 +228,12 @@ def build_fix_rate_payload(
 
 def build_dashboard_fix_rate(user) -> Dict[str, Any]:
     batches = list(
-        BatchAnalysisReport.objects.filter(
+        BatchAnalysisReport.objects.summary("batch_summary", "coaching_report", "per_game_results")
+        .filter(
             user=user,
             status__in=["completed", "partial"],
-        ).order_by(
-            "-pk"
-        )[:2]
+        )
+        .order_by("-pk")[:2]
     )
     if len(batches) < 2:
         return {"show": False}
@@ -27,6 +27,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 from .analysis.feedback_generator import FeedbackGenerator
 from .analysis.metrics_calculator import MetricsCalculator, MetricsError
+from .analysis.position_evaluator import PositionEvaluator
 from .analysis.single_game_coach_generator import generate_single_game_coaching
 from .analysis.single_game_moments import extract_critical_moments
 from .analysis.stockfish_analyzer import StockfishAnalyzer
@@ -843,6 +844,7 @@ class GameAnalyzer:
         try:
             results = []
             board = chess.Board()
+            boards_after = []
 
             total_moves = len(moves)
             progress_base = 30  # Starting progress percentage
@@ -862,13 +864,14 @@ class GameAnalyzer:
                 move = chess.Move.from_uci(move_uci)
 
                 # Analyze position before move
-                position_before = self.engine.analyze_position(board, depth)
+                position_before = self.engine.analyze_position(board, depth, features=False)
 
                 # Apply move
                 board.push(move)
+                boards_after.append(board.copy(stack=False))
 
                 # Analyze position after move
-                position_after = self.engine.analyze_position(board, depth)
+                position_after = self.engine.analyze_position(board, depth, features=False)
 
                 # Calculate evaluation change
                 eval_before = position_before.get("score", 0)
@@ -887,11 +890,14 @@ class GameAnalyzer:
                     "eval_after": eval_after,
                     "eval_change": eval_change,
                     "classification": classification,
-                    "position_metrics": position_after.get("position_metrics", {}),
                 }
 
                 results.append(result)
 
+            # Static metrics for every resulting position in one pass, outside the engine loop
+            for result, metrics in zip(results, PositionEvaluator().evaluate_game(boards_after)):
+                result["position_metrics"] = metrics
+
             return results
 
         except Exception as e:
@@ -0,0 +1,144 @@
+"""
+Keyset (cursor) pagination and filters for game lists.
+
+Pages are ordered by ``(-date_played, -id)`` and continue from the last row seen rather
+than an OFFSET, so page 500 costs the same as page 1 and no COUNT(*) is issued. ``Game`` has a
+``(user, -date_played, -id)`` index plus ``(user, <filter>, -date_played, -id)`` for the
+platform, result, time control and analysis status filters; ECO/opening filters are
+rare enough to ride the per-user index.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .error_handling import ValidationError
+
+GAME_ORDERING = ("-date_played", "-id")
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Columns returned by the plain ``/games/`` list endpoint.
+USER_GAME_LIST_FIELDS = ("id", "platform", "white", "black", "result", "analysis_status")
+
+# query param -> Game field (exact match)
+GAME_FILTERS = {
+    "platform": "platform",
+    "result": "result",
+    "time_control": "time_control_type",
+    "analysis_status": "analysis_status",
+    "eco": "eco_code",
+    "opening": "opening_name",
+}
+
+
+def apply_game_filters(queryset: QuerySet, params) -> QuerySet:
+    """Apply the supported list filters present in ``params`` (a QueryDict or dict)."""
+    for param, field in GAME_FILTERS.items():
+        value = params.get(param)
+        if value not in (None, ""):
+            queryset = queryset.filter(**{field: value})
+    return queryset
+
+
+def encode_game_cursor(row: Any) -> str:
+    """Opaque cursor for the row a page ended on (model instance or ``.values()`` dict)."""
+    if isinstance(row, dict):
+        date_played, row_id = row["date_played"], row["id"]
+    else:
+        date_played, row_id = row.date_played, row.id
+    raw = json.dumps({"d": date_played.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_game_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        date_played = parse_datetime(payload["d"])
+        row_id = int(payload["i"])
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise ValidationError([{"field": "cursor", "message": "Invalid cursor"}]) from None
+    if date_played is None:
+        raise ValidationError([{"field": "cursor", "message": "Invalid cursor"}])
+    return date_played, row_id
+
+
+def parse_page_size(value: Any, default: int = DEFAULT_PAGE_SIZE) -> int:
+    if value in (None, ""):
+        return default
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError([{"field": "limit", "message": "Page size must be an integer"}]) from None
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_page(queryset: QuerySet, *, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """One page after ``cursor`` plus the cursor for the next page (None on the last page)."""
+    queryset = queryset.order_by(*GAME_ORDERING)
+    if cursor:
+        date_played, row_id = decode_game_cursor(cursor)
+        queryset = queryset.filter(Q(date_played__lt=date_played) | Q(date_played=date_played, id__lt=row_id))
+    rows = list(queryset[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_game_cursor(rows[-1])
+
+
+class GameKeysetPagination(BasePagination):
+    """``?cursor=&page_size=`` keyset pages; ``?page=`` keeps the legacy numbered pages."""
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.legacy = None
+        if "page" in request.query_params:
+            self.legacy = PageNumberPagination()
+            return self.legacy.paginate_queryset(queryset, request, view)
+
+        size = parse_page_size(request.query_params.get(self.page_size_query_param))
+        rows, self.next_cursor = keyset_page(
+            queryset,
+            cursor=request.query_params.get(self.cursor_query_param),
+            limit=size,
+        )
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "next_cursor": self.next_cursor,
+                "results": data,
+            }
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.next_cursor:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "next_cursor": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
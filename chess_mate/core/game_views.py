@@ -22,7 +22,7 @@ from celery.result import AsyncResult  # type: ignore
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.db import DatabaseError, OperationalError, transaction
-from django.db.models import Q
+from django.db.models import F, Q
 from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
@@ -53,6 +53,7 @@ from .cache_invalidation import invalidate_cache, invalidates_cache
 from .chess_services import ChessComService, LichessService, save_game
 from .chess_utils import extract_metadata_from_pgn, validate_pgn
 from .constants import MAX_BATCH_SIZE
+from .credit_ledger import credit_balance
 from .decorators import (
     api_login_required,
     auth_csrf_exempt,
@@ -66,6 +67,14 @@ from .error_handling import (
     create_error_response,
     handle_api_error,
 )
+from .game_listing import (
+    GAME_ORDERING,
+    USER_GAME_LIST_FIELDS,
+    GameKeysetPagination,
+    apply_game_filters,
+    keyset_page,
+    parse_page_size,
+)
 from .inbox_streak import get_inbox_streak_payload
 
 # Local application imports
@@ -80,6 +89,7 @@ from .single_game_analysis_cache import (
 from .single_game_credits import (
     charge_single_game_credit,
     resolve_single_game_credit_waiver,
+    single_game_credits_amount,
 )
 from .single_game_moment_share import (
     build_moment_share_url,
@@ -782,9 +792,16 @@ class GameViewSet(viewsets.ModelViewSet):
 
     serializer_class = GameSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = GameKeysetPagination
 
     def get_queryset(self):
         """Get games for the current user with optimized query."""
+        # List rows are keyset-paginated plain dicts of the serialized columns, filtered
+        # server-side (see game_listing for the covering indexes).
+        if self.action == "list":
+            queryset = apply_game_filters(Game.objects.filter(user=self.request.user), self.request.query_params)
+            return queryset.order_by(*GAME_ORDERING).values(*GameSerializer.Meta.fields)
+
         # Use select_related to fetch related user in a single query
         # This avoids n+1 query issue when serializing
         queryset = Game.objects.select_related("user").filter(user=self.request.user)
@@ -820,16 +837,18 @@ class GameViewSet(viewsets.ModelViewSet):
                 batch_id=data.get("batch_id") or data.get("batch"),
                 force_reanalyze=force_reanalyze,
             )
-            if not request.user.is_staff and not credit_waiver and (profile is None or profile.credits < 1):
-                return Response(
-                    {
-                        "status": "error",
-                        "error": "Insufficient credits",
-                        "credits_required": 1,
-                        "credits_available": 0 if profile is None else profile.credits,
-                    },
-                    status=status.HTTP_402_PAYMENT_REQUIRED,
-                )
+            if not request.user.is_staff and not credit_waiver:
+                credits_available = 0 if profile is None else credit_balance(profile.user_id)
+                if credits_available < single_game_credits_amount():
+                    return Response(
+                        {
+                            "status": "error",
+                            "error": "Insufficient credits",
+                            "credits_required": single_game_credits_amount(),
+                            "credits_available": credits_available,
+                        },
+                        status=status.HTTP_402_PAYMENT_REQUIRED,
+                    )
 
             analysis_allowed, analysis_info = check_single_analysis_allowed(request.user)
             if not analysis_allowed:
@@ -873,6 +892,7 @@ class GameViewSet(viewsets.ModelViewSet):
                     game.id,
                     profile,
                     waiver=credit_waiver,
+                    attempt=enqueue_result.get("task_id"),
                 )
             except Profile.DoesNotExist:
                 credits_charged = 0
@@ -1131,20 +1151,19 @@ def get_user_games(request):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        games: List[Any] = list(Game.objects.filter(user_id=user_id).order_by("-date_played"))
-        game_list = [
-            {
-                "id": game.id,
-                "platform": game.platform,
-                "white": game.white,
-                "black": game.black,
-                "result": game.result,
-                "analysis_status": game.analysis_status,
-            }
-            for game in games
-        ]
+        games = apply_game_filters(Game.objects.filter(user_id=user_id), request.GET).values(*USER_GAME_LIST_FIELDS)
 
-        return Response(game_list, status=status.HTTP_200_OK)
+        # ``cursor`` / ``limit`` opt into keyset pages; without them the full list is returned as before.
+        if "cursor" in request.GET or "limit" in request.GET:
+            rows, next_cursor = keyset_page(
+                games.values(*USER_GAME_LIST_FIELDS, "date_played"),
+                cursor=request.GET.get("cursor"),
+                limit=parse_page_size(request.GET.get("limit")),
+            )
+            results = [{field: row[field] for field in USER_GAME_LIST_FIELDS} for row in rows]
+            return Response({"results": results, "next_cursor": next_cursor}, status=status.HTTP_200_OK)
+
+        return Response(list(games.order_by(*GAME_ORDERING)), status=status.HTTP_200_OK)
 
     except (
         Exception
@@ -1442,16 +1461,18 @@ def analyze_game(request, game_id=None):
         free_from_batch = credit_waiver == "batch"
         free_first_game = credit_waiver == "first_free"
 
-        if not request.user.is_staff and not credit_waiver and (profile is None or profile.credits < 1):
-            return Response(
-                {
-                    "status": "error",
-                    "error": "Insufficient credits",
-                    "credits_required": 1,
-                    "credits_available": 0 if profile is None else profile.credits,
-                },
-                status=status.HTTP_402_PAYMENT_REQUIRED,
-            )
+        if not request.user.is_staff and not credit_waiver:
+            credits_available = 0 if profile is None else credit_balance(profile.user_id)
+            if credits_available < single_game_credits_amount():
+                return Response(
+                    {
+                        "status": "error",
+                        "error": "Insufficient credits",
+                        "credits_required": single_game_credits_amount(),
+                        "credits_available": credits_available,
+                    },
+                    status=status.HTTP_402_PAYMENT_REQUIRED,
+                )
 
         analysis_allowed, analysis_info = check_single_analysis_allowed(request.user)
         if not analysis_allowed:
@@ -1507,6 +1528,7 @@ def analyze_game(request, game_id=None):
                 game.id,
                 profile,
                 waiver=credit_waiver,
+                attempt=enqueue_result.get("task_id"),
             )
         except Profile.DoesNotExist:
             credits_charged = 0
@@ -1622,13 +1644,14 @@ def import_external_games(request):
         # Check if user has enough credits
         try:
             profile = Profile.objects.get(user_id=user_id)
-            if profile.credits < num_games and not request.user.is_staff:
+            credits_available = credit_balance(user_id)
+            if credits_available < num_games and not request.user.is_staff:
                 return JsonResponse(
                     {
                         "status": "error",
                         "message": "Insufficient credits",
                         "credits_required": num_games,
-                        "credits_available": profile.credits,
+                        "credits_available": credits_available,
                     },
                     status=402,
                 )
@@ -1697,7 +1720,7 @@ def import_external_games(request):
 
         # Deduct credits if not staff
         if not request.user.is_staff:
-            profile.credits = max(0, profile.credits - imported_count)
+            profile.credits = F("credits") - min(imported_count, max(0, credit_balance(user_id)))
             profile.save(update_fields=["credits"])
 
         # Invalidate cache (pattern + Redis user games list)
@@ -2229,7 +2252,7 @@ def batch_analyze_games(request):
         # Deduct one credit per game for legacy behavior
         try:
             profile = Profile.objects.get(user=request.user)
-            profile.credits = max(0, profile.credits - len(game_ids))
+            profile.credits = F("credits") - min(len(game_ids), max(0, credit_balance(request.user.id)))
             profile.save(update_fields=["credits"])
         except Profile.DoesNotExist:
             pass
@@ -15,7 +15,7 @@ from django.contrib.auth.models import User
 from django.db import transaction
 from django.utils import timezone
 
-from .abuse_limits import check_signup_allowed, record_signup_attempt
+from .abuse_limits import check_signup_allowed
 from .email_utils import get_frontend_base_url
 from .models import Profile, profile_creation_defaults
 
@@ -197,7 +197,7 @@ def _mark_email_verified(profile: Profile) -> None:
 
 
 def issue_auth_tokens(user: User, remember_me: bool = True) -> Tuple[str, str]:
-    from rest_framework_simplejwt.tokens import RefreshToken
+    from .token_blacklist import RefreshToken
 
     refresh = RefreshToken.for_user(user)
     refresh_lifetime = (
@@ -280,8 +280,6 @@ def upsert_user_from_google(
         signup_ip=request.META.get("REMOTE_ADDR"),
     )
 
-    record_signup_attempt(request)
-
     from .welcome_email import send_welcome_email_once
 
     send_welcome_email_once(user, profile, request)
@@ -35,6 +35,7 @@ from django.utils import timezone
 
 # Import Redis connection function
 from .cache import get_redis_connection
+from .redis_manager import redis_manager
 
 if not hasattr(_builtins, "socket"):
     _builtins.socket = socket
@@ -170,9 +171,6 @@ def check_redis() -> Dict[str, Any]:
     Returns:
         Dict with status information
     """
-    # Import here to avoid circular imports
-    from .cache import is_redis_available
-
     start_time = time.time()
     status = STATUS_UNKNOWN
     message = ""
@@ -180,9 +178,9 @@ def check_redis() -> Dict[str, Any]:
     details = {}
 
     try:
-        # First check if Redis is available using our utility function
-        if is_redis_available():
-            redis_client = get_redis_connection()
+        # Always PING here: the shared client's own liveness checks are lazy (see core.redis_manager)
+        redis_client = get_redis_connection()
+        if redis_client is not None and redis_client.ping():
             status = STATUS_OK
             message = "Redis is operational"
 
@@ -205,6 +203,7 @@ def check_redis() -> Dict[str, Any]:
                             if name.startswith("db") and isinstance(db, dict)
                         ),
                     }
+                    details["pool"] = redis_manager.stats()
             except Exception as e:
                 # We can still be operational even if we can't get detailed info
                 logger.warning(f"Error getting Redis info: {str(e)}")
@@ -242,7 +241,10 @@ def check_redis() -> Dict[str, Any]:
 
 def check_celery() -> Dict[str, Any]:
     """
-    Check if Celery is operational by sending a simple task.
+    Check if Celery is operational by sending a task that reports the worker's warm-up state.
+
+    A worker that answers before its post-fork warm-up ran (Stockfish spawn, module preload)
+    is reported as a warning while warm-up is enabled.
 
     Returns:
         Dict with status information
@@ -250,21 +252,28 @@ def check_celery() -> Dict[str, Any]:
     start_time = time.time()
     status = STATUS_UNKNOWN
     message = ""
+    worker: Optional[Dict[str, Any]] = None
 
     try:
         # Import here to avoid circular imports
-        from .tasks import health_check_task
+        from .tasks import worker_readiness_task
+        from .worker_warmup import warmup_enabled
 
         # Submit a simple task
-        task = health_check_task.delay()
+        task = worker_readiness_task.delay()
         result = task.get(timeout=5)  # Wait up to 5 seconds for result
 
-        if result == "ok":
-            status = STATUS_OK
-            message = "Celery is operational"
-        else:
+        if not isinstance(result, dict):
             status = STATUS_WARNING
             message = f"Celery returned unexpected result: {result}"
+        else:
+            worker = {key: result.get(key) for key in ("ready", "pid", "engine_ready", "warmup_ms")}
+            if result.get("ready") or not warmup_enabled():
+                status = STATUS_OK
+                message = "Celery is operational"
+            else:
+                status = STATUS_WARNING
+                message = "Celery worker has not finished warm-up"
 
     except ImportError:
         status = STATUS_UNKNOWN
@@ -280,6 +289,7 @@ def check_celery() -> Dict[str, Any]:
         "component": CELERY_CHECK,
         "status": status,
         "message": message,
+        "worker": worker,
         "response_time": round(response_time, 3),
         "timestamp": timezone.now().isoformat(),
     }
@@ -652,6 +662,7 @@ def system_status_view(request):
 
     # Get health status for all components
     health_result = run_all_checks()
+    redis_info = get_redis_connection().info()
 
     # Build response with additional system information
     response_data = {
@@ -670,9 +681,10 @@ def system_status_view(request):
             "default": {
                 "type": "redis",
                 "location": getattr(settings, "REDIS_URL", "redis://localhost:6379/0"),
-                "version": get_redis_connection().info().get("redis_version", "unknown"),
-                "clients": get_redis_connection().info().get("connected_clients", 0),
-                "memory": f"{get_redis_connection().info().get('used_memory_human', '0')}",
+                "version": redis_info.get("redis_version", "unknown"),
+                "clients": redis_info.get("connected_clients", 0),
+                "memory": f"{redis_info.get('used_memory_human', '0')}",
+                "pool": redis_manager.stats(),
             }
         },
         "system": get_system_info(),
@@ -0,0 +1,314 @@
+"""
+Content-addressed cache for LLM calls (coaching reports and feedback).
+
+An LLM response is treated as a pure function of the model, the system prompt, the user
+payload, the coach persona, the response schema version and the sampling parameters.
+Hashing those inputs gives a stable key; a response is looked up in two tiers:
+
+* hot tier   - Django's default cache (Redis in production), short TTL;
+* durable tier - the ``LLMResponse`` table, so repeat reports survive cache flushes/deploys.
+  Rows older than ``LLM_CACHE_DURABLE_TTL_DAYS`` are ignored and pruned by a beat task.
+
+Concurrent identical misses are single-flighted: the first caller takes a short cache
+lock and calls the model, the others wait for its result instead of paying for the same
+completion. Only successful results are stored; exceptions propagate to the caller.
+
+Any client exposing ``client.chat.completions.create(...)`` works with
+``completion_content`` (the OpenAI SDK or a local stub in tests).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import LLMResponse
+
+logger = logging.getLogger("chessmate.llm_cache")
+
+# Bump to invalidate every stored response (e.g. after a change in how responses are post-processed).
+LLM_CACHE_VERSION = "1"
+
+PURPOSE_BATCH_COACHING = "batch_coaching"
+PURPOSE_GAME_FEEDBACK = "game_feedback"
+PURPOSE_ANALYSIS_FEEDBACK = "analysis_feedback"
+PURPOSE_BATCH_FEEDBACK = "batch_feedback"
+PURPOSES = (PURPOSE_BATCH_COACHING, PURPOSE_GAME_FEEDBACK, PURPOSE_ANALYSIS_FEEDBACK, PURPOSE_BATCH_FEEDBACK)
+
+OUTCOME_HOT_HIT = "hot_hit"
+OUTCOME_DURABLE_HIT = "durable_hit"
+OUTCOME_SHARED = "shared"
+OUTCOME_MISS = "miss"
+OUTCOMES = (OUTCOME_HOT_HIT, OUTCOME_DURABLE_HIT, OUTCOME_SHARED, OUTCOME_MISS)
+
+_HOT_PREFIX = "llm_cache:"
+_LOCK_PREFIX = "llm_cache_lock:"
+_STATS_PREFIX = "llm_cache_stats:"
+_POLL_SECONDS = 0.1
+
+
+def schema_version(schema: Any) -> str:
+    """Short fingerprint of a response schema, so schema edits change the cache key."""
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMRequest:
+    """One chat completion request, identified by a content hash of its inputs."""
+
+    def __init__(
+        self,
+        purpose: str,
+        model: str,
+        system_prompt: str,
+        user_payload: str,
+        *,
+        persona: str = "",
+        schema_version: str = "",
+        params: Optional[Dict[str, Any]] = None,
+    ):
+        self.purpose = purpose
+        self.model = model
+        self.system_prompt = system_prompt or ""
+        self.user_payload = user_payload or ""
+        self.persona = persona or ""
+        self.schema_version = schema_version or ""
+        self.params = dict(params or {})
+
+    @property
+    def key(self) -> str:
+        """SHA-256 over every input that changes the completion."""
+        material = "\x1f".join(
+            [
+                LLM_CACHE_VERSION,
+                self.purpose,
+                self.model,
+                self.persona,
+                self.schema_version,
+                json.dumps(self.params, sort_keys=True, default=str),
+                self.system_prompt,
+                self.user_payload,
+            ]
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def messages(self) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": self.user_payload},
+        ]
+
+
+def completion_content(client: Any, request: LLMRequest) -> str:
+    """Run ``request`` through the bounded LLM client (``core.llm_client``) and return the message text."""
+    from .llm_client import create_completion
+
+    response = create_completion(client, model=request.model, messages=request.messages(), **request.params)
+    choices = getattr(response, "choices", None) or []
+    if not choices:
+        return ""
+    return (choices[0].message.content or "").strip()
+
+
+def _enabled() -> bool:
+    return bool(getattr(settings, "LLM_CACHE_ENABLED", True))
+
+
+def _hot_ttl() -> int:
+    return int(getattr(settings, "LLM_CACHE_HOT_TTL", 86400))
+
+
+def _lock_seconds() -> int:
+    return int(getattr(settings, "LLM_CACHE_LOCK_SECONDS", 120))
+
+
+def _wait_seconds() -> float:
+    return float(getattr(settings, "LLM_CACHE_WAIT_SECONDS", 90))
+
+
+def _durable_ttl_days() -> int:
+    return int(getattr(settings, "LLM_CACHE_DURABLE_TTL_DAYS", 90))
+
+
+def _durable_cutoff():
+    return timezone.now() - timedelta(days=_durable_ttl_days())
+
+
+def _hot_get(key: str) -> Any:
+    try:
+        return cache.get(_HOT_PREFIX + key)
+    except Exception as exc:
+        logger.warning("LLM cache hot read failed for %s: %s", key[:12], exc)
+        return None
+
+
+def _hot_set(key: str, value: Any) -> None:
+    try:
+        cache.set(_HOT_PREFIX + key, value, timeout=_hot_ttl())
+    except Exception as exc:
+        logger.warning("LLM cache hot write failed for %s: %s", key[:12], exc)
+
+
+def _durable_get(key: str) -> Any:
+    try:
+        row = (
+            LLMResponse.objects.filter(response_key=key, created_at__gte=_durable_cutoff())
+            .values_list("pk", "response")
+            .first()
+        )
+        if row is None:
+            return None
+        LLMResponse.objects.filter(pk=row[0]).update(hit_count=F("hit_count") + 1)
+        return row[1]
+    except Exception as exc:
+        logger.warning("LLM cache durable read failed for %s: %s", key[:12], exc)
+        return None
+
+
+def _durable_set(request: LLMRequest, key: str, value: Any) -> None:
+    # Replaces an expired or refreshed row; created_at restarts the TTL.
+    try:
+        with transaction.atomic():
+            LLMResponse.objects.update_or_create(
+                response_key=key,
+                defaults={
+                    "purpose": request.purpose,
+                    "model": request.model[:100],
+                    "response": value,
+                    "hit_count": 0,
+                    "created_at": timezone.now(),
+                },
+            )
+    except Exception as exc:
+        logger.warning("LLM cache durable write failed for %s: %s", key[:12], exc)
+
+
+def _record(request: LLMRequest, key: str, outcome: str) -> None:
+    """Bump the per-purpose outcome counter and emit one JSON line for log-based dashboards."""
+    stat_key = f"{_STATS_PREFIX}{request.purpose}:{outcome}"
+    try:
+        if not cache.add(stat_key, 1, timeout=None):
+            cache.incr(stat_key)
+    except Exception:
+        pass
+    payload = {"event": "llm_cache", "purpose": request.purpose, "outcome": outcome, "key": key[:12]}
+    logger.info("llm_cache_event %s", json.dumps(payload, sort_keys=True))
+
+
+def _lookup(key: str) -> Tuple[Any, Optional[str]]:
+    """Hot tier first, then the durable tier (which re-warms the hot tier on a hit)."""
+    value = _hot_get(key)
+    if value is not None:
+        return value, OUTCOME_HOT_HIT
+    value = _durable_get(key)
+    if value is not None:
+        _hot_set(key, value)
+        return value, OUTCOME_DURABLE_HIT
+    return None, None
+
+
+def _wait_for_leader(key: str) -> Any:
+    """Poll the hot tier while another caller holds the lock; None when it gave up or failed."""
+    deadline = time.monotonic() + _wait_seconds()
+    while time.monotonic() < deadline:
+        time.sleep(_POLL_SECONDS)
+        value = _hot_get(key)
+        if value is not None:
+            return value
+        try:
+            if cache.get(_LOCK_PREFIX + key) is None:
+                return _hot_get(key)
+        except Exception:
+            return None
+    return None
+
+
+def cached_llm_call(
+    request: LLMRequest,
+    call: Callable[[], Any],
+    *,
+    accept: Optional[Callable[[Any], bool]] = None,
+    refresh: bool = False,
+) -> Any:
+    """
+    Return the cached result for ``request`` or compute it with ``call()``.
+
+    ``call`` receives no arguments and should perform the model call plus whatever parsing
+    the caller wants cached (the stored value must be JSON-serialisable). Results that are
+    empty or rejected by ``accept`` are returned but not stored. ``refresh`` skips the
+    lookup and replaces any stored result.
+    """
+    if not _enabled():
+        return call()
+
+    key = request.key
+    if not refresh:
+        value, outcome = _lookup(key)
+        if value is not None:
+            _record(request, key, outcome)
+            return value
+
+    lock_key = _LOCK_PREFIX + key
+    try:
+        leader = cache.add(lock_key, "1", timeout=_lock_seconds())
+    except Exception as exc:
+        logger.warning("LLM cache lock failed for %s: %s", key[:12], exc)
+        leader = True
+
+    if not leader and not refresh:
+        value = _wait_for_leader(key)
+        if value is not None:
+            _record(request, key, OUTCOME_SHARED)
+            return value
+        # The leader failed or timed out; a result may still have reached the durable tier.
+        value, outcome = _lookup(key)
+        if value is not None:
+            _record(request, key, outcome)
+            return value
+
+    try:
+        value = call()
+        if value and (accept is None or accept(value)):
+            _durable_set(request, key, value)
+            _hot_set(key, value)
+        _record(request, key, OUTCOME_MISS)
+        return value
+    finally:
+        if leader:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                pass
+
+
+def prune_llm_responses() -> int:
+    """Delete durable-tier rows past ``LLM_CACHE_DURABLE_TTL_DAYS``; returns rows deleted."""
+    deleted, _ = LLMResponse.objects.filter(created_at__lt=_durable_cutoff()).delete()
+    if deleted:
+        logger.info("Pruned %s expired LLM response(s)", deleted)
+    return deleted
+
+
+def llm_cache_stats(purposes: Iterable[str] = PURPOSES) -> Dict[str, Dict[str, Any]]:
+    """Per-purpose outcome counts and hit rate (shared single-flight results count as hits)."""
+    stats: Dict[str, Dict[str, Any]] = {}
+    for purpose in purposes:
+        counts = {outcome: int(cache.get(f"{_STATS_PREFIX}{purpose}:{outcome}") or 0) for outcome in OUTCOMES}
+        total = sum(counts.values())
+        hits = total - counts[OUTCOME_MISS]
+        stats[purpose] = {**counts, "total": total, "hit_rate": round(hits / total, 4) if total else None}
+    return stats
+
+
+def reset_llm_cache_stats(purposes: Iterable[str] = PURPOSES) -> None:
+    cache.delete_many([f"{_STATS_PREFIX}{purpose}:{outcome}" for purpose in purposes for outcome in OUTCOMES])
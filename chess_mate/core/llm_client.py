@@ -0,0 +1,344 @@
+"""
+Bounded-concurrency async client for OpenAI chat completions.
+
+All LLM calls in a worker process run as coroutines on one background event loop, so a
+thread-pool Celery worker on the ``llm`` queue can keep many completions in flight while
+each task thread simply waits on its own future. Around every call:
+
+* a global concurrency cap shared by all workers (Redis sorted-set semaphore with leased
+  slots; a process-local ``asyncio.Semaphore`` when Redis is unavailable);
+* a per-attempt deadline plus an overall deadline, with exponential backoff and full
+  jitter between retries of timeouts, connection errors, 429s and 5xx responses;
+* optional hedging: when an attempt outlives the rolling p95 latency for its model, a
+  second identical request is started and the first response wins.
+
+Any client exposing ``client.chat.completions.create(**kwargs)`` works: ``AsyncOpenAI``
+is awaited directly, synchronous clients (``OpenAI`` or a local test stub) run in the
+loop's executor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger("chessmate.llm_client")
+
+SEMAPHORE_KEY = "llm_client:semaphore"
+_RETRYABLE_OPENAI_ERRORS = ("APITimeoutError", "APIConnectionError", "RateLimitError", "InternalServerError")
+_SLOT_POLL_SECONDS = 0.05
+
+
+class LLMClientError(Exception):
+    """Raised when a completion could not be obtained within the deadline/retry budget."""
+
+
+def _setting(name: str, default: Any) -> Any:
+    return getattr(settings, name, default)
+
+
+def _client_factory() -> Any:
+    """``AsyncOpenAI`` when the SDK provides it, otherwise the synchronous client class."""
+    try:
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI
+    except Exception:
+        pass
+    try:
+        from openai import OpenAI
+
+        return OpenAI
+    except Exception:
+        # Fallback: try importing openai module object
+        import openai as _openai
+
+        return getattr(_openai, "OpenAI", _openai)
+
+
+_default_client: Tuple[Any, Optional[int], Any] = (None, None, None)
+_default_client_lock = threading.Lock()
+
+
+def default_llm_client() -> Any:
+    """
+    The process-wide OpenAI client, built once so its connection pool is reused across calls.
+
+    SDK retries are disabled: ``AsyncLLMClient`` already retries within the call deadline. The
+    client is rebuilt after fork or when the ``openai`` client class changes (tests swap the module).
+    """
+    global _default_client
+    factory = _client_factory()
+    with _default_client_lock:
+        cached_factory, cached_pid, client = _default_client
+        if cached_factory is not factory or cached_pid != os.getpid():
+            try:
+                client = factory(max_retries=0)
+            except TypeError:
+                # Stand-ins for the SDK client that take no options.
+                client = factory()
+            _default_client = (factory, os.getpid(), client)
+        return client
+
+
+def _retryable_errors() -> Tuple[type, ...]:
+    errors: list = [asyncio.TimeoutError, ConnectionError]
+    try:
+        import openai as _openai
+
+        errors.extend(
+            error for error in (getattr(_openai, name, None) for name in _RETRYABLE_OPENAI_ERRORS) if error is not None
+        )
+    except ImportError:
+        pass
+    return tuple(error for error in errors if isinstance(error, type))
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (0-based)."""
+    return random.uniform(0.0, min(cap, base * (2**attempt)))
+
+
+class LatencyTracker:
+    """Rolling per-model latency window used to pick the hedging threshold."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def p95(self, model: str, min_samples: int) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(model) or ())
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+latency_tracker = LatencyTracker()
+
+
+def _redis_connection() -> Any:
+    if _setting("REDIS_DISABLED", False):
+        return None
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except Exception:
+        # Non-Redis cache backend (LocMem/Dummy in dev and tests).
+        return None
+
+
+class ConcurrencyLimiter:
+    """
+    Global cap on in-flight LLM calls.
+
+    Each slot is a member of a Redis sorted set scored by its acquire time; members older than
+    ``lease_seconds`` are treated as leaked by a crashed worker and purged before every acquire.
+    """
+
+    def __init__(self, limit: int, lease_seconds: float, key: str = SEMAPHORE_KEY):
+        self.limit = max(1, int(limit))
+        self.lease_seconds = lease_seconds
+        self.key = key
+        self._local: Optional[asyncio.Semaphore] = None
+
+    def _try_acquire_redis(self, connection: Any, token: str) -> bool:
+        now = time.time()
+        pipe = connection.pipeline()
+        pipe.zremrangebyscore(self.key, "-inf", now - self.lease_seconds)
+        pipe.zadd(self.key, {token: now})
+        pipe.zrank(self.key, token)
+        pipe.expire(self.key, int(self.lease_seconds) + 60)
+        rank = pipe.execute()[2]
+        if rank is not None and rank < self.limit:
+            return True
+        connection.zrem(self.key, token)
+        return False
+
+    async def acquire(self, timeout: float) -> Optional[str]:
+        """Return a slot token (None for a local slot); raises ``asyncio.TimeoutError`` on timeout."""
+        connection = _redis_connection()
+        if connection is None:
+            if self._local is None:
+                self._local = asyncio.Semaphore(self.limit)
+            await asyncio.wait_for(self._local.acquire(), timeout)
+            return None
+
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if await asyncio.to_thread(self._try_acquire_redis, connection, token):
+                    return token
+            except Exception as exc:
+                logger.warning("LLM semaphore unavailable, proceeding without global cap: %s", exc)
+                return token
+            if time.monotonic() >= deadline:
+                raise asyncio.TimeoutError("No LLM concurrency slot available")
+            await asyncio.sleep(_SLOT_POLL_SECONDS + random.uniform(0, _SLOT_POLL_SECONDS))
+
+    async def release(self, token: Optional[str]) -> None:
+        if token is None:
+            if self._local is not None:
+                self._local.release()
+            return
+        connection = _redis_connection()
+        if connection is None:
+            return
+        try:
+            await asyncio.to_thread(connection.zrem, self.key, token)
+        except Exception as exc:
+            logger.warning("LLM semaphore release failed: %s", exc)
+
+
+class AsyncLLMClient:
+    """Deadline/retry/hedging wrapper around one chat completions client (see module docstring)."""
+
+    def __init__(
+        self,
+        client: Any,
+        limiter: "ConcurrencyLimiter",
+        *,
+        attempt_timeout: float,
+        deadline: float,
+        max_retries: int,
+        hedge: bool,
+        hedge_min_samples: int = 20,
+        tracker: LatencyTracker = latency_tracker,
+    ):
+        self.client = client
+        self.limiter = limiter
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.tracker = tracker
+
+    async def create(self, **kwargs: Any) -> Any:
+        """``chat.completions.create(**kwargs)`` with the concurrency cap, deadlines, retries and hedging."""
+        retryable = _retryable_errors()
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            remaining = max(0.001, deadline - time.monotonic())
+            try:
+                return await self._hedged(kwargs, min(self.attempt_timeout, remaining))
+            except retryable as exc:
+                delay = backoff_delay(attempt)
+                if attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                    raise LLMClientError(f"LLM call failed after {attempt + 1} attempt(s): {exc!r}") from exc
+                logger.warning("LLM call attempt %d failed (%r); retrying in %.2fs", attempt + 1, exc, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def _hedged(self, kwargs: Dict[str, Any], timeout: float) -> Any:
+        model = str(kwargs.get("model") or "")
+        primary = asyncio.ensure_future(self._call(kwargs, timeout))
+        hedge_after = self.tracker.p95(model, self.hedge_min_samples) if self.hedge else None
+        if hedge_after is None or hedge_after >= timeout:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+        logger.info("LLM call for %s exceeded p95 %.2fs; sending hedged request", model, hedge_after)
+        pending = {primary, asyncio.ensure_future(self._call(kwargs, max(0.0, timeout - hedge_after)))}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error  # type: ignore[misc]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call(self, kwargs: Dict[str, Any], timeout: float) -> Any:
+        started = time.monotonic()
+        token = await self.limiter.acquire(timeout)
+        try:
+            response = await asyncio.wait_for(self._invoke(kwargs), max(0.0, timeout - (time.monotonic() - started)))
+        finally:
+            await self.limiter.release(token)
+        self.tracker.record(str(kwargs.get("model") or ""), time.monotonic() - started)
+        return response
+
+    async def _invoke(self, kwargs: Dict[str, Any]) -> Any:
+        create = self.client.chat.completions.create
+        if inspect.iscoroutinefunction(create):
+            return await create(**kwargs)
+        result = await asyncio.get_running_loop().run_in_executor(None, functools.partial(create, **kwargs))
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+class _LoopThread:
+    """One background event loop per process, restarted after fork."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.limiter: Optional[ConcurrencyLimiter] = None
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid() or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                # Runs as the loop's first callback, so the loop is accepting work once ``started`` is set.
+                loop.call_soon(started.set)
+                thread = threading.Thread(target=loop.run_forever, name="llm-event-loop", daemon=True)
+                thread.start()
+                started.wait()
+                self._loop, self._thread, self._pid = loop, thread, os.getpid()
+                # asyncio primitives belong to one loop; a fresh loop gets a fresh limiter.
+                self.limiter = ConcurrencyLimiter(
+                    _setting("LLM_MAX_CONCURRENCY", 8),
+                    lease_seconds=float(_setting("LLM_CALL_DEADLINE", 180)) + 30,
+                )
+            return self._loop
+
+
+_loop_thread = _LoopThread()
+
+
+def create_completion(client: Any, **kwargs: Any) -> Any:
+    """
+    Blocking entry point for sync callers (Celery tasks, views): run ``create`` on the
+    worker's event loop and wait for the response.
+    """
+    loop = _loop_thread.loop()
+    llm = AsyncLLMClient(
+        client,
+        _loop_thread.limiter,  # type: ignore[arg-type]
+        attempt_timeout=float(_setting("LLM_REQUEST_TIMEOUT", 60)),
+        deadline=float(_setting("LLM_CALL_DEADLINE", 180)),
+        max_retries=int(_setting("LLM_MAX_RETRIES", 2)),
+        hedge=bool(_setting("LLM_HEDGE_ENABLED", False)),
+        hedge_min_samples=int(_setting("LLM_HEDGE_MIN_SAMPLES", 20)),
+    )
+    return asyncio.run_coroutine_threadsafe(llm.create(**kwargs), loop).result()
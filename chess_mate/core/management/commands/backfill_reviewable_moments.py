@@ -0,0 +1,45 @@
+"""
+Build ReviewableMoment rows for analyses saved before the spaced-repetition index existed.
+
+Usage:
+    python manage.py backfill_reviewable_moments [--dry-run] [--chunk-size 200]
+"""
+
+from core.models import GameAnalysis, ReviewableMoment
+from core.spaced_repetition_email import index_reviewable_moments
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Index critical moments of existing analyses for spaced-repetition reminders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count analyses without indexed moments without writing them",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Rows fetched per database round trip",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get("dry_run")
+        chunk_size = max(1, int(options.get("chunk_size") or 200))
+        indexed_games = ReviewableMoment.objects.values("game_id")
+        pending = GameAnalysis.objects.exclude(game_id__in=indexed_games)
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Dry run: {pending.count()} analysis row(s) would be indexed."))
+            return
+
+        analyses = 0
+        moments = 0
+        for analysis in pending.select_related("game").iterator(chunk_size=chunk_size):
+            moments += index_reviewable_moments(analysis)
+            analyses += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {moments} moment(s) from {analyses} analysis row(s)."))
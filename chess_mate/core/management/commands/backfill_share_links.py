@@ -0,0 +1,67 @@
+"""
+Backfill ShareLink rows for moment shares created before the indexed lookup table.
+
+Usage:
+    python manage.py backfill_share_links [--dry-run]
+"""
+
+from core.models import GameAnalysis, ShareLink
+from core.share_links import normalize_share_token
+from core.single_game_moment_share import SHARE_META_KEY
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Create ShareLink rows for existing moment share tokens (analysis_data)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count missing links without writing them",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Rows per bulk insert",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get("dry_run")
+        chunk_size = max(1, int(options.get("chunk_size") or 500))
+        existing = set(ShareLink.objects.values_list("token", flat=True))
+
+        pending = []
+        moment_count = 0
+        analyses = (
+            GameAnalysis.objects.filter(**{f"analysis_data__{SHARE_META_KEY}__token__isnull": False})
+            .only("id", "analysis_data")
+            .iterator(chunk_size=chunk_size)
+        )
+        for analysis in analyses:
+            payload = analysis.analysis_data if isinstance(analysis.analysis_data, dict) else {}
+            share_meta = payload.get(SHARE_META_KEY)
+            if not isinstance(share_meta, dict):
+                continue
+            token = normalize_share_token(share_meta.get("token"))
+            if token is None or token in existing:
+                continue
+            move_number = share_meta.get("move_number")
+            pending.append(
+                ShareLink(
+                    token=token,
+                    kind=ShareLink.KIND_MOMENT,
+                    analysis_id=analysis.pk,
+                    move_number=move_number if isinstance(move_number, int) else None,
+                )
+            )
+            existing.add(token)
+            moment_count += 1
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Dry run: {moment_count} moment share link(s) would be created."))
+            return
+
+        ShareLink.objects.bulk_create(pending, batch_size=chunk_size, ignore_conflicts=True)
+        self.stdout.write(self.style.SUCCESS(f"Created {moment_count} moment share link(s)."))
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+from core.batch_cancellation import request_batch_cancel
 from core.batch_credits import refund_batch_credits_on_hard_fail
 from core.models import BatchAnalysisReport
 from django.core.management.base import BaseCommand, CommandError
@@ -7,7 +8,10 @@ from django.utils import timezone
 
 
 class Command(BaseCommand):
-    help = "Mark a stuck batch as failed (by database id, Celery task_id, or bulk in_progress)."
+    help = (
+        "Mark a batch as failed and stop its analysis (by database id, Celery task_id, or bulk in_progress): "
+        "queued game subtasks are revoked and running ones stop within a few plies."
+    )
 
     def add_arguments(self, parser):
         group = parser.add_mutually_exclusive_group(required=True)
@@ -111,11 +115,13 @@ class Command(BaseCommand):
         report.failed_games = failed
         report.save(update_fields=["status", "failed_games", "updated_at"])
         refunded = refund_batch_credits_on_hard_fail(report)
+        revoked = request_batch_cancel(report.task_id, report.games_count or len(report.game_ids or []))
 
         self.stdout.write(
             self.style.SUCCESS(
                 f"Batch id={report.pk} task_id={report.task_id}: {previous} -> failed ({reason})"
                 + (f"; refunded {refunded} credits" if refunded else "")
+                + (f"; revoked {len(revoked)} game subtask(s)" if revoked else "")
             )
         )
         return refunded or 0
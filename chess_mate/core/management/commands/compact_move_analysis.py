@@ -0,0 +1,46 @@
+"""
+Pack per-move analysis stored as JSON into GameAnalysis.moves_blob.
+
+Usage:
+    python manage.py compact_move_analysis [--dry-run] [--chunk-size 200]
+"""
+
+from core.models import GameAnalysis
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Repack legacy JSON move lists on GameAnalysis rows into the compact moves_blob format."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count rows that still store moves as JSON without rewriting them",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Rows fetched per database round trip",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get("dry_run")
+        chunk_size = max(1, int(options.get("chunk_size") or 200))
+        pending = GameAnalysis.objects.filter(moves_blob__isnull=True, analysis_data__has_key="moves")
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Dry run: {pending.count()} analysis row(s) would be compacted."))
+            return
+
+        compacted = 0
+        skipped = 0
+        for analysis in pending.only("id", "analysis_data", "moves_blob").iterator(chunk_size=chunk_size):
+            analysis.save(update_fields=["analysis_data"])
+            if analysis.moves_blob is None:
+                skipped += 1
+            else:
+                compacted += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Compacted {compacted} analysis row(s); {skipped} left as JSON."))
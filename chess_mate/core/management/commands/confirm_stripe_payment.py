@@ -4,13 +4,13 @@ Apply credits for a completed Stripe Checkout session (ops recovery).
 Use when the user paid but /confirm-purchase/ did not run (expired JWT, old redirect URL, etc.).
 """
 
+from core.credit_ledger import REASON_PURCHASE, credit_balance, post_credit_entry
 from core.models import Profile, Transaction
 from core.payment import PaymentProcessor
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from django.db.models import F
 
 
 class Command(BaseCommand):
@@ -80,11 +80,10 @@ class Command(BaseCommand):
 
         existing = Transaction.objects.filter(user=user, stripe_payment_id=session_id, status="completed").first()
         if existing:
-            profile = Profile.objects.get(user=user)
             self.stdout.write(
                 self.style.WARNING(
                     f"Already applied: {credits_to_add} credits for session {session_id}. "
-                    f"Current balance={profile.credits}"
+                    f"Current balance={credit_balance(user.id)}"
                 )
             )
             return
@@ -99,10 +98,9 @@ class Command(BaseCommand):
             return
 
         with transaction.atomic():
-            profile, _ = Profile.objects.select_for_update().get_or_create(user=user)
-            profile.credits = F("credits") + credits_to_add
-            profile.save(update_fields=["credits"])
-            profile.refresh_from_db(fields=["credits"])
+            Profile.objects.get_or_create(user=user)
+            if not post_credit_entry(user.id, credits_to_add, REASON_PURCHASE, session_id):
+                raise CommandError(f"Session {session_id} was already credited (ledger entry exists).")
 
             amount_dollars = float(payment_data.get("amount") or 0) / 100.0
             Transaction.objects.create(
@@ -116,6 +114,7 @@ class Command(BaseCommand):
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Added {credits_to_add} credits to id={user.id} {user.username}. " f"New balance={profile.credits}"
+                f"Added {credits_to_add} credits to id={user.id} {user.username}. "
+                f"New balance={credit_balance(user.id)}"
             )
         )
@@ -1,3 +1,6 @@
+import uuid
+
+from core.credit_ledger import REASON_ADMIN_GRANT, credit_balance, post_credit_entry
 from core.models import Profile
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
@@ -45,11 +48,11 @@ class Command(BaseCommand):
                     f"Multiple users have email {email}. Use --user-id (see: python manage.py list_users {email})"
                 ) from exc
 
-        profile, _ = Profile.objects.get_or_create(user=user)
-        before = profile.credits
-        profile.credits = before + amount
-        profile.save(update_fields=["credits"])
+        Profile.objects.get_or_create(user=user)
+        before = credit_balance(user.id)
+        post_credit_entry(user.id, amount, REASON_ADMIN_GRANT, f"command:{uuid.uuid4().hex}")
+        after = credit_balance(user.id)
 
         self.stdout.write(
-            self.style.SUCCESS(f"User {user.username} ({email}): credits {before} -> {profile.credits} ({amount:+d})")
+            self.style.SUCCESS(f"User {user.username} ({email}): credits {before} -> {after} ({amount:+d})")
         )
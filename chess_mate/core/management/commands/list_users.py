@@ -1,3 +1,4 @@
+from core.credit_ledger import credit_balance
 from core.models import Profile
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
@@ -27,9 +28,9 @@ class Command(BaseCommand):
             return
 
         for user in qs:
-            try:
-                credits = Profile.objects.get(user=user).credits
-            except Profile.DoesNotExist:
+            if Profile.objects.filter(user=user).exists():
+                credits = credit_balance(user.id)
+            else:
                 credits = "no profile"
             admin = "admin" if user.is_superuser else ("staff" if user.is_staff else "user")
             self.stdout.write(
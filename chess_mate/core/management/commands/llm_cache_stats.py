@@ -0,0 +1,39 @@
+"""
+Report LLM response cache hit rates and stored responses per purpose.
+
+Usage:
+    python manage.py llm_cache_stats [--reset]
+"""
+
+from core.llm_cache import PURPOSES, llm_cache_stats, reset_llm_cache_stats
+from core.models import LLMResponse
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum
+
+
+class Command(BaseCommand):
+    help = "Show hot/durable/shared hit counts, hit rate, and stored responses for the LLM cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Zero the hit/miss counters after printing them",
+        )
+
+    def handle(self, *args, **options):
+        stored = {
+            row["purpose"]: row
+            for row in LLMResponse.objects.values("purpose").annotate(rows=Count("id"), hits=Sum("hit_count"))
+        }
+        for purpose, stats in llm_cache_stats(PURPOSES).items():
+            hit_rate = "n/a" if stats["hit_rate"] is None else f"{stats['hit_rate'] * 100:.1f}%"
+            row = stored.get(purpose) or {}
+            self.stdout.write(
+                f"{purpose:<18} hit rate {hit_rate:>6}  hot={stats['hot_hit']} durable={stats['durable_hit']} "
+                f"shared={stats['shared']} miss={stats['miss']}  stored={row.get('rows', 0)} "
+                f"durable_hits_all_time={row.get('hits') or 0}"
+            )
+        if options.get("reset"):
+            reset_llm_cache_stats(PURPOSES)
+            self.stdout.write("Counters reset.")
@@ -0,0 +1,108 @@
+"""
+Measure per-request overhead of a middleware against a pass-through response.
+
+Usage:
+    python manage.py middleware_benchmark [--requests 10000] [--middleware core.middleware.RequestFixMiddleware]
+        [--read-data]
+
+With ``--read-data`` the wrapped response reads ``request.data`` through DRF's parsers, as a
+view would, so work a middleware saves the view shows up as lower (or negative) overhead.
+"""
+
+import base64
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+PGN_UPLOAD = ('[Event "Benchmark"]\n\n' + " ".join(f"{n}. e4 e5" for n in range(1, 40)) + " 1-0\n") * 500
+
+
+def _jwt_shaped(payload):
+    segment = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+    return f"{segment}.{segment}.{'x' * 43}"
+
+
+def _scenarios(factory):
+    token = _jwt_shaped({"token_type": "access", "user_id": 1, "jti": "0" * 32})
+    bearer = f"Bearer {token}"
+    return {
+        "api bearer header": lambda: factory.get("/api/v1/games/", HTTP_AUTHORIZATION=bearer),
+        "api access_token cookie": lambda: _with_cookie(factory.get("/api/v1/dashboard/"), "access_token", token),
+        "api anonymous": lambda: factory.get("/api/v1/health/"),
+        "api pgn upload": lambda: factory.post(
+            "/api/v1/games/import/",
+            {"pgn": PGN_UPLOAD, "platform": "upload"},
+            HTTP_AUTHORIZATION=bearer,
+        ),
+        "api anonymous upload": lambda: factory.post("/api/v1/games/import/", {"pgn": PGN_UPLOAD}),
+        "api register json": lambda: factory.post(
+            "/api/v1/register/",
+            {"email": "bench@example.com", "password": "Secure.Password.123", "username": "bench"},
+            content_type="application/json",
+        ),
+        "api comparative feedback json": lambda: factory.post(
+            "/api/feedback/comparative/",
+            {"game_ids": list(range(1, 9))},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=bearer,
+        ),
+        "non-api page": lambda: factory.get("/static/js/main.js"),
+    }
+
+
+def _with_cookie(request, name, value):
+    request.COOKIES[name] = value
+    return request
+
+
+class Command(BaseCommand):
+    help = "Report per-request time added by a middleware for common request shapes (RequestFactory)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=10000, help="Requests per scenario")
+        parser.add_argument(
+            "--middleware",
+            default="core.middleware.RequestFixMiddleware",
+            help="Dotted path of the middleware to measure",
+        )
+        parser.add_argument(
+            "--read-data",
+            action="store_true",
+            help="Parse request.data with DRF's parsers in the wrapped response",
+        )
+
+    def handle(self, *args, **options):
+        count = max(1, options["requests"])
+        passthrough = self._read_data if options.get("read_data") else lambda request: HttpResponse()
+        middleware = import_string(options["middleware"])(passthrough)
+        self.stdout.write(f"{options['middleware']}, {count} requests per scenario")
+
+        for name, build in _scenarios(RequestFactory()).items():
+            overhead = self._overhead(middleware, passthrough, build, count)
+            self.stdout.write(f"{overhead:9.2f} us/request  {name}")
+
+    @staticmethod
+    def _read_data(request):
+        Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES]).data
+        return HttpResponse()
+
+    @staticmethod
+    def _overhead(middleware, passthrough, build, count):
+        """Median per-request difference, timing the two handlers alternately on fresh requests."""
+        differences = []
+        for _ in range(count):
+            first, second = build(), build()
+            started = time.perf_counter()
+            passthrough(first)
+            baseline = time.perf_counter() - started
+            started = time.perf_counter()
+            middleware(second)
+            differences.append(time.perf_counter() - started - baseline)
+        return statistics.median(differences) * 1e6
@@ -28,6 +28,11 @@ class Command(BaseCommand):
             action="store_true",
             help="Run inline in this process (local dev; no Celery worker needed)",
         )
+        parser.add_argument(
+            "--no-reuse",
+            action="store_true",
+            help="Re-run Stockfish on every game instead of reusing stored per-game results",
+        )
         parser.add_argument(
             "--dry-run",
             action="store_true",
@@ -70,7 +75,11 @@ class Command(BaseCommand):
         ok = 0
         for report in reports:
             try:
-                message = queue_batch_rerun(report, eager=bool(options.get("eager")))
+                message = queue_batch_rerun(
+                    report,
+                    eager=bool(options.get("eager")),
+                    reuse=not options.get("no_reuse"),
+                )
                 self.stdout.write(self.style.SUCCESS(message))
                 ok += 1
             except BatchRerunError as exc:
@@ -87,7 +96,11 @@ class Command(BaseCommand):
             return
 
         try:
-            message = queue_batch_rerun(report, eager=bool(options.get("eager")))
+            message = queue_batch_rerun(
+                report,
+                eager=bool(options.get("eager")),
+                reuse=not options.get("no_reuse"),
+            )
         except BatchRerunError as exc:
             raise CommandError(str(exc)) from exc
 
@@ -0,0 +1,49 @@
+"""
+Measure Celery worker cold-start cost: per-module import time plus engine spawn.
+
+Usage:
+    python manage.py worker_startup_benchmark [--no-engine]
+"""
+
+import time
+
+from core.worker_warmup import (
+    PRELOAD_MODULES,
+    measure_import_times,
+    preload_reference_data,
+    spawn_engine,
+)
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Report per-module import time and Stockfish spawn time for a fresh worker process."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-engine",
+            action="store_true",
+            help="Skip spawning and handshaking Stockfish",
+        )
+
+    def handle(self, *args, **options):
+        timings = measure_import_times(PRELOAD_MODULES)
+        for name, elapsed in sorted(timings.items(), key=lambda item: -(item[1] or 0.0)):
+            label = "failed" if elapsed is None else f"{elapsed:8.1f} ms"
+            self.stdout.write(f"{label:>12}  {name}")
+        self.stdout.write(f"{sum(value or 0.0 for value in timings.values()):8.1f} ms  total imports")
+
+        started = time.perf_counter()
+        reference_data = preload_reference_data()
+        self.stdout.write(
+            f"{(time.perf_counter() - started) * 1000:8.1f} ms  reference data "
+            + ", ".join(f"{key}={value}" for key, value in reference_data.items())
+        )
+
+        if options.get("no_engine"):
+            return
+        started = time.perf_counter()
+        ready = spawn_engine()
+        elapsed = (time.perf_counter() - started) * 1000
+        style = self.style.SUCCESS if ready else self.style.ERROR
+        self.stdout.write(style(f"{elapsed:8.1f} ms  stockfish spawn ({'ready' if ready else 'unavailable'})"))
@@ -16,6 +16,7 @@ import threading
 import time
 import uuid
 from datetime import datetime
+from functools import partial
 from typing import (
     Any,
     Callable,
@@ -23,6 +24,7 @@ from typing import (
     Iterator,
     List,
     Mapping,
+    NamedTuple,
     Optional,
     Tuple,
     TypedDict,
@@ -36,12 +38,14 @@ from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.utils.cache import add_never_cache_headers
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 
 from .cache import CACHE_BACKEND_REDIS, cache_delete, cache_get, cache_set
 from .error_handling import create_error_response
+from .parsers import PARSED_JSON_ATTR
 from .rate_limiting import limiter
 
 logger = logging.getLogger(__name__)
@@ -108,6 +112,8 @@ class MethodSchema(TypedDict, total=False):
     DELETE: SchemaOptions
 
 
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+
 # Validation schemas defined as a mapping of URL patterns to required fields and their types
 VALIDATION_SCHEMAS: Dict[str, MethodSchema] = {
     # Auth endpoints
@@ -123,7 +129,7 @@ VALIDATION_SCHEMAS: Dict[str, MethodSchema] = {
                 "last_name": str,
             },
             "custom_validators": {
-                "email": lambda x: re.match(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$", x) is not None,
+                "email": lambda x: EMAIL_PATTERN.match(x) is not None,
                 "password": lambda x: len(x) >= 8,
             },
         }
@@ -290,6 +296,106 @@ def get_method_schema(method_schemas: MethodSchema, method: str) -> Optional[Sch
     return None
 
 
+class FieldCheck(NamedTuple):
+    """One precompiled type, value or custom check of a schema field."""
+
+    field: str
+    check: Callable[[Any], Any]
+    message: str
+    detail: Optional[str]  # None reports the type of the rejected value
+    error_message: str
+
+
+class CompiledSchema(NamedTuple):
+    required: Tuple[str, ...]
+    checks: Tuple[FieldCheck, ...]
+
+
+def compile_schema(schema: SchemaOptions) -> CompiledSchema:
+    """Flatten a schema into its required fields and checks, in the order errors are reported."""
+    checks: List[FieldCheck] = []
+    for field, field_type in schema.get("type_validation", {}).items():
+        type_name = getattr(field_type, "__name__", str(field_type))
+        checks.append(
+            FieldCheck(
+                field,
+                partial(_is_instance, field_type=field_type),
+                f"Field must be of type {type_name}",
+                None,
+                "Type validation error",
+            )
+        )
+    for field, validator in schema.get("value_validation", {}).items():
+        if callable(validator):
+            checks.append(
+                FieldCheck(
+                    field,
+                    validator,
+                    "Field failed validation",
+                    "Value did not meet the requirements",
+                    "Validation error",
+                )
+            )
+    for field, validator in schema.get("custom_validators", {}).items():
+        if callable(validator):
+            checks.append(
+                FieldCheck(
+                    field,
+                    validator,
+                    "Invalid value",
+                    "Value did not meet custom validation rules",
+                    "Value validation error",
+                )
+            )
+    return CompiledSchema(tuple(schema.get("required", [])), tuple(checks))
+
+
+def _is_instance(value: Any, field_type: type) -> bool:
+    return isinstance(value, field_type)
+
+
+class RouteTable:
+    """
+    URL patterns compiled into one alternation per HTTP method.
+
+    Each pattern becomes an outer group of the method's regex, so a single ``match`` finds
+    the first pattern (in ``VALIDATION_SCHEMAS`` order) that matches the path, and
+    ``lastindex`` identifies it.
+    """
+
+    def __init__(self, schemas: Mapping[str, MethodSchema]):
+        routes: Dict[str, List[Tuple[str, CompiledSchema]]] = {}
+        for pattern, method_schemas in schemas.items():
+            for method in method_schemas:
+                schema = get_method_schema(method_schemas, method)
+                if schema is not None:
+                    routes.setdefault(method, []).append((pattern, compile_schema(schema)))
+
+        self._tables: Dict[str, Tuple[re.Pattern, Dict[int, CompiledSchema]]] = {}
+        for method, entries in routes.items():
+            alternatives, by_group, group = [], {}, 1
+            for pattern, schema in entries:
+                alternatives.append(f"({pattern})")
+                by_group[group] = schema
+                group += 1 + re.compile(pattern).groups
+            self._tables[method] = (re.compile("|".join(alternatives)), by_group)
+
+    def resolve(self, method: str, path: str) -> Optional[CompiledSchema]:
+        table = self._tables.get(method)
+        if table is None:
+            return None
+        match = table[0].match(path)
+        return table[1][match.lastindex] if match else None
+
+
+VALIDATION_ROUTES = RouteTable(VALIDATION_SCHEMAS)
+
+
+def _reject_constant(constant: str) -> Any:
+    # Match DRF's strict JSONParser, which rejects NaN and Infinity.
+    raise ValueError(f"Out of range float values are not JSON compliant: {constant}")
+
+
 class RequestValidationMiddleware:
     """Middleware for validating API requests against defined schemas."""
 
@@ -297,158 +403,85 @@ class RequestValidationMiddleware:
         self.get_response = get_response
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
-        if not self._should_validate(request):
+        schema = self._resolve_schema(request)
+        if schema is None:
             return self.get_response(request)
 
         # Validate the request
-        is_valid, errors = self._validate_request(request)
+        is_valid, errors = self._validate_request(request, schema)
         if not is_valid:
-            logger.warning(f"Request validation failed: {errors}")
+            logger.warning("Request validation failed: %s", errors)
             return self._create_error_response(errors)
 
         # Request is valid, continue processing
         return self.get_response(request)
 
-    def _should_validate(self, request: HttpRequest) -> bool:
-        """Determine if the request should be validated."""
-        # Only validate API requests
-        if not request.path.startswith("/api/"):
-            return False
+    def _resolve_schema(self, request: HttpRequest) -> Optional[CompiledSchema]:
+        """Schema for an API request with a body, or None when it is not validated."""
+        # Only validate API requests; GET, HEAD and OPTIONS have no body to validate
+        if not request.path.startswith("/api/") or request.method in ("GET", "HEAD", "OPTIONS"):
+            return None
+        return VALIDATION_ROUTES.resolve(request.method, request.path)
 
-        # Skip validation for GET, HEAD and OPTIONS requests
-        if request.method in ("GET", "HEAD", "OPTIONS"):
-            return False
-
-        # Check if there's a validation schema for this path
-        for pattern in VALIDATION_SCHEMAS:
-            if re.match(pattern, request.path):
-                # Check if there's a schema for this method
-                method_schemas = VALIDATION_SCHEMAS[pattern]
-                if request.method in method_schemas:
-                    return True
-
-        return False
-
-    def _validate_request(self, request: HttpRequest) -> Tuple[bool, List[ErrorDetail]]:
+    def _validate_request(self, request: HttpRequest, schema: CompiledSchema) -> Tuple[bool, List[ErrorDetail]]:
         """Validate request data against schema."""
         errors: List[ErrorDetail] = []
 
         try:
             # Parse JSON data if content-type is application/json
             if request.content_type == "application/json":
-                if not request.body:
-                    return True, []  # Empty body is fine for some requests
+                if hasattr(request, PARSED_JSON_ATTR):
+                    data = getattr(request, PARSED_JSON_ATTR)
+                else:
+                    if not request.body:
+                        return True, []  # Empty body is fine for some requests
+                    try:
+                        data = json.loads(request.body, parse_constant=_reject_constant)
+                    except ValueError as e:
+                        errors.append(
+                            {
+                                "field": "body",
+                                "message": "Invalid JSON format",
+                                "detail": str(e),
+                            }
+                        )
+                        return False, errors
+                    setattr(request, PARSED_JSON_ATTR, data)
+            else:
+                # Use POST/PUT data as dictionary
+                data = getattr(request, request.method, {})
+
+            for field in schema.required:
+                if field not in data:
+                    errors.append(
+                        {
+                            "field": field,
+                            "message": "Field is required",
+                            "detail": None,
+                        }
+                    )
+
+            for field, check, message, detail, error_message in schema.checks:
+                if field not in data or data[field] is None:
+                    continue
+                value = data[field]
                 try:
-                    data = json.loads(request.body)
-                except json.JSONDecodeError as e:
+                    if not check(value):
+                        errors.append(
+                            {
+                                "field": field,
+                                "message": message,
+                                "detail": detail if detail is not None else f"Got {type(value).__name__}",
+                            }
+                        )
+                except Exception as e:
                     errors.append(
                         {
-                            "field": "body",
-                            "message": "Invalid JSON format",
+                            "field": field,
+                            "message": error_message,
                             "detail": str(e),
                         }
                     )
-                    return False, errors
-            else:
-                # Use POST/PUT data as dictionary
-                data = getattr(request, request.method, {})
-
-            # Find matching schema
-            for pattern in VALIDATION_SCHEMAS:
-                if re.match(pattern, request.path):
-                    method_schemas = VALIDATION_SCHEMAS[pattern]
-                    if request.method in method_schemas:
-                        schema = get_method_schema(method_schemas, request.method)
-                        if not schema:
-                            continue
-
-                        # Validate required fields
-                        for field in schema.get("required", []):
-                            if field not in data:
-                                errors.append(
-                                    {
-                                        "field": field,
-                                        "message": "Field is required",
-                                        "detail": None,
-                                    }
-                                )
-
-                        # Validate field types
-                        type_validation = schema.get("type_validation", {})
-                        for field, field_type in type_validation.items():
-                            if field in data and data[field] is not None:
-                                try:
-                                    # Use isinstance to check types, handling special cases
-                                    is_valid_type = isinstance(data[field], field_type)
-
-                                    if not is_valid_type:
-                                        type_name = (
-                                            field_type.__name__ if hasattr(field_type, "__name__") else str(field_type)
-                                        )
-                                        value_type = type(data[field]).__name__
-
-                                        errors.append(
-                                            {
-                                                "field": field,
-                                                "message": f"Field must be of type {type_name}",
-                                                "detail": f"Got {value_type}",
-                                            }
-                                        )
-                                except Exception as e:
-                                    errors.append(
-                                        {
-                                            "field": field,
-                                            "message": "Type validation error",
-                                            "detail": str(e),
-                                        }
-                                    )
-
-                        # Validate field values
-                        value_validation = schema.get("value_validation", {})
-                        for field, validator in value_validation.items():
-                            if field in data and data[field] is not None:
-                                try:
-                                    if callable(validator) and not validator(data[field]):
-                                        errors.append(
-                                            {
-                                                "field": field,
-                                                "message": "Field failed validation",
-                                                "detail": "Value did not meet the requirements",
-                                            }
-                                        )
-                                except Exception as e:
-                                    errors.append(
-                                        {
-                                            "field": field,
-                                            "message": "Validation error",
-                                            "detail": str(e),
-                                        }
-                                    )
-
-                        # Apply custom validators
-                        custom_validators = schema.get("custom_validators", {})
-                        for field, validator in custom_validators.items():
-                            if field in data and data[field] is not None:
-                                try:
-                                    if callable(validator) and not validator(data[field]):
-                                        errors.append(
-                                            {
-                                                "field": field,
-                                                "message": "Invalid value",
-                                                "detail": "Value did not meet custom validation rules",
-                                            }
-                                        )
-                                except Exception as e:
-                                    errors.append(
-                                        {
-                                            "field": field,
-                                            "message": "Value validation error",
-                                            "detail": str(e),
-                                        }
-                                    )
-
-                        # Break after first matching schema
-                        break
 
             return len(errors) == 0, errors
 
@@ -724,137 +757,71 @@ class RequestIDFilter(logging.Filter):
 
 
 class RequestFixMiddleware:
-    """Middleware to fix common request issues, particularly with authentication headers."""
+    """
+    Normalize the access token of ``/api/`` requests into ``HTTP_AUTHORIZATION``.
+
+    Sources are tried in ``AUTH_SOURCES`` order: the Authorization header, an
+    ``Authorization`` or ``access_token`` cookie, then the ``token`` query parameter. The
+    ``access_token`` form field is only read with ``ALLOW_BODY_TOKEN`` enabled, since reading
+    ``request.POST`` parses the whole body (PGN uploads included) before any view runs.
+
+    A bearer token also becomes DRF's forced user, resolved lazily: the signature and user
+    are only checked when the view first reads ``request.user``, and an invalid token yields
+    ``AnonymousUser``.
+    """
+
+    # (request attribute, key, value prefix); Authorization headers already live in META.
+    AUTH_SOURCES = (
+        ("META", "HTTP_AUTHORIZATION", ""),
+        ("COOKIES", "Authorization", ""),
+        ("COOKIES", "access_token", "Bearer "),
+        ("GET", "token", "Bearer "),
+    )
+    BODY_AUTH_SOURCES = (("POST", "access_token", "Bearer "),)
 
     def __init__(self, get_response):
         self.get_response = get_response
         self.logger = logging.getLogger(__name__)
+        sources = self.AUTH_SOURCES
+        if getattr(settings, "ALLOW_BODY_TOKEN", False):
+            sources += self.BODY_AUTH_SOURCES
+        self.auth_sources = tuple((attribute, key, prefix, f"{attribute}.{key}") for attribute, key, prefix in sources)
         self.logger.info("RequestFixMiddleware initialized")
 
-    def __call__(self, request):
-        # Check for authentication headers in different formats and normalize them
-        auth_header = None
-        original_auth = None
-
-        # First check for standard HTTP_AUTHORIZATION
-        if "HTTP_AUTHORIZATION" in request.META:
-            auth_header = request.META["HTTP_AUTHORIZATION"]
-            original_auth = "HTTP_AUTHORIZATION"
-            self.logger.debug(f"Found HTTP_AUTHORIZATION header: {auth_header[:20]}..." if auth_header else "None")
-
-        # Then check for Authorization in headers (common with JavaScript fetch)
-        elif hasattr(request, "headers") and "Authorization" in request.headers:
-            auth_header = request.headers.get("Authorization")
-            original_auth = "headers.Authorization"
-            self.logger.debug(
-                f"Found Authorization in request.headers: {auth_header[:20]}..." if auth_header else "None"
-            )
-
-        # Next check for Authorization in cookies (possible alternative auth method)
-        elif "Authorization" in request.COOKIES:
-            auth_header = request.COOKIES.get("Authorization")
-            original_auth = "COOKIES.Authorization"
-            self.logger.debug(f"Found Authorization in cookies: {auth_header[:20]}..." if auth_header else "None")
-
-        # Check for access_token in cookies (used with simplejwt cookie auth)
-        elif "access_token" in request.COOKIES:
-            auth_header = f"Bearer {request.COOKIES.get('access_token')}"
-            original_auth = "COOKIES.access_token"
-            self.logger.debug(
-                f"Found access_token in cookies, converted to Bearer format: {auth_header[:20]}..."
-                if auth_header
-                else "None"
-            )
-
-        # Check if token is in the request GET parameters (not recommended for production but useful for debugging)
-        elif "token" in request.GET:
-            auth_header = f"Bearer {request.GET.get('token')}"
-            original_auth = "GET.token"
-            self.logger.debug(
-                f"Found token in GET parameters, converted to Bearer format: {auth_header[:20]}..."
-                if auth_header
-                else "None"
-            )
-
-        # Check if access_token is in the request POST data (sometimes used in form submissions)
-        elif "access_token" in request.POST:
-            auth_header = f"Bearer {request.POST.get('access_token')}"
-            original_auth = "POST.access_token"
-            self.logger.debug(
-                f"Found access_token in POST data, converted to Bearer format: {auth_header[:20]}..."
-                if auth_header
-                else "None"
-            )
-
-        # If an auth header was found in any form, normalize it and add to META
-        if auth_header:
-            # Ensure it has Bearer prefix if it's a JWT token
-            if not auth_header.startswith("Bearer ") and " " not in auth_header:
-                # Looks like a raw token without 'Bearer' prefix
-                auth_header = f"Bearer {auth_header}"
-                self.logger.debug(f"Added Bearer prefix to raw token: {auth_header[:20]}..." if auth_header else "None")
-
-            # Set the authorization header in multiple places to ensure it's recognized
-            request.META["HTTP_AUTHORIZATION"] = auth_header
-
-            # For Django REST Framework specifically
-            if hasattr(request, "_request"):
-                request._request.META["HTTP_AUTHORIZATION"] = auth_header
-
-            # Make sure it's also in the standard headers dict
-            if hasattr(request, "headers") and isinstance(request.headers, dict):
-                request.headers["Authorization"] = auth_header
-
-            # Fix Django 3.x vs Django 4.x compatibility issues
-            # Django 4.x uses Authorization directly in some cases
-            request.META["Authorization"] = auth_header
-
-            # Log the token for debugging
-            token = auth_header.split(" ")[1] if auth_header.startswith("Bearer ") else auth_header
-            self.logger.debug(f"Auth normalized from {original_auth} - Token: {token[:15]}..." if token else "None")
+    def resolve_authorization(self, request) -> Tuple[Optional[str], Optional[str]]:
+        """Return ``(authorization, source)`` from the first source that has a value."""
+        for attribute, key, prefix, source in self.auth_sources:
+            value = getattr(request, attribute).get(key)
+            if value:
+                if not prefix and " " not in value:
+                    # A raw token without its scheme.
+                    prefix = "Bearer "
+                return prefix + value, source
+        return None, None
+
+    def token_user(self, raw_token: str) -> Any:
+        """The user of a valid access token, ``AnonymousUser`` otherwise."""
+        from django.contrib.auth.models import AnonymousUser
+        from rest_framework.exceptions import AuthenticationFailed
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+
+        authenticator = JWTAuthentication()
+        try:
+            return authenticator.get_user(authenticator.get_validated_token(raw_token))
+        except AuthenticationFailed as exc:
+            self.logger.debug("Ignoring bearer token: %s", exc)
+            return AnonymousUser()
 
-            # Try to decode the token payload (without verification) for debugging
-            if auth_header.startswith("Bearer "):
-                token = auth_header.split(" ")[1]
-                try:
-                    import base64
-                    import json
-
-                    # Get the payload part (second segment of JWT)
-                    parts = token.split(".")
-                    if len(parts) >= 2:
-                        # Add padding if needed
-                        payload = parts[1]
-                        padding_needed = 4 - (len(payload) % 4)
-                        if padding_needed < 4:
-                            payload += "=" * padding_needed
-
-                        # Decode and log user_id
-                        try:
-                            decoded = base64.urlsafe_b64decode(payload).decode("utf-8")
-                            payload_data = json.loads(decoded)
-                            if "user_id" in payload_data:
-                                self.logger.debug(f"Token contains user_id: {payload_data['user_id']}")
-
-                                # For debugging only - load user info
-                                try:
-                                    from django.contrib.auth.models import User
-
-                                    user = User.objects.get(id=payload_data["user_id"])
-                                    self.logger.debug(f"Found user: {user.username}")
-
-                                    # For JWT auth specifically, set user on request
-                                    # This helps with authentication issues
-                                    request.user = user
-                                    request._force_auth_user = user
-                                except Exception as user_e:
-                                    self.logger.debug(f"Could not load user from token: {str(user_e)}")
-                            elif "id" in payload_data:
-                                self.logger.debug(f"Token contains id: {payload_data['id']}")
-                        except Exception as e:
-                            self.logger.debug(f"Error decoding token payload: {str(e)}")
-                except Exception as e:
-                    self.logger.debug(f"Error processing token (for debugging only): {str(e)}")
+    def __call__(self, request):
+        if request.path_info.startswith("/api/"):
+            auth_header, source = self.resolve_authorization(request)
+            if auth_header:
+                request.META["HTTP_AUTHORIZATION"] = auth_header
+                request.META["Authorization"] = auth_header
+                if source != "META.HTTP_AUTHORIZATION":
+                    self.logger.debug("Authorization normalized from %s", source)
+                if auth_header.startswith("Bearer ") and getattr(request, "_force_auth_user", None) is None:
+                    request._force_auth_user = SimpleLazyObject(partial(self.token_user, auth_header[7:]))
 
         # Process the request
         response = self.get_response(request)
@@ -0,0 +1,77 @@
+from django.db import migrations, models
+from django.db.models import Q, Value
+
+
+# Frozen copies of core.models.coaching_summary_snippet / build_batch_summary_columns as of this
+# migration, so later changes to the model helpers do not change what the backfill writes.
+def _coaching_summary_snippet(coaching_report, max_len=200):
+    if not isinstance(coaching_report, dict):
+        return ""
+    raw = coaching_report.get("executive_summary") or coaching_report.get("summary") or ""
+    if isinstance(raw, list):
+        raw = raw[0] if raw else ""
+    text = str(raw).strip()
+    if len(text) <= max_len:
+        return text
+    return f"{text[: max_len - 1].rstrip()}…"
+
+
+def _summary_columns(batch_summary, coaching_report):
+    summary = batch_summary if isinstance(batch_summary, dict) else {}
+    accuracy = summary.get("overall_accuracy_pct")
+    try:
+        accuracy = float(accuracy) if accuracy is not None else None
+    except (TypeError, ValueError):
+        accuracy = None
+
+    top_moments = summary.get("top_critical_moments")
+    top_moment = None
+    if isinstance(top_moments, list) and top_moments and isinstance(top_moments[0], dict):
+        top_moment = top_moments[0]
+
+    return {
+        "overall_accuracy_pct": accuracy,
+        "coach_summary": _coaching_summary_snippet(coaching_report),
+        "top_moment": top_moment,
+    }
+
+
+def _has_payload(field):
+    # Neither SQL NULL nor a stored JSON null has anything to backfill.
+    return Q(**{f"{field}__isnull": False}) & ~Q(**{field: Value(None, models.JSONField())})
+
+
+def backfill_summary_columns(apps, schema_editor):
+    BatchAnalysisReport = apps.get_model("core", "BatchAnalysisReport")
+    reports = BatchAnalysisReport.objects.filter(_has_payload("batch_summary") | _has_payload("coaching_report")).only(
+        "id", "batch_summary", "coaching_report"
+    )
+    for report in reports.iterator(chunk_size=200):
+        columns = _summary_columns(report.batch_summary, report.coaching_report)
+        BatchAnalysisReport.objects.filter(pk=report.pk).update(**columns)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0030_sharelink"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="batchanalysisreport",
+            name="overall_accuracy_pct",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="batchanalysisreport",
+            name="coach_summary",
+            field=models.CharField(blank=True, default="", max_length=200),
+        ),
+        migrations.AddField(
+            model_name="batchanalysisreport",
+            name="top_moment",
+            field=models.JSONField(blank=True, default=None, null=True),
+        ),
+        migrations.RunPython(backfill_summary_columns, migrations.RunPython.noop),
+    ]
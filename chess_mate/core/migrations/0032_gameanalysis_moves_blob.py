@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0031_batchanalysisreport_summary_columns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gameanalysis",
+            name="moves_blob",
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0032_gameanalysis_moves_blob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BatchGameResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("result_key", models.CharField(max_length=64, unique=True)),
+                ("depth", models.IntegerField()),
+                ("result", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["created_at"], name="core_batchg_created_7e562a_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated manually for the spaced-repetition moment index
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0033_batchgameresult"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReviewableMoment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("moment_key", models.CharField(max_length=128)),
+                ("move_number", models.IntegerField()),
+                ("swing", models.FloatField()),
+                ("phase", models.CharField(blank=True, default="", max_length=16)),
+                ("moment", models.JSONField(blank=True, default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "analysis",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reviewable_moments",
+                        to="core.gameanalysis",
+                    ),
+                ),
+                (
+                    "game",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reviewable_moments",
+                        to="core.game",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reviewable_moments",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="reviewablemoment",
+            index=models.Index(fields=["user", "-swing"], name="core_review_user_id_3691ca_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="reviewablemoment",
+            index=models.Index(fields=["user", "moment_key"], name="core_review_user_id_a022d4_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="reviewablemoment",
+            constraint=models.UniqueConstraint(
+                fields=("game", "move_number"),
+                name="unique_reviewable_moment_per_move",
+            ),
+        ),
+    ]
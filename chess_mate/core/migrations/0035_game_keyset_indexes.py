@@ -0,0 +1,37 @@
+# Generated manually for keyset pagination of game lists
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0034_reviewablemoment"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(fields=["user", "-date_played", "-id"], name="games_user_id_c3762b_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(fields=["user", "platform", "-date_played", "-id"], name="games_user_id_37e275_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(fields=["user", "result", "-date_played", "-id"], name="games_user_id_fa292d_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["user", "time_control_type", "-date_played", "-id"], name="games_user_id_dc7b26_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["user", "analysis_status", "-date_played", "-id"], name="games_user_id_679821_idx"
+            ),
+        ),
+    ]
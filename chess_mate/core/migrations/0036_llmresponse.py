@@ -0,0 +1,36 @@
+# Generated manually for the content-addressed LLM response cache
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0035_game_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LLMResponse",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("response_key", models.CharField(max_length=64, unique=True)),
+                ("purpose", models.CharField(max_length=50)),
+                ("model", models.CharField(max_length=100)),
+                ("response", models.JSONField()),
+                ("hit_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["purpose", "created_at"], name="core_llmres_purpose_e6b174_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated manually for the append-only credit ledger
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0036_llmresponse"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="credits_ledger_through",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="CreditLedgerEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("delta", models.IntegerField()),
+                ("reason", models.CharField(max_length=32)),
+                ("reference", models.CharField(max_length=128)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="credit_ledger_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["user", "id"], name="core_credit_user_id_b41299_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "reason", "reference"),
+                        name="credit_ledger_unique_reference",
+                    )
+                ],
+            },
+        ),
+    ]
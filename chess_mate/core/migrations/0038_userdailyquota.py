@@ -0,0 +1,51 @@
+# Generated manually for the denormalized abuse-limit counters
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0037_creditledgerentry"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserDailyQuota",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("local_date", models.DateField()),
+                ("batches", models.IntegerField(default=0)),
+                ("games_imported", models.IntegerField(default=0)),
+                ("single_analyses", models.IntegerField(default=0)),
+                ("active_batches", models.IntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_quotas",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "local_date"),
+                        name="unique_user_daily_quota",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -15,13 +15,17 @@ import re
 import uuid
 from typing import Any, Dict, List, Optional
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models.query_utils import DeferredAttribute
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from .move_analysis_codec import MOVE_FORMAT_VERSION, decode_moves, encode_moves
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +54,8 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     bio = models.TextField(blank=True, default="")
     credits = models.IntegerField(default=10)
+    # Id of the last CreditLedgerEntry already folded into `credits` (see core.credit_ledger).
+    credits_ledger_through = models.BigIntegerField(default=0)
     elo_rating = models.IntegerField(default=1200)
     # Legacy production DBs have a NOT NULL core_profile.rating column not used by app logic.
     legacy_rating = models.IntegerField(default=1200, db_column="rating")
@@ -533,6 +539,16 @@ def get_default_user():
     return User.objects.get_or_create(username="legacy_user")[0].id
 
 
+class GameQuerySet(models.QuerySet):
+    """Game querysets with a lean projection for list and status paths."""
+
+    HEAVY_FIELDS = ("pgn", "analysis", "feedback")
+
+    def lean(self, *keep: str) -> "GameQuerySet":
+        """Defer the PGN text and analysis/feedback JSON unless listed in ``keep``."""
+        return self.defer(*(field for field in self.HEAVY_FIELDS if field not in keep))
+
+
 class Game(models.Model):
     """Model representing a chess game."""
 
@@ -587,6 +603,8 @@ class Game(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
     analysis_completed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = GameQuerySet.as_manager()
+
     class Meta:
         db_table = "games"
         unique_together = ("user", "platform", "game_id")
@@ -597,6 +615,12 @@ class Game(models.Model):
             models.Index(fields=["analysis_status"]),
             models.Index(fields=["time_control_type"]),
             models.Index(fields=["eco_code"]),
+            # Keyset pagination for game lists (see core.game_listing).
+            models.Index(fields=["user", "-date_played", "-id"]),
+            models.Index(fields=["user", "platform", "-date_played", "-id"]),
+            models.Index(fields=["user", "result", "-date_played", "-id"]),
+            models.Index(fields=["user", "time_control_type", "-date_played", "-id"]),
+            models.Index(fields=["user", "analysis_status", "-date_played", "-id"]),
         ]
 
     def __init__(self, *args, **kwargs):
@@ -829,6 +853,46 @@ class Game(models.Model):
         return None
 
 
+PACKED_MOVES_KEY = "moves_packed"
+STORED_ANALYSIS_ATTR = "_stored_analysis_data"
+
+
+class _MoveDetailAttribute(DeferredAttribute):
+    """Unpacks ``moves_blob`` into ``analysis_data["moves"]`` the first time the JSON is read."""
+
+    def __get__(self, instance, cls=None):
+        data = super().__get__(instance, cls)
+        if instance is None:
+            return data
+        if isinstance(data, dict) and PACKED_MOVES_KEY in data:
+            data.pop(PACKED_MOVES_KEY)
+            try:
+                data["moves"] = decode_moves(instance.moves_blob)
+            except Exception as exc:
+                logger.error("Could not unpack move analysis for GameAnalysis %s: %s", instance.pk, exc)
+                data["moves"] = []
+        return data
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class MoveDetailJSONField(models.JSONField):
+    """JSON column whose ``moves`` list may be stored packed in a sibling ``moves_blob``."""
+
+    descriptor_class = _MoveDetailAttribute
+
+    def pre_save(self, model_instance, add):
+        # GameAnalysis.save stages the packed form here; the attribute keeps the logical value.
+        stored = model_instance.__dict__.get(STORED_ANALYSIS_ATTR)
+        return stored if stored is not None else super().pre_save(model_instance, add)
+
+    def deconstruct(self):
+        # The column itself is plain JSON; keep migrations on the stock field class.
+        name, _path, args, kwargs = super().deconstruct()
+        return name, "django.db.models.JSONField", args, kwargs
+
+
 class GameAnalysis(models.Model):
     """Analysis results for a chess game."""
 
@@ -843,8 +907,9 @@ class GameAnalysis(models.Model):
     # If metrics field is causing errors because it doesn't exist in the database schema,
     # we'll provide a property that safely returns metrics data from the analysis_data
 
-    # Store the detailed analysis as JSON
-    analysis_data = models.JSONField(default=dict, blank=True)
+    # Store the detailed analysis as JSON; per-move detail is packed into moves_blob on save.
+    analysis_data = MoveDetailJSONField(default=dict, blank=True)
+    moves_blob = models.BinaryField(null=True, blank=True, editable=False)
 
     # Store the AI-generated feedback
     feedback = models.JSONField(default=dict, blank=True)
@@ -858,6 +923,32 @@ class GameAnalysis(models.Model):
             models.Index(fields=["created_at"]),
         ]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        data = self.__dict__.get("analysis_data")
+        if not isinstance(data, dict) or (update_fields is not None and "analysis_data" not in update_fields):
+            return super().save(*args, **kwargs)
+
+        # Copy so a receiver that unpacks the attribute in place cannot change what is written.
+        stored = dict(data)
+        if PACKED_MOVES_KEY not in data:
+            # Move detail was read (or replaced) since load: repack it.
+            blob = encode_moves(data.get("moves")) if getattr(settings, "COMPACT_MOVE_ANALYSIS", True) else None
+            self.moves_blob = blob
+            if blob is not None:
+                stored.pop("moves", None)
+                stored[PACKED_MOVES_KEY] = MOVE_FORMAT_VERSION
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "moves_blob"}
+
+        # Only the column sees the packed dict (MoveDetailJSONField.pre_save); signal receivers
+        # read analysis_data as usual.
+        self.__dict__[STORED_ANALYSIS_ATTR] = stored
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            del self.__dict__[STORED_ANALYSIS_ATTR]
+
     @property
     def metrics(self):
         """Safely get metrics from analysis_data."""
@@ -911,9 +1002,56 @@ class GameAnalysis(models.Model):
         return f"Analysis for Game {self.game_id} - Created: {self.created_at.strftime('%Y-%m-%d')}"
 
 
+def coaching_summary_snippet(coaching_report: Any, max_len: int = 200) -> str:
+    """One-line preview from coaching_report for list/history views."""
+    if not isinstance(coaching_report, dict):
+        return ""
+    raw = coaching_report.get("executive_summary") or coaching_report.get("summary") or ""
+    if isinstance(raw, list):
+        raw = raw[0] if raw else ""
+    text = str(raw).strip()
+    if len(text) <= max_len:
+        return text
+    return f"{text[: max_len - 1].rstrip()}…"
+
+
+def build_batch_summary_columns(batch_summary: Any, coaching_report: Any) -> Dict[str, Any]:
+    """Denormalized list-view columns derived from the batch JSON payloads."""
+    summary = batch_summary if isinstance(batch_summary, dict) else {}
+    accuracy = summary.get("overall_accuracy_pct")
+    try:
+        accuracy = float(accuracy) if accuracy is not None else None
+    except (TypeError, ValueError):
+        accuracy = None
+
+    top_moments = summary.get("top_critical_moments")
+    top_moment = None
+    if isinstance(top_moments, list) and top_moments and isinstance(top_moments[0], dict):
+        top_moment = top_moments[0]
+
+    return {
+        "overall_accuracy_pct": accuracy,
+        "coach_summary": coaching_summary_snippet(coaching_report),
+        "top_moment": top_moment,
+    }
+
+
+class BatchAnalysisReportQuerySet(models.QuerySet):
+    """Batch report querysets that skip the large JSON payloads for list/status paths."""
+
+    HEAVY_FIELDS = ("aggregate_metrics", "batch_summary", "per_game_results", "coaching_report")
+
+    def summary(self, *keep: str) -> "BatchAnalysisReportQuerySet":
+        """Defer the report JSON unless listed in ``keep``; list views read the summary columns."""
+        return self.defer(*(field for field in self.HEAVY_FIELDS if field not in keep))
+
+
 class BatchAnalysisReport(models.Model):
     """Persisted combined report for a completed batch analysis task."""
 
+    SUMMARY_SOURCE_FIELDS = ("batch_summary", "coaching_report")
+    SUMMARY_FIELDS = ("overall_accuracy_pct", "coach_summary", "top_moment")
+
     STATUS_CHOICES = [
         ("pending", "Pending"),
         ("in_progress", "In Progress"),
@@ -939,9 +1077,16 @@ class BatchAnalysisReport(models.Model):
     credits_refunded = models.BooleanField(default=False)
     share_token = models.UUIDField(null=True, blank=True, unique=True, db_index=True)
 
+    # Summary columns kept in sync with batch_summary/coaching_report on save()
+    overall_accuracy_pct = models.FloatField(null=True, blank=True)
+    coach_summary = models.CharField(max_length=200, blank=True, default="")
+    top_moment = models.JSONField(null=True, blank=True, default=None)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BatchAnalysisReportQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Batch Analysis Report"
         verbose_name_plural = "Batch Analysis Reports"
@@ -957,6 +1102,140 @@ class BatchAnalysisReport(models.Model):
     def __str__(self) -> str:
         return f"Batch report {self.id} for {self.user.username} ({self.games_count} games)"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as loaded, so core.daily_quota can tell which saves start or finish a batch.
+        if "status" in field_names:
+            instance._quota_status = instance.status
+        return instance
+
+    def refresh_summary_columns(self) -> None:
+        for field, value in build_batch_summary_columns(self.batch_summary, self.coaching_report).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        """Recompute summary columns whenever the JSON they derive from is written."""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            if set(self.SUMMARY_SOURCE_FIELDS) & set(update_fields):
+                self.refresh_summary_columns()
+                kwargs["update_fields"] = list(dict.fromkeys([*update_fields, *self.SUMMARY_FIELDS]))
+        elif not set(self.SUMMARY_SOURCE_FIELDS) & self.get_deferred_fields():
+            self.refresh_summary_columns()
+        super().save(*args, **kwargs)
+
+
+class ShareLink(models.Model):
+    """Indexed lookup for public moment share tokens.
+
+    Batch shares need no row here: ``BatchAnalysisReport.share_token`` is already a unique column.
+    """
+
+    KIND_MOMENT = "moment"
+
+    KIND_CHOICES = [
+        (KIND_MOMENT, "Game Moment"),
+    ]
+
+    token = models.UUIDField(unique=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    analysis = models.ForeignKey(
+        "GameAnalysis",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="share_links",
+    )
+    move_number = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["analysis", "kind"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} share {self.token}"
+
+
+class BatchGameResult(models.Model):
+    """Content-addressed per-game batch result, reused by re-runs when the inputs are unchanged."""
+
+    result_key = models.CharField(max_length=64, unique=True)
+    depth = models.IntegerField()
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Batch game result {self.result_key[:12]} (depth {self.depth})"
+
+
+class LLMResponse(models.Model):
+    """Content-addressed LLM completion (durable tier of core.llm_cache)."""
+
+    response_key = models.CharField(max_length=64, unique=True)
+    purpose = models.CharField(max_length=50)
+    model = models.CharField(max_length=100)
+    response = models.JSONField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["purpose", "created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"LLM response {self.response_key[:12]} ({self.purpose})"
+
+
+class CreditLedgerEntry(models.Model):
+    """Append-only credit change; balances are derived in core.credit_ledger."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="credit_ledger_entries")
+    delta = models.IntegerField()
+    reason = models.CharField(max_length=32)
+    reference = models.CharField(max_length=128)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "reason", "reference"], name="credit_ledger_unique_reference"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "id"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.reason} {self.delta:+d} credits for user {self.user_id} ({self.reference})"
+
+
+class UserDailyQuota(models.Model):
+    """Per-user, per-local-day counters behind the abuse limits; maintained by core.daily_quota."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_quotas")
+    local_date = models.DateField()
+    batches = models.IntegerField(default=0)
+    games_imported = models.IntegerField(default=0)
+    single_analyses = models.IntegerField(default=0)
+    # Pending/in-progress batches created on local_date; the active-batch check sums every row.
+    active_batches = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "local_date"], name="unique_user_daily_quota"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Daily quota for user {self.user_id} on {self.local_date}"
+
 
 class UserNotification(models.Model):
     """In-app notification for inbox items, analysis completions, and coach insights."""
@@ -1039,6 +1318,39 @@ class SpacedReminderLog(models.Model):
         return f"spaced:{self.moment_key} for {self.user.username}"
 
 
+class ReviewableMoment(models.Model):
+    """Spaced-repetition candidate: one row per critical moment of an analyzed game (SRG-13).
+
+    Rebuilt from the analysis feedback whenever a GameAnalysis is saved, so reminder
+    selection is a single indexed query joined against SpacedReminderLog.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="reviewable_moments")
+    game = models.ForeignKey("Game", on_delete=models.CASCADE, related_name="reviewable_moments")
+    analysis = models.ForeignKey("GameAnalysis", on_delete=models.CASCADE, related_name="reviewable_moments")
+    moment_key = models.CharField(max_length=128)
+    move_number = models.IntegerField()
+    swing = models.FloatField()
+    phase = models.CharField(max_length=16, blank=True, default="")
+    moment = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-swing"]),
+            models.Index(fields=["user", "moment_key"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game", "move_number"],
+                name="unique_reviewable_moment_per_move",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"moment:{self.moment_key} ({self.swing:+.2f})"
+
+
 class EmailSendLog(models.Model):
     """Tracks coaching email sends for caps and idempotency (SRG-15/13/27)."""
 
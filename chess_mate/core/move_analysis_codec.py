@@ -0,0 +1,326 @@
+"""
+Compact, versioned storage format for per-move analysis payloads.
+
+The verbose move dicts written by the analyzers (``eval_before``, ``best_line``,
+``fen`` ...) are packed into parallel typed columns and compressed:
+
+- evaluations as int16 centipawns (only when the value round-trips exactly; a mask bit
+  records whether the value was an int so it decodes as one),
+- UCI moves / best lines as packed uint16 (from, to, promotion),
+- classifications as uint8 codes,
+- SAN / FEN strings as newline-joined text sections (``position`` is stored once
+  when it repeats ``fen``).
+
+Anything that does not fit a column is kept verbatim in a per-move residual dict, so
+``decode_moves(encode_moves(moves)) == moves`` holds for every input the encoder
+accepts. Blobs start with ``MAGIC`` + a one-byte format version; decoders for older
+versions must be kept when the layout changes.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+import sys
+import zlib
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import chess
+
+MAGIC = b"CMA"
+MOVE_FORMAT_VERSION = 1
+
+# Append-only: codes are persisted in blobs.
+CLASSIFICATIONS = (
+    "neutral",
+    "best",
+    "excellent_move",
+    "good_move",
+    "inaccuracy",
+    "mistake",
+    "blunder",
+    "brilliant",
+    "great",
+    "excellent",
+    "good",
+    "book",
+    "missed_win",
+    "forced",
+)
+_CLASSIFICATION_CODES = {name: code for code, name in enumerate(CLASSIFICATIONS, start=1)}
+
+# Evaluation keys stored as int16 centipawns.
+EVAL_KEYS = (
+    "eval_before",
+    "eval_after",
+    "eval_after_best",
+    "eval_change",
+    "position_score",
+    "evaluation",
+    "centipawn_loss",
+)
+BOOL_KEYS = ("is_white", "is_best", "is_critical", "is_check", "is_capture", "is_tactical")
+TIME_KEYS = ("time", "time_spent")
+TEXT_KEYS = ("san", "best_move_san", "fen", "position")
+
+# One presence bit per slot; BOOL_KEYS use two bits (present, value).
+_SLOTS = (
+    ("move_number", "move", "best_move", "best_line", "classification", "depth", "position_is_fen")
+    + EVAL_KEYS
+    + TIME_KEYS
+    + TEXT_KEYS
+)
+_BIT = {name: 1 << index for index, name in enumerate(_SLOTS)}
+_BOOL_PRESENT = {name: 1 << (len(_SLOTS) + 2 * index) for index, name in enumerate(BOOL_KEYS)}
+_BOOL_VALUE = {name: 1 << (len(_SLOTS) + 2 * index + 1) for index, name in enumerate(BOOL_KEYS)}
+# Set when an EVAL_KEYS value was an int; these bits were always zero in earlier v1 blobs.
+_EVAL_IS_INT = {name: 1 << (len(_SLOTS) + 2 * len(BOOL_KEYS) + index) for index, name in enumerate(EVAL_KEYS)}
+
+_PROMOTIONS = {None: 0, chess.KNIGHT: 1, chess.BISHOP: 2, chess.ROOK: 3, chess.QUEEN: 4}
+_PROMOTION_PIECES = {code: piece for piece, code in _PROMOTIONS.items()}
+_NULL_MOVE = 0xFFFF
+
+
+def _pack_uci(value: Any) -> Optional[int]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        move = chess.Move.from_uci(value)
+    except ValueError:
+        return None
+    if not move or move.uci() != value or move.drop:
+        return None
+    return move.from_square | (move.to_square << 6) | (_PROMOTIONS[move.promotion] << 12)
+
+
+@lru_cache(maxsize=4096)
+def _unpack_uci(packed: int) -> str:
+    return chess.Move(packed & 0x3F, (packed >> 6) & 0x3F, _PROMOTION_PIECES[packed >> 12]).uci()
+
+
+def _pack_centipawns(value: Any) -> Optional[int]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    centipawns = round(value * 100)
+    if not -32768 <= centipawns <= 32767 or centipawns / 100 != value:
+        return None
+    return centipawns
+
+
+def _column_bytes(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _column_from(typecode: str, raw: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(raw)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def encode_moves(moves: Any) -> Optional[bytes]:
+    """Pack a list of move dicts; returns ``None`` when the payload should stay JSON."""
+    if not isinstance(moves, list) or not moves or not all(isinstance(move, dict) for move in moves):
+        return None
+
+    masks = array("Q")
+    move_numbers = array("H")
+    ucis = array("H")
+    best_moves = array("H")
+    classifications = array("B")
+    depths = array("B")
+    evals = {key: array("h") for key in EVAL_KEYS}
+    times = {key: array("d") for key in TIME_KEYS}
+    line_lengths = array("B")
+    line_moves = array("H")
+    texts: Dict[str, List[str]] = {key: [] for key in TEXT_KEYS}
+    residuals: Dict[str, Dict[str, Any]] = {}
+
+    for index, move in enumerate(moves):
+        mask = 0
+        residual: Dict[str, Any] = {}
+
+        number = move.get("move_number")
+        if isinstance(number, int) and not isinstance(number, bool) and 0 <= number <= 0xFFFF:
+            mask |= _BIT["move_number"]
+        elif "move_number" in move:
+            residual["move_number"] = number
+        move_numbers.append(number if mask & _BIT["move_number"] else 0)
+
+        for key, column in (("move", ucis), ("best_move", best_moves)):
+            packed = _pack_uci(move.get(key))
+            if packed is not None:
+                mask |= _BIT[key]
+            elif key in move:
+                residual[key] = move[key]
+            column.append(_NULL_MOVE if packed is None else packed)
+
+        line = move.get("best_line")
+        packed_line = [_pack_uci(step) for step in line] if isinstance(line, list) and len(line) < 256 else None
+        if packed_line is not None and None not in packed_line:
+            mask |= _BIT["best_line"]
+            line_lengths.append(len(packed_line))
+            line_moves.extend(packed_line)
+        else:
+            line_lengths.append(0)
+            if "best_line" in move:
+                residual["best_line"] = line
+
+        classification = move.get("classification")
+        code = _CLASSIFICATION_CODES.get(classification) if isinstance(classification, str) else None
+        if code is not None:
+            mask |= _BIT["classification"]
+        elif "classification" in move:
+            residual["classification"] = classification
+        classifications.append(code or 0)
+
+        depth = move.get("depth")
+        if isinstance(depth, int) and not isinstance(depth, bool) and 0 <= depth < 256:
+            mask |= _BIT["depth"]
+        elif "depth" in move:
+            residual["depth"] = depth
+        depths.append(depth if mask & _BIT["depth"] else 0)
+
+        for key in EVAL_KEYS:
+            centipawns = _pack_centipawns(move.get(key))
+            if centipawns is not None:
+                mask |= _BIT[key]
+                if isinstance(move[key], int):
+                    mask |= _EVAL_IS_INT[key]
+            elif key in move:
+                residual[key] = move[key]
+            evals[key].append(centipawns or 0)
+
+        for key in TIME_KEYS:
+            value = move.get(key)
+            if isinstance(value, float):
+                mask |= _BIT[key]
+            elif key in move:
+                residual[key] = value
+            times[key].append(value if mask & _BIT[key] else 0.0)
+
+        for key in BOOL_KEYS:
+            if isinstance(move.get(key), bool):
+                mask |= _BOOL_PRESENT[key]
+                if move[key]:
+                    mask |= _BOOL_VALUE[key]
+            elif key in move:
+                residual[key] = move[key]
+
+        fen = move.get("fen")
+        if isinstance(fen, str) and "\n" not in fen and "position" in move and move["position"] == fen:
+            mask |= _BIT["position_is_fen"]
+        for key in TEXT_KEYS:
+            if key == "position" and mask & _BIT["position_is_fen"]:
+                continue
+            value = move.get(key)
+            if isinstance(value, str) and "\n" not in value:
+                mask |= _BIT[key]
+                texts[key].append(value)
+            elif key in move:
+                residual[key] = value
+
+        for key, value in move.items():
+            if key not in _BIT and key not in _BOOL_PRESENT:
+                residual[key] = value
+
+        masks.append(mask)
+        if residual:
+            residuals[str(index)] = residual
+
+    try:
+        residual_bytes = json.dumps(residuals, separators=(",", ":")).encode("utf-8") if residuals else b""
+    except (TypeError, ValueError):
+        return None
+
+    sections = [_column_bytes(column) for column in (masks, move_numbers, ucis, best_moves, classifications, depths)]
+    sections.extend(_column_bytes(evals[key]) for key in EVAL_KEYS)
+    sections.extend(_column_bytes(times[key]) for key in TIME_KEYS)
+    sections.extend([_column_bytes(line_lengths), _column_bytes(line_moves)])
+    sections.extend("\n".join(texts[key]).encode("utf-8") for key in TEXT_KEYS)
+    sections.append(residual_bytes)
+
+    body = [struct.pack("<I", len(moves))]
+    for raw in sections:
+        body.append(struct.pack("<I", len(raw)))
+        body.append(raw)
+    return MAGIC + bytes([MOVE_FORMAT_VERSION]) + zlib.compress(b"".join(body), 6)
+
+
+def decode_moves(blob: Any) -> List[Dict[str, Any]]:
+    """Rebuild the move dict list from an ``encode_moves`` blob."""
+    raw = bytes(blob or b"")
+    if raw[: len(MAGIC)] != MAGIC or len(raw) <= len(MAGIC):
+        raise ValueError("Not a packed move analysis payload")
+    version = raw[len(MAGIC)]
+    if version != MOVE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported move analysis format version {version}")
+    return _decode_v1(zlib.decompress(raw[len(MAGIC) + 1 :]))
+
+
+def _decode_v1(body: bytes) -> List[Dict[str, Any]]:
+    (count,) = struct.unpack_from("<I", body, 0)
+    offset = 4
+    sections = []
+    while offset < len(body):
+        (size,) = struct.unpack_from("<I", body, offset)
+        offset += 4
+        sections.append(body[offset : offset + size])
+        offset += size
+
+    typecodes = ["Q", "H", "H", "H", "B", "B"] + ["h"] * len(EVAL_KEYS) + ["d"] * len(TIME_KEYS) + ["B", "H"]
+    columns = [_column_from(typecode, raw) for typecode, raw in zip(typecodes, sections)]
+    masks, move_numbers, ucis, best_moves, classifications, depths = columns[:6]
+    evals = dict(zip(EVAL_KEYS, columns[6 : 6 + len(EVAL_KEYS)]))
+    times = dict(zip(TIME_KEYS, columns[6 + len(EVAL_KEYS) : 6 + len(EVAL_KEYS) + len(TIME_KEYS)]))
+    line_lengths, line_moves = columns[-2:]
+    text_sections = sections[len(typecodes) : len(typecodes) + len(TEXT_KEYS)]
+    texts = {key: iter(raw.decode("utf-8").split("\n")) for key, raw in zip(TEXT_KEYS, text_sections)}
+    residual_raw = sections[len(typecodes) + len(TEXT_KEYS)]
+    residuals = json.loads(residual_raw.decode("utf-8")) if residual_raw else {}
+
+    moves: List[Dict[str, Any]] = []
+    line_offset = 0
+    for index in range(count):
+        mask = masks[index]
+        move: Dict[str, Any] = {}
+        if mask & _BIT["move_number"]:
+            move["move_number"] = move_numbers[index]
+        if mask & _BIT["move"]:
+            move["move"] = _unpack_uci(ucis[index])
+        if mask & _BIT["best_move"]:
+            move["best_move"] = _unpack_uci(best_moves[index])
+        line_length = line_lengths[index]
+        if mask & _BIT["best_line"]:
+            move["best_line"] = [_unpack_uci(step) for step in line_moves[line_offset : line_offset + line_length]]
+        line_offset += line_length
+        if mask & _BIT["classification"]:
+            move["classification"] = CLASSIFICATIONS[classifications[index] - 1]
+        if mask & _BIT["depth"]:
+            move["depth"] = depths[index]
+        for key in EVAL_KEYS:
+            if mask & _EVAL_IS_INT[key]:
+                move[key] = evals[key][index] // 100
+            elif mask & _BIT[key]:
+                move[key] = evals[key][index] / 100
+        for key in TIME_KEYS:
+            if mask & _BIT[key]:
+                move[key] = times[key][index]
+        for key in BOOL_KEYS:
+            if mask & _BOOL_PRESENT[key]:
+                move[key] = bool(mask & _BOOL_VALUE[key])
+        for key in TEXT_KEYS:
+            if mask & _BIT[key]:
+                move[key] = next(texts[key])
+        if mask & _BIT["position_is_fen"]:
+            move["position"] = move["fen"]
+        move.update(residuals.get(str(index), {}))
+        moves.append(move)
+    return moves
@@ -0,0 +1,21 @@
+"""
+Request parsers for the REST API.
+
+Kept free of other ``core`` imports: DRF imports ``DEFAULT_PARSER_CLASSES`` while
+``core.error_handling`` is still loading.
+"""
+
+from rest_framework.parsers import JSONParser
+
+# Request attribute holding the JSON body parsed by RequestValidationMiddleware.
+PARSED_JSON_ATTR = "_validated_json"
+
+
+class ValidatedJSONParser(JSONParser):
+    """JSONParser that returns the body RequestValidationMiddleware already parsed, if any."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = getattr((parser_context or {}).get("request"), "_request", None)
+        if request is not None and hasattr(request, PARSED_JSON_ATTR):
+            return getattr(request, PARSED_JSON_ATTR)
+        return super().parse(stream, media_type, parser_context)
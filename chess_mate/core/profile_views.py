@@ -31,6 +31,9 @@ from .cache import CACHE_BACKEND_REDIS, cacheable, invalidate_cache_for
 # Local imports - Constants
 from .constants import CREDIT_VALUES
 
+# Local imports - Credits
+from .credit_ledger import credit_balance
+
 # Local imports - Error handling
 from .error_handling import (
     api_error_handler,
@@ -85,13 +88,14 @@ def get_basic_profile(user):
         if hasattr(user, "profile"):
             try:
                 profile = user.profile
-                response_data["profile"]["credits"] = getattr(profile, "credits", 0)
+                balance = credit_balance(user.id)
+                response_data["profile"]["credits"] = balance
                 response_data["profile"]["chess_com_username"] = getattr(profile, "chess_com_username", "")
                 response_data["profile"]["lichess_username"] = getattr(profile, "lichess_username", "")
                 response_data["profile"]["preferences"] = getattr(profile, "preferences", {})
                 response_data["elo_rating"] = getattr(profile, "elo_rating", 1200)
                 response_data["analysis_count"] = getattr(profile, "analysis_count", 0)
-                response_data["credits"] = getattr(profile, "credits", 0)
+                response_data["credits"] = balance
                 response_data["chess_com_username"] = getattr(profile, "chess_com_username", "")
                 response_data["lichess_username"] = getattr(profile, "lichess_username", "")
                 response_data["preferences"] = getattr(profile, "preferences", {})
@@ -160,7 +164,7 @@ def profile_view(request):
                 ),  # Use max rating as general rating
                 "elo_rating": getattr(profile, "elo_rating", 1200),
                 "analysis_count": getattr(profile, "analysis_count", 0),
-                "credits": profile.credits,
+                "credits": credit_balance(profile.user_id),
                 "email_verified": profile.email_verified,
                 "created_at": profile.created_at,
                 "updated_at": profile.updated_at,
@@ -202,7 +206,7 @@ def profile_view(request):
                 "email": request.user.email,
                 "first_name": request.user.first_name,
                 "last_name": request.user.last_name,
-                "credits": profile.credits,
+                "credits": credit_balance(profile.user_id),
                 "chess_com_username": profile.chess_com_username,
                 "chesscom_username": profile.chess_com_username,
                 "lichess_username": profile.lichess_username,
@@ -238,7 +242,7 @@ def profile_view(request):
                             "email": request.user.email,
                         },
                         "profile": {
-                            "credits": getattr(request.user.profile, "credits", 10),
+                            "credits": credit_balance(request.user.id),
                             "chess_com_username": getattr(request.user.profile, "chess_com_username", "") or "",
                             "lichess_username": getattr(request.user.profile, "lichess_username", "") or "",
                             "email_verified": getattr(request.user.profile, "email_verified", False),
@@ -249,7 +253,7 @@ def profile_view(request):
                     },
                     "username": request.user.username,
                     "email": request.user.email,
-                    "credits": getattr(request.user.profile, "credits", 10),
+                    "credits": credit_balance(request.user.id),
                     "chess_com_username": getattr(request.user.profile, "chess_com_username", "") or "",
                     "lichess_username": getattr(request.user.profile, "lichess_username", "") or "",
                     "elo_rating": getattr(request.user.profile, "elo_rating", 1200),
@@ -271,7 +275,7 @@ def profile_view(request):
                         "email": request.user.email,
                     },
                     "profile": {
-                        "credits": getattr(request.user.profile, "credits", 10),
+                        "credits": credit_balance(request.user.id),
                         "chess_com_username": getattr(request.user.profile, "chess_com_username", "") or "",
                         "lichess_username": getattr(request.user.profile, "lichess_username", "") or "",
                         "email_verified": getattr(request.user.profile, "email_verified", False),
@@ -282,7 +286,7 @@ def profile_view(request):
                 },
                 "username": request.user.username,
                 "email": request.user.email,
-                "credits": getattr(request.user.profile, "credits", 10),
+                "credits": credit_balance(request.user.id),
                 "chess_com_username": getattr(request.user.profile, "chess_com_username", "") or "",
                 "lichess_username": getattr(request.user.profile, "lichess_username", "") or "",
                 "elo_rating": getattr(request.user.profile, "elo_rating", 1200),
@@ -324,7 +328,7 @@ def fallback_profile_view(request):
         try:
             profile = request.user.profile
             profile_data = {
-                "credits": profile.credits,
+                "credits": credit_balance(profile.user_id),
                 "chess_com_username": profile.chess_com_username or "",
                 "lichess_username": profile.lichess_username or "",
                 "email_verified": profile.email_verified,
@@ -395,7 +399,7 @@ def update_profile(request):
                             "email": user.email,
                             "first_name": user.first_name,
                             "last_name": user.last_name,
-                            "credits": profile.credits,
+                            "credits": credit_balance(profile.user_id),
                             "chess_com_username": profile.chess_com_username,
                             "lichess_username": profile.lichess_username,
                             "elo_rating": profile.elo_rating,
@@ -479,7 +483,7 @@ def update_profile(request):
                 "email": user.email,
                 "first_name": user.first_name,
                 "last_name": user.last_name,
-                "credits": profile.credits,
+                "credits": credit_balance(profile.user_id),
                 "chess_com_username": profile.chess_com_username,
                 "lichess_username": profile.lichess_username,
                 "elo_rating": profile.elo_rating,
@@ -536,7 +540,7 @@ def add_credits(request):
 
         # Return updated profile
         return create_success_response(
-            data={"credits_added": credit_amount, "total_credits": profile.credits},
+            data={"credits_added": credit_amount, "total_credits": credit_balance(profile.user_id)},
             message=f"Successfully added {credit_amount} credits",
         )
     except ImportError as e:
@@ -917,7 +921,7 @@ def get_user_statistics(request):
             "by_result": {"win": win_count, "loss": loss_count, "draw": draw_count},
             "by_platform": {"chess_com": chess_com_count, "lichess": lichess_count},
         },
-        "analysis": {"remaining_credits": profile.credits},
+        "analysis": {"remaining_credits": credit_balance(profile.user_id)},
         "subscription": {"status": "none"},
     }
 
@@ -1337,7 +1341,7 @@ def minimal_profile_view(request):
             if hasattr(user, "profile"):
                 profile = user.profile
                 profile_data = {
-                    "credits": getattr(profile, "credits", 10),
+                    "credits": credit_balance(user.id),
                     "chess_com_username": getattr(profile, "chess_com_username", ""),
                     "lichess_username": getattr(profile, "lichess_username", ""),
                     "email_verified": getattr(profile, "email_verified", False),
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from datetime import timedelta
-from typing import Any, Dict, Optional
+from typing import Optional
 
 from django.contrib.auth.models import User
 from django.core import mail
@@ -14,8 +14,10 @@ from django.utils import timezone
 from django.utils.html import strip_tags
 
 from .email_send_log import (
+    claim_email_send,
     digest_already_sent_this_week,
-    log_email_send,
+    iso_week_key,
+    send_after_claim,
     spaced_sent_in_last_days,
 )
 from .email_utils import (
@@ -86,10 +88,24 @@ def send_reactivation_for_user(user: User, *, force: bool = False) -> bool:
     if not force and not is_eligible_for_reactivation(user, profile):
         return False
 
+    return deliver_reactivation_email(user)
+
+
+@transaction.atomic
+def deliver_reactivation_email(user: User, *, week_key: Optional[str] = None, connection=None) -> bool:
+    """Send the reactivation email; eligibility is the caller's job.
+
+    The EmailSendLog row for the ISO week is claimed first (unique per user, type and key),
+    so overlapping or resumed runs send at most once. The email is sent after the claim commits.
+    """
     if not is_email_configured():
         logger.error("Reactivation email not sent for %s: SMTP not configured", user.email)
         return False
 
+    claim = claim_email_send(user, EmailSendLog.TYPE_REACTIVATION, week_key=week_key or iso_week_key())
+    if claim is None:
+        return False
+
     base = get_frontend_base_url()
     cta_url = f"{base}/batch-analysis"
     context = email_template_context(
@@ -108,25 +124,23 @@ def send_reactivation_for_user(user: User, *, force: bool = False) -> bool:
             f"{cta_url}\n"
         )
 
-    mail.send_mail(
-        subject=REACTIVATION_SUBJECT,
-        message=strip_tags(str(html_body)),
-        from_email=None,
-        recipient_list=[user.email],
-        html_message=str(html_body),
-    )
-    log_email_send(user, EmailSendLog.TYPE_REACTIVATION)
-    logger.info("Reactivation email sent to %s", user.email)
+    def send() -> None:
+        mail.send_mail(
+            subject=REACTIVATION_SUBJECT,
+            message=strip_tags(str(html_body)),
+            from_email=None,
+            recipient_list=[user.email],
+            html_message=str(html_body),
+            connection=connection,
+        )
+        logger.info("Reactivation email sent to %s", user.email)
+
+    send_after_claim(claim, send)
     return True
 
 
 def send_reactivation_emails() -> int:
-    sent = 0
-    users = User.objects.filter(email__gt="", is_active=True).select_related("profile")
-    for user in users:
-        try:
-            if send_reactivation_for_user(user):
-                sent += 1
-        except Exception as exc:
-            logger.exception("Reactivation failed for user %s: %s", user.pk, exc)
-    return sent
+    """Send reactivation emails to all eligible users inline; beat shards this via ``send_reactivation_email_task``."""
+    from .email_campaigns import CAMPAIGN_REACTIVATION, run_campaign_inline
+
+    return run_campaign_inline(CAMPAIGN_REACTIVATION)
@@ -4,7 +4,6 @@ import builtins
 import inspect
 import json
 import logging
-import os
 import sys
 from functools import wraps
 from typing import Any, Dict, List, Optional, Set, Union
@@ -12,23 +11,14 @@ from typing import Any, Dict, List, Optional, Set, Union
 import redis
 from django.conf import settings
 
+from .redis_manager import redis_manager
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Keep module aliases unified for legacy tests that patch either import path.
 sys.modules.setdefault("chess_mate.core.redis_config", sys.modules[__name__])
 
-# Redis connection pool configuration
-REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
-REDIS_PORT = int(os.environ.get("REDIS_PORT", 6379))
-REDIS_DB = int(os.environ.get("REDIS_DB", 0))
-REDIS_PASSWORD = os.environ.get("REDIS_PASSWORD", None)
-REDIS_SOCKET_TIMEOUT = int(os.environ.get("REDIS_SOCKET_TIMEOUT", 5))
-REDIS_SOCKET_CONNECT_TIMEOUT = int(os.environ.get("REDIS_SOCKET_CONNECT_TIMEOUT", 5))
-REDIS_RETRY_ON_TIMEOUT = os.environ.get("REDIS_RETRY_ON_TIMEOUT", "true").lower() == "true"
-REDIS_CONNECTION_POOL_SIZE = int(os.environ.get("REDIS_CONNECTION_POOL_SIZE", 20))
-REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 100))
-
 # Redis key prefixes for different data types
 KEY_PREFIX_GAME = "game:"
 KEY_PREFIX_USER = "user:"
@@ -51,76 +41,24 @@ TTL_LOCK = 300  # 5 minutes
 TTL_RATE_LIMIT = 3600  # 1 hour
 TTL_STATS = 86400  # 24 hours
 
-# Initialize connection pool as None, will be created on first use
-connection_pool = None
-
 
 def get_redis_client() -> redis.Redis:
-    """Get a Redis client from the connection pool with improved error handling and retries."""
-    global connection_pool
+    """
+    Get the process-wide Redis client (``core.redis_manager``).
 
+    Falls back to ``DummyRedisClient`` when Redis is disabled or failed its last health
+    check, which is refreshed at most once per ``REDIS_HEALTH_CHECK_INTERVAL``.
+    """
     # Check if Redis is disabled in settings
     if getattr(settings, "REDIS_DISABLED", False):
         logger.info("Redis is disabled, using dummy client")
         return DummyRedisClient()
 
-    # Maximum number of retry attempts
-    max_retries = 3
-    retry_delay = 0.5  # seconds
-
-    # Create connection pool if it doesn't exist
-    if connection_pool is None:
-        for attempt in range(max_retries):
-            try:
-                connection_pool = redis.ConnectionPool(
-                    host=REDIS_HOST,
-                    port=REDIS_PORT,
-                    db=REDIS_DB,
-                    password=REDIS_PASSWORD,
-                    socket_timeout=REDIS_SOCKET_TIMEOUT,
-                    socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
-                    retry_on_timeout=REDIS_RETRY_ON_TIMEOUT,
-                    max_connections=REDIS_MAX_CONNECTIONS,
-                    decode_responses=False,
-                    health_check_interval=30,  # Periodically check connections
-                )
-                logger.info(f"Created Redis connection pool for {REDIS_HOST}:{REDIS_PORT} (attempt {attempt+1})")
-                break
-            except Exception as e:
-                logger.error(f"Failed to create Redis connection pool (attempt {attempt+1}): {str(e)}")
-                if attempt < max_retries - 1:
-                    import time
-
-                    time.sleep(retry_delay)
-                else:
-                    logger.critical(f"Max retries ({max_retries}) reached for creating Redis connection pool")
-                    return DummyRedisClient()
-
-    # Get client from pool with retries
-    for attempt in range(max_retries):
-        try:
-            client = redis.Redis(connection_pool=connection_pool)
-
-            # Test connection with a ping
-            if client.ping():
-                return client
-            else:
-                logger.warning(f"Redis ping failed on attempt {attempt+1}")
-        except redis.ConnectionError as e:
-            logger.error(f"Redis connection error (attempt {attempt+1}): {str(e)}")
-        except redis.TimeoutError as e:
-            logger.error(f"Redis timeout error (attempt {attempt+1}): {str(e)}")
-        except Exception as e:
-            logger.error(f"Failed to get Redis client (attempt {attempt+1}): {str(e)}")
-
-        # Retry after delay if this isn't the last attempt
-        if attempt < max_retries - 1:
-            import time
-
-            time.sleep(retry_delay)
-
-    # Return dummy client if all attempts failed
-    logger.critical(f"All {max_retries} attempts to get Redis client failed, using dummy client")
+    try:
+        if redis_manager.is_available():
+            return redis_manager.client()
+    except Exception as e:
+        logger.error(f"Failed to get Redis client: {str(e)}")
     return DummyRedisClient()
 
 
@@ -774,57 +712,69 @@ def redis_hashmap_delete(key: str, field: str) -> bool:
 # Utility functions for specific ChessMate data types
 
 
+def game_cache_key(game_id: int) -> str:
+    return get_redis_key(KEY_PREFIX_GAME, game_id)
+
+
+def user_games_cache_key(user_id: int) -> str:
+    return get_redis_key(KEY_PREFIX_USER, user_id, "games")
+
+
+def analysis_cache_key(analysis_id: int) -> str:
+    return get_redis_key(KEY_PREFIX_ANALYSIS, analysis_id)
+
+
 def cache_game(game_id: int, data: Dict[str, Any]) -> bool:
     """Cache game data with proper TTL."""
-    key = get_redis_key(KEY_PREFIX_GAME, game_id)
+    key = game_cache_key(game_id)
     return redis_set(key, data, TTL_GAME)
 
 
 def get_cached_game(game_id: int) -> Optional[Dict[str, Any]]:
     """Get cached game data."""
-    key = get_redis_key(KEY_PREFIX_GAME, game_id)
+    key = game_cache_key(game_id)
     return redis_get(key)
 
 
 def invalidate_game_cache(game_id: int) -> bool:
     """Invalidate game cache."""
-    key = get_redis_key(KEY_PREFIX_GAME, game_id)
+    key = game_cache_key(game_id)
     return redis_delete(key)
 
 
 def cache_user_games(user_id: int, data: List[Dict[str, Any]]) -> bool:
     """Cache user games with proper TTL."""
-    key = get_redis_key(KEY_PREFIX_USER, user_id, "games")
+    key = user_games_cache_key(user_id)
     return redis_set(key, data, TTL_USER)
 
 
 def get_cached_user_games(user_id: int) -> Optional[List[Dict[str, Any]]]:
     """Get cached user games."""
-    key = get_redis_key(KEY_PREFIX_USER, user_id, "games")
+    key = user_games_cache_key(user_id)
     return redis_get(key)
 
 
 def invalidate_user_games_cache(user_id: int) -> bool:
     """Invalidate user games cache."""
-    key = get_redis_key(KEY_PREFIX_USER, user_id, "games")
+    key = user_games_cache_key(user_id)
     return redis_delete(key)
 
 
 def cache_analysis(analysis_id: int, data: Dict[str, Any]) -> bool:
     """Cache analysis data with proper TTL."""
-    key = get_redis_key(KEY_PREFIX_ANALYSIS, analysis_id)
+    key = analysis_cache_key(analysis_id)
     return redis_set(key, data, TTL_ANALYSIS)
 
 
 def get_cached_analysis(analysis_id: int) -> Optional[Dict[str, Any]]:
     """Get cached analysis data."""
-    key = get_redis_key(KEY_PREFIX_ANALYSIS, analysis_id)
+    key = analysis_cache_key(analysis_id)
     return redis_get(key)
 
 
 def invalidate_analysis_cache(analysis_id: int) -> bool:
     """Invalidate analysis cache."""
-    key = get_redis_key(KEY_PREFIX_ANALYSIS, analysis_id)
+    key = analysis_cache_key(analysis_id)
     return redis_delete(key)
 
 
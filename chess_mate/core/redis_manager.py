@@ -1,104 +1,218 @@
-"""Redis connection manager for ChessMate."""
+"""
+Process-wide Redis connection manager for ChessMate.
+
+Every direct Redis user (``core.redis_connection``, ``core.redis_config``, ``core.cache``)
+and the django-redis cache backends (via ``SharedPoolConnectionFactory``) draw connections
+from one pool per process, sized by ``REDIS_MAX_CONNECTIONS``:
+
+* the pool is created lazily and reset when the process id changes, so Celery prefork
+  children never share the parent's sockets;
+* liveness is checked lazily: redis-py pings a pooled connection only after it has been
+  idle for ``REDIS_HEALTH_CHECK_INTERVAL`` seconds, and ``is_available`` sends at most one
+  PING per interval instead of one per call;
+* checkouts are counted and timed, so pool saturation and checkout waits show up in
+  ``stats()`` (reported by the Redis health check).
+"""
 
 import logging
 import os
 import threading
+import time
 from contextlib import contextmanager
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import redis
-from redis.connection import ConnectionPool
+from django.conf import settings
+from django_redis.pool import ConnectionFactory
 
 logger = logging.getLogger(__name__)
 
 
-class RedisManager:
-    """Singleton Redis connection manager with connection pooling."""
-
-    _instance = None
-    _lock = threading.Lock()
-    _pool = None
-    _initialized = False
-    _MAX_CONNECTIONS = 20  # Reduced from 50
-    _SOCKET_TIMEOUT = 5.0
-    _CONNECT_TIMEOUT = 2.0
-
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super(RedisManager, cls).__new__(cls)
-        return cls._instance
+class PoolMetrics:
+    """Checkout counters for one connection pool."""
 
     def __init__(self):
-        """Initialize the Redis connection pool if not already initialized."""
-        if not self._initialized:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_errors = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_release(self) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.checkout_errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_errors": self.checkout_errors,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "avg_wait_ms": round(1000 * self.total_wait_seconds / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(1000 * self.max_wait_seconds, 3),
+            }
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """Blocking pool (callers wait up to ``timeout`` for a free connection) that records checkouts."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self.metrics = PoolMetrics()
+        super().__init__(*args, **kwargs)
+
+    def reset(self) -> None:
+        super().reset()
+        self.metrics = PoolMetrics()
+
+    def get_connection(self, command_name: str, *keys: Any, **options: Any):
+        started = time.perf_counter()
+        try:
+            connection = super().get_connection(command_name, *keys, **options)
+        except redis.ConnectionError:
+            # Includes "No connection available." when the pool stays saturated for `timeout`.
+            self.metrics.record_error()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def release(self, connection) -> None:
+        super().release(connection)
+        self.metrics.record_release()
+
+
+def redis_url() -> Optional[str]:
+    """REDIS_URL, or a URL built from REDIS_HOST/PORT/DB/PASSWORD."""
+    url = getattr(settings, "REDIS_URL", None)
+    if url:
+        return url
+    host = getattr(settings, "REDIS_HOST", "localhost") or "localhost"
+    port = int(getattr(settings, "REDIS_PORT", 6379) or 6379)
+    db = int(getattr(settings, "REDIS_DB", 0) or 0)
+    password = getattr(settings, "REDIS_PASSWORD", None)
+    auth = f":{password}@" if password else ""
+    return f"redis://{auth}{host}:{port}/{db}"
+
+
+class RedisManager:
+    """One instrumented connection pool and one shared client per process."""
+
+    def __init__(self, **pool_overrides: Any):
+        self._lock = threading.Lock()
+        self._pool_overrides = pool_overrides
+        self._pool: Optional[InstrumentedConnectionPool] = None
+        self._pid: Optional[int] = None
+        self._client: Optional[redis.Redis] = None
+        self._client_factory: Any = None
+        self._checked_at = 0.0
+        self._healthy = False
+
+    def _health_check_interval(self) -> int:
+        return int(getattr(settings, "REDIS_HEALTH_CHECK_INTERVAL", 30))
+
+    def _create_pool(self) -> InstrumentedConnectionPool:
+        options = {
+            "max_connections": int(getattr(settings, "REDIS_MAX_CONNECTIONS", 100)),
+            "timeout": float(getattr(settings, "REDIS_POOL_TIMEOUT", 5)),
+            "socket_timeout": getattr(settings, "REDIS_SOCKET_TIMEOUT", 5),
+            "socket_connect_timeout": getattr(settings, "REDIS_SOCKET_CONNECT_TIMEOUT", 5),
+            "retry_on_timeout": getattr(settings, "REDIS_RETRY_ON_TIMEOUT", True),
+            "health_check_interval": self._health_check_interval(),
+        }
+        options.update(self._pool_overrides)
+        pool = InstrumentedConnectionPool.from_url(redis_url(), **options)
+        logger.info("Created Redis connection pool (max_connections=%s, pid=%s)", pool.max_connections, os.getpid())
+        return pool
+
+    def pool(self) -> InstrumentedConnectionPool:
+        pid = os.getpid()
+        if self._pool is None or self._pid != pid:
             with self._lock:
-                if not self._initialized:
-                    self._initialize_pool()
-                    self._initialized = True
+                if self._pool is None:
+                    self._pool = self._create_pool()
+                elif self._pid != pid:
+                    # Forked child: drop the inherited sockets and counters, keep the pool object so
+                    # clients created before the fork (django-redis caches them) stay valid.
+                    self._pool.reset()
+                    self._checked_at, self._healthy = 0.0, False
+                self._pid = pid
+        return self._pool
 
-    def _initialize_pool(self):
-        """Initialize the Redis connection pool with optimized settings."""
+    def client(self) -> redis.Redis:
+        """Shared client over the process pool (no PING; see ``is_available``)."""
+        pool = self.pool()
+        # `redis.Redis` is looked up per call so a patched client class is honored.
+        factory = redis.Redis
+        client = self._client
+        if client is None or self._client_factory is not factory:
+            client = factory(connection_pool=pool)
+            self._client, self._client_factory = client, factory
+        return client
+
+    def is_available(self) -> bool:
+        """Result of the last PING, refreshed at most once per REDIS_HEALTH_CHECK_INTERVAL."""
+        self.pool()
+        now = time.monotonic()
+        if self._checked_at and now - self._checked_at < self._health_check_interval():
+            return self._healthy
         try:
-            redis_url = os.getenv("REDIS_URL")
-            if not redis_url:
-                raise ValueError("REDIS_URL environment variable not set")
-
-            self._pool = ConnectionPool.from_url(
-                redis_url,
-                max_connections=self._MAX_CONNECTIONS,
-                socket_timeout=self._SOCKET_TIMEOUT,
-                socket_connect_timeout=self._CONNECT_TIMEOUT,
-                socket_keepalive=True,
-                retry_on_timeout=True,
-                health_check_interval=30,
-                decode_responses=True,
-            )
-            logger.info(f"Redis connection pool initialized with {self._MAX_CONNECTIONS} max connections")
-        except Exception as e:
-            logger.error(f"Failed to initialize Redis connection pool: {str(e)}")
-            raise
+            healthy = bool(self.client().ping())
+        except Exception as exc:
+            logger.warning("Redis health check failed: %s", exc)
+            healthy = False
+        self._checked_at, self._healthy = now, healthy
+        return healthy
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, saturation and checkout-wait metrics for this process."""
+        pool = self.pool()
+        snapshot = pool.metrics.snapshot()
+        snapshot.update(
+            {
+                "pid": self._pid,
+                "max_connections": pool.max_connections,
+                "saturation": round(snapshot["peak_in_use"] / pool.max_connections, 3),
+            }
+        )
+        return snapshot
 
     @contextmanager
     def get_client(self):
-        """Get a Redis client from the connection pool with automatic cleanup."""
-        client = None
-        try:
-            if not self._pool:
-                with self._lock:
-                    if not self._pool:
-                        self._initialize_pool()
-            client = redis.Redis(connection_pool=self._pool)
-            yield client
-        finally:
-            if client:
-                try:
-                    client.close()
-                except Exception as e:
-                    logger.warning(f"Error closing Redis client: {str(e)}")
-
-    def get_connection_pool(self) -> Optional[ConnectionPool]:
-        """Get the Redis connection pool."""
-        if not self._pool:
-            with self._lock:
-                if not self._pool:
-                    self._initialize_pool()
-        return self._pool
+        """Context-manager form of ``client()`` kept for older callers; the client is shared."""
+        yield self.client()
 
-    def close_all(self):
-        """Close all connections in the pool."""
-        if self._pool:
-            with self._lock:
-                if self._pool:
-                    self._pool.disconnect()
-                    self._pool = None
-                    self._initialized = False
-                    logger.info("All Redis connections closed")
-
-    def __del__(self):
-        """Ensure connections are cleaned up on deletion."""
-        self.close_all()
+    def get_connection_pool(self) -> InstrumentedConnectionPool:
+        return self.pool()
+
+    def close_all(self) -> None:
+        """Disconnect every pooled connection (the next call reconnects lazily)."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.disconnect()
+            self._checked_at, self._healthy = 0.0, False
+
+
+class SharedPoolConnectionFactory(ConnectionFactory):
+    """django-redis connection factory that reuses the process pool for the main Redis URL."""
+
+    def get_or_create_connection_pool(self, params):
+        if params.get("url") == redis_url():
+            return redis_manager.pool()
+        return super().get_or_create_connection_pool(params)
 
 
 # Global instance
@@ -0,0 +1,47 @@
+"""Indexed public moment share-token lookups (ShareLink rows instead of JSON-path scans)."""
+
+from __future__ import annotations
+
+import uuid
+from typing import Optional
+
+from core.models import GameAnalysis, ShareLink
+
+
+def normalize_share_token(share_token) -> Optional[uuid.UUID]:
+    """Parse a share token; malformed tokens never reach the database."""
+    if not share_token:
+        return None
+    if isinstance(share_token, uuid.UUID):
+        return share_token
+    try:
+        return uuid.UUID(str(share_token))
+    except (TypeError, ValueError):
+        return None
+
+
+def register_moment_share_link(
+    analysis: GameAnalysis,
+    share_token,
+    move_number: Optional[int] = None,
+) -> Optional[ShareLink]:
+    token = normalize_share_token(share_token)
+    if token is None:
+        return None
+    link, _ = ShareLink.objects.update_or_create(
+        token=token,
+        defaults={
+            "kind": ShareLink.KIND_MOMENT,
+            "analysis": analysis,
+            "move_number": move_number,
+        },
+    )
+    return link
+
+
+def find_share_link(share_token, kind: str) -> Optional[ShareLink]:
+    """Single unique-index lookup; joins the target row so callers do not re-query."""
+    token = normalize_share_token(share_token)
+    if token is None:
+        return None
+    return ShareLink.objects.select_related("analysis__game").filter(token=token, kind=kind).first()
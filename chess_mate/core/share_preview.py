@@ -5,20 +5,26 @@ from __future__ import annotations
 import html
 import os
 import re
+from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 
 from django.conf import settings
 from django.http import Http404, HttpRequest, HttpResponse
 
+from .cache import cache_get, cache_set
 from .single_game_moment_share import (
     build_public_moment_payload,
     find_analysis_by_share_token,
+    share_preview_cache_key,
 )
 
 DEFAULT_SITE_NAME = "ChessMate"
 DEFAULT_OG_IMAGE_PATH = "/chessmate-og.png"
 OG_TITLE_MAX = 60
 OG_DESCRIPTION_MAX = 125
+# Crawlers re-fetch share pages constantly; OG copy only changes when the share is updated.
+SHARE_PREVIEW_CACHE_TTL = 600
+_MISSING_MOMENT = {"found": False}
 
 
 def _truncate(text: str, limit: int) -> str:
@@ -66,22 +72,68 @@ def _absolute_url(request: HttpRequest, path: str) -> str:
     return request.build_absolute_uri(normalized)
 
 
-def _inject_meta_block(html_doc: str, meta_block: str) -> str:
+@lru_cache(maxsize=8)
+def _load_index_template(index_path: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Read the SPA shell once per process and pre-split it around ``</head>``.
+
+    Returns ``(head, tail)`` with the default title/description already stripped,
+    ``(doc, None)`` when there is no ``</head>`` to inject into, or None when the
+    build is missing.
+    """
+    if not os.path.isfile(index_path):
+        return None
+
+    with open(index_path, encoding="utf-8") as handle:
+        html_doc = handle.read()
+
+    html_doc = re.sub(r"<title>[^<]*</title>", "", html_doc, count=1)
+    html_doc = re.sub(
+        r'<meta\s+name="description"[^>]*>',
+        "",
+        html_doc,
+        count=1,
+        flags=re.IGNORECASE,
+    )
     if "</head>" not in html_doc:
-        return html_doc
-    return html_doc.replace("</head>", f"{meta_block}\n  </head>", 1)
+        return html_doc, None
+    head, tail = html_doc.split("</head>", 1)
+    return head, tail
+
+
+def _resolve_share_meta(share_token: str) -> Optional[Tuple[str, str]]:
+    """(page_title, description) for a token, cached so repeat crawls skip the DB."""
+    key = share_preview_cache_key(share_token)
+    cached = cache_get(key)
+    if isinstance(cached, dict):
+        if not cached.get("found"):
+            return None
+        return cached["title"], cached["description"]
+
+    analysis = find_analysis_by_share_token(str(share_token))
+    payload = build_public_moment_payload(analysis) if analysis else None
+    if payload is None or not payload.get("moment"):
+        cache_set(key, _MISSING_MOMENT, timeout=SHARE_PREVIEW_CACHE_TTL)
+        return None
+
+    page_title, description = build_share_moment_meta(payload)
+    cache_set(
+        key,
+        {"found": True, "title": page_title, "description": description},
+        timeout=SHARE_PREVIEW_CACHE_TTL,
+    )
+    return page_title, description
 
 
 def render_share_moment_html(
     request: HttpRequest,
     share_token: str,
 ) -> str:
-    analysis = find_analysis_by_share_token(str(share_token))
-    payload = build_public_moment_payload(analysis) if analysis else None
-    if payload is None or not payload.get("moment"):
+    share_meta = _resolve_share_meta(str(share_token))
+    if share_meta is None:
         raise Http404("Shared moment not found.")
 
-    page_title, description = build_share_moment_meta(payload)
+    page_title, description = share_meta
     canonical_path = f"/share/game-moment/{share_token}"
     canonical_url = _absolute_url(request, canonical_path)
     og_image_url = _absolute_url(request, DEFAULT_OG_IMAGE_PATH)
@@ -104,22 +156,14 @@ def render_share_moment_html(
         ]
     )
 
-    index_path = _frontend_build_index_path()
-    if not os.path.isfile(index_path):
+    template = _load_index_template(_frontend_build_index_path())
+    if template is None:
         return "<!DOCTYPE html><html><head>" f"{meta_block}" '</head><body><div id="root"></div></body></html>'
 
-    with open(index_path, encoding="utf-8") as handle:
-        html_doc = handle.read()
-
-    html_doc = re.sub(r"<title>[^<]*</title>", "", html_doc, count=1)
-    html_doc = re.sub(
-        r'<meta\s+name="description"[^>]*>',
-        "",
-        html_doc,
-        count=1,
-        flags=re.IGNORECASE,
-    )
-    return _inject_meta_block(html_doc, meta_block)
+    head, tail = template
+    if tail is None:
+        return head
+    return f"{head}{meta_block}\n  </head>{tail}"
 
 
 def share_game_moment_page(request: HttpRequest, share_token: str) -> HttpResponse:
@@ -1,4 +1,4 @@
-"""Single-game analysis credit refunds on hard failure."""
+"""Single-game analysis credit charges and refunds on hard failure."""
 
 from __future__ import annotations
 
@@ -6,40 +6,36 @@ import logging
 from typing import Any, Optional
 
 from django.conf import settings
-from django.core.cache import cache
-from django.db import transaction
 
-from .models import Profile
+from .credit_ledger import (
+    REASON_SINGLE_GAME_CHARGE,
+    REASON_SINGLE_GAME_REFUND,
+    latest_credit_entry,
+    post_credit_entry,
+)
+from .models import CreditLedgerEntry, Profile
 
 logger = logging.getLogger(__name__)
 
 PREF_FIRST_FREE_USED = "single_game_free_used"
 
-_REFUND_CACHE_TTL = 60 * 60 * 24 * 7
-_CHARGE_CACHE_TTL = 60 * 60 * 24 * 7
 
+def _charge_reference_prefix(game_id: int) -> str:
+    return f"{game_id}:"
 
-def _refund_cache_key(user_id: int, game_id: int) -> str:
-    return f"single_game_credit_refund:{user_id}:{game_id}"
 
-
-def _charge_cache_key(user_id: int, game_id: int) -> str:
-    return f"single_game_credit_charged:{user_id}:{game_id}"
+def _latest_charge(user_id: int, game_id: int) -> Optional[CreditLedgerEntry]:
+    return latest_credit_entry(user_id, REASON_SINGLE_GAME_CHARGE, _charge_reference_prefix(game_id))
 
 
 def single_game_credits_amount() -> int:
     return int(getattr(settings, "SINGLE_GAME_ANALYSIS_CREDITS", 1))
 
 
-def mark_single_game_credit_charged(user_id: int, game_id: int) -> None:
-    if user_id and game_id:
-        cache.set(_charge_cache_key(user_id, game_id), True, _CHARGE_CACHE_TTL)
-
-
 def was_single_game_credit_charged(user_id: int, game_id: int) -> bool:
     if not user_id or not game_id:
         return False
-    return bool(cache.get(_charge_cache_key(user_id, game_id)))
+    return _latest_charge(user_id, game_id) is not None
 
 
 def has_used_first_single_game_free(profile: Profile) -> bool:
@@ -96,51 +92,57 @@ def charge_single_game_credit(
     profile: Optional[Profile],
     *,
     waiver: str = "",
+    attempt: Optional[str] = None,
 ) -> int:
-    """Deduct one credit when not waived; return credits charged (0 or 1)."""
+    """Deduct SINGLE_GAME_ANALYSIS_CREDITS when not waived; return credits charged.
+
+    ``attempt`` identifies the analysis run (its task id); charging the same run twice,
+    e.g. from a retried or double-submitted request, records a single ledger entry.
+    """
     if user.is_staff or waiver:
         if waiver == "first_free" and profile is not None:
             mark_first_single_game_free_used(profile)
         return 0
 
-    if profile is None:
-        profile = Profile.objects.get(user=user)
-
-    profile.credits = max(0, profile.credits - 1)
-    profile.save(update_fields=["credits"])
-    mark_single_game_credit_charged(user.id, game_id)
-    return 1
+    amount = single_game_credits_amount()
+    if amount <= 0:
+        return 0
+    if profile is None and not Profile.objects.filter(user=user).exists():
+        raise Profile.DoesNotExist(f"No profile for user_id={user.id}")
+
+    # One ledger entry per analysis attempt ("<game_id>:<task id>"); re-analysis is a new attempt.
+    if not attempt:
+        attempt = CreditLedgerEntry.objects.filter(
+            user_id=user.id,
+            reason=REASON_SINGLE_GAME_CHARGE,
+            reference__startswith=_charge_reference_prefix(game_id),
+        ).count()
+    reference = f"{_charge_reference_prefix(game_id)}{attempt}"
+    if not post_credit_entry(user.id, -amount, REASON_SINGLE_GAME_CHARGE, reference):
+        logger.info("Single-game charge %s already recorded for user_id=%s", reference, user.id)
+        return 0
+    return amount
 
 
 def refund_single_game_credit_on_fail(user_id: int, game_id: int) -> int:
     """
-    Refund credits when single-game analysis hard-fails after enqueue charge.
-    Idempotent per user/game for one week.
+    Refund the latest charge for user/game when single-game analysis hard-fails.
+    Idempotent: each charge is refunded at most once (ledger unique reference).
     """
     if not user_id or not game_id:
         return 0
 
-    if not was_single_game_credit_charged(user_id, game_id):
+    charge = _latest_charge(user_id, game_id)
+    if charge is None:
         return 0
 
-    cache_key = _refund_cache_key(user_id, game_id)
-    if cache.get(cache_key):
-        return 0
-
-    amount = single_game_credits_amount()
+    amount = -charge.delta
     if amount <= 0:
         return 0
 
-    try:
-        with transaction.atomic():
-            profile = Profile.objects.select_for_update().get(user_id=user_id)
-            profile.credits += amount
-            profile.save(update_fields=["credits"])
-    except Profile.DoesNotExist:
-        logger.warning("Cannot refund single-game credit — profile missing user_id=%s", user_id)
+    if not post_credit_entry(user_id, amount, REASON_SINGLE_GAME_REFUND, charge.reference):
         return 0
 
-    cache.set(cache_key, True, _REFUND_CACHE_TTL)
     logger.info(
         "Refunded %s credit(s) for failed single-game analysis game_id=%s user_id=%s",
         amount,
@@ -6,11 +6,14 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-from core.models import Game, GameAnalysis
+from core.cache import cache_delete
+from core.models import Game, GameAnalysis, ShareLink
+from core.share_links import find_share_link, register_moment_share_link
 from core.stats_helpers import build_single_game_context
 from django.conf import settings
 
 SHARE_META_KEY = "moment_share"
+SHARE_PREVIEW_CACHE_PREFIX = "share_moment_meta"
 
 
 def _utc_now_iso() -> str:
@@ -27,6 +30,10 @@ def build_moment_share_url(share_token: str) -> str:
     return f"{origin}{path}" if origin else path
 
 
+def share_preview_cache_key(share_token: str) -> str:
+    return f"{SHARE_PREVIEW_CACHE_PREFIX}:{share_token}"
+
+
 def get_moment_share_meta(analysis: GameAnalysis) -> Optional[Dict[str, Any]]:
     payload = analysis.analysis_data if isinstance(analysis.analysis_data, dict) else {}
     share_meta = payload.get(SHARE_META_KEY)
@@ -77,6 +84,8 @@ def get_or_create_moment_share(
             payload[SHARE_META_KEY] = share_meta
             analysis.analysis_data = payload
             analysis.save(update_fields=["analysis_data", "updated_at"])
+            cache_delete(share_preview_cache_key(share_meta["token"]))
+        register_moment_share_link(analysis, share_meta["token"], share_meta.get("move_number"))
         return share_meta
 
     token = str(uuid.uuid4())
@@ -88,15 +97,14 @@ def get_or_create_moment_share(
     payload[SHARE_META_KEY] = share_meta
     analysis.analysis_data = payload
     analysis.save(update_fields=["analysis_data", "updated_at"])
+    register_moment_share_link(analysis, token, move_number)
     return share_meta
 
 
 def find_analysis_by_share_token(share_token: str) -> Optional[GameAnalysis]:
-    if not share_token:
-        return None
-    return (
-        GameAnalysis.objects.select_related("game").filter(analysis_data__moment_share__token=str(share_token)).first()
-    )
+    """Resolve a moment share via the indexed ShareLink table (see ``backfill_share_links``)."""
+    link = find_share_link(share_token, ShareLink.KIND_MOMENT)
+    return link.analysis if link is not None else None
 
 
 def _pick_moment(critical_moments: list, move_number: Optional[int]) -> Optional[Dict[str, Any]]:
@@ -4,19 +4,23 @@ from __future__ import annotations
 
 import logging
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Window
+from django.db.models.functions import RowNumber
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.html import strip_tags
 
 from .email_send_log import (
+    claim_email_send,
     coaching_email_budget_exceeded,
     digest_already_sent_this_week,
-    log_email_send,
+    iso_week_key,
     received_coaching_touchpoint_today,
+    send_after_claim,
     spaced_sent_in_last_days,
     user_active_within_hours,
 )
@@ -26,7 +30,13 @@ from .email_utils import (
     is_email_configured,
     send_coaching_email,
 )
-from .models import EmailSendLog, Game, GameAnalysis, Profile, SpacedReminderLog
+from .models import (
+    EmailSendLog,
+    Game,
+    GameAnalysis,
+    ReviewableMoment,
+    SpacedReminderLog,
+)
 from .notification_preferences import user_wants_spaced_repetition_email
 from .stats_helpers import ANALYZED_GAME_Q
 
@@ -90,33 +100,105 @@ def _moment_sent_recently(user: User, key: str, days: int = MOMENT_COOLDOWN_DAYS
     ).exists()
 
 
-def find_best_spaced_moment(user: User) -> Optional[Tuple[Game, Dict[str, Any]]]:
-    games = Game.objects.filter(user=user).filter(ANALYZED_GAME_Q).order_by("-updated_at")[:20]
-    best: Optional[Tuple[Game, Dict[str, Any], float]] = None
-    stale_cutoff = timezone.now() - timedelta(days=7)
+def _moment_phase(moment: Dict[str, Any], max_move: int) -> str:
+    from .analysis.alignment_score import _infer_phase_from_move_number
+
+    phase = moment.get("phase")
+    if phase in ("opening", "middlegame", "endgame"):
+        return phase
+    return _infer_phase_from_move_number(moment.get("move_number"), max_move) or ""
+
 
-    for game in games:
+def index_reviewable_moments(analysis: GameAnalysis, *, replace: bool = True) -> int:
+    """Rebuild the ReviewableMoment rows for one analysis (strongest swing per move wins).
+
+    ``replace=False`` skips deleting existing rows (a freshly created analysis has none).
+    """
+    best: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+    for moment in _extract_moments(analysis):
         try:
-            analysis = GameAnalysis.objects.get(game=game)
-        except GameAnalysis.DoesNotExist:
-            continue
-        if analysis.updated_at and analysis.updated_at >= stale_cutoff:
+            move_number = int(moment.get("move_number"))
+        except (TypeError, ValueError):
             continue
+        swing = _moment_swing(moment)
+        if move_number not in best or swing > best[move_number][0]:
+            best[move_number] = (swing, moment)
+
+    game = analysis.game
+    # GameAnalysis.moves unpacks moves_blob when move detail is stored packed.
+    moves = analysis.moves if isinstance(analysis.moves, list) else []
+    played = [move.get("move_number") for move in moves if isinstance(move, dict)]
+    max_move = max([number for number in played if isinstance(number, int)] + list(best), default=0)
+    rows = [
+        ReviewableMoment(
+            user_id=game.user_id,
+            game_id=game.id,
+            analysis_id=analysis.pk,
+            moment_key=moment_key(game.id, move_number),
+            move_number=move_number,
+            swing=swing,
+            phase=_moment_phase(moment, max_move),
+            moment=moment,
+        )
+        for move_number, (swing, moment) in sorted(best.items())
+    ]
+    if not rows and not replace:
+        return 0
+    with transaction.atomic():
+        if replace:
+            ReviewableMoment.objects.filter(game_id=game.id).delete()
+        if rows:
+            ReviewableMoment.objects.bulk_create(rows)
+    return len(rows)
+
+
+def best_unsent_moments(user_ids: Iterable[int], now=None) -> Dict[int, ReviewableMoment]:
+    """Largest-swing stale moment per user not reminded within the cooldown, in one query.
+
+    A moment qualifies when its swing clears ``SWING_THRESHOLD``, its analysis has not
+    changed for 7 days, the game is still analyzed and no SpacedReminderLog row for the
+    same key exists inside ``MOMENT_COOLDOWN_DAYS``.
+    """
+    now = now or timezone.now()
+    reminded = SpacedReminderLog.objects.filter(
+        user_id=OuterRef("user_id"),
+        moment_key=OuterRef("moment_key"),
+        sent_at__gte=now - timedelta(days=MOMENT_COOLDOWN_DAYS),
+    )
+    analyzed = Game.objects.filter(ANALYZED_GAME_Q, pk=OuterRef("game_id"))
+    candidates = (
+        ReviewableMoment.objects.filter(
+            user_id__in=list(user_ids),
+            swing__gte=SWING_THRESHOLD,
+            analysis__updated_at__lt=now - timedelta(days=7),
+        )
+        .filter(Exists(analyzed))
+        .exclude(Exists(reminded))
+        .annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=[F("user_id")],
+                order_by=[F("swing").desc(), F("game__updated_at").desc(), F("pk").asc()],
+            )
+        )
+        .filter(rank=1)
+        .select_related("game")
+    )
+    return {row.user_id: row for row in candidates}
+
 
-        for moment in _extract_moments(analysis):
-            swing = _moment_swing(moment)
-            move_number = moment.get("move_number")
-            if swing < SWING_THRESHOLD or move_number is None:
-                continue
-            key = moment_key(game.id, int(move_number))
-            if _moment_sent_recently(user, key):
-                continue
-            if best is None or swing > best[2]:
-                best = (game, moment, swing)
-
-    if best is None:
+def find_best_spaced_moment(user: User) -> Optional[Tuple[Game, Dict[str, Any]]]:
+    row = best_unsent_moments([user.pk]).get(user.pk)
+    if row is None:
         return None
-    return best[0], best[1]
+    return row.game, spaced_moment_payload(row)
+
+
+def spaced_moment_payload(row: ReviewableMoment) -> Dict[str, Any]:
+    payload = dict(row.moment) if isinstance(row.moment, dict) else {}
+    payload["move_number"] = row.move_number
+    payload.setdefault("phase", row.phase)
+    return payload
 
 
 def build_spaced_email_subject(moment: Dict[str, Any]) -> str:
@@ -150,16 +232,37 @@ def send_spaced_repetition_for_user(user: User, *, force: bool = False) -> bool:
         return False
 
     game, moment = match
+    if not force and _moment_sent_recently(user, moment_key(game.id, int(moment["move_number"]))):
+        return False
+
+    return deliver_spaced_reminder(user, game, moment)
+
+
+@transaction.atomic
+def deliver_spaced_reminder(user: User, game: Game, moment: Dict[str, Any], *, connection=None) -> bool:
+    """Send the reminder for one moment; eligibility is the caller's job.
+
+    The EmailSendLog row for the ISO week is claimed before sending, so overlapping or resumed
+    runs send at most one reminder per week. The moment itself is tracked by SpacedReminderLog,
+    so it can be reminded again once ``MOMENT_COOLDOWN_DAYS`` have passed. The email is sent
+    after the claim commits.
+    """
     move_number = int(moment["move_number"])
     key = moment_key(game.id, move_number)
 
-    if not force and _moment_sent_recently(user, key):
-        return False
-
     if not is_email_configured():
         logger.error("Spaced reminder not sent for %s: SMTP not configured", user.email)
         return False
 
+    claim = claim_email_send(
+        user,
+        EmailSendLog.TYPE_SPACED_MOMENT,
+        week_key=iso_week_key(),
+        meta={"game_id": game.id, "move_number": move_number, "moment_key": key},
+    )
+    if claim is None:
+        return False
+
     base = get_frontend_base_url()
     review_url = f"{base}/game/{game.id}/analysis?mode=review&move={move_number}"
     subject = build_spaced_email_subject(moment)
@@ -181,32 +284,25 @@ def send_spaced_repetition_for_user(user: User, *, force: bool = False) -> bool:
         html_body = f"{subject}\n\n" f"Replay the moment that swung your game: {review_url}\n"
 
     preferences_url = f"{base}/profile"
-    send_coaching_email(
-        subject=subject,
-        message=strip_tags(str(html_body)),
-        recipient_list=[user.email],
-        html_message=str(html_body),
-        preferences_url=preferences_url,
-    )
 
-    SpacedReminderLog.objects.create(user=user, moment_key=key)
-    log_email_send(
-        user,
-        EmailSendLog.TYPE_SPACED_MOMENT,
-        week_key=key,
-        meta={"game_id": game.id, "move_number": move_number},
-    )
-    logger.info("Spaced reminder sent to %s for %s", user.email, key)
+    def send() -> None:
+        send_coaching_email(
+            subject=subject,
+            message=strip_tags(str(html_body)),
+            recipient_list=[user.email],
+            html_message=str(html_body),
+            preferences_url=preferences_url,
+            connection=connection,
+        )
+        SpacedReminderLog.objects.create(user=user, moment_key=key)
+        logger.info("Spaced reminder sent to %s for %s", user.email, key)
+
+    send_after_claim(claim, send)
     return True
 
 
 def send_spaced_repetition_reminders() -> int:
-    sent = 0
-    users = User.objects.filter(email__gt="").select_related("profile")
-    for user in users:
-        try:
-            if send_spaced_repetition_for_user(user):
-                sent += 1
-        except Exception as exc:
-            logger.exception("Spaced reminder failed for user %s: %s", user.pk, exc)
-    return sent
+    """Send spaced reminders to all eligible users inline; beat shards this via ``send_spaced_repetition_task``."""
+    from .email_campaigns import CAMPAIGN_SPACED_REPETITION, run_campaign_inline
+
+    return run_campaign_inline(CAMPAIGN_SPACED_REPETITION)
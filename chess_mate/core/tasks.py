@@ -36,9 +36,16 @@ from .analysis.per_game_coach_generator import (
     attach_coach_notes_to_results,
     generate_per_game_coach_notes,
 )
-from .analysis.stockfish_game_result import build_game_result
+from .analysis.stockfish_game_result import AnalysisCancelled, build_game_result
+from .batch_cancellation import (
+    BatchCancelToken,
+    batch_subtask_id,
+    is_batch_cancelled,
+    start_batch_run,
+)
 from .batch_observability import (
     log_batch_completed,
+    log_batch_event,
     log_batch_game_failed,
     log_batch_started,
 )
@@ -687,6 +694,14 @@ def health_check_task() -> str:
     return "ok"
 
 
+@shared_task(name="chess_mate.core.tasks.worker_readiness_task")
+def worker_readiness_task() -> Dict[str, Any]:
+    """Warm-up state of the worker process that runs this task (see ``core.worker_warmup``)."""
+    from .worker_warmup import worker_readiness
+
+    return worker_readiness()
+
+
 @shared_task(
     name="chess_mate.core.tasks.batch_analyze_games_task",
     bind=True,
@@ -1059,6 +1074,10 @@ def analyze_single_game_subtask(
     Returns:
         {"game_id": game_id, "status": "success"|"failed", "result": {...} or "error": "..."}
     """
+    if is_batch_cancelled(batch_id):
+        logger.info(f"[batch={batch_id}] skipping game {game_id}: batch cancelled")
+        return {"game_id": game_id, "status": "failed", "error": "Batch cancelled"}
+
     try:
         # Resolve the `build_game_result` function robustly across import
         # paths and prefer a patched/mock implementation when present. Some
@@ -1238,6 +1257,7 @@ def analyze_single_game_subtask(
             saved_game_id=saved_game_id,
             chess_com_username=chess_com_username,
             lichess_username=lichess_username,
+            should_stop=BatchCancelToken(batch_id),
         )
 
         if not game_result:
@@ -1249,43 +1269,27 @@ def analyze_single_game_subtask(
                 "error": "Failed to build game result (empty output)",
             }
 
+        if isinstance(game_result, dict) and not game_result.get("analysis_failed"):
+            from .batch_result_store import game_result_key, store_game_result
+
+            result_key = game_result_key(
+                pgn,
+                batch_depth,
+                chess_com_username=chess_com_username,
+                lichess_username=lichess_username,
+            )
+            store_game_result(result_key, batch_depth, dict(game_result))
+
         if saved_game_id:
             try:
+                from .batch_result_store import (
+                    SAVED_GAME_FIELDS,
+                    apply_saved_game_metadata,
+                )
                 from .models import Game
 
-                saved_row = (
-                    Game.objects.filter(id=saved_game_id, user_id=user_id)
-                    .values(
-                        "opponent",
-                        "date_played",
-                        "platform",
-                        "game_url",
-                        "opening_name",
-                        "eco_code",
-                    )
-                    .first()
-                )
-                if saved_row:
-                    if saved_row.get("opponent"):
-                        game_result["opponent"] = saved_row["opponent"]
-                    if saved_row.get("date_played"):
-                        game_result["date_played"] = saved_row["date_played"].isoformat()
-                    if saved_row.get("platform"):
-                        game_result["platform"] = saved_row["platform"]
-                    if saved_row.get("game_url"):
-                        game_result["platform_game_url"] = saved_row["game_url"]
-                    saved_opening = (saved_row.get("opening_name") or "").strip()
-                    if saved_opening and saved_opening.lower() not in (
-                        "unknown",
-                        "unknown opening",
-                        "?",
-                    ):
-                        from .opening_name_utils import compact_opening_name
-
-                        game_result["opening_name"] = compact_opening_name(saved_opening) or saved_opening
-                    saved_eco = (saved_row.get("eco_code") or "").strip().upper()
-                    if saved_eco:
-                        game_result["eco_code"] = saved_eco[:3]
+                saved_row = Game.objects.filter(id=saved_game_id, user_id=user_id).values(*SAVED_GAME_FIELDS).first()
+                apply_saved_game_metadata(game_result, saved_row)
             except Exception:
                 _log_ignored_exception(f"Ignoring saved game metadata lookup for {saved_game_id}")
 
@@ -1296,6 +1300,11 @@ def analyze_single_game_subtask(
             "result": game_result,
         }
 
+    except AnalysisCancelled:
+        # The batch was cancelled mid-game; it is already marked failed and refunded.
+        logger.info(f"[batch={batch_id}] stopped game {game_id}: batch cancelled")
+        return {"game_id": game_id, "status": "failed", "error": "Batch cancelled"}
+
     except Exception as exc:
         error_message = str(exc)
         logger.exception(f"Error analyzing game {game_id} in batch {batch_id}: {error_message}")
@@ -1308,6 +1317,20 @@ def analyze_single_game_subtask(
         }
 
 
+def merge_batch_game_results(
+    task_results: List[Dict[str, Any]],
+    reused_results: List[Dict[str, Any]] | None,
+) -> List[Dict[str, Any]]:
+    """Combine fresh subtask envelopes with reused ones, ordered by their ``game_{i}`` index."""
+    merged = list(reused_results or []) + list(task_results or [])
+
+    def _game_index(envelope: Dict[str, Any]) -> int:
+        suffix = str(envelope.get("game_id") or "").rsplit("_", 1)[-1]
+        return int(suffix) if suffix.isdigit() else len(merged)
+
+    return sorted(merged, key=_game_index)
+
+
 @shared_task(
     name="chess_mate.core.tasks.aggregate_and_report_task",
     bind=False,
@@ -1319,6 +1342,7 @@ def aggregate_and_report_task(
     batch_id: str,
     game_pgn_list: List[str],
     user_id: int,
+    reused_refs: List[Dict[str, Any]] | None = None,
 ) -> Dict[str, Any]:
     """
     Chord callback: aggregate per-game results and generate coaching report.
@@ -1330,11 +1354,19 @@ def aggregate_and_report_task(
         batch_id: Batch ID (task_id)
         game_pgn_list: List of PGN strings (for date extraction)
         user_id: User who owns the batch
+        reused_refs: Stored-result references from a re-run; loaded here and merged with task_results in game order
 
     Returns:
-        {"status": "completed"|"partial"|"failed", "batch_id": batch_id, ...}
+        {"status": "completed"|"partial"|"failed"|"cancelled", "batch_id": batch_id, ...}
     """
     logger.info(f"Chord callback: aggregating results for batch {batch_id}")
+    if is_batch_cancelled(batch_id):
+        logger.info(f"Batch {batch_id}: cancelled, skipping aggregation")
+        return {"status": "cancelled", "batch_id": batch_id}
+    if reused_refs:
+        from .batch_result_store import reused_envelopes
+
+        task_results = merge_batch_game_results(task_results, reused_envelopes(reused_refs, user_id))
 
     try:
         # Lookup or create BatchAnalysisReport
@@ -1388,61 +1420,7 @@ def aggregate_and_report_task(
                 "successful_count": successful_count,
             }
 
-        # Resolve `aggregate_batch` and `generate_coaching_report` at runtime
-        # so tests that patch `core.tasks.aggregate_batch` /
-        # `core.tasks.generate_coaching_report` are honored regardless of
-        # import aliasing between `core` and `chess_mate.core`.
-        try:
-            import sys as _sys
-            from unittest.mock import Mock as _Mock
-
-            # Start with module globals (most likely patched target)
-            _aggregate_batch = globals().get("aggregate_batch")
-            _generate_coaching_report = globals().get("generate_coaching_report")
-
-            # Check patched names on expected module objects
-            try:
-                _mod = _sys.modules.get("core.tasks")
-                if _mod is not None:
-                    _aggregate_batch = getattr(_mod, "aggregate_batch", _aggregate_batch)
-                    _generate_coaching_report = getattr(_mod, "generate_coaching_report", _generate_coaching_report)
-            except Exception:
-                _log_ignored_exception(f"Ignoring core.tasks aggregate/report lookup failure for batch {batch_id}")
-
-            try:
-                _mod2 = _sys.modules.get("chess_mate.core.tasks")
-                if _mod2 is not None:
-                    _aggregate_batch = getattr(_mod2, "aggregate_batch", _aggregate_batch)
-                    _generate_coaching_report = getattr(_mod2, "generate_coaching_report", _generate_coaching_report)
-            except Exception:
-                _log_ignored_exception(
-                    f"Ignoring chess_mate.core.tasks aggregate/report lookup failure for batch {batch_id}"
-                )
-
-            # Prefer any Mock attached anywhere named aggregate_batch / generate_coaching_report
-            for _m in list(_sys.modules.values()):
-                try:
-                    _cand_agg = getattr(_m, "aggregate_batch", None)
-                    if isinstance(_cand_agg, _Mock):
-                        _aggregate_batch = _cand_agg
-                        break
-                except Exception:
-                    _log_ignored_exception(f"Ignoring aggregate_batch module scan failure for batch {batch_id}")
-
-            for _m in list(_sys.modules.values()):
-                try:
-                    _cand_gen = getattr(_m, "generate_coaching_report", None)
-                    if isinstance(_cand_gen, _Mock):
-                        _generate_coaching_report = _cand_gen
-                        break
-                except Exception:
-                    _log_ignored_exception(
-                        f"Ignoring generate_coaching_report module scan failure for batch {batch_id}"
-                    )
-
-        except Exception:
-            _aggregate_batch = globals().get("aggregate_batch")
-            _generate_coaching_report = globals().get("generate_coaching_report")
+        _aggregate_batch, _generate_coaching_report = _resolve_batch_callables(batch_id)
 
         # Aggregate batch summary from successful results
         try:
@@ -1471,49 +1449,9 @@ def aggregate_and_report_task(
                 "reason": f"Aggregation validation failed: {str(exc)}",
             }
 
-        # Generate coaching report using OpenAI
-        coaching_report = None
-        coaching_error = None
-        try:
-            # Extract player_rating from batch_summary (derived from game ELOs)
-            player_rating = batch_summary.get("player_rating")
-            from .coach_persona import resolve_coach_persona
-
-            _coach_profile = Profile.objects.filter(user_id=user_id).first()
-            coaching_report = _generate_coaching_report(
-                batch_summary,
-                per_game_results,
-                player_rating=player_rating,
-                coach_persona=resolve_coach_persona(_coach_profile),
-            )
-            # Status matrix (see docs/SHIP_CONTRACT.md P0-5):
-            # - completed: coaching OK; failed_results may be non-empty (some games failed)
-            # - partial (here): some games failed but coaching succeeded
-            # - partial (CoachingGeneratorError below): coaching failed, analysis OK
-            final_status = "completed" if failed_results == [] else "partial"
-
-        except CoachingGeneratorError as exc:
-            # Degraded mode: coaching failure doesn't fail the entire batch
-            # Save what we have (batch_summary + per_game_results) and mark as partial
-            coaching_error = str(exc)
-            logger.warning(f"Batch {batch_id}: coaching generation failed (degraded mode): {coaching_error}")
-            coaching_report = None
-            final_status = "partial"
-
-        try:
-            coach_notes = generate_per_game_coach_notes(
-                per_game_results,
-                player_rating=batch_summary.get("player_rating"),
-            )
-            per_game_results = attach_coach_notes_to_results(per_game_results, coach_notes)
-        except Exception as exc:
-            logger.warning("Batch %s: per-game coach notes failed: %s", batch_id, exc)
-
-        # Persist to BatchAnalysisReport
+        # Persist the analysis before coaching so the LLM call can run on its own queue.
         batch_report.batch_summary = batch_summary
         batch_report.per_game_results = per_game_results
-        batch_report.coaching_report = coaching_report
-        batch_report.status = final_status
         batch_report.games_count = len(task_results)
         batch_report.completed_games = [r.get("game_id") for r in successful_results]
         batch_report.failed_games = [{"game_id": r.get("game_id"), "error": r.get("error")} for r in failed_results]
@@ -1521,8 +1459,6 @@ def aggregate_and_report_task(
             update_fields=[
                 "batch_summary",
                 "per_game_results",
-                "coaching_report",
-                "status",
                 "games_count",
                 "completed_games",
                 "failed_games",
@@ -1530,90 +1466,258 @@ def aggregate_and_report_task(
             ]
         )
 
-        logger.info(f"Batch {batch_id} completed with status {final_status}")
-        _duration = (timezone.now() - batch_report.created_at).total_seconds()
-        log_batch_completed(
-            batch_id,
-            final_status=final_status,
-            games_analyzed=successful_count,
-            games_failed=len(failed_results),
-            duration_seconds=_duration,
-            coaching_ok=coaching_report is not None,
-            coaching_error=coaching_error,
-        )
-
-        if getattr(settings, "BATCH_SEND_COMPLETE_EMAIL", True) and final_status in (
-            "completed",
-            "partial",
-        ):
+        coaching_queue = getattr(settings, "BATCH_COACHING_QUEUE", "")
+        if coaching_queue:
+            # Free this CPU worker for Stockfish; the I/O worker waits on OpenAI instead.
             try:
-                from .batch_notifications import send_batch_complete_email
-
-                send_batch_complete_email(batch_report.user, batch_report)
-            except Exception as email_exc:
-                logger.warning("Batch complete email failed for %s: %s", batch_id, email_exc)
-
-        if coaching_report is not None:
-            try:
-                from .priority_inbox import seed_priority_inbox_from_batch
-
-                seed_priority_inbox_from_batch(batch_report)
-            except Exception as inbox_exc:
-                logger.warning("Priority inbox seed failed for %s: %s", batch_id, inbox_exc)
-
-        if batch_report.status in ("completed", "partial"):
-            try:
-                from .moment_timeline import record_batch_timeline_events
-
-                record_batch_timeline_events(batch_report)
-            except Exception as timeline_exc:
-                logger.warning("Moment timeline seed failed for %s: %s", batch_id, timeline_exc)
-
-        if batch_report.status in ("completed", "partial"):
-            try:
-                from .notifications import notify_batch_complete
-
-                notify_batch_complete(batch_report.user, batch_report)
-            except Exception as notify_exc:
+                generate_batch_coaching_task.apply_async(args=[batch_id, user_id], queue=coaching_queue)
+                log_batch_event("batch_coaching_queued", batch_id, queue=coaching_queue)
+                return {
+                    "status": "coaching_queued",
+                    "batch_id": batch_id,
+                    "games_analyzed": successful_count,
+                    "games_failed": len(failed_results),
+                }
+            except Exception as queue_exc:
                 logger.warning(
-                    "Batch in-app notifications failed for %s: %s",
+                    "Batch %s: could not queue coaching on %s, generating inline: %s",
                     batch_id,
-                    notify_exc,
+                    coaching_queue,
+                    queue_exc,
                 )
 
-        if batch_report.status in ("completed", "partial"):
-            try:
-                from .referral import process_referral_on_first_batch
+        return _finish_batch_with_coaching(batch_report, _generate_coaching_report)
 
-                process_referral_on_first_batch(batch_report)
-            except Exception as referral_exc:
-                logger.warning("Referral redemption failed for %s: %s", batch_id, referral_exc)
+    except Exception as exc:
+        logger.exception(f"Error in aggregate_and_report_task for batch {batch_id}: {str(exc)}")
+        _mark_batch_failed(batch_id, user_id)
 
         return {
-            "status": final_status,
+            "status": "failed",
             "batch_id": batch_id,
-            "games_analyzed": successful_count,
-            "games_failed": len(failed_results),
+            "reason": f"Aggregation failed: {str(exc)}",
         }
 
-    except Exception as exc:
-        logger.exception(f"Error in aggregate_and_report_task for batch {batch_id}: {str(exc)}")
 
-        try:
-            batch_report = BatchAnalysisReport.objects.get(task_id=batch_id, user_id=user_id)
-            batch_report.status = "failed"
-            batch_report.save(update_fields=["status", "updated_at"])
-            _refund_failed_batch_credits(batch_report)
-        except Exception:
-            _log_ignored_exception(f"Ignoring batch report failure update for batch {batch_id}")
+@shared_task(
+    name="chess_mate.core.tasks.generate_batch_coaching_task",
+    bind=False,
+    soft_time_limit=600,
+    time_limit=660,
+)
+def generate_batch_coaching_task(batch_id: str, user_id: int) -> Dict[str, Any]:
+    """
+    Coaching report and completion hooks for an aggregated batch.
+
+    Queued by aggregate_and_report_task on BATCH_COACHING_QUEUE (the I/O-bound ``llm`` queue),
+    so CPU-bound Stockfish workers never block on the OpenAI call.
+    """
+    if is_batch_cancelled(batch_id):
+        logger.info(f"Batch {batch_id}: cancelled, skipping coaching")
+        return {"status": "cancelled", "batch_id": batch_id}
+    try:
+        batch_report = BatchAnalysisReport.objects.get(task_id=batch_id, user_id=user_id)
+        _, _generate_coaching_report = _resolve_batch_callables(batch_id)
+        return _finish_batch_with_coaching(batch_report, _generate_coaching_report)
+    except Exception as exc:
+        logger.exception(f"Error in generate_batch_coaching_task for batch {batch_id}: {str(exc)}")
+        _mark_batch_failed(batch_id, user_id)
 
         return {
             "status": "failed",
             "batch_id": batch_id,
-            "reason": f"Aggregation failed: {str(exc)}",
+            "reason": f"Coaching failed: {str(exc)}",
         }
 
 
+def _mark_batch_failed(batch_id: str, user_id: int) -> None:
+    try:
+        batch_report = BatchAnalysisReport.objects.get(task_id=batch_id, user_id=user_id)
+        batch_report.status = "failed"
+        batch_report.save(update_fields=["status", "updated_at"])
+        _refund_failed_batch_credits(batch_report)
+    except Exception:
+        _log_ignored_exception(f"Ignoring batch report failure update for batch {batch_id}")
+
+
+def _resolve_batch_callables(batch_id: str):
+    """
+    Resolve `aggregate_batch` and `generate_coaching_report` at runtime
+    so tests that patch `core.tasks.aggregate_batch` /
+    `core.tasks.generate_coaching_report` are honored regardless of
+    import aliasing between `core` and `chess_mate.core`.
+    """
+    try:
+        import sys as _sys
+        from unittest.mock import Mock as _Mock
+
+        # Start with module globals (most likely patched target)
+        _aggregate_batch = globals().get("aggregate_batch")
+        _generate_coaching_report = globals().get("generate_coaching_report")
+
+        # Check patched names on expected module objects
+        try:
+            _mod = _sys.modules.get("core.tasks")
+            if _mod is not None:
+                _aggregate_batch = getattr(_mod, "aggregate_batch", _aggregate_batch)
+                _generate_coaching_report = getattr(_mod, "generate_coaching_report", _generate_coaching_report)
+        except Exception:
+            _log_ignored_exception(f"Ignoring core.tasks aggregate/report lookup failure for batch {batch_id}")
+
+        try:
+            _mod2 = _sys.modules.get("chess_mate.core.tasks")
+            if _mod2 is not None:
+                _aggregate_batch = getattr(_mod2, "aggregate_batch", _aggregate_batch)
+                _generate_coaching_report = getattr(_mod2, "generate_coaching_report", _generate_coaching_report)
+        except Exception:
+            _log_ignored_exception(
+                f"Ignoring chess_mate.core.tasks aggregate/report lookup failure for batch {batch_id}"
+            )
+
+        # Prefer any Mock attached anywhere named aggregate_batch / generate_coaching_report
+        for _m in list(_sys.modules.values()):
+            try:
+                _cand_agg = getattr(_m, "aggregate_batch", None)
+                if isinstance(_cand_agg, _Mock):
+                    _aggregate_batch = _cand_agg
+                    break
+            except Exception:
+                _log_ignored_exception(f"Ignoring aggregate_batch module scan failure for batch {batch_id}")
+
+        for _m in list(_sys.modules.values()):
+            try:
+                _cand_gen = getattr(_m, "generate_coaching_report", None)
+                if isinstance(_cand_gen, _Mock):
+                    _generate_coaching_report = _cand_gen
+                    break
+            except Exception:
+                _log_ignored_exception(f"Ignoring generate_coaching_report module scan failure for batch {batch_id}")
+
+    except Exception:
+        _aggregate_batch = globals().get("aggregate_batch")
+        _generate_coaching_report = globals().get("generate_coaching_report")
+    return _aggregate_batch, _generate_coaching_report
+
+
+def _finish_batch_with_coaching(batch_report: BatchAnalysisReport, coaching_fn) -> Dict[str, Any]:
+    """Generate coaching for a persisted batch, save the final status, and run the completion hooks."""
+    batch_id = batch_report.task_id
+    user_id = batch_report.user_id
+    batch_summary = batch_report.batch_summary or {}
+    per_game_results = list(batch_report.per_game_results or [])
+    failed_games = batch_report.failed_games or []
+    successful_count = len(batch_report.completed_games or [])
+
+    # Generate coaching report using OpenAI
+    coaching_report = None
+    coaching_error = None
+    try:
+        # Extract player_rating from batch_summary (derived from game ELOs)
+        player_rating = batch_summary.get("player_rating")
+        from .coach_persona import resolve_coach_persona
+
+        _coach_profile = Profile.objects.filter(user_id=user_id).first()
+        coaching_report = coaching_fn(
+            batch_summary,
+            per_game_results,
+            player_rating=player_rating,
+            coach_persona=resolve_coach_persona(_coach_profile),
+        )
+        # Status matrix (see docs/SHIP_CONTRACT.md P0-5):
+        # - completed: coaching OK; failed_results may be non-empty (some games failed)
+        # - partial (here): some games failed but coaching succeeded
+        # - partial (CoachingGeneratorError below): coaching failed, analysis OK
+        final_status = "completed" if not failed_games else "partial"
+
+    except CoachingGeneratorError as exc:
+        # Degraded mode: coaching failure doesn't fail the entire batch
+        # Save what we have (batch_summary + per_game_results) and mark as partial
+        coaching_error = str(exc)
+        logger.warning(f"Batch {batch_id}: coaching generation failed (degraded mode): {coaching_error}")
+        coaching_report = None
+        final_status = "partial"
+
+    try:
+        coach_notes = generate_per_game_coach_notes(
+            per_game_results,
+            player_rating=batch_summary.get("player_rating"),
+        )
+        per_game_results = attach_coach_notes_to_results(per_game_results, coach_notes)
+    except Exception as exc:
+        logger.warning("Batch %s: per-game coach notes failed: %s", batch_id, exc)
+
+    batch_report.per_game_results = per_game_results
+    batch_report.coaching_report = coaching_report
+    batch_report.status = final_status
+    batch_report.save(update_fields=["per_game_results", "coaching_report", "status", "updated_at"])
+
+    logger.info(f"Batch {batch_id} completed with status {final_status}")
+    _duration = (timezone.now() - batch_report.created_at).total_seconds()
+    log_batch_completed(
+        batch_id,
+        final_status=final_status,
+        games_analyzed=successful_count,
+        games_failed=len(failed_games),
+        duration_seconds=_duration,
+        coaching_ok=coaching_report is not None,
+        coaching_error=coaching_error,
+    )
+
+    if getattr(settings, "BATCH_SEND_COMPLETE_EMAIL", True) and final_status in (
+        "completed",
+        "partial",
+    ):
+        try:
+            from .batch_notifications import send_batch_complete_email
+
+            send_batch_complete_email(batch_report.user, batch_report)
+        except Exception as email_exc:
+            logger.warning("Batch complete email failed for %s: %s", batch_id, email_exc)
+
+    if coaching_report is not None:
+        try:
+            from .priority_inbox import seed_priority_inbox_from_batch
+
+            seed_priority_inbox_from_batch(batch_report)
+        except Exception as inbox_exc:
+            logger.warning("Priority inbox seed failed for %s: %s", batch_id, inbox_exc)
+
+    if batch_report.status in ("completed", "partial"):
+        try:
+            from .moment_timeline import record_batch_timeline_events
+
+            record_batch_timeline_events(batch_report)
+        except Exception as timeline_exc:
+            logger.warning("Moment timeline seed failed for %s: %s", batch_id, timeline_exc)
+
+    if batch_report.status in ("completed", "partial"):
+        try:
+            from .notifications import notify_batch_complete
+
+            notify_batch_complete(batch_report.user, batch_report)
+        except Exception as notify_exc:
+            logger.warning(
+                "Batch in-app notifications failed for %s: %s",
+                batch_id,
+                notify_exc,
+            )
+
+    if batch_report.status in ("completed", "partial"):
+        try:
+            from .referral import process_referral_on_first_batch
+
+            process_referral_on_first_batch(batch_report)
+        except Exception as referral_exc:
+            logger.warning("Referral redemption failed for %s: %s", batch_id, referral_exc)
+
+    return {
+        "status": final_status,
+        "batch_id": batch_id,
+        "games_analyzed": successful_count,
+        "games_failed": len(failed_games),
+    }
+
+
 def _refund_failed_batch_credits(batch_report: BatchAnalysisReport) -> None:
     try:
         from .batch_credits import refund_batch_credits_on_hard_fail
@@ -1639,6 +1743,7 @@ def analyze_batch_task(
     game_pgn_list: List[str],
     user_id: int,
     source_game_ids: List | None = None,
+    reused_refs: List[Dict[str, Any]] | None = None,
 ) -> str:
     """
     Fan-out/fan-in batch analysis task.
@@ -1650,6 +1755,8 @@ def analyze_batch_task(
         batch_id: Batch identifier (will become task_id on BatchAnalysisReport)
         game_pgn_list: List of PGN strings to analyze
         user_id: User who owns the batch
+        reused_refs: ``{"game_id", "result_key", "saved_game_id"}`` references to stored results
+            (re-runs); those games get no subtask and the callback loads their results by key
 
     Returns:
         Celery task ID or status string
@@ -1774,14 +1881,28 @@ def analyze_batch_task(
         _group = globals().get("group")
         _chord = globals().get("chord")
 
+    reused_ids = {ref.get("game_id") for ref in reused_refs or []}
+    pending = [(i, pgn) for i, pgn in enumerate(game_pgn_list) if f"game_{i}" not in reused_ids]
+    callback_args = (batch_id, game_pgn_list, user_id)
+    if reused_refs:
+        callback_args += (reused_refs,)
+        logger.info(f"Batch {batch_id}: reusing {len(reused_ids)} stored game result(s), analyzing {len(pending)}")
+    if reused_refs and not pending:
+        # Every game has a stored result: skip the fan-out and go straight to aggregation.
+        aggregate_and_report_task([], *callback_args)
+        return batch_id
+
     # Single-container EB: parallel chord runs multiple Stockfish processes and often stalls after game 1.
     if os.environ.get("SEQUENTIAL_BATCH_ANALYSIS", "").lower() in ("1", "true", "yes"):
         logger.info(
-            f"Batch {batch_id}: SEQUENTIAL_BATCH_ANALYSIS enabled — analyzing {len(game_pgn_list)} games one at a time"
+            f"Batch {batch_id}: SEQUENTIAL_BATCH_ANALYSIS enabled — analyzing {len(pending)} games one at a time"
         )
         resolved_ids = source_game_ids or [None] * len(game_pgn_list)
         results: List[Dict[str, Any]] = []
-        for i, pgn in enumerate(game_pgn_list):
+        for i, pgn in pending:
+            if is_batch_cancelled(batch_id):
+                logger.info(f"Batch {batch_id}: cancelled before game {i + 1}/{len(game_pgn_list)}")
+                return batch_id
             logger.info(f"Batch {batch_id}: starting game {i + 1}/{len(game_pgn_list)}")
             saved_id = resolved_ids[i] if i < len(resolved_ids) else None
             try:
@@ -1789,11 +1910,13 @@ def analyze_batch_task(
             except Exception as exc:
                 logger.exception(f"Batch {batch_id} game {i} failed: {exc}")
                 results.append({"game_id": f"game_{i}", "status": "failed", "error": str(exc)})
-        aggregate_and_report_task(results, batch_id, game_pgn_list, user_id)
+        aggregate_and_report_task(results, *callback_args)
         return batch_id
 
     resolved_ids = source_game_ids or [None] * len(game_pgn_list)
-    # Build group of subtasks: one per game
+    # Build group of subtasks: one per game still missing a stored result. Ids derived from the
+    # run nonce let request_batch_cancel revoke the ones still queued without clashing with a rerun.
+    run = start_batch_run(batch_id)
     subtasks = _group(
         analyze_single_game_subtask.s(
             pgn,
@@ -1801,12 +1924,12 @@ def analyze_batch_task(
             batch_id,
             user_id,
             resolved_ids[i] if i < len(resolved_ids) else None,
-        )
-        for i, pgn in enumerate(game_pgn_list)
+        ).set(task_id=batch_subtask_id(batch_id, i, run))
+        for i, pgn in pending
     )
 
     # Chain group to callback
-    callback = aggregate_and_report_task.s(batch_id, game_pgn_list, user_id)
+    callback = aggregate_and_report_task.s(*callback_args)
     workflow = _chord(subtasks)(callback)
 
     logger.info(f"Batch {batch_id} workflow initiated: {workflow.id}")
@@ -1814,31 +1937,101 @@ def analyze_batch_task(
     return workflow.id
 
 
+def dispatch_email_campaign(campaign: str, run_key: Optional[str] = None) -> int:
+    """Select a campaign's eligible users in one query and fan them out as chunk subtasks.
+
+    Returns the number of users queued. Chunks re-check eligibility, so re-dispatching the
+    same ``run_key`` (a resumed or repeated beat run) only reaches users not yet logged.
+    """
+    from .email_campaigns import campaign_run_key, chunk_user_ids, eligible_user_ids
+
+    run_key = run_key or campaign_run_key(campaign)
+    user_ids = eligible_user_ids(campaign, run_key)
+    chunks = chunk_user_ids(user_ids)
+    if chunks:
+        group(send_email_campaign_chunk_task.s(campaign, run_key, chunk) for chunk in chunks).apply_async()
+    logger.info("Email campaign %s (%s): %s users in %s chunks", campaign, run_key, len(user_ids), len(chunks))
+    return len(user_ids)
+
+
+@shared_task(
+    name="core.tasks.send_email_campaign_chunk_task",
+    ignore_result=True,
+    acks_late=True,
+    soft_time_limit=600,
+)
+def send_email_campaign_chunk_task(campaign: str, run_key: str, user_ids: List[int]) -> int:
+    """Send one chunk of a campaign run; redelivery is safe (sends are claimed per user and key)."""
+    from .email_campaigns import send_campaign_chunk
+
+    return send_campaign_chunk(campaign, run_key, user_ids)
+
+
 @shared_task(name="core.tasks.send_weekly_digest_task", ignore_result=True)
 def send_weekly_digest_task() -> int:
-    """Celery beat: send weekly coach digest to opted-in users (SRG-15)."""
-    from .weekly_digest_email import send_weekly_digests
+    """Celery beat: fan out the weekly coach digest to opted-in users (SRG-15)."""
+    from .email_campaigns import CAMPAIGN_WEEKLY_DIGEST
 
-    sent = send_weekly_digests()
-    logger.info("Weekly digest task completed: %s sends", sent)
-    return sent
+    queued = dispatch_email_campaign(CAMPAIGN_WEEKLY_DIGEST)
+    logger.info("Weekly digest task completed: %s users queued", queued)
+    return queued
 
 
 @shared_task(name="core.tasks.send_spaced_repetition_task", ignore_result=True)
 def send_spaced_repetition_task() -> int:
-    """Celery beat: spaced moment reminder for opted-in users (SRG-13)."""
-    from .spaced_repetition_email import send_spaced_repetition_reminders
+    """Celery beat: fan out spaced moment reminders for opted-in users (SRG-13)."""
+    from .email_campaigns import CAMPAIGN_SPACED_REPETITION
 
-    sent = send_spaced_repetition_reminders()
-    logger.info("Spaced repetition task completed: %s sends", sent)
-    return sent
+    queued = dispatch_email_campaign(CAMPAIGN_SPACED_REPETITION)
+    logger.info("Spaced repetition task completed: %s users queued", queued)
+    return queued
 
 
 @shared_task(name="core.tasks.send_reactivation_email_task", ignore_result=True)
 def send_reactivation_email_task() -> int:
-    """Celery beat: inactive user reactivation for opted-in users (SRG-27)."""
-    from .reactivation_email import send_reactivation_emails
+    """Celery beat: fan out inactive user reactivation for opted-in users (SRG-27)."""
+    from .email_campaigns import CAMPAIGN_REACTIVATION
+
+    queued = dispatch_email_campaign(CAMPAIGN_REACTIVATION)
+    logger.info("Reactivation email task completed: %s users queued", queued)
+    return queued
+
+
+@shared_task(name="core.tasks.compact_credit_ledger_task", ignore_result=True)
+def compact_credit_ledger_task() -> int:
+    """Celery beat: fold settled credit ledger entries into Profile.credits snapshots."""
+    from .credit_ledger import compact_credit_ledger
+
+    return compact_credit_ledger()
+
+
+@shared_task(name="core.tasks.reconcile_daily_quotas_task", ignore_result=True)
+def reconcile_daily_quotas_task() -> int:
+    """Celery beat: rebuild the UserDailyQuota abuse-limit counters from games and batch reports."""
+    from .daily_quota import reconcile_daily_quotas
+
+    return reconcile_daily_quotas()
+
+
+@shared_task(name="core.tasks.flush_expired_tokens_task", ignore_result=True)
+def flush_expired_tokens_task() -> int:
+    """Celery beat: prune expired SQL token-blacklist rows and copy live ones into Redis."""
+    from .token_blacklist import flush_expired_tokens
+
+    return flush_expired_tokens()
+
+
+@shared_task(name="core.tasks.prune_llm_responses_task", ignore_result=True)
+def prune_llm_responses_task() -> int:
+    """Celery beat: delete stored LLM responses older than LLM_CACHE_DURABLE_TTL_DAYS."""
+    from .llm_cache import prune_llm_responses
+
+    return prune_llm_responses()
+
+
+@shared_task(name="core.tasks.prune_batch_game_results_task", ignore_result=True)
+def prune_batch_game_results_task() -> int:
+    """Celery beat: delete stored per-game batch results older than BATCH_RESULT_RETENTION_DAYS."""
+    from .batch_result_store import prune_game_results
 
-    sent = send_reactivation_emails()
-    logger.info("Reactivation email task completed: %s sends", sent)
-    return sent
+    return prune_game_results()
@@ -21,10 +21,11 @@ from core.cache_invalidation import (
 )
 from django.conf import settings
 from django.core.cache import cache
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 
+@override_settings(USE_REDIS=True)
 class CacheInvalidationTestCase(TestCase):
     """Test cache invalidation functionality."""
 
@@ -28,7 +28,7 @@ from core.health_checks import (
 )
 from django.core.cache import cache
 from django.db.utils import OperationalError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
 
@@ -109,6 +109,33 @@ class HealthFunctionsTestCase(TestCase):
         self.assertEqual(result["component"], "cache")
         self.assertIn("Cache error", result["message"])
 
+    @patch("core.tasks.worker_readiness_task.delay")
+    def test_check_celery_reports_worker_readiness(self, mock_delay):
+        """Test Celery check includes the answering worker's warm-up state."""
+        mock_delay.return_value.get.return_value = {
+            "ready": True,
+            "pid": 4321,
+            "engine_ready": True,
+            "warmup_ms": 850.0,
+            "import_ms": {"core.tasks": 120.0},
+        }
+
+        result = check_celery()
+
+        self.assertEqual(result["status"], STATUS_OK)
+        self.assertEqual(result["worker"], {"ready": True, "pid": 4321, "engine_ready": True, "warmup_ms": 850.0})
+
+    @override_settings(CELERY_WORKER_WARMUP=True)
+    @patch("core.tasks.worker_readiness_task.delay")
+    def test_check_celery_warns_when_worker_is_not_warmed_up(self, mock_delay):
+        """Test Celery check warns when a worker answers before its warm-up ran."""
+        mock_delay.return_value.get.return_value = {"ready": False, "pid": 4321}
+
+        result = check_celery()
+
+        self.assertEqual(result["status"], STATUS_WARNING)
+        self.assertIn("warm-up", result["message"])
+
     @patch("core.health_checks.get_redis_connection")
     def test_check_redis_success(self, mock_get_redis):
         """Test Redis check when Redis is operational."""
@@ -1,9 +1,12 @@
 """Tests for signup, auth, import, analysis, batch, and checkout abuse limits."""
 
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import fakeredis
 import pytest
+from core import abuse_limits
 from core.abuse_limits import (
     batches_started_today,
     check_batch_creation_allowed,
@@ -20,10 +23,9 @@ from core.abuse_limits import (
     record_coaching_regenerate,
     record_external_fetch,
     record_failed_login,
-    record_password_reset_request,
-    record_signup_attempt,
     record_single_analysis,
 )
+from core.daily_quota import reconcile_daily_quotas
 from core.models import BatchAnalysisReport, Game, Profile
 from core.tests.profile_helpers import ensure_profile
 from django.conf import settings as django_settings
@@ -68,7 +70,6 @@ def _clear_cache():
             "password_reset_ip",
         ):
             cache_delete(f"{prefix}:{ip}")
-            cache_delete(f"{prefix}:{ip}:ts")
 
 
 MIDDLEWARE_NO_RATE_LIMIT = [m for m in django_settings.MIDDLEWARE if m != "core.middleware.RateLimitMiddleware"]
@@ -129,6 +130,37 @@ class TestSignupRateLimit(TestCase):
         assert blocked.data["code"] == "RATE_001"
         assert "retry_after" in blocked.data
 
+    @override_settings(
+        SIGNUP_RATE_LIMIT_MAX_PER_IP=2,
+        SIGNUP_RATE_LIMIT_WINDOW_SECONDS=3600,
+        CACHES=LOCMEM_CACHES,
+    )
+    def test_failed_registrations_do_not_use_up_the_ip_limit(self):
+        for idx in range(3):
+            invalid = self.client.post(
+                "/api/v1/auth/register/",
+                {"username": f"bad{idx}", "email": "not-an-email", "password": "Password123!"},
+                format="json",
+                REMOTE_ADDR="198.51.100.20",
+            )
+            assert invalid.status_code == 400
+        for idx in range(2):
+            response = self.client.post(
+                "/api/v1/auth/register/",
+                {"username": f"ok{idx}", "email": f"ok{idx}@example.com", "password": "Password123!"},
+                format="json",
+                REMOTE_ADDR="198.51.100.20",
+            )
+            assert response.status_code == 201, response.data
+        blocked = self.client.post(
+            "/api/v1/auth/register/",
+            {"username": "ok2", "email": "ok2@example.com", "password": "Password123!"},
+            format="json",
+            REMOTE_ADDR="198.51.100.20",
+        )
+        assert blocked.status_code == 429
+        assert blocked.data["code"] == "RATE_001"
+
 
 @pytest.mark.django_db
 class TestLoginRateLimit(TestCase):
@@ -310,6 +342,8 @@ class TestDailyBatchLimit(TestCase):
             games_count=5,
         )
         BatchAnalysisReport.objects.filter(pk=old.pk).update(created_at=yesterday)
+        # QuerySet.update bypasses the quota signals; reconciliation rebuilds the counters.
+        reconcile_daily_quotas()
 
         assert batches_started_today(self.user) == 0
         allowed, _info = check_batch_creation_allowed(self.user)
@@ -391,11 +425,12 @@ class TestAbuseLimitUnitHelpers(TestCase):
 
     @override_settings(CACHES=LOCMEM_CACHES)
     def test_ip_window_helpers_for_signup_and_login(self):
-        assert check_signup_allowed(self.request)[0] is True
-        record_signup_attempt(self.request)
-        record_signup_attempt(self.request)
         with override_settings(SIGNUP_RATE_LIMIT_MAX_PER_IP=2):
-            assert check_signup_allowed(self.request)[0] is False
+            assert check_signup_allowed(self.request)[0] is True
+            assert check_signup_allowed(self.request)[0] is True
+            allowed, retry_after = check_signup_allowed(self.request)
+            assert allowed is False
+            assert 0 < retry_after <= 3600
 
         assert check_login_allowed(self.request)[0] is True
         record_failed_login(self.request)
@@ -407,10 +442,20 @@ class TestAbuseLimitUnitHelpers(TestCase):
     def test_password_reset_email_window(self):
         with override_settings(PASSWORD_RESET_MAX_PER_EMAIL=2):
             assert check_password_reset_allowed(self.request, "a@example.com")[0] is True
-            record_password_reset_request(self.request, "a@example.com")
-            record_password_reset_request(self.request, "a@example.com")
+            assert check_password_reset_allowed(self.request, "a@example.com")[0] is True
             assert check_password_reset_allowed(self.request, "a@example.com")[0] is False
 
+    @override_settings(CACHES=LOCMEM_CACHES, PASSWORD_RESET_MAX_PER_IP=3, PASSWORD_RESET_MAX_PER_EMAIL=1)
+    def test_password_reset_email_rejection_releases_ip_attempt(self):
+        request = _request("203.0.113.45")
+        assert check_password_reset_allowed(request, "locked@example.com")[0] is True
+        for _ in range(5):
+            assert check_password_reset_allowed(request, "locked@example.com")[0] is False
+        # Only the one admitted reset counts against the IP.
+        assert check_password_reset_allowed(request, "other1@example.com")[0] is True
+        assert check_password_reset_allowed(request, "other2@example.com")[0] is True
+        assert check_password_reset_allowed(request, "other3@example.com")[0] is False
+
     @override_settings(CACHES=LOCMEM_CACHES, MAX_GAME_IMPORTS_PER_USER_PER_DAY=3)
     def test_game_import_daily_count(self):
         for idx in range(3):
@@ -449,7 +494,6 @@ class TestAbuseLimitUnitHelpers(TestCase):
         from core.cache import cache_delete
 
         cache_delete(f"checkout_sessions:{self.user.id}")
-        cache_delete(f"checkout_sessions:{self.user.id}:ts")
         record_checkout_session(self.user)
         record_checkout_session(self.user)
         assert check_checkout_allowed(self.user)[0] is False
@@ -506,3 +550,57 @@ class TestAwsSetupArtifacts(TestCase):
             "Chessmate-RDS-Connections-High",
         ):
             assert alarm_name in content
+
+
+def _run_concurrently(target, attempts):
+    barrier = threading.Barrier(attempts)
+    results = []
+
+    def runner():
+        barrier.wait()
+        results.append(target())
+
+    threads = [threading.Thread(target=runner) for _ in range(attempts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@override_settings(SIGNUP_RATE_LIMIT_MAX_PER_IP=5, SIGNUP_RATE_LIMIT_WINDOW_SECONDS=600)
+def test_concurrent_signup_attempts_admit_exactly_max_count(monkeypatch):
+    # Redis 6, as in CI: no EXPIRE ... NX.
+    client = fakeredis.FakeRedis(version=6)
+    monkeypatch.setattr(abuse_limits, "_redis_connection", lambda: client)
+    request = _request("198.51.100.7")
+
+    results = _run_concurrently(lambda: abuse_limits.check_signup_allowed(request), 200)
+
+    assert sum(1 for allowed, _ in results if allowed) == 5
+    assert client.get("signup_attempts:198.51.100.7") == b"200"
+    assert not client.exists("signup_attempts:198.51.100.7:ts")
+    # Retry-After comes from the counter's TTL, which the first hit set and later hits left alone.
+    retry_afters = {retry_after for allowed, retry_after in results if not allowed}
+    assert retry_afters and all(0 < retry_after <= 600 for retry_after in retry_afters)
+    assert 0 < client.ttl("signup_attempts:198.51.100.7") <= 600
+
+    for _ in range(200):
+        abuse_limits.release_signup_attempt(request)
+    assert not client.exists("signup_attempts:198.51.100.7")
+    abuse_limits.release_signup_attempt(request)
+    assert not client.exists("signup_attempts:198.51.100.7")
+
+
+@override_settings(LOGIN_FAILED_MAX_PER_IP=3, LOGIN_FAILED_WINDOW_SECONDS=600)
+def test_concurrent_failed_logins_are_all_counted(monkeypatch):
+    client = fakeredis.FakeRedis(version=6)
+    monkeypatch.setattr(abuse_limits, "_redis_connection", lambda: client)
+    request = _request("198.51.100.8")
+
+    _run_concurrently(lambda: abuse_limits.record_failed_login(request), 50)
+
+    assert client.get("login_failed:198.51.100.8") == b"50"
+    allowed, retry_after = abuse_limits.check_login_allowed(request)
+    assert allowed is False
+    assert 0 < retry_after <= 600
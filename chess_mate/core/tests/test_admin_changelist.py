@@ -0,0 +1,85 @@
+"""Tests for the estimated-count, lean admin changelists on large tables."""
+
+import pytest
+from core import admin_changelist
+from core.admin_changelist import EstimatedCountPaginator
+from core.models import BatchAnalysisReport, Game, GameAnalysis
+from django.contrib.admin import site
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+ROWS = 500
+HEAVY_FIELDS = {
+    "game": ("pgn", "analysis", "feedback"),
+    "gameanalysis": ("moves_blob", "feedback"),
+    "batchanalysisreport": ("failed_games", "coaching_report", "per_game_results"),
+}
+
+
+@pytest.fixture
+def large_tables(test_user):
+    games = Game.objects.bulk_create(
+        Game(
+            user=test_user,
+            platform="lichess",
+            game_id=f"g{index}",
+            pgn="1. e4 e5 2. Nf3 Nc6 " * 50,
+            result="1-0",
+            white="white",
+            black=f"black{index}",
+            analysis={"moves": list(range(200))},
+        )
+        for index in range(ROWS)
+    )
+    GameAnalysis.objects.bulk_create(GameAnalysis(game=game, feedback={"notes": "x" * 500}) for game in games)
+    BatchAnalysisReport.objects.bulk_create(
+        BatchAnalysisReport(
+            user=test_user,
+            task_id=f"task-{index}",
+            status="completed",
+            failed_games=[{"game_id": n} for n in range(index % 3)],
+            coaching_report={"executive_summary": "Work on endgames"} if index % 2 else None,
+        )
+        for index in range(ROWS)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("model", ["game", "gameanalysis", "batchanalysisreport"])
+def test_changelist_query_count_is_bounded(admin_client, large_tables, model):
+    url = reverse(f"admin:core_{model}_changelist")
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    assert response.context["cl"].result_count == ROWS
+    # Session, user, count, one page of rows (joins included) and the filter choices; none per row.
+    assert len(queries) <= 6, [query["sql"] for query in queries]
+    row = response.context["cl"].result_list[0]
+    assert set(HEAVY_FIELDS[model]) <= row.get_deferred_fields()
+
+
+@pytest.mark.django_db
+def test_batch_indicators_are_computed_in_sql(large_tables):
+    model_admin = site._registry[BatchAnalysisReport]
+    queryset = model_admin.get_queryset(RequestFactory().get("/")).filter(task_id__in=["task-2", "task-3", "task-4"])
+    rows = {report.task_id: report for report in queryset.defer("failed_games", "coaching_report")}
+    assert [model_admin.failed_count(rows[task]) for task in ("task-2", "task-3", "task-4")] == [2, 0, 1]
+    assert [model_admin.has_coaching(rows[task]) for task in ("task-2", "task-3", "task-4")] == [False, True, False]
+    assert not any(row.get_deferred_fields() - {"failed_games", "coaching_report"} for row in rows.values())
+
+
+@pytest.mark.django_db
+def test_paginator_uses_table_statistics_for_unfiltered_lists(large_tables, monkeypatch):
+    monkeypatch.setattr(admin_changelist, "EXACT_COUNT_LIMIT", 100)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    Game.objects.filter(pk__in=Game.objects.values("pk")[:50]).delete()
+
+    # The estimate is as of ANALYZE; filtered lists are still counted exactly.
+    assert EstimatedCountPaginator(Game.objects.all(), 100).count == ROWS
+    assert EstimatedCountPaginator(Game.objects.filter(result="1-0"), 100).count == ROWS - 50
+
+    monkeypatch.setattr(admin_changelist, "EXACT_COUNT_LIMIT", 10 * ROWS)
+    assert EstimatedCountPaginator(Game.objects.all(), 100).count == ROWS - 50
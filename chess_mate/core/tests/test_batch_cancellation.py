@@ -0,0 +1,147 @@
+"""Tests for cooperative batch cancellation (cancel flag, subtask revoke, engine loop polling)."""
+
+import io
+from unittest.mock import patch
+
+import pytest
+from core.analysis.stockfish_game_result import (
+    CANCEL_POLL_PLIES,
+    AnalysisCancelled,
+    StockfishAnalyzer,
+    build_game_result,
+)
+from core.batch_cancellation import (
+    batch_subtask_id,
+    current_batch_run,
+    is_batch_cancelled,
+    request_batch_cancel,
+    start_batch_run,
+)
+from core.batch_rerun import queue_batch_rerun
+from core.models import BatchAnalysisReport, Game
+from core.tasks import aggregate_and_report_task, analyze_single_game_subtask
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+
+LONG_GAME_PGN = """
+[Event "Test"]
+[White "Tester"]
+[Black "Opponent"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 8. c3 O-O 9. h3 Nb8
+10. d4 Nbd7 11. c4 c6 12. cxb5 axb5 13. Nc3 Bb7 14. Bg5 b4 15. Nb1 h6 16. Bh4 c5 1-0
+"""
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "batch-cancel"}}
+
+
+class CountingEngine:
+    """Fake analyzer that counts searches and can run a hook after the Nth one."""
+
+    def __init__(self, on_search=None, after=0):
+        self.searches = 0
+        self.on_search = on_search
+        self.after = after
+
+    def analyze_position(self, _board, depth=20, features=True):
+        self.searches += 1
+        if self.on_search is not None and self.searches == self.after:
+            self.on_search()
+        return {"score": 0.1, "depth": depth, "pv": ["e2e4"], "time": 0.01}
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHES):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+def _use_engine(monkeypatch, engine):
+    monkeypatch.setattr(StockfishAnalyzer, "get_instance", staticmethod(lambda: engine))
+
+
+def test_engine_loop_stops_within_poll_interval(monkeypatch):
+    stop = {"now": False}
+    engine = CountingEngine(on_search=lambda: stop.update(now=True), after=5)
+    _use_engine(monkeypatch, engine)
+
+    with pytest.raises(AnalysisCancelled):
+        build_game_result(LONG_GAME_PGN, game_id="g", depth=10, should_stop=lambda: stop["now"])
+
+    # Two searches per ply; at most one poll interval of plies runs after the flag flips.
+    assert 5 <= engine.searches <= 5 + 2 * CANCEL_POLL_PLIES
+    assert engine.searches < 64
+
+
+@pytest.mark.django_db
+def test_cancel_batch_command_stops_running_and_queued_games(monkeypatch):
+    user = User.objects.create_user(username="cancel-user", password="x")
+    batch_id = "batch-cancel-30"
+    BatchAnalysisReport.objects.create(user=user, task_id=batch_id, status="in_progress", games_count=30)
+
+    def cancel():
+        call_command("cancel_batch", "--task-id", batch_id, stdout=io.StringIO())
+
+    engine = CountingEngine(on_search=cancel, after=6)
+    _use_engine(monkeypatch, engine)
+
+    with patch("core.batch_cancellation.current_app") as app:
+        running = analyze_single_game_subtask(LONG_GAME_PGN, "game_0", batch_id, user.id)
+        searches_at_cancel = engine.searches
+        queued = analyze_single_game_subtask(LONG_GAME_PGN, "game_1", batch_id, user.id)
+
+    assert running == {"game_id": "game_0", "status": "failed", "error": "Batch cancelled"}
+    assert searches_at_cancel <= 6 + 2 * CANCEL_POLL_PLIES
+    assert queued["error"] == "Batch cancelled"
+    assert engine.searches == searches_at_cancel
+    app.control.revoke.assert_called_once_with([batch_subtask_id(batch_id, index) for index in range(30)])
+
+    result = aggregate_and_report_task([running, queued], batch_id, [LONG_GAME_PGN] * 30, user.id)
+    assert result["status"] == "cancelled"
+    assert BatchAnalysisReport.objects.get(task_id=batch_id).status == "failed"
+
+
+def test_cancel_flag_survives_revoke_failure():
+    with patch("core.batch_cancellation.current_app") as app:
+        app.control.revoke.side_effect = ConnectionError("broker down")
+        assert request_batch_cancel("batch-x", games_count=3) == []
+    assert is_batch_cancelled("batch-x")
+    assert not is_batch_cancelled("batch-y")
+
+
+@pytest.mark.django_db
+def test_rerun_after_cancel_analyzes_games_again(monkeypatch):
+    user = User.objects.create_user(username="rerun-cancel-user", password="x")
+    games = [
+        Game.objects.create(user=user, platform="lichess", game_id=f"rc-{i}", pgn=LONG_GAME_PGN, result="win")
+        for i in range(5)
+    ]
+    batch_id = "batch-cancel-rerun"
+    BatchAnalysisReport.objects.create(
+        user=user, task_id=batch_id, status="in_progress", games_count=5, game_ids=[g.id for g in games]
+    )
+    first_run = start_batch_run(batch_id)
+    with patch("core.batch_cancellation.current_app") as app:
+        call_command("cancel_batch", "--task-id", batch_id, stdout=io.StringIO())
+    app.control.revoke.assert_called_once_with([batch_subtask_id(batch_id, index, first_run) for index in range(5)])
+    assert is_batch_cancelled(batch_id)
+
+    engine = CountingEngine()
+    _use_engine(monkeypatch, engine)
+    queue_batch_rerun(BatchAnalysisReport.objects.get(task_id=batch_id), eager=True, reuse=False)
+
+    assert not is_batch_cancelled(batch_id)
+    assert engine.searches > 0
+    report = BatchAnalysisReport.objects.get(task_id=batch_id)
+    assert report.status != "in_progress"
+    assert report.failed_games == []
+
+    # The next queued run gets subtask ids workers have never seen revoked.
+    second_run = start_batch_run(batch_id)
+    assert current_batch_run(batch_id) == second_run != first_run
+    assert batch_subtask_id(batch_id, 0, second_run) != batch_subtask_id(batch_id, 0, first_run)
@@ -3,6 +3,7 @@
 from unittest.mock import patch
 
 from core.batch_credits import refund_batch_credits_on_hard_fail
+from core.credit_ledger import credit_balance
 from core.models import BatchAnalysisReport, Profile
 from core.tasks import aggregate_and_report_task
 from core.tests.profile_helpers import ensure_profile
@@ -47,8 +48,7 @@ class TestBatchCreditRefund(TestCase):
         mock_agg.assert_not_called()
         mock_coach.assert_not_called()
 
-        self.profile.refresh_from_db()
-        assert self.profile.credits == 50
+        assert credit_balance(self.user.id) == 50
 
         batch_report = BatchAnalysisReport.objects.get(task_id=batch_id)
         assert batch_report.credits_refunded is True
@@ -65,13 +65,11 @@ class TestBatchCreditRefund(TestCase):
         self.profile.save(update_fields=["credits"])
 
         assert refund_batch_credits_on_hard_fail(batch_report) == 5
-        self.profile.refresh_from_db()
-        assert self.profile.credits == 50
+        assert credit_balance(self.user.id) == 50
 
         batch_report.refresh_from_db()
         assert refund_batch_credits_on_hard_fail(batch_report) == 0
-        self.profile.refresh_from_db()
-        assert self.profile.credits == 50
+        assert credit_balance(self.user.id) == 50
 
     def test_partial_batch_does_not_refund(self):
         batch_report = BatchAnalysisReport.objects.create(
@@ -85,5 +83,4 @@ class TestBatchCreditRefund(TestCase):
         self.profile.save(update_fields=["credits"])
 
         assert refund_batch_credits_on_hard_fail(batch_report) == 0
-        self.profile.refresh_from_db()
-        assert self.profile.credits == 40
+        assert credit_balance(self.user.id) == 40
@@ -1,5 +1,7 @@
 """Tests for batch Stockfish re-run (ops / classification refresh)."""
 
+from datetime import timedelta
+
 import pytest
 from core.batch_rerun import (
     BatchRerunError,
@@ -8,9 +10,17 @@ from core.batch_rerun import (
     queue_batch_rerun,
     resolve_batch_game_ids,
 )
-from core.models import BatchAnalysisReport, Game
+from core.batch_result_store import (
+    game_result_key,
+    prune_game_results,
+    reused_envelopes,
+    store_game_result,
+)
+from core.models import BatchAnalysisReport, BatchGameResult, Game
 from core.tests.profile_helpers import ensure_profile
 from django.contrib.auth import get_user_model
+from django.test.utils import override_settings
+from django.utils import timezone
 
 
 @pytest.mark.django_db
@@ -90,3 +100,97 @@ class TestBatchRerun:
         assert "Re-analyzed" in message
         assert len(subtask_calls) == 5
         assert aggregate_calls == ["rerun-task-1"]
+
+    def test_collect_batch_pgns_uses_one_game_query(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            pgns, _ = collect_batch_pgns(self.batch)
+        assert len(pgns) == 5
+
+    @override_settings(BATCH_ANALYSIS_DEPTH=14, STOCKFISH_VERSION="sf-test")
+    def test_queue_batch_rerun_only_analyzes_games_without_stored_result(self, monkeypatch):
+        for idx, game in enumerate(self.games[:4]):
+            store_game_result(
+                game_result_key(game.pgn, 14),
+                14,
+                {"game_id": "old", "saved_game_id": None, "accuracy": 80 + idx},
+            )
+        subtask_calls = []
+        aggregated = []
+
+        def fake_subtask(pgn, game_id, batch_id, user_id, saved_id=None):
+            subtask_calls.append((game_id, saved_id))
+            return {"game_id": game_id, "status": "success", "result": {"game_id": game_id, "accuracy": 50}}
+
+        def fake_aggregate(results, batch_id, pgn_list, user_id):
+            aggregated.extend(results)
+
+        monkeypatch.setattr("core.tasks.analyze_single_game_subtask", fake_subtask)
+        monkeypatch.setattr("core.tasks.aggregate_and_report_task", fake_aggregate)
+
+        message = queue_batch_rerun(self.batch, eager=True)
+
+        assert "4 reused" in message
+        assert subtask_calls == [("game_4", self.games[4].id)]
+        assert [r["game_id"] for r in aggregated] == [f"game_{i}" for i in range(5)]
+        assert [r["result"]["accuracy"] for r in aggregated] == [80, 81, 82, 83, 50]
+        assert aggregated[0]["result"]["saved_game_id"] == self.games[0].id
+        self.batch.refresh_from_db()
+        assert self.batch.completed_games == ["game_0", "game_1", "game_2", "game_3"]
+
+    @override_settings(BATCH_ANALYSIS_DEPTH=14, STOCKFISH_VERSION="sf-test")
+    def test_queue_batch_rerun_without_reuse_analyzes_every_game(self, monkeypatch):
+        for game in self.games:
+            store_game_result(game_result_key(game.pgn, 14), 14, {"game_id": "old"})
+        subtask_calls = []
+
+        def fake_subtask(pgn, game_id, batch_id, user_id, saved_id=None):
+            subtask_calls.append(game_id)
+            return {"game_id": game_id, "status": "success", "result": {"game_id": game_id}}
+
+        monkeypatch.setattr("core.tasks.analyze_single_game_subtask", fake_subtask)
+        monkeypatch.setattr("core.tasks.aggregate_and_report_task", lambda *args: None)
+
+        queue_batch_rerun(self.batch, eager=True, reuse=False)
+
+        assert len(subtask_calls) == 5
+
+    @override_settings(BATCH_ANALYSIS_DEPTH=14, STOCKFISH_VERSION="sf-test")
+    def test_queued_rerun_sends_references_not_results(self, monkeypatch):
+        for game in self.games[:2]:
+            store_game_result(game_result_key(game.pgn, 14), 14, {"game_id": "old", "moves": ["x"] * 500})
+        queued = []
+        monkeypatch.setattr("core.tasks.analyze_batch_task.delay", lambda *args, **kwargs: queued.append(kwargs))
+
+        message = queue_batch_rerun(self.batch)
+
+        assert "2 reused" in message
+        refs = queued[0]["reused_refs"]
+        assert [ref["game_id"] for ref in refs] == ["game_0", "game_1"]
+        assert all(set(ref) == {"game_id", "result_key", "saved_game_id"} for ref in refs)
+        assert refs[0]["saved_game_id"] == self.games[0].id
+
+    @override_settings(BATCH_ANALYSIS_DEPTH=14, STOCKFISH_VERSION="sf-test")
+    def test_reused_envelopes_load_results_and_flag_pruned_ones(self):
+        key = game_result_key(self.games[0].pgn, 14)
+        store_game_result(key, 14, {"game_id": "old", "accuracy": 91})
+        refs = [
+            {"game_id": "game_0", "result_key": key, "saved_game_id": self.games[0].id},
+            {"game_id": "game_1", "result_key": "f" * 64, "saved_game_id": self.games[1].id},
+        ]
+
+        envelopes = reused_envelopes(refs, self.user.id)
+
+        assert envelopes[0]["status"] == "success"
+        assert envelopes[0]["result"]["accuracy"] == 91
+        assert envelopes[0]["result"]["game_id"] == "game_0"
+        assert envelopes[0]["result"]["saved_game_id"] == self.games[0].id
+        assert envelopes[1] == {"game_id": "game_1", "status": "failed", "error": "Stored game result expired"}
+
+    @override_settings(BATCH_RESULT_RETENTION_DAYS=30)
+    def test_prune_game_results_deletes_rows_past_retention(self):
+        store_game_result("a" * 64, 14, {"game_id": "old"})
+        store_game_result("b" * 64, 14, {"game_id": "new"})
+        BatchGameResult.objects.filter(result_key="a" * 64).update(created_at=timezone.now() - timedelta(days=31))
+
+        assert prune_game_results() == 1
+        assert list(BatchGameResult.objects.values_list("result_key", flat=True)) == ["b" * 64]
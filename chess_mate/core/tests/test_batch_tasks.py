@@ -2,7 +2,7 @@
 Tests for Phase 1 batch analysis Celery tasks.
 """
 
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 import pytest
 from core.models import BatchAnalysisReport
@@ -10,9 +10,10 @@ from core.tasks import (
     aggregate_and_report_task,
     analyze_batch_task,
     analyze_single_game_subtask,
+    generate_batch_coaching_task,
 )
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 
 class TestAnalyzeSingleGameSubtask(TestCase):
@@ -41,8 +42,21 @@ class TestAnalyzeSingleGameSubtask(TestCase):
                 saved_game_id=None,
                 chess_com_username="",
                 lichess_username="",
+                should_stop=ANY,
             )
 
+    def test_subtask_stores_content_addressed_result(self):
+        """Successful results are saved under the PGN/depth/engine/analyzer key for re-runs."""
+        from core.batch_result_store import game_result_key, load_game_results
+
+        pgn = '[Event "Test"]\n1.e4 e5 2.Nf3 Nc6'
+        with patch("core.tasks.build_game_result") as mock_build:
+            mock_build.return_value = {"game_id": "game_0", "total_moves": 4}
+            analyze_single_game_subtask(pgn, "game_0", "batch_store", 1)
+
+        key = game_result_key(pgn, 14)
+        assert load_game_results([key]) == {key: {"game_id": "game_0", "total_moves": 4}}
+
     def test_subtask_exception_handling(self):
         """Subtask catches exceptions and returns failed envelope."""
         pgn = '[Event "Bad PGN"]'
@@ -263,6 +277,40 @@ class TestAggregateAndReportTask(TestCase):
                 assert len(batch_report.per_game_results) == 5
                 assert batch_report.coaching_report is None
 
+    @override_settings(BATCH_COACHING_QUEUE="llm")
+    def test_coaching_handed_off_to_llm_queue(self):
+        """With BATCH_COACHING_QUEUE set, the summary is saved and coaching runs as its own task."""
+        batch_id = "batch_coaching_queue"
+        user_id = self.user.id
+        task_results = [
+            {"game_id": f"game_{i}", "status": "success", "result": {"game_id": f"game_{i}", "total_moves": 20}}
+            for i in range(5)
+        ]
+
+        with patch("core.tasks.aggregate_batch") as mock_agg:
+            with patch("core.tasks.generate_coaching_report") as mock_coach:
+                with patch("core.tasks.generate_batch_coaching_task.apply_async") as mock_queue:
+                    mock_agg.return_value = {"games_analyzed": 5}
+                    mock_coach.return_value = {"executive_summary": "Good"}
+
+                    result = aggregate_and_report_task(task_results, batch_id, ["pgn"] * 5, user_id)
+
+                    assert result["status"] == "coaching_queued"
+                    assert mock_coach.call_count == 0
+                    mock_queue.assert_called_once_with(args=[batch_id, user_id], queue="llm")
+                    batch_report = BatchAnalysisReport.objects.get(task_id=batch_id)
+                    assert batch_report.status == "in_progress"
+                    assert batch_report.batch_summary == {"games_analyzed": 5}
+
+                    result = generate_batch_coaching_task(batch_id, user_id)
+
+                    assert result["status"] == "completed"
+                    assert mock_coach.call_count == 1
+                    batch_report.refresh_from_db()
+                    assert batch_report.status == "completed"
+                    assert batch_report.coaching_report == {"executive_summary": "Good"}
+                    assert len(batch_report.completed_games) == 5
+
 
 class TestAnalyzeBatchTask(TestCase):
     """Test analyze_batch_task group/chord orchestration."""
@@ -306,6 +354,24 @@ class TestAnalyzeBatchTask(TestCase):
                 assert batch_report.status == "in_progress"
                 assert batch_report.games_count == 3
 
+    def test_batch_task_skips_games_with_reused_results(self):
+        """Only games without a reused result get a subtask; the callback receives the stored-result references."""
+        reused = [{"game_id": "game_1", "result_key": "a" * 64, "saved_game_id": None}]
+
+        with patch("core.tasks.chord") as mock_chord:
+            with patch("core.tasks.group") as mock_group:
+                mock_group.side_effect = lambda subtasks: list(subtasks)
+                mock_chord_instance = MagicMock()
+                mock_chord_instance.return_value.id = "workflow_reuse"
+                mock_chord.return_value = mock_chord_instance
+
+                analyze_batch_task("batch_reuse", ["pgn0", "pgn1", "pgn2"], self.user.id, reused_refs=reused)
+
+                dispatched = mock_chord.call_args[0][0]
+                assert [signature.args[1] for signature in dispatched] == ["game_0", "game_2"]
+                callback = mock_chord_instance.call_args[0][0]
+                assert callback.args == ("batch_reuse", ["pgn0", "pgn1", "pgn2"], self.user.id, reused)
+
     def test_batch_task_empty_pgn_list(self):
         """analyze_batch_task handles empty PGN list."""
         batch_id = "batch_005"
@@ -3,18 +3,22 @@
 import json
 from unittest.mock import MagicMock, call, patch
 
+import fakeredis
 import pytest
 from core.cache_middleware import (
     MODEL_CACHE_MAPPING,
     CacheInvalidationMiddleware,
+    InvalidationBatch,
     get_related_values,
     invalidate_cache_on_delete,
     invalidate_cache_on_save,
     setup_cache_invalidation,
 )
 from core.models import Game, GameAnalysis, Player, Profile
+from core.redis_config import analysis_cache_key, game_cache_key, user_games_cache_key
 from core.tests.profile_helpers import ensure_profile
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.test import TestCase
 
@@ -25,35 +29,17 @@ class TestCacheInvalidation:
 
     def setup_method(self):
         """Set up test data and mocks before each test."""
-        # Patch the cache functions
-        self.invalidate_by_tags_patch = patch("core.cache_middleware.redis_invalidate_by_tags")
-        self.invalidate_game_patch = patch("core.cache_middleware.invalidate_game_cache")
-        self.invalidate_user_games_patch = patch("core.cache_middleware.invalidate_user_games_cache")
-        self.invalidate_analysis_patch = patch("core.cache_middleware.invalidate_analysis_cache")
-        self.invalidate_prefix_patch = patch("core.cache_middleware.redis_invalidate_by_prefix")
-
-        # Start patches
-        self.mock_invalidate_by_tags = self.invalidate_by_tags_patch.start()
-        self.mock_invalidate_game = self.invalidate_game_patch.start()
-        self.mock_invalidate_user_games = self.invalidate_user_games_patch.start()
-        self.mock_invalidate_analysis = self.invalidate_analysis_patch.start()
-        self.mock_invalidate_prefix = self.invalidate_prefix_patch.start()
-
-        # Create mock return values
-        self.mock_invalidate_by_tags.return_value = 1
-        self.mock_invalidate_game.return_value = True
-        self.mock_invalidate_user_games.return_value = True
-        self.mock_invalidate_analysis.return_value = True
-        self.mock_invalidate_prefix.return_value = 1
+        # Record what the signal handlers queue instead of flushing it to Redis
+        self.queue_patch = patch("core.cache_middleware.queue_cache_invalidation")
+        self.mock_queue = self.queue_patch.start()
 
     def teardown_method(self):
         """Clean up after each test."""
-        # Stop patches
-        self.invalidate_by_tags_patch.stop()
-        self.invalidate_game_patch.stop()
-        self.invalidate_user_games_patch.stop()
-        self.invalidate_analysis_patch.stop()
-        self.invalidate_prefix_patch.stop()
+        self.queue_patch.stop()
+
+    def queued(self, kind):
+        """Union of one kind (tags, keys or prefixes) over every queue_cache_invalidation call."""
+        return {value for recorded in self.mock_queue.call_args_list for value in recorded.kwargs.get(kind, ())}
 
     @patch("core.cache_middleware.logger")
     def test_model_cache_mapping_structure(self, mock_logger):
@@ -182,14 +168,15 @@ class TestCacheInvalidation:
             result="win",
         )
 
+        # Reset mocks
+        self.mock_queue.reset_mock()
+
         # Manually trigger the signal handler
         invalidate_cache_on_save(Game, game)
 
-        # Check that the tag invalidation was called
-        self.mock_invalidate_by_tags.assert_called_with(["games"])
-
-        # Check that the game cache was invalidated
-        self.mock_invalidate_game.assert_called_with(game.id)
+        # Check that the tag and the game and user games keys were queued
+        assert self.queued("tags") == {"games"}
+        assert self.queued("keys") == {game_cache_key(game.id), user_games_cache_key(user.id)}
 
     def test_invalidate_cache_on_save_player(self):
         """Test cache invalidation when a Player model is saved."""
@@ -206,21 +193,16 @@ class TestCacheInvalidation:
         player = Player.objects.create(game=game, user=user, username="testuser", color="white", rating=1500)
 
         # Reset mocks
-        self.mock_invalidate_by_tags.reset_mock()
-        self.mock_invalidate_game.reset_mock()
-        self.mock_invalidate_user_games.reset_mock()
+        self.mock_queue.reset_mock()
 
         # Manually trigger the signal handler
         invalidate_cache_on_save(Player, player)
 
-        # Check that the tags were invalidated
-        self.mock_invalidate_by_tags.assert_called_with(["players", "games"])
-
-        # Check that the game cache was invalidated
-        self.mock_invalidate_game.assert_called_with(game.id)
+        # Check that the tags were queued
+        assert self.queued("tags") == {"players", "games"}
 
-        # Check that the user games cache was invalidated
-        self.mock_invalidate_user_games.assert_called_with(user.id)
+        # Check that the game and user games keys were queued
+        assert self.queued("keys") == {game_cache_key(game.id), user_games_cache_key(user.id)}
 
     def test_invalidate_cache_on_save_game_analysis(self):
         """Test cache invalidation when a GameAnalysis model is saved."""
@@ -243,21 +225,16 @@ class TestCacheInvalidation:
         )
 
         # Reset mocks
-        self.mock_invalidate_by_tags.reset_mock()
-        self.mock_invalidate_game.reset_mock()
-        self.mock_invalidate_analysis.reset_mock()
+        self.mock_queue.reset_mock()
 
         # Manually trigger the signal handler
         invalidate_cache_on_save(GameAnalysis, analysis)
 
-        # Check that the tags were invalidated
-        self.mock_invalidate_by_tags.assert_called_with(["analysis"])
-
-        # Check that the analysis cache was invalidated
-        self.mock_invalidate_analysis.assert_called_with(analysis.id)
+        # Check that the tags were queued
+        assert self.queued("tags") == {"analysis"}
 
-        # Check that the game cache was invalidated
-        self.mock_invalidate_game.assert_called_with(game.id)
+        # Check that the analysis and game keys were queued
+        assert self.queued("keys") == {analysis_cache_key(analysis.id), game_cache_key(game.id)}
 
     def test_invalidate_cache_on_save_profile(self):
         """Test cache invalidation when a Profile model is saved."""
@@ -271,21 +248,16 @@ class TestCacheInvalidation:
         )
 
         # Reset mocks
-        self.mock_invalidate_by_tags.reset_mock()
-        self.mock_invalidate_prefix.reset_mock()
+        self.mock_queue.reset_mock()
 
         # Manually trigger the signal handler
         invalidate_cache_on_save(Profile, profile)
 
-        # Check that the tags were invalidated
-        self.mock_invalidate_by_tags.assert_called_with(["profiles", "users"])
+        # Check that the tags were queued
+        assert self.queued("tags") == {"profiles", "users"}
 
-        # Check that the user cache prefix was invalidated
-        self.mock_invalidate_prefix.assert_called_once()
-
-        # Check that the call used the correct user ID
-        args, kwargs = self.mock_invalidate_prefix.call_args
-        assert f"user:{user.id}" in args[0]
+        # Check that the user cache prefix was queued with the correct user ID
+        assert self.queued("prefixes") == {f"user:{user.id}"}
 
     def test_invalidate_cache_on_delete(self):
         """Test that cache invalidation works for model deletion."""
@@ -300,25 +272,20 @@ class TestCacheInvalidation:
             result="win",
         )
 
-        # Reset mocks
-        self.mock_invalidate_by_tags.reset_mock()
-        self.mock_invalidate_game.reset_mock()
-
         # Create a copy of the game to use after deletion
         game_copy = MagicMock()
         game_copy.id = game.id
 
         # Delete the game
         game.delete()
+        self.mock_queue.reset_mock()
 
         # Manually trigger the signal handler
         invalidate_cache_on_delete(Game, game_copy)
 
-        # Check that the tag invalidation was called
-        self.mock_invalidate_by_tags.assert_called_with(["games"])
-
-        # Check that the game cache was invalidated
-        self.mock_invalidate_game.assert_called_with(game_copy.id)
+        # Check that the tag and the game key were queued
+        assert self.queued("tags") == {"games"}
+        assert game_cache_key(game_copy.id) in self.queued("keys")
 
     @patch("core.cache_middleware.apps")
     def test_setup_cache_invalidation(self, mock_apps):
@@ -378,3 +345,73 @@ class TestCacheInvalidation:
 
         # Check that the middleware returned our response
         assert result == response
+
+
+@pytest.fixture
+def recorded_flushes(monkeypatch):
+    """Point flushes at a fakeredis client and record every batch that gets flushed."""
+    client = fakeredis.FakeRedis()
+    flushed = []
+    original_flush = InvalidationBatch.flush
+
+    def flush(batch):
+        flushed.append(batch)
+        return original_flush(batch)
+
+    monkeypatch.setattr("core.cache_middleware.get_redis_client", lambda: client)
+    monkeypatch.setattr(InvalidationBatch, "flush", flush)
+    return client, flushed
+
+
+def _create_game(user, index):
+    return Game.objects.create(
+        user=user,
+        platform="chess.com",
+        white=f"player{index}",
+        black="opponent",
+        pgn='[Event "Test"]\n1. e4 e5',
+        result="win",
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_saves_in_one_transaction_flush_once_with_deduplicated_keys(recorded_flushes):
+    client, flushed = recorded_flushes
+    user = User.objects.create(username="bulk-importer")
+    assert len(flushed) == 1  # autocommit: the profile created with the user flushes immediately
+    client.sadd("tag:games", "list:games:recent")
+    client.set("list:games:recent", "cached")
+    client.set("unrelated", "kept")
+
+    with transaction.atomic():
+        games = [_create_game(user, index) for index in range(5)]
+        for game in games:
+            client.set(game_cache_key(game.id), "stale")
+        with transaction.atomic():
+            games[0].save()
+        assert len(flushed) == 1
+
+    assert len(flushed) == 2
+    batch = flushed[1]
+    assert batch.tags == {"games"}
+    assert batch.keys == {game_cache_key(game.id) for game in games} | {user_games_cache_key(user.id)}
+    assert client.keys("game:*") == []
+    assert not client.exists("tag:games", "list:games:recent")
+    assert client.get("unrelated") == b"kept"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_transaction_drops_its_queued_invalidations(recorded_flushes):
+    _, flushed = recorded_flushes
+    user = User.objects.create(username="rollback-user")
+    flushed.clear()
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            _create_game(user, 1)
+            raise RuntimeError("abort import")
+    with transaction.atomic():
+        game = _create_game(user, 2)
+
+    assert len(flushed) == 1
+    assert flushed[0].keys == {game_cache_key(game.id), user_games_cache_key(user.id)}
@@ -5,6 +5,9 @@ from types import SimpleNamespace
 
 import pytest
 from core.analysis import coaching_generator as cg
+from core.models import LLMResponse
+from django.core.cache import cache
+from django.test import override_settings
 
 
 def _make_dummy_openai(fixture_response=None, raise_exc=False):
@@ -111,6 +114,53 @@ def test_generate_coaching_report_success(monkeypatch):
     assert json_schema.get("name") == "batch_coaching_report"
 
 
+def _coaching_fixture(specific_drill):
+    return {
+        "executive_summary": "Summary",
+        "coaching_narrative": {"opening": "O", "middlegame": "M", "endgame": "E"},
+        "top_3_priorities": [
+            {
+                "rank": rank,
+                "title": f"T{rank}",
+                "why_it_matters": "W",
+                "how_to_fix": "H",
+                "specific_drill": specific_drill if rank == 1 else f"D{rank}",
+                "estimated_study_hours": 1,
+            }
+            for rank in (1, 2, 3)
+        ],
+        "training_plan": {"week_1": "w1", "week_2": "w2", "week_3": "w3", "week_4": "w4"},
+        "one_thing_to_do_today": "Do one tactic",
+    }
+
+
+@pytest.mark.django_db
+@override_settings(
+    LLM_CACHE_ENABLED=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "coaching-cache"}},
+)
+@pytest.mark.parametrize(
+    "drill, calls_per_report, stored",
+    [("Do puzzles", 2, False), ("In game_0 move 22, drill the fork.", 1, True)],
+)
+def test_only_grounded_reports_are_cached(monkeypatch, drill, calls_per_report, stored):
+    cache.clear()
+    per_game_results = [{"game_id": "game_0", "player_color": "white", "critical_moments": [{"move_number": 22}]}]
+    dummy = _make_dummy_openai(fixture_response=_coaching_fixture(drill))
+    monkeypatch.setitem(sys.modules, "openai", dummy)
+    create_calls = dummy.OpenAI().chat.completions.create_calls
+
+    for _ in range(2):
+        cg.generate_coaching_report({"games_analyzed": 1}, per_game_results)
+
+    # A report that fails the citation checks (even after the retry) is never reused.
+    assert len(create_calls) == (2 * calls_per_report if not stored else calls_per_report)
+    assert LLMResponse.objects.exists() is stored
+
+    cg.generate_coaching_report({"games_analyzed": 1}, per_game_results, refresh=True)
+    assert len(create_calls) == (3 * calls_per_report if not stored else 2 * calls_per_report)
+
+
 def test_generate_coaching_report_raises_on_api_error(monkeypatch):
     batch_summary = {"games_analyzed": 0}
     per_game_results = []
@@ -124,6 +174,36 @@ def test_generate_coaching_report_raises_on_api_error(monkeypatch):
     assert "Coaching generation failed" in str(excinfo.value)
 
 
+def test_generate_coaching_report_sends_compacted_prompt(monkeypatch):
+    batch_summary = {"games_analyzed": 12, "overall_eval_stability": 0.7, "overall_accuracy": 0.7}
+    per_game_results = [
+        {
+            "game_id": f"game_{index}",
+            "player_color": "white",
+            "result": "0-1",
+            "opening_name": "Italian Game",
+            "move_quality": {"blunder": index % 3, "mistake": 1},
+            "critical_moments": [
+                {"move_number": 10 + move, "type": "mistake", "played_move": "Qh5", "eval_swing": 1.5}
+                for move in range(5)
+            ],
+        }
+        for index in range(12)
+    ]
+    dummy = _make_dummy_openai(fixture_response={"executive_summary": "S"})
+    monkeypatch.setitem(sys.modules, "openai", dummy)
+    monkeypatch.setattr(cg, "_validate_coaching_report", lambda parsed: None)
+
+    with override_settings(COACHING_PROMPT_TOKEN_BUDGET=400):
+        cg.generate_coaching_report(batch_summary, per_game_results)
+
+    user_message = dummy.OpenAI().chat.completions.create_calls[0]["messages"][1]["content"]
+    batch_json = user_message.split("BATCH_SUMMARY_JSON:\n", 1)[1].split("\n", 1)[0]
+    assert json.loads(batch_json) == {"games_analyzed": 12, "overall_eval_stability": 0.7}
+    assert ", " not in batch_json
+    assert "lower-impact games omitted for length" in user_message
+
+
 def test_validate_coaching_citations_requires_game_and_move():
     batch_summary = {
         "opening_insights": [{"opening_name": "Italian Game", "status": "struggling"}],
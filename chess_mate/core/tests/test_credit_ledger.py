@@ -0,0 +1,134 @@
+"""Tests for the append-only credit ledger (idempotent entries, lock-free balance, compaction)."""
+
+import threading
+import time
+
+import pytest
+from core.batch_credits import refund_batch_credits_on_hard_fail
+from core.credit_ledger import (
+    REASON_ADMIN_GRANT,
+    REASON_PURCHASE,
+    compact_credit_ledger,
+    credit_balance,
+    post_credit_entry,
+)
+from core.models import BatchAnalysisReport, CreditLedgerEntry, Profile
+from core.single_game_credits import (
+    charge_single_game_credit,
+    refund_single_game_credit_on_fail,
+)
+from core.tests.profile_helpers import ensure_profile
+from django.contrib.auth.models import User
+from django.db import OperationalError, connection
+from django.test import override_settings
+
+
+def _call_retrying_table_locks(target):
+    # The shared-cache in-memory SQLite test DB fails fast with "table is locked" where a file
+    # database or Postgres would wait; the failed statement's transaction is rolled back, so retry.
+    for _ in range(200):
+        try:
+            return target()
+        except OperationalError as exc:
+            if "locked" not in str(exc):
+                raise
+            time.sleep(0.005)
+    raise AssertionError("test database stayed locked")
+
+
+def _run_in_threads(*targets):
+    """Start every target at once (barrier) on its own DB connection and re-raise the first error."""
+    barrier = threading.Barrier(len(targets))
+    errors = []
+
+    def runner(target):
+        try:
+            barrier.wait()
+            _call_retrying_table_locks(target)
+        except Exception as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=runner, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+@pytest.mark.django_db
+def test_balance_survives_compaction_and_stale_profile_saves():
+    user = User.objects.create_user(username="ledger-user", password="x")
+    ensure_profile(user, credits=10)
+    stale = Profile.objects.get(user=user)
+
+    assert post_credit_entry(user.id, 50, REASON_PURCHASE, "cs_1")
+    assert not post_credit_entry(user.id, 50, REASON_PURCHASE, "cs_1")
+    assert post_credit_entry(user.id, -3, REASON_ADMIN_GRANT, "manual")
+    assert credit_balance(user.id) == 57
+
+    with override_settings(CREDIT_LEDGER_COMPACT_DELAY=0):
+        assert compact_credit_ledger() == 1
+    profile = Profile.objects.get(user=user)
+    assert profile.credits == 57
+    assert profile.credits_ledger_through == CreditLedgerEntry.objects.latest("id").id
+    assert credit_balance(user.id) == 57
+
+    # A full save of a profile loaded before compaction rewinds snapshot and watermark together.
+    stale.save()
+    assert credit_balance(user.id) == 57
+
+    with override_settings(CREDIT_LEDGER_COMPACT_DELAY=3600):
+        post_credit_entry(user.id, 5, REASON_ADMIN_GRANT, "recent")
+        compact_credit_ledger()
+    assert Profile.objects.get(user=user).credits == 10
+    assert credit_balance(user.id) == 62
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_charges_and_refunds_never_double_count():
+    user = User.objects.create_user(username="ledger-race", password="x")
+    ensure_profile(user, credits=20, preferences={"single_game_free_used": True})
+    games = [101, 102, 103, 104]
+    report = BatchAnalysisReport.objects.create(
+        user=user, task_id="batch-race", status="failed", games_count=5, credits_charged=5
+    )
+
+    # Charge every game concurrently, then refund each game and the failed batch from several workers at once.
+    _run_in_threads(*(lambda game_id=game_id: charge_single_game_credit(user, game_id, None) for game_id in games))
+    assert credit_balance(user.id) == 16
+
+    refunds = [lambda game_id=game_id: refund_single_game_credit_on_fail(user.id, game_id) for game_id in games * 3]
+    batch_refunds = [lambda: refund_batch_credits_on_hard_fail(BatchAnalysisReport.objects.get(pk=report.pk))] * 3
+    _run_in_threads(*refunds, *batch_refunds)
+
+    assert credit_balance(user.id) == 20 + 5
+    entries = CreditLedgerEntry.objects.filter(user=user)
+    assert entries.filter(reason="single_game_charge").count() == len(games)
+    assert entries.filter(reason="single_game_refund").count() == len(games)
+    assert entries.filter(reason="batch_refund").count() == 1
+    assert Profile.objects.get(user=user).credits == 20
+
+
+@pytest.mark.django_db(transaction=True)
+def test_racing_charges_for_the_same_game_charge_once():
+    user = User.objects.create_user(username="ledger-double", password="x")
+    ensure_profile(user, credits=10, preferences={"single_game_free_used": True})
+    charged = []
+
+    # A double-submitted analysis request: both workers charge the same enqueued run.
+    def charge():
+        charged.append(charge_single_game_credit(user, 201, None, attempt="task-201"))
+
+    _run_in_threads(charge, charge)
+
+    assert sorted(charged) == [0, 1]
+    assert credit_balance(user.id) == 9
+    assert CreditLedgerEntry.objects.filter(user=user, reason="single_game_charge").count() == 1
+
+    # A re-analysis is a new run and is charged again.
+    assert charge_single_game_credit(user, 201, None, attempt="task-201-rerun") == 1
+    assert credit_balance(user.id) == 8
@@ -0,0 +1,122 @@
+"""Tests for the denormalized UserDailyQuota counters behind the abuse limits."""
+
+import random
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from core.abuse_limits import check_batch_creation_allowed
+from core.daily_quota import (
+    ACTIVE_BATCH_STATUSES,
+    quota_for,
+    reconcile_daily_quotas,
+    record_single_analysis_quota,
+)
+from core.models import BatchAnalysisReport, Game, UserDailyQuota
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils import timezone
+
+STATUSES = ["pending", "in_progress", "completed", "partial", "failed"]
+
+
+def _query_path(user):
+    """The COUNT/EXISTS queries the abuse limits ran before the counters existed."""
+    start = timezone.make_aware(
+        timezone.datetime.combine(timezone.localdate(), timezone.datetime.min.time()),
+        timezone.get_current_timezone(),
+    )
+    return {
+        "batches": BatchAnalysisReport.objects.filter(user=user, created_at__gte=start).count(),
+        "games_imported": Game.objects.filter(user=user, created_at__gte=start).count(),
+        "active_batches": BatchAnalysisReport.objects.filter(user=user, status__in=ACTIVE_BATCH_STATUSES).count(),
+    }
+
+
+def _counter_path(user):
+    quota = quota_for(user.id)
+    return {"batches": quota.batches, "games_imported": quota.games_imported, "active_batches": quota.active_batches}
+
+
+def _at(moment):
+    return patch("django.utils.timezone.now", return_value=moment)
+
+
+def _apply_random_writes(rng, users, steps):
+    now = timezone.now()
+    yesterday = now - timedelta(days=1)
+    for step in range(steps):
+        user = rng.choice(users)
+        action = rng.choice(["game", "game", "batch", "transition", "transition", "delete_game", "delete_batch"])
+        when = rng.choice([now, yesterday])
+        if action == "game":
+            with _at(when):
+                Game.objects.create(user=user, platform="lichess", game_id=f"g{step}", pgn="1. e4 e5", result="1-0")
+        elif action == "batch":
+            with _at(when):
+                BatchAnalysisReport.objects.create(user=user, task_id=f"b{step}", status=rng.choice(STATUSES))
+        elif action == "transition":
+            report = BatchAnalysisReport.objects.filter(user=user).order_by("?").first()
+            if report is not None:
+                report.status = rng.choice(STATUSES)
+                if rng.random() < 0.5:
+                    report.save(update_fields=["status", "updated_at"])
+                else:
+                    report.save()
+        elif action == "delete_game":
+            Game.objects.filter(pk__in=Game.objects.filter(user=user).values("pk")[:1]).delete()
+        else:
+            report = BatchAnalysisReport.objects.filter(user=user).order_by("?").first()
+            if report is not None:
+                report.delete()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("seed", [3, 17, 2024])
+def test_counters_match_source_queries_on_random_writes(seed):
+    rng = random.Random(seed)
+    users = [User.objects.create_user(username=f"quota-{seed}-{index}", password="x") for index in range(3)]
+
+    _apply_random_writes(rng, users, steps=120)
+
+    for user in users:
+        assert _counter_path(user) == _query_path(user)
+    assert reconcile_daily_quotas() == 0
+
+    # Drift from writes that bypass signals is repaired by reconciliation.
+    UserDailyQuota.objects.update(batches=99, games_imported=99, active_batches=7)
+    assert reconcile_daily_quotas() > 0
+    for user in users:
+        assert _counter_path(user) == _query_path(user)
+
+
+@pytest.mark.django_db
+def test_single_analyses_are_counted_per_day_and_survive_reconciliation():
+    user = User.objects.create_user(username="quota-single", password="x")
+    record_single_analysis_quota(user.id)
+    record_single_analysis_quota(user.id)
+    with _at(timezone.now() + timedelta(days=1)):
+        assert quota_for(user.id).single_analyses == 0
+
+    reconcile_daily_quotas()
+    assert quota_for(user.id).single_analyses == 2
+
+
+@pytest.mark.django_db
+@override_settings(ALLOW_CONCURRENT_BATCHES=False, MAX_BATCHES_PER_USER_PER_DAY=0)
+def test_stale_instances_finishing_one_batch_twice_do_not_go_negative():
+    user = User.objects.create_user(username="quota-stale", password="x")
+    report = BatchAnalysisReport.objects.create(user=user, task_id="stale", status="pending")
+    first = BatchAnalysisReport.objects.get(pk=report.pk)
+    second = BatchAnalysisReport.objects.get(pk=report.pk)
+    for instance in (first, second):
+        instance.status = "completed"
+        instance.save(update_fields=["status", "updated_at"])
+
+    assert UserDailyQuota.objects.get(user=user).active_batches == 0
+
+    BatchAnalysisReport.objects.create(user=user, task_id="next", status="pending")
+    assert quota_for(user.id).active_batches == 1
+    allowed, info = check_batch_creation_allowed(user)
+    assert allowed is False
+    assert info["active_batch"] is True
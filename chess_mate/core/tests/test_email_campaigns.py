@@ -0,0 +1,146 @@
+"""Tests for the sharded coaching email campaign engine."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from core.email_campaigns import (
+    CAMPAIGN_REACTIVATION,
+    CAMPAIGN_SPACED_REPETITION,
+    CAMPAIGN_WEEKLY_DIGEST,
+    campaign_run_key,
+    reactivation_user_ids,
+    run_campaign_inline,
+    send_campaign_chunk,
+    weekly_digest_user_ids,
+)
+from core.email_send_log import iso_week_key, log_email_send
+from core.models import EmailSendLog, Game, GameAnalysis, Profile, SpacedReminderLog
+from core.notification_preferences import (
+    WANTS_REACTIVATION_KEY,
+    WANTS_SPACED_REPETITION_KEY,
+    WANTS_WEEKLY_DIGEST_KEY,
+)
+from core.reactivation_email import is_eligible_for_reactivation
+from core.tasks import dispatch_email_campaign
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+
+User = get_user_model()
+
+
+def _user(username, preferences, **profile_fields):
+    user = User.objects.create_user(username=username, email=f"{username}@example.com", password="Test.Password.123")
+    profile = Profile.objects.get(user=user)
+    profile.preferences = preferences
+    for field, value in profile_fields.items():
+        setattr(profile, field, value)
+    profile.save()
+    return user
+
+
+def _analyzed_game(user, game_id):
+    return Game.objects.create(
+        user=user,
+        platform="lichess",
+        game_id=game_id,
+        pgn='[Event "test"]',
+        result="loss",
+        white=user.username,
+        black="rival",
+        analysis_status="completed",
+        status="analyzed",
+    )
+
+
+@pytest.fixture
+def digest_users(db):
+    users = [_user(f"digest_{index}", {WANTS_WEEKLY_DIGEST_KEY: True}) for index in range(3)]
+    for user in users:
+        _analyzed_game(user, f"digest-game-{user.pk}")
+    return users
+
+
+def test_digest_eligibility_applies_cooldowns_in_one_query(digest_users, django_assert_num_queries):
+    already_sent, over_budget, eligible = digest_users
+    log_email_send(already_sent, EmailSendLog.TYPE_WEEKLY_DIGEST, week_key=iso_week_key())
+    log_email_send(over_budget, EmailSendLog.TYPE_SPACED_MOMENT, week_key="game:1:move:1")
+    log_email_send(over_budget, EmailSendLog.TYPE_ANALYSIS_COMPLETION, week_key="game:1")
+    _user("digest_opted_out", {WANTS_WEEKLY_DIGEST_KEY: False})
+
+    with django_assert_num_queries(1):
+        ids = weekly_digest_user_ids(iso_week_key())
+
+    assert ids == [eligible.pk]
+
+
+def test_digest_campaign_sends_once_per_week_key(digest_users, mailoutbox, django_capture_on_commit_callbacks):
+    run_key = campaign_run_key(CAMPAIGN_WEEKLY_DIGEST)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        assert run_campaign_inline(CAMPAIGN_WEEKLY_DIGEST, run_key) == 3
+        # Claims are written first; no email leaves until the claiming transaction commits.
+        assert mailoutbox == []
+    assert len(callbacks) == 3
+    assert sorted(message.to[0] for message in mailoutbox) == sorted(user.email for user in digest_users)
+    assert EmailSendLog.objects.filter(email_type=EmailSendLog.TYPE_WEEKLY_DIGEST, week_key=run_key).count() == 3
+
+    # A resumed run or a redelivered chunk reaches nobody twice.
+    assert send_campaign_chunk(CAMPAIGN_WEEKLY_DIGEST, run_key, [user.pk for user in digest_users]) == 0
+    assert len(mailoutbox) == 3
+
+
+def test_spaced_campaign_sends_best_moment(db, mailoutbox, django_capture_on_commit_callbacks):
+    user = _user("spaced_campaign", {WANTS_SPACED_REPETITION_KEY: True})
+    game = _analyzed_game(user, "spaced-campaign-1")
+    analysis = GameAnalysis.objects.create(
+        game=game,
+        feedback={"critical_moments": [{"move_number": 9, "eval_swing": 2.1}, {"move_number": 4, "eval_swing": 0.8}]},
+    )
+    GameAnalysis.objects.filter(pk=analysis.pk).update(updated_at=timezone.now() - timedelta(days=10))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert run_campaign_inline(CAMPAIGN_SPACED_REPETITION) == 1
+    assert mailoutbox[0].subject == "Still thinking about move 9?"
+    assert SpacedReminderLog.objects.filter(user=user, moment_key=f"game:{game.id}:move:9").exists()
+    assert run_campaign_inline(CAMPAIGN_SPACED_REPETITION) == 0
+
+
+def test_reactivation_selection_matches_per_user_rules(db):
+    stale = timezone.now() - timedelta(days=45)
+    users = [
+        _user("idle_linked", {WANTS_REACTIVATION_KEY: True}, lichess_username="idle_linked"),
+        _user("idle_unlinked", {WANTS_REACTIVATION_KEY: True}),
+        _user("recent_login", {WANTS_REACTIVATION_KEY: True}, lichess_username="recent_login"),
+        _user("opted_out", {WANTS_REACTIVATION_KEY: False}, lichess_username="opted_out"),
+    ]
+    Profile.objects.filter(user__in=users).update(updated_at=stale, created_at=stale)
+    User.objects.filter(pk__in=[user.pk for user in users]).update(last_login=stale)
+    User.objects.filter(username="recent_login").update(last_login=timezone.now())
+
+    selected = set(reactivation_user_ids())
+
+    expected = set()
+    for user in User.objects.filter(pk__in=[user.pk for user in users]).select_related("profile"):
+        if is_eligible_for_reactivation(user, user.profile):
+            expected.add(user.pk)
+    assert selected == expected == {users[0].pk}
+
+
+@override_settings(EMAIL_CAMPAIGN_CHUNK_SIZE=2)
+def test_dispatch_fans_out_chunks(digest_users):
+    fake_group = MagicMock()
+    with patch("core.tasks.group", fake_group):
+        assert dispatch_email_campaign(CAMPAIGN_REACTIVATION) == 0
+        fake_group.assert_not_called()
+
+        assert dispatch_email_campaign(CAMPAIGN_WEEKLY_DIGEST, "2026-W40") == 3
+
+    signatures = list(fake_group.call_args.args[0])
+    assert [signature.args[2] for signature in signatures] == [
+        [digest_users[0].pk, digest_users[1].pk],
+        [digest_users[2].pk],
+    ]
+    assert {signature.args[1] for signature in signatures} == {"2026-W40"}
+    fake_group.return_value.apply_async.assert_called_once()
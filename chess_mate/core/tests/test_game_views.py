@@ -3,6 +3,7 @@ Tests for game views.
 """
 
 import json
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -10,10 +11,12 @@ from core.tests.profile_helpers import ensure_profile
 from django.contrib.auth.models import User
 from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from .. import constants, game_views
+from .. import constants, game_listing, game_views
+from ..credit_ledger import credit_balance
 from ..models import BatchAnalysisReport, Game, GameAnalysis, Profile
 
 
@@ -65,6 +68,63 @@ class TestGameViews:
         assert response.data[0]["white"] == "testuser"
         assert response.data[0]["black"] == "opponent"
 
+    def _tied_games(self, user, count=5):
+        played = timezone.now() - timedelta(days=1)
+        return [
+            Game.objects.create(
+                user=user,
+                platform="lichess" if index % 2 else "chess.com",
+                game_id=f"keyset-{index}",
+                white="testuser",
+                black="opponent",
+                result="win",
+                pgn='[Event "Keyset"]',
+                date_played=played,
+            )
+            for index in range(count)
+        ]
+
+    def test_user_games_cursor_pages_cover_ties_once(self, authenticated_client, test_user):
+        games = self._tied_games(test_user)
+        url = reverse("user_games")
+
+        seen, cursor = [], ""
+        while True:
+            response = authenticated_client.get(url, {"limit": 2, "cursor": cursor})
+            assert response.status_code == status.HTTP_200_OK
+            assert set(response.data["results"][0]) == set(game_listing.USER_GAME_LIST_FIELDS)
+            seen.extend(row["id"] for row in response.data["results"])
+            cursor = response.data["next_cursor"]
+            if not cursor:
+                break
+
+        assert seen == sorted((game.id for game in games), reverse=True)
+
+    def test_user_games_filters_and_rejects_bad_cursor(self, authenticated_client, test_user):
+        self._tied_games(test_user)
+        url = reverse("user_games")
+
+        response = authenticated_client.get(url, {"platform": "lichess"})
+        assert [row["platform"] for row in response.data] == ["lichess", "lichess"]
+
+        response = authenticated_client.get(url, {"cursor": "not-a-cursor"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_game_list_keyset_and_legacy_pages(self, authenticated_client, test_user):
+        self._tied_games(test_user, count=3)
+        url = reverse("game-list")
+
+        first = authenticated_client.get(url, {"page_size": 2})
+        assert first.status_code == status.HTTP_200_OK
+        assert len(first.data["results"]) == 2
+        second = authenticated_client.get(url, {"page_size": 2, "cursor": first.data["next_cursor"]})
+        assert second.data["next_cursor"] is None
+        ids = [row["id"] for row in first.data["results"] + second.data["results"]]
+        assert len(set(ids)) == 3
+
+        legacy = authenticated_client.get(url, {"page": 1})
+        assert legacy.data["count"] == 3
+
     @patch("core.chess_services.ChessComService.fetch_games")
     def test_fetch_games_chess_com(self, mock_fetch_games, authenticated_client, test_user):
         mock_fetch_games.return_value = {
@@ -307,8 +367,7 @@ class TestGameViews:
                         mock_task.assert_called_once()
                         mock_register.assert_called_once()
 
-                        profile = Profile.objects.get(user=test_user)
-                        assert profile.credits == 9
+                        assert credit_balance(test_user.id) == 9
 
                         test_game.refresh_from_db()
                         assert test_game.analysis_status == "analyzing"
@@ -0,0 +1,153 @@
+"""Tests for the content-addressed LLM response cache (hot tier, durable tier, single-flight)."""
+
+import threading
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from core.llm_cache import (
+    PURPOSE_ANALYSIS_FEEDBACK,
+    LLMRequest,
+    cached_llm_call,
+    completion_content,
+    llm_cache_stats,
+    prune_llm_responses,
+    schema_version,
+)
+from core.models import LLMResponse
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
+
+class StubClient:
+    """Local stand-in for the OpenAI SDK: records calls and echoes the user message."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        with self.lock:
+            self.calls.append(kwargs)
+        time.sleep(self.delay)
+        content = f"reply to {kwargs['messages'][-1]['content']}"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _request(payload="summary", **overrides):
+    fields = {"persona": "encouraging", "schema_version": "1", "params": {"temperature": 0.2}}
+    fields.update(overrides)
+    return LLMRequest(PURPOSE_ANALYSIS_FEEDBACK, "gpt-4o-mini", "You are a chess coach.", payload, **fields)
+
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "llm-cache-tests"}}
+
+
+@pytest.fixture(autouse=True)
+def enabled_cache():
+    with override_settings(CACHES=LOCMEM_CACHES, LLM_CACHE_ENABLED=True, LLM_CACHE_WAIT_SECONDS=5):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+def test_key_covers_every_input():
+    base = _request()
+    assert base.key == _request().key
+    assert len(base.key) == 64
+    variants = [
+        _request(payload="other summary"),
+        _request(persona="strict"),
+        _request(schema_version="2"),
+        _request(params={"temperature": 0.7}),
+        LLMRequest(PURPOSE_ANALYSIS_FEEDBACK, "gpt-4o", "You are a chess coach.", "summary", persona="encouraging"),
+    ]
+    assert len({base.key} | {request.key for request in variants}) == len(variants) + 1
+    assert schema_version({"a": 1, "b": [2]}) == schema_version({"b": [2], "a": 1})
+
+
+@pytest.mark.django_db
+def test_durable_tier_serves_after_hot_tier_is_flushed():
+    client = StubClient()
+    request = _request()
+
+    first = cached_llm_call(request, lambda: completion_content(client, request))
+    second = cached_llm_call(request, lambda: completion_content(client, request))
+    cache.delete(f"llm_cache:{request.key}")
+    third = cached_llm_call(request, lambda: completion_content(client, request))
+
+    assert first == second == third == "reply to summary"
+    assert len(client.calls) == 1
+    assert client.calls[0]["temperature"] == 0.2
+    row = LLMResponse.objects.get(response_key=request.key)
+    assert (row.purpose, row.response, row.hit_count) == (PURPOSE_ANALYSIS_FEEDBACK, "reply to summary", 1)
+
+    stats = llm_cache_stats([PURPOSE_ANALYSIS_FEEDBACK])[PURPOSE_ANALYSIS_FEEDBACK]
+    assert (stats["miss"], stats["hot_hit"], stats["durable_hit"], stats["total"]) == (1, 1, 1, 3)
+    assert stats["hit_rate"] == pytest.approx(0.6667)
+
+
+@pytest.mark.django_db
+def test_failed_and_rejected_results_are_not_stored():
+    request = _request()
+
+    with pytest.raises(RuntimeError):
+        cached_llm_call(request, lambda: (_ for _ in ()).throw(RuntimeError("api down")))
+    assert cached_llm_call(request, lambda: "not json", accept=lambda text: text.startswith("{")) == "not json"
+    assert cached_llm_call(request, lambda: "") == ""
+
+    assert not LLMResponse.objects.exists()
+    assert cached_llm_call(request, lambda: "{}", accept=lambda text: text.startswith("{")) == "{}"
+    assert LLMResponse.objects.filter(response_key=request.key).exists()
+
+
+@pytest.mark.django_db
+def test_refresh_replaces_and_expired_rows_are_ignored_then_pruned():
+    request = _request()
+    cached_llm_call(request, lambda: "first")
+    assert cached_llm_call(request, lambda: "second", refresh=True) == "second"
+    assert cached_llm_call(request, lambda: "third") == "second"
+    assert LLMResponse.objects.get(response_key=request.key).response == "second"
+
+    cache.clear()
+    with override_settings(LLM_CACHE_DURABLE_TTL_DAYS=30):
+        LLMResponse.objects.update(created_at=timezone.now() - timedelta(days=31))
+        assert cached_llm_call(_request(payload="other"), lambda: "fresh") == "fresh"
+        assert cached_llm_call(request, lambda: "recomputed") == "recomputed"
+        LLMResponse.objects.filter(response_key=request.key).update(created_at=timezone.now() - timedelta(days=31))
+        assert prune_llm_responses() == 1
+    assert list(LLMResponse.objects.values_list("response", flat=True)) == ["fresh"]
+
+
+def test_concurrent_identical_requests_share_one_call():
+    client = StubClient(delay=0.3)
+    request = _request(payload="same batch")
+    results = []
+
+    def worker():
+        results.append(cached_llm_call(request, lambda: completion_content(client, request)))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["reply to same batch"] * 4
+    assert len(client.calls) == 1
+    stats = llm_cache_stats([PURPOSE_ANALYSIS_FEEDBACK])[PURPOSE_ANALYSIS_FEEDBACK]
+    assert stats["miss"] == 1
+    assert stats["shared"] + stats["hot_hit"] == 3
+
+
+def test_disabled_cache_calls_through():
+    client = StubClient()
+    request = _request()
+    with override_settings(LLM_CACHE_ENABLED=False):
+        for _ in range(2):
+            cached_llm_call(request, lambda: completion_content(client, request))
+    assert len(client.calls) == 2
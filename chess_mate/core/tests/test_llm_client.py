@@ -0,0 +1,179 @@
+"""Tests for the bounded-concurrency LLM client (deadlines, retries, concurrency cap, hedging)."""
+
+import asyncio
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+from core import llm_client
+from core.llm_client import (
+    AsyncLLMClient,
+    ConcurrencyLimiter,
+    LatencyTracker,
+    LLMClientError,
+    create_completion,
+    default_llm_client,
+)
+from django.test import override_settings
+
+
+def _response(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class StubClient:
+    """Local stand-in for the OpenAI SDK: per-call delays/errors and an in-flight high-water mark."""
+
+    def __init__(self, delays=(), errors=(), default_delay=0.0):
+        self.delays = list(delays)
+        self.errors = list(errors)
+        self.default_delay = default_delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        with self.lock:
+            index = self.calls
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays[index] if index < len(self.delays) else self.default_delay)
+            if index < len(self.errors) and self.errors[index] is not None:
+                raise self.errors[index]
+            return _response(f"call {index}")
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def _client(stub, limit=8, **overrides):
+    options = {"attempt_timeout": 1.0, "deadline": 5.0, "max_retries": 2, "hedge": False}
+    options.update(overrides)
+    return AsyncLLMClient(stub, ConcurrencyLimiter(limit, lease_seconds=30), **options)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr("core.llm_client.backoff_delay", lambda attempt: 0.0)
+
+
+def test_timed_out_and_transient_attempts_are_retried():
+    stub = StubClient(delays=[0.5, 0.0, 0.0], errors=[None, ConnectionError("reset"), None])
+    response = asyncio.run(_client(stub, attempt_timeout=0.2).create(model="gpt-4o-mini", messages=[]))
+
+    assert response.choices[0].message.content == "call 2"
+    assert stub.calls == 3
+
+
+def test_retry_budget_exhaustion_raises_client_error():
+    stub = StubClient(errors=[ConnectionError("reset")] * 5)
+    with pytest.raises(LLMClientError):
+        asyncio.run(_client(stub, max_retries=1).create(model="gpt-4o-mini", messages=[]))
+    assert stub.calls == 2
+
+
+def test_non_retryable_errors_propagate_immediately():
+    stub = StubClient(errors=[ValueError("bad request")])
+    with pytest.raises(ValueError):
+        asyncio.run(_client(stub).create(model="gpt-4o-mini", messages=[]))
+    assert stub.calls == 1
+
+
+def test_concurrency_cap_bounds_in_flight_calls():
+    stub = StubClient(default_delay=0.05)
+    client = _client(stub, limit=3)
+
+    async def run():
+        return await asyncio.gather(*(client.create(model="gpt-4o-mini", messages=[]) for _ in range(10)))
+
+    assert len(asyncio.run(run())) == 10
+    assert stub.calls == 10
+    assert stub.max_in_flight == 3
+
+
+def _use_redis(monkeypatch, connection):
+    # Patch the globals the limiter really reads: the suite can load core.llm_client under more than one name.
+    monkeypatch.setitem(ConcurrencyLimiter.acquire.__globals__, "_redis_connection", lambda: connection)
+
+
+def test_redis_semaphore_caps_calls_and_frees_every_slot(monkeypatch):
+    connection = fakeredis.FakeRedis()
+    _use_redis(monkeypatch, connection)
+    stub = StubClient(default_delay=0.05)
+    limiter = ConcurrencyLimiter(2, lease_seconds=30, key="llm_client:test-semaphore")
+    client = AsyncLLMClient(stub, limiter, attempt_timeout=2.0, deadline=5.0, max_retries=0, hedge=False)
+
+    async def run():
+        return await asyncio.gather(*(client.create(model="gpt-4o-mini", messages=[]) for _ in range(6)))
+
+    assert len(asyncio.run(run())) == 6
+    assert stub.max_in_flight == 2
+    assert limiter._local is None  # never fell back to the process-local semaphore
+    assert connection.zcard("llm_client:test-semaphore") == 0
+
+
+def test_redis_semaphore_purges_slots_past_their_lease(monkeypatch):
+    connection = fakeredis.FakeRedis()
+    _use_redis(monkeypatch, connection)
+    connection.zadd("llm_client:test-semaphore", {"crashed-worker": time.time() - 60})
+    limiter = ConcurrencyLimiter(1, lease_seconds=30, key="llm_client:test-semaphore")
+
+    token = asyncio.run(limiter.acquire(timeout=0.5))
+
+    assert connection.zrange("llm_client:test-semaphore", 0, -1) == [token.encode()]
+
+
+def test_hedged_request_wins_when_primary_is_slow():
+    tracker = LatencyTracker()
+    for _ in range(5):
+        tracker.record("gpt-4o-mini", 0.05)
+    stub = StubClient(delays=[0.6, 0.01])
+    client = _client(stub, hedge=True, hedge_min_samples=5, tracker=tracker)
+
+    async def run():
+        started = time.monotonic()
+        response = await client.create(model="gpt-4o-mini", messages=[])
+        return response, time.monotonic() - started
+
+    response, elapsed = asyncio.run(run())
+
+    assert response.choices[0].message.content == "call 1"
+    assert elapsed < 0.5
+    assert stub.calls == 2
+
+
+def test_create_completion_runs_on_background_loop():
+    stub = StubClient()
+    with override_settings(LLM_MAX_RETRIES=0):
+        response = create_completion(stub, model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+    assert response.choices[0].message.content == "call 0"
+
+
+def test_background_loop_is_running_before_it_is_handed_out():
+    loop = llm_client._loop_thread.loop()
+    assert loop.is_running()
+    assert llm_client._loop_thread.loop() is loop
+
+
+def test_default_client_is_shared_and_has_sdk_retries_disabled(monkeypatch):
+    built = []
+
+    class FakeAsyncOpenAI:
+        def __init__(self, **options):
+            built.append(options)
+
+    monkeypatch.setitem(sys.modules, "openai", SimpleNamespace(AsyncOpenAI=FakeAsyncOpenAI))
+    first = default_llm_client()
+    assert default_llm_client() is first
+    assert built == [{"max_retries": 0}]
+
+    # A different openai module (as tests swap in) gets its own client.
+    monkeypatch.setitem(sys.modules, "openai", SimpleNamespace(OpenAI=lambda: "sync-client"))
+    assert default_llm_client() == "sync-client"
@@ -1,13 +1,24 @@
-"""Tests for the request validation middleware."""
+"""Tests for the request validation and request fix middleware."""
 
 import json
+import re
 
 import pytest
-from core.middleware import RequestValidationMiddleware
+from core.middleware import (
+    VALIDATION_ROUTES,
+    VALIDATION_SCHEMAS,
+    RequestFixMiddleware,
+    RequestValidationMiddleware,
+)
+from core.parsers import PARSED_JSON_ATTR, ValidatedJSONParser
 from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.request import Request
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
 
 @pytest.fixture
@@ -167,3 +178,87 @@ class TestRequestValidationMiddleware:
         if response.status_code == status.HTTP_400_BAD_REQUEST:
             # This would happen if the user already exists
             assert "already exists" in str(response.content)
+
+    @pytest.mark.parametrize(
+        "method,path",
+        [
+            ("POST", "/api/register/"),
+            ("POST", "/api/v1/games/42/analyze/"),
+            ("POST", "/api/games/42/feedback/"),
+            ("PUT", "/api/v1/profile/update/"),
+            ("POST", "/api/v1/profile/update/"),
+            ("POST", "/api/v2/register/"),
+            ("DELETE", "/api/login/"),
+        ],
+    )
+    def test_route_table_matches_first_schema_pattern(self, method, path):
+        """Test that the compiled route table picks the schema a linear pattern scan would."""
+        expected = next(
+            (
+                schemas[method].get("required", [])
+                for pattern, schemas in VALIDATION_SCHEMAS.items()
+                if re.match(pattern, path) and method in schemas
+            ),
+            None,
+        )
+        resolved = VALIDATION_ROUTES.resolve(method, path)
+        assert (resolved.required if resolved else None) == (tuple(expected) if expected is not None else None)
+
+    def test_json_body_is_parsed_once(self):
+        """Test that the view's parser reuses the body parsed during validation."""
+        seen = {}
+
+        def view(request):
+            seen["data"] = Request(request, parsers=[ValidatedJSONParser()]).data
+            return HttpResponse()
+
+        request = RequestFactory().post("/api/v1/games/7/analyze/", {"depth": 12}, content_type="application/json")
+        RequestValidationMiddleware(view)(request)
+        assert seen["data"] == {"depth": 12}
+        assert seen["data"] is getattr(request, PARSED_JSON_ATTR)
+
+
+class TestRequestFixMiddleware:
+    """Tests for the Authorization normalization in RequestFixMiddleware."""
+
+    def _run(self, request):
+        RequestFixMiddleware(lambda request: HttpResponse())(request)
+        return request
+
+    def test_cookie_and_query_tokens_become_bearer_headers(self):
+        factory = RequestFactory()
+        request = factory.get("/api/v1/games/", {"token": "from-query"})
+        request.COOKIES["access_token"] = "from-cookie"
+        assert self._run(request).META["HTTP_AUTHORIZATION"] == "Bearer from-cookie"
+
+        request = self._run(factory.get("/api/v1/games/", {"token": "from-query"}))
+        assert request.META["HTTP_AUTHORIZATION"] == "Bearer from-query"
+
+        request = self._run(factory.get("/api/v1/games/", HTTP_AUTHORIZATION="raw-token"))
+        assert request.META["HTTP_AUTHORIZATION"] == "Bearer raw-token"
+
+    def test_non_api_paths_are_left_alone(self):
+        request = self._run(RequestFactory().get("/admin/", {"token": "abc"}))
+        assert "HTTP_AUTHORIZATION" not in request.META
+
+    @pytest.mark.django_db
+    def test_bearer_user_is_resolved_from_verified_tokens_only(self, user):
+        factory = RequestFactory()
+        access = str(AccessToken.for_user(user))
+        request = self._run(factory.get("/api/v1/profile/", HTTP_AUTHORIZATION=f"Bearer {access}"))
+        assert request._force_auth_user.pk == user.pk
+
+        header, payload, _ = access.split(".")
+        forged = f"{header}.{payload}.{'A' * 43}"
+        request = self._run(factory.get("/api/v1/profile/", HTTP_AUTHORIZATION=f"Bearer {forged}"))
+        assert not request._force_auth_user.is_authenticated
+
+    def test_body_is_not_parsed_unless_allowed(self, settings):
+        factory = RequestFactory()
+        request = self._run(factory.post("/api/v1/games/import/", {"access_token": "from-body"}))
+        assert "HTTP_AUTHORIZATION" not in request.META
+        assert not hasattr(request, "_post")
+
+        settings.ALLOW_BODY_TOKEN = True
+        request = self._run(factory.post("/api/v1/games/import/", {"access_token": "from-body"}))
+        assert request.META["HTTP_AUTHORIZATION"] == "Bearer from-body"
@@ -0,0 +1,157 @@
+"""Tests for the packed per-move analysis storage format."""
+
+import json
+
+import chess
+import pytest
+from core.models import PACKED_MOVES_KEY, GameAnalysis
+from core.move_analysis_codec import MAGIC, decode_moves, encode_moves
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+
+
+def _analyzed_moves(count=40):
+    board = chess.Board()
+    moves = []
+    for index in range(count):
+        move = sorted(board.legal_moves, key=lambda candidate: candidate.uci())[index % 3]
+        best = sorted(board.legal_moves, key=lambda candidate: candidate.uci())[0]
+        eval_before = round((index % 7 - 3) * 0.37, 2)
+        moves.append(
+            {
+                "move_number": index // 2 + 1,
+                "move": move.uci(),
+                "san": board.san(move),
+                "is_white": board.turn == chess.WHITE,
+                "fen": board.fen(),
+                "position_score": eval_before,
+                "evaluation": eval_before,
+                "eval_before": eval_before,
+                "eval_after": -eval_before,
+                "best_move": best.uci(),
+                "best_line": [best.uci()],
+                "depth": 20,
+                "time": 0.125 * index,
+                "classification": "mistake" if index % 5 == 0 else "best",
+            }
+        )
+        board.push(move)
+    return moves
+
+
+def _stored_row(analysis_id):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT analysis_data, moves_blob FROM core_gameanalysis WHERE id = %s", [analysis_id])
+        raw_json, blob = cursor.fetchone()
+    return json.loads(raw_json), blob
+
+
+def test_encode_decode_round_trip_is_lossless():
+    moves = _analyzed_moves()
+    moves[3]["classification"] = "custom_label"
+    moves[4]["eval_before"] = 12.3456
+    moves[5]["eval_after"] = 1000.0
+    moves[6]["position"] = moves[6]["fen"]
+    moves[7]["note"] = {"tag": "unmapped keys survive"}
+
+    blob = encode_moves(moves)
+
+    assert blob.startswith(MAGIC)
+    assert decode_moves(blob) == moves
+    assert len(blob) * 5 < len(json.dumps(moves))
+
+
+def test_round_trip_keeps_int_and_float_evaluations_apart():
+    moves = _analyzed_moves(6)
+    moves[0].update(eval_before=1, eval_after=-3, centipawn_loss=0, evaluation=2.0)
+    moves[1].update(eval_before=-0.5, eval_after=0.0, centipawn_loss=2)
+
+    decoded = decode_moves(encode_moves(moves))
+
+    assert decoded == moves
+    for original, restored in zip(moves, decoded):
+        assert {key: type(value) for key, value in restored.items()} == {
+            key: type(value) for key, value in original.items()
+        }
+
+
+def test_encode_leaves_non_list_payloads_as_json():
+    assert encode_moves([]) is None
+    assert encode_moves({"e4": 0.3}) is None
+    assert encode_moves(["e2e4"]) is None
+
+
+def test_decode_rejects_unknown_format_version():
+    blob = encode_moves(_analyzed_moves(4))
+    with pytest.raises(ValueError):
+        decode_moves(MAGIC + bytes([99]) + blob[len(MAGIC) + 1 :])
+
+
+def test_game_analysis_stores_moves_packed_and_unpacks_on_read(test_game):
+    moves = _analyzed_moves()
+    analysis = GameAnalysis.objects.create(
+        game=test_game,
+        analysis_data={"status": "complete", "metrics": {"overall": {"accuracy": 81.0}}, "moves": moves},
+    )
+    assert analysis.analysis_data["moves"] == moves
+
+    stored_json, blob = _stored_row(analysis.id)
+    assert "moves" not in stored_json
+    assert stored_json[PACKED_MOVES_KEY] == 1
+    assert decode_moves(blob) == moves
+
+    reloaded = GameAnalysis.objects.get(id=analysis.id)
+    assert reloaded.moves == moves
+    assert reloaded.analysis_data["metrics"]["overall"]["accuracy"] == 81.0
+    assert PACKED_MOVES_KEY not in reloaded.analysis_data
+
+
+def test_saving_other_fields_keeps_packed_moves(test_game):
+    moves = _analyzed_moves(10)
+    analysis = GameAnalysis.objects.create(game=test_game, analysis_data={"moves": moves})
+
+    reloaded = GameAnalysis.objects.get(id=analysis.id)
+    reloaded.feedback = {"summary": "ok"}
+    reloaded.save()
+    _, blob = _stored_row(analysis.id)
+    assert decode_moves(blob) == moves
+
+    reloaded.analysis_data = {"status": "in_progress"}
+    reloaded.save(update_fields=["analysis_data"])
+    stored_json, blob = _stored_row(analysis.id)
+    assert stored_json == {"status": "in_progress"}
+    assert blob is None
+
+
+def test_compact_move_analysis_command_repacks_legacy_rows(test_game):
+    moves = _analyzed_moves(12)
+    analysis = GameAnalysis.objects.create(game=test_game, analysis_data={"status": "complete"})
+    GameAnalysis.objects.filter(id=analysis.id).update(analysis_data={"status": "complete", "moves": moves})
+
+    call_command("compact_move_analysis")
+
+    stored_json, blob = _stored_row(analysis.id)
+    assert "moves" not in stored_json
+    assert GameAnalysis.objects.get(id=analysis.id).moves == moves
+
+
+def test_post_save_receivers_see_logical_analysis_data(test_game):
+    moves = _analyzed_moves(8)
+    seen = []
+
+    def receiver(sender, instance, **kwargs):
+        seen.append(instance.analysis_data)
+
+    post_save.connect(receiver, sender=GameAnalysis)
+    try:
+        analysis = GameAnalysis.objects.create(game=test_game, analysis_data={"status": "complete", "moves": moves})
+        GameAnalysis.objects.get(id=analysis.id).save()
+    finally:
+        post_save.disconnect(receiver, sender=GameAnalysis)
+
+    assert [data["moves"] for data in seen] == [moves, moves]
+    assert all(PACKED_MOVES_KEY not in data for data in seen)
+    stored_json, blob = _stored_row(analysis.id)
+    assert "moves" not in stored_json
+    assert decode_moves(blob) == moves
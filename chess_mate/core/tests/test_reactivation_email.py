@@ -60,9 +60,27 @@ def test_skipped_when_reactivation_sent_recently(inactive_user):
 @patch("core.reactivation_email.is_email_configured", return_value=True)
 @patch("core.reactivation_email.render_to_string", return_value="<p>Come back</p>")
 @patch("core.reactivation_email.mail.send_mail", return_value=1)
-def test_sends_when_eligible(mock_send, _mock_render, _mock_email, inactive_user):
-    assert send_reactivation_for_user(inactive_user) is True
+def test_sends_when_eligible(mock_send, _mock_render, _mock_email, inactive_user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        assert send_reactivation_for_user(inactive_user) is True
     mock_send.assert_called_once()
     assert reactivation_sent_recently(inactive_user) is True
     assert send_reactivation_for_user(inactive_user) is False
     mock_send.assert_called_once()
+
+
+@patch("core.reactivation_email.is_email_configured", return_value=True)
+@patch("core.reactivation_email.render_to_string", return_value="<p>Come back</p>")
+@patch("core.reactivation_email.mail.send_mail", side_effect=[ConnectionError("smtp down"), 1])
+def test_failed_send_releases_the_claim(
+    mock_send, _mock_render, _mock_email, inactive_user, django_capture_on_commit_callbacks
+):
+    with pytest.raises(ConnectionError):
+        with django_capture_on_commit_callbacks(execute=True):
+            send_reactivation_for_user(inactive_user)
+    assert not EmailSendLog.objects.filter(user=inactive_user, email_type=EmailSendLog.TYPE_REACTIVATION).exists()
+
+    # The next run retries the user.
+    with django_capture_on_commit_callbacks(execute=True):
+        assert send_reactivation_for_user(inactive_user) is True
+    assert mock_send.call_count == 2
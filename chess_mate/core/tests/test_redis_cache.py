@@ -346,6 +346,7 @@ class TestRedisCache:
 
 
 @pytest.mark.integration
+@override_settings(USE_REDIS=True)
 class TestRedisIntegration(TestCase):
     """Integration tests with real Redis."""
 
@@ -400,7 +401,7 @@ class TestRedisIntegration(TestCase):
 @pytest.fixture
 def mock_redis():
     """Create a mock Redis client."""
-    with patch("core.cache.redis.Redis") as mock_redis_class:
+    with override_settings(USE_REDIS=True), patch("redis.Redis") as mock_redis_class:
         # Create a mock instance to return
         mock_instance = MagicMock()
         mock_redis_class.return_value = mock_instance
@@ -628,7 +629,8 @@ class TestIntegrationWithRedis:
             # Clear test database
             r.flushdb()
 
-            yield r
+            with override_settings(USE_REDIS=True):
+                yield r
 
             # Clean up after tests
             r.flushdb()
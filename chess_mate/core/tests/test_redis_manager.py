@@ -0,0 +1,122 @@
+"""Tests for the process-wide Redis connection manager (one pool per PID, lazy health checks, metrics)."""
+
+import json
+import os
+import time
+
+import fakeredis
+import pytest
+import redis
+from core import cache as core_cache
+from core import redis_config, redis_connection
+from core.redis_manager import RedisManager
+from django.test import override_settings
+
+
+class CountingConnection(fakeredis.FakeRedisConnection):
+    """fakeredis connection that counts every PING sent (explicit or redis-py health checks)."""
+
+    pings = 0
+
+    def send_command(self, *args, **kwargs):
+        if args and str(args[0]).upper() == "PING":
+            CountingConnection.pings += 1
+        return super().send_command(*args, **kwargs)
+
+    def read_response(self, *args, **kwargs):
+        # Like redis.Connection (fakeredis does not): a reply pushes the next idle health check out.
+        response = super().read_response(*args, **kwargs)
+        if self.health_check_interval:
+            self.next_health_check = time.time() + self.health_check_interval
+        return response
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = RedisManager(connection_class=CountingConnection, server=fakeredis.FakeServer())
+    for module in (redis_connection, redis_config, core_cache):
+        monkeypatch.setattr(module, "redis_manager", manager)
+    CountingConnection.pings = 0
+    with override_settings(REDIS_DISABLED=False, USE_REDIS=True):
+        yield manager
+    manager.close_all()
+
+
+def test_every_factory_shares_one_pool_and_client(manager):
+    clients = [
+        redis_connection.get_redis_connection(),
+        redis_config.get_redis_client(),
+        core_cache.get_redis_connection(),
+        redis_connection.get_redis_connection(),
+    ]
+
+    pool = manager.pool()
+    assert all(client is clients[0] for client in clients)
+    assert clients[0].connection_pool is pool
+    clients[0].set("key", "value")
+    assert clients[2].get("key") == b"value"
+    assert manager.stats()["pid"] == os.getpid()
+
+
+def test_steady_state_calls_send_no_ping(manager):
+    redis_connection.get_redis_connection().set("warm", 1)
+    assert CountingConnection.pings >= 1  # the first lazy health check on a fresh connection
+
+    CountingConnection.pings = 0
+    for index in range(50):
+        redis_connection.get_redis_connection().set(f"key:{index}", index)
+        redis_config.get_redis_client().get(f"key:{index}")
+    assert CountingConnection.pings == 0
+
+    stats = manager.stats()
+    assert stats["checkouts"] == 1 + 1 + 100
+    assert stats["in_use"] == 0
+    assert stats["checkout_errors"] == 0
+
+
+def test_forked_child_gets_its_own_pool_state(manager):
+    client = redis_connection.get_redis_connection()
+    client.set("parent", 1)
+    parent_stats = manager.stats()
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child process
+        try:
+            os.close(read_fd)
+            child_client = redis_connection.get_redis_connection()
+            child_client.set("child", 1)
+            payload = {"same_client": child_client is client, "stats": manager.stats()}
+            os.write(write_fd, json.dumps(payload).encode())
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as reader:
+        child = json.loads(reader.read())
+    os.waitpid(pid, 0)
+
+    assert child["same_client"] is True
+    assert child["stats"]["pid"] == pid != parent_stats["pid"]
+    # Counters (and sockets) were reset in the child: one health-check PING plus one SET.
+    assert child["stats"]["checkouts"] == 2
+    assert manager.stats() == parent_stats
+
+
+def test_saturated_pool_reports_wait_and_errors():
+    manager = RedisManager(
+        connection_class=CountingConnection, server=fakeredis.FakeServer(), max_connections=1, timeout=0.05
+    )
+    pool = manager.pool()
+    held = pool.get_connection("GET")
+    try:
+        with pytest.raises(redis.ConnectionError):
+            manager.client().get("key")
+        stats = manager.stats()
+        assert stats["saturation"] == 1.0
+        assert stats["in_use"] == 1
+        assert stats["checkout_errors"] == 1
+    finally:
+        pool.release(held)
+    assert manager.client().get("key") is None
+    assert manager.stats()["in_use"] == 0
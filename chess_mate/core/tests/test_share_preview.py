@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import os
 import tempfile
+from unittest.mock import patch
 
 import pytest
+from core import share_preview
 from core.models import GameAnalysis
 from core.share_preview import build_share_moment_meta, render_share_moment_html
 from core.single_game_moment_share import get_or_create_moment_share
@@ -112,3 +114,23 @@ def test_share_game_moment_url_with_and_without_trailing_slash(client, test_game
         assert response.status_code == 200
         assert 'property="og:title"' in response.content.decode()
         assert "You lost the center on move 12" in response.content.decode()
+
+
+def test_index_template_is_read_once_per_process(rf):
+    index_html = "<!DOCTYPE html><html><head><title>Chess Mate</title></head><body></body></html>"
+    meta = ("Shared moment · ChessMate", "Move 3")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        build_dir = os.path.join(tmpdir, "frontend", "build")
+        os.makedirs(build_dir)
+        with open(os.path.join(build_dir, "index.html"), "w", encoding="utf-8") as handle:
+            handle.write(index_html)
+
+        with override_settings(BASE_DIR=tmpdir), patch.object(share_preview, "_resolve_share_meta", return_value=meta):
+            first = render_share_moment_html(rf.get("/share/game-moment/a/"), "a")
+            os.remove(os.path.join(build_dir, "index.html"))
+            second = render_share_moment_html(rf.get("/share/game-moment/b/"), "b")
+
+    assert "<title>Chess Mate</title>" not in first
+    assert first.index('property="og:title"') < first.index("</head>")
+    assert "/share/game-moment/b" in second
+    assert "<body></body>" in second
@@ -1,8 +1,8 @@
 """Tests for single-game analysis credit refunds on hard failure."""
 
+from core.credit_ledger import credit_balance
 from core.single_game_credits import (
     charge_single_game_credit,
-    mark_single_game_credit_charged,
     qualifies_for_first_single_game_free,
     refund_single_game_credit_on_fail,
     resolve_single_game_credit_waiver,
@@ -31,26 +31,31 @@ class TestSingleGameCreditRefund(TestCase):
         cache.clear()
 
     def test_refund_restores_one_credit(self):
-        self.profile.credits = 9
-        self.profile.save(update_fields=["credits"])
-        mark_single_game_credit_charged(self.user.id, self.game_id)
+        assert charge_single_game_credit(self.user, self.game_id, self.profile) == 1
+        assert credit_balance(self.user.id) == 9
 
         refunded = refund_single_game_credit_on_fail(self.user.id, self.game_id)
 
         assert refunded == 1
-        self.profile.refresh_from_db()
-        assert self.profile.credits == 10
+        assert credit_balance(self.user.id) == 10
 
     def test_refund_is_idempotent(self):
-        self.profile.credits = 9
-        self.profile.save(update_fields=["credits"])
-        mark_single_game_credit_charged(self.user.id, self.game_id)
+        charge_single_game_credit(self.user, self.game_id, self.profile)
 
         assert refund_single_game_credit_on_fail(self.user.id, self.game_id) == 1
         assert refund_single_game_credit_on_fail(self.user.id, self.game_id) == 0
 
-        self.profile.refresh_from_db()
-        assert self.profile.credits == 10
+        assert credit_balance(self.user.id) == 10
+
+    def test_reanalysis_is_a_new_charge_refunded_separately(self):
+        charge_single_game_credit(self.user, self.game_id, self.profile)
+        assert refund_single_game_credit_on_fail(self.user.id, self.game_id) == 1
+        charge_single_game_credit(self.user, self.game_id, self.profile)
+        assert credit_balance(self.user.id) == 9
+
+        assert refund_single_game_credit_on_fail(self.user.id, self.game_id) == 1
+        assert refund_single_game_credit_on_fail(self.user.id, self.game_id) == 0
+        assert credit_balance(self.user.id) == 10
 
     def test_refund_skips_invalid_ids(self):
         assert refund_single_game_credit_on_fail(0, self.game_id) == 0
@@ -84,5 +89,4 @@ class TestSingleGameCreditRefund(TestCase):
         self.profile.save(update_fields=["credits"])
 
         assert refund_single_game_credit_on_fail(self.user.id, self.game_id) == 0
-        self.profile.refresh_from_db()
-        assert self.profile.credits == 9
+        assert credit_balance(self.user.id) == 9
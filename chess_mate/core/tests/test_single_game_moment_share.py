@@ -1,7 +1,13 @@
 """Tests for public single-game moment share links."""
 
-from core.models import GameAnalysis
-from core.single_game_moment_share import get_or_create_moment_share
+import uuid
+
+from core.models import GameAnalysis, ShareLink
+from core.single_game_moment_share import (
+    find_analysis_by_share_token,
+    get_or_create_moment_share,
+)
+from django.core.management import call_command
 from django.urls import reverse
 
 
@@ -80,3 +86,45 @@ def test_moment_share_migrates_legacy_game_analysis(authenticated_client, test_g
     assert response.status_code == 200
     assert response.data["share_token"]
     assert GameAnalysis.objects.filter(game_id=test_game.id).exists()
+
+
+def test_moment_share_lookup_uses_share_link_index(test_game, django_assert_num_queries):
+    analysis = GameAnalysis.objects.create(
+        game=test_game,
+        analysis_data={"critical_moments": [{"move_number": 7, "eval_swing": 2.1}]},
+        feedback={},
+        depth=20,
+    )
+    token = get_or_create_moment_share(analysis, move_number=7)["token"]
+
+    link = ShareLink.objects.get(token=token)
+    assert link.kind == ShareLink.KIND_MOMENT
+    assert link.analysis_id == analysis.id
+    assert link.move_number == 7
+
+    with django_assert_num_queries(1):
+        found = find_analysis_by_share_token(token)
+        assert found.game.id == test_game.id
+
+    assert find_analysis_by_share_token("not-a-uuid") is None
+    assert find_analysis_by_share_token(str(uuid.uuid4())) is None
+
+
+def test_backfill_share_links_indexes_legacy_moment_tokens(test_game):
+    token = str(uuid.uuid4())
+    analysis = GameAnalysis.objects.create(
+        game=test_game,
+        analysis_data={
+            "critical_moments": [{"move_number": 4, "eval_swing": 1.0}],
+            "moment_share": {"token": token, "move_number": 4, "created_at": "2026-01-01T00:00:00+00:00"},
+        },
+        feedback={},
+        depth=20,
+    )
+    assert find_analysis_by_share_token(token) is None
+
+    call_command("backfill_share_links")
+    call_command("backfill_share_links")
+
+    assert ShareLink.objects.filter(token=token).count() == 1
+    assert find_analysis_by_share_token(token).id == analysis.id
@@ -4,11 +4,25 @@ from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
-from core.email_send_log import log_email_send
-from core.models import EmailSendLog, Game, GameAnalysis, Profile, SpacedReminderLog
+from core.email_send_log import iso_week_key, log_email_send
+from core.models import (
+    EmailSendLog,
+    Game,
+    GameAnalysis,
+    Profile,
+    ReviewableMoment,
+    SpacedReminderLog,
+)
 from core.notification_preferences import WANTS_SPACED_REPETITION_KEY
-from core.spaced_repetition_email import moment_key, send_spaced_repetition_for_user
+from core.spaced_repetition_email import (
+    best_unsent_moments,
+    deliver_spaced_reminder,
+    moment_key,
+    send_spaced_repetition_for_user,
+)
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
 from django.utils import timezone
 
 User = get_user_model()
@@ -62,17 +76,67 @@ def stale_moment_game(spaced_user):
 @patch("core.spaced_repetition_email.is_email_configured", return_value=True)
 @patch("core.spaced_repetition_email.render_to_string", return_value="<p>Spaced</p>")
 @patch("core.spaced_repetition_email.send_coaching_email", return_value=1)
-def test_sends_for_eligible_moment(mock_send, _mock_render, _mock_email, spaced_user, stale_moment_game):
+def test_sends_for_eligible_moment(
+    mock_send, _mock_render, _mock_email, spaced_user, stale_moment_game, django_capture_on_commit_callbacks
+):
     with patch(
         "core.spaced_repetition_email.received_coaching_touchpoint_today",
         return_value=False,
     ):
-        assert send_spaced_repetition_for_user(spaced_user) is True
+        with django_capture_on_commit_callbacks(execute=True):
+            assert send_spaced_repetition_for_user(spaced_user) is True
     mock_send.assert_called_once()
     assert mock_send.call_args.kwargs["subject"] == "Still thinking about move 12?"
     assert SpacedReminderLog.objects.filter(user=spaced_user, moment_key=moment_key(stale_moment_game.id, 12)).exists()
 
 
+@patch("core.spaced_repetition_email.is_email_configured", return_value=True)
+@patch("core.spaced_repetition_email.render_to_string", return_value="<p>Spaced</p>")
+@patch("core.spaced_repetition_email.send_coaching_email", return_value=1)
+def test_moment_is_reminded_again_after_the_cooldown(
+    mock_send, _mock_render, _mock_email, spaced_user, stale_moment_game, freezer, django_capture_on_commit_callbacks
+):
+    moment = {"move_number": 12, "eval_swing": 1.4}
+    freezer.move_to(timezone.now() - timedelta(days=31))
+    with django_capture_on_commit_callbacks(execute=True):
+        assert deliver_spaced_reminder(spaced_user, stale_moment_game, moment) is True
+
+    freezer.move_to(timezone.now() + timedelta(days=31))
+    with patch("core.spaced_repetition_email.received_coaching_touchpoint_today", return_value=False):
+        with django_capture_on_commit_callbacks(execute=True):
+            assert send_spaced_repetition_for_user(spaced_user) is True
+
+    assert mock_send.call_count == 2
+    key = moment_key(stale_moment_game.id, 12)
+    assert SpacedReminderLog.objects.filter(user=spaced_user, moment_key=key).count() == 2
+
+
+@patch("core.spaced_repetition_email.is_email_configured", return_value=True)
+@patch("core.spaced_repetition_email.render_to_string", return_value="<p>Spaced</p>")
+@patch("core.spaced_repetition_email.send_coaching_email", return_value=1)
+def test_claim_key_fits_for_large_game_ids(
+    mock_send, _mock_render, _mock_email, spaced_user, django_capture_on_commit_callbacks
+):
+    game = Game.objects.create(
+        id=123456,
+        user=spaced_user,
+        platform="lichess",
+        game_id="spaced-large-id",
+        pgn='[Event "test"]',
+        result="loss",
+        white="spaced_user",
+        black="rival",
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        assert deliver_spaced_reminder(spaced_user, game, {"move_number": 140, "eval_swing": 2.0}) is True
+
+    claim = EmailSendLog.objects.get(user=spaced_user, email_type=EmailSendLog.TYPE_SPACED_MOMENT)
+    assert claim.week_key == iso_week_key()
+    assert len(claim.week_key) <= EmailSendLog._meta.get_field("week_key").max_length
+    assert claim.meta["moment_key"] == "game:123456:move:140"
+    mock_send.assert_called_once()
+
+
 def test_skips_when_digest_sent_this_week(spaced_user, stale_moment_game):
     log_email_send(
         spaced_user,
@@ -110,7 +174,7 @@ def test_skips_when_spaced_sent_in_last_7_days(spaced_user, stale_moment_game):
     log_email_send(
         spaced_user,
         EmailSendLog.TYPE_SPACED_MOMENT,
-        week_key=moment_key(stale_moment_game.id, 12),
+        week_key=iso_week_key(),
     )
     with patch("core.spaced_repetition_email.send_coaching_email") as mock_send:
         assert send_spaced_repetition_for_user(spaced_user) is False
@@ -144,3 +208,66 @@ def test_skips_when_opted_out(spaced_user, stale_moment_game):
     with patch("core.spaced_repetition_email.send_coaching_email") as mock_send:
         assert send_spaced_repetition_for_user(spaced_user) is False
         mock_send.assert_not_called()
+
+
+def test_analysis_save_indexes_reviewable_moments(spaced_user, stale_moment_game):
+    row = ReviewableMoment.objects.get(game=stale_moment_game)
+    assert row.user_id == spaced_user.id
+    assert row.moment_key == moment_key(stale_moment_game.id, 12)
+    assert row.swing == 1.4
+
+    analysis = GameAnalysis.objects.get(game=stale_moment_game)
+    analysis.feedback = {"critical_moments": [{"move_number": 30, "eval_swing": -2.0, "phase": "endgame"}]}
+    analysis.save()
+    assert list(
+        ReviewableMoment.objects.filter(game=stale_moment_game).values_list("move_number", "swing", "phase")
+    ) == [(30, 2.0, "endgame")]
+
+
+@override_settings(COMPACT_MOVE_ANALYSIS=True)
+def test_indexing_infers_phase_from_packed_moves(spaced_user, stale_moment_game):
+    moves = [{"move_number": ply // 2 + 1, "move": "e2e4", "eval_before": 0.1} for ply in range(120)]
+    analysis = GameAnalysis.objects.get(game=stale_moment_game)
+    analysis.analysis_data = {"status": "complete", "moves": moves}
+    analysis.feedback = {"critical_moments": [{"move_number": 25, "eval_swing": 1.2}]}
+    analysis.save()
+    assert GameAnalysis.objects.filter(pk=analysis.pk, moves_blob__isnull=False).exists()
+    assert ReviewableMoment.objects.get(game=stale_moment_game).phase == "middlegame"
+
+    ReviewableMoment.objects.all().delete()
+    call_command("backfill_reviewable_moments")
+    assert ReviewableMoment.objects.get(game=stale_moment_game).phase == "middlegame"
+
+
+def test_best_unsent_moments_is_one_query_for_a_chunk(spaced_user, stale_moment_game, django_assert_num_queries):
+    other = User.objects.create_user(username="spaced_other", email="other@example.com", password="Test.Password.123")
+    game = Game.objects.create(
+        user=other,
+        platform="lichess",
+        game_id="spaced-test-2",
+        pgn='[Event "test"]',
+        result="loss",
+        white="spaced_other",
+        black="rival",
+        analysis_status="completed",
+    )
+    analysis = GameAnalysis.objects.create(
+        game=game,
+        feedback={"critical_moments": [{"move_number": 8, "eval_swing": 3.0}, {"move_number": 20, "eval_swing": 0.9}]},
+    )
+    GameAnalysis.objects.filter(pk=analysis.pk).update(updated_at=timezone.now() - timedelta(days=10))
+    SpacedReminderLog.objects.create(user=other, moment_key=moment_key(game.id, 8))
+
+    with django_assert_num_queries(1):
+        best = best_unsent_moments([spaced_user.id, other.id])
+        picks = {user_id: (row.game.id, row.move_number) for user_id, row in best.items()}
+
+    assert picks == {spaced_user.id: (stale_moment_game.id, 12), other.id: (game.id, 20)}
+
+
+def test_backfill_reviewable_moments_indexes_legacy_analyses(spaced_user, stale_moment_game):
+    ReviewableMoment.objects.all().delete()
+
+    call_command("backfill_reviewable_moments")
+
+    assert ReviewableMoment.objects.filter(game=stale_moment_game, move_number=12).exists()
@@ -195,6 +195,26 @@ class TestStockfishAnalyzer(TransactionTestCase):
             except Exception as e:
                 logger.error(f"Error in test cleanup: {str(e)}")
 
+    def test_analyze_position_without_features_skips_metrics(self):
+        """Engine-only searches leave the static metrics for the caller to request."""
+        mock_engine = MagicMock()
+        mock_engine.analyse.return_value = {
+            "score": MockPovScore(MockScore(50), chess.WHITE),
+            "depth": 12,
+            "pv": [chess.Move.from_uci("e2e4")],
+        }
+        self.analyzer._engine = mock_engine
+        self.analyzer._initialized = True
+
+        result = self.analyzer.analyze_position(self.test_board, depth=12, features=False)
+
+        self.assertEqual(result["score"], 0.5)
+        self.assertNotIn("position_metrics", result)
+        self.analyzer.position_evaluator.evaluate_position.assert_not_called()
+
+        self.assertEqual(self.analyzer.position_metrics(self.test_board)["material_count"], 39)
+        self.analyzer.position_evaluator.evaluate_position.assert_called_once_with(self.test_board)
+
     @patch("chess.engine.SimpleEngine.popen_uci")
     def test_analyze_move(self, mock_popen):
         """Test move analysis with various scenarios."""
@@ -12,7 +12,7 @@ class _FakeAnalyzer:
     def __init__(self):
         self._calls = 0
 
-    def analyze_position(self, _board, depth=20):
+    def analyze_position(self, _board, depth=20, features=True):
         # Monotonic decreasing score creates at least one critical moment.
         score = float(-self._calls)
         self._calls += 1
@@ -1,6 +1,7 @@
 import json
 
 import pytest
+from core.credit_ledger import credit_balance
 from core.models import Profile, Transaction
 from core.tests.profile_helpers import ensure_profile
 from django.contrib.auth import get_user_model
@@ -67,8 +68,7 @@ class TestStripeWebhook:
         )
         assert response.status_code == 200
 
-        self.user.profile.refresh_from_db()
-        assert self.user.profile.credits == 55
+        assert credit_balance(self.user.id) == 55
         assert Transaction.objects.filter(stripe_payment_id="cs_test_webhook_1").exists()
 
     def test_webhook_idempotent(self, settings, monkeypatch):
@@ -0,0 +1,147 @@
+"""Tests for the Redis-backed refresh-token blacklist (rotation, logout, expiry, SQL fallback)."""
+
+from datetime import timedelta
+
+import fakeredis
+import pytest
+from core import token_blacklist
+from core.token_blacklist import (
+    SQL_SYNCED_KEY,
+    RedisTokenBlacklist,
+    RefreshToken,
+    blacklist_key,
+    flush_expired_tokens,
+)
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_pending_fallback(monkeypatch):
+    monkeypatch.setattr(RedisTokenBlacklist, "sql_fallback_pending", False)
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_client(monkeypatch, redis_server):
+    client = fakeredis.FakeRedis(server=redis_server)
+    monkeypatch.setattr(token_blacklist, "get_redis_connection", lambda: client)
+    return client
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="jwt-user", email="jwt@example.com", password="x")
+
+
+def _session_token(user, hours=12):
+    refresh = RefreshToken.for_user(user)
+    refresh.set_exp(lifetime=timedelta(hours=hours))
+    return refresh
+
+
+@pytest.mark.django_db
+def test_refresh_rotation_revokes_old_token_in_redis_only(redis_client, user, freezer):
+    original = _session_token(user)
+    client = APIClient()
+
+    freezer.tick(timedelta(minutes=30))
+    response = client.post(reverse("token_refresh"), {"refresh": str(original)}, format="json")
+    assert response.status_code == 200
+    rotated = RefreshToken(response.data["refresh"])
+    assert rotated["jti"] != original["jti"]
+    assert rotated["exp"] == original["exp"]
+
+    assert redis_client.ttl(blacklist_key(original["jti"])) == int(timedelta(hours=11, minutes=30).total_seconds())
+    replay = client.post(reverse("token_refresh"), {"refresh": str(original)}, format="json")
+    assert replay.status_code >= 400
+    assert client.post(reverse("token_refresh"), {"refresh": str(rotated)}, format="json").status_code == 200
+    assert OutstandingToken.objects.count() == 0
+    assert BlacklistedToken.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_logout_revokes_until_the_token_expires(redis_client, user, freezer):
+    refresh = _session_token(user, hours=1)
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    assert client.post(reverse("logout"), {"refresh": str(refresh)}, format="json").status_code == 200
+    assert client.post(reverse("token_refresh"), {"refresh": str(refresh)}, format="json").status_code >= 400
+    assert redis_client.exists(blacklist_key(refresh["jti"]))
+
+    # The entry expires with the token itself, leaving nothing to prune.
+    freezer.tick(timedelta(hours=1, seconds=1))
+    assert not redis_client.exists(blacklist_key(refresh["jti"]))
+    assert OutstandingToken.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_sql_fallback_is_flushed_after_expiry_and_promoted_to_redis(monkeypatch, user, freezer):
+    monkeypatch.setattr(token_blacklist, "get_redis_connection", lambda: None)
+    short, long = _session_token(user, hours=1), _session_token(user, hours=48)
+    short.blacklist()
+    long.blacklist()
+    assert BlacklistedToken.objects.count() == 2
+    with pytest.raises(TokenError):
+        RefreshToken(str(long))
+
+    redis_client = fakeredis.FakeRedis()
+    monkeypatch.setattr(token_blacklist, "get_redis_connection", lambda: redis_client)
+    freezer.tick(timedelta(hours=2))
+    assert flush_expired_tokens() >= 1
+
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == [long["jti"]]
+    assert redis_client.ttl(blacklist_key(long["jti"])) == int(timedelta(hours=46).total_seconds())
+    with pytest.raises(TokenError):
+        RefreshToken(str(long))
+
+
+@pytest.mark.django_db
+def test_token_revoked_during_outage_stays_revoked_after_redis_returns(
+    redis_server, redis_client, user, django_assert_num_queries
+):
+    flush_expired_tokens()
+    assert redis_client.exists(SQL_SYNCED_KEY)
+    trusted = _session_token(user)
+    with django_assert_num_queries(0):
+        RefreshToken(str(trusted))
+
+    redis_server.connected = False
+    refresh = _session_token(user)
+    refresh.blacklist()
+    assert BlacklistedToken.objects.filter(token__jti=refresh["jti"]).exists()
+
+    # Redis is back with the pre-outage marker; the SQL-only revocation must still hold.
+    redis_server.connected = True
+    with pytest.raises(TokenError):
+        RefreshToken(str(refresh))
+    assert not redis_client.exists(SQL_SYNCED_KEY)
+
+    flush_expired_tokens()
+    assert redis_client.exists(blacklist_key(refresh["jti"]))
+    with pytest.raises(TokenError):
+        RefreshToken(str(refresh))
+
+
+@pytest.mark.django_db
+def test_rows_blacklisted_before_deploy_are_checked_until_synced(monkeypatch, redis_client, user):
+    refresh = _session_token(user)
+    monkeypatch.setattr(token_blacklist, "get_redis_connection", lambda: None)
+    refresh.blacklist()
+    monkeypatch.setattr(token_blacklist, "get_redis_connection", lambda: redis_client)
+    monkeypatch.setattr(RedisTokenBlacklist, "sql_fallback_pending", False)
+
+    assert not redis_client.exists(SQL_SYNCED_KEY)
+    with pytest.raises(TokenError):
+        RefreshToken(str(refresh))
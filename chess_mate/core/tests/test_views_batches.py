@@ -3,13 +3,18 @@ Tests for batch analysis views (PRD section 11, Step 9).
 """
 
 import uuid
+from importlib import import_module
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from core.models import BatchAnalysisReport, Profile
 from core.tests.profile_helpers import ensure_profile
+from django.apps import apps
 from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import JSONField, Value
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
@@ -66,6 +71,65 @@ class TestBatchViews(TestCase):
         assert response.data["results"][0]["coach_summary"] == "Latest batch insight."
         assert response.data["results"][0]["overall_accuracy_pct"] == 81.2
 
+    def test_get_batch_list_does_not_load_report_json(self):
+        BatchAnalysisReport.objects.create(
+            user=self.user,
+            task_id="lean-list",
+            status="completed",
+            games_count=5,
+            coaching_report={"executive_summary": "Convert winning endgames."},
+            batch_summary={"overall_accuracy_pct": 77.0},
+            per_game_results=[{"game_id": "game_0", "moves": [{"move": "e4"}] * 50}],
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/batches/")
+
+        assert response.status_code == 200
+        assert response.data["results"][0]["coach_summary"] == "Convert winning endgames."
+        batch_sql = [q["sql"] for q in queries.captured_queries if "core_batchanalysisreport" in q["sql"]]
+        assert batch_sql
+        for sql in batch_sql:
+            assert "per_game_results" not in sql
+            assert "coaching_report" not in sql
+            assert "batch_summary" not in sql
+
+    def test_summary_columns_follow_coaching_regeneration(self):
+        batch = BatchAnalysisReport.objects.create(
+            user=self.user,
+            task_id="summary-cols",
+            status="partial",
+            games_count=5,
+            batch_summary={"overall_accuracy_pct": 70, "top_critical_moments": [{"move_number": 14}]},
+        )
+        assert batch.coach_summary == ""
+        assert batch.top_moment == {"move_number": 14}
+
+        batch.coaching_report = {"executive_summary": "New plan"}
+        batch.save(update_fields=["coaching_report", "updated_at"])
+
+        batch.refresh_from_db()
+        assert batch.coach_summary == "New plan"
+        assert batch.overall_accuracy_pct == 70.0
+
+    def test_summary_backfill_skips_reports_without_payloads(self):
+        migration = import_module("core.migrations.0031_batchanalysisreport_summary_columns")
+        filled = BatchAnalysisReport.objects.create(
+            user=self.user, task_id="backfill-dict", batch_summary={"overall_accuracy_pct": 64}
+        )
+        json_null = BatchAnalysisReport.objects.create(user=self.user, task_id="backfill-json-null")
+        BatchAnalysisReport.objects.filter(pk=json_null.pk).update(batch_summary=Value(None, JSONField()))
+        BatchAnalysisReport.objects.create(user=self.user, task_id="backfill-sql-null")
+        BatchAnalysisReport.objects.filter(pk=filled.pk).update(overall_accuracy_pct=None)
+
+        with CaptureQueriesContext(connection) as queries:
+            migration.backfill_summary_columns(apps, None)
+
+        # One SELECT and a single UPDATE: neither null report is rewritten.
+        assert len(queries) == 2, [query["sql"] for query in queries]
+        filled.refresh_from_db()
+        assert filled.overall_accuracy_pct == 64.0
+
     def test_get_batch_list_supports_offset_and_has_more(self):
         for index in range(6):
             BatchAnalysisReport.objects.create(
@@ -1,4 +1,5 @@
 import pytest
+from core.credit_ledger import credit_balance
 from core.models import Profile
 from core.tests.profile_helpers import ensure_profile
 from django.contrib.auth import get_user_model
@@ -63,8 +64,7 @@ class TestCreditsViews:
         assert response.status_code == 200
         assert response.data["credits_added"] == 50
 
-        self.user.profile.refresh_from_db()
-        assert self.user.profile.credits == 62
+        assert credit_balance(self.user.id) == 62
 
     def test_confirm_purchase_rejects_wrong_user(self, settings, monkeypatch):
         settings.STRIPE_SECRET_KEY = "sk_test_x"
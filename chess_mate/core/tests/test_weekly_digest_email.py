@@ -65,7 +65,7 @@ def test_digest_skipped_when_no_content(digest_user):
 @patch("core.weekly_digest_email.is_email_configured", return_value=True)
 @patch("core.weekly_digest_email.render_to_string", return_value="<p>Digest</p>")
 @patch("core.weekly_digest_email.send_coaching_email", return_value=1)
-def test_sends_once_per_week(mock_send, _mock_render, _mock_email, digest_user):
+def test_sends_once_per_week(mock_send, _mock_render, _mock_email, digest_user, django_capture_on_commit_callbacks):
     payload = {
         "has_content": True,
         "sections": [{"label": "Coach inbox", "body": "2 priorities waiting."}],
@@ -83,7 +83,8 @@ def test_sends_once_per_week(mock_send, _mock_render, _mock_email, digest_user):
             "core.weekly_digest_email.build_weekly_digest_payload",
             return_value=payload,
         ):
-            assert send_weekly_digest_for_user(digest_user) is True
+            with django_capture_on_commit_callbacks(execute=True):
+                assert send_weekly_digest_for_user(digest_user) is True
             mock_send.assert_called_once()
 
             mock_send.reset_mock()
@@ -0,0 +1,73 @@
+"""Tests for Celery worker warm-up and fork-safe Stockfish ownership."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from core import worker_warmup
+from core.analysis.stockfish_analyzer import StockfishAnalyzer
+from django.test import override_settings
+
+
+@pytest.fixture
+def analyzer():
+    instance = StockfishAnalyzer.get_instance()
+    saved = (instance._engine, instance._initialized, instance._init_failed, instance._owner_pid)
+    yield instance
+    instance._engine, instance._initialized, instance._init_failed, instance._owner_pid = saved
+
+
+def test_measure_import_times_reports_each_module():
+    timings = worker_warmup.measure_import_times(["json", "core.eco_codes", "core.no_such_module"])
+
+    assert timings["json"] >= 0
+    assert timings["core.eco_codes"] >= 0
+    assert timings["core.no_such_module"] is None
+
+
+def test_warm_worker_process_marks_this_pid_ready():
+    readiness = worker_warmup.warm_worker_process(spawn=False)
+
+    assert readiness["ready"] is True
+    assert readiness["pid"] == os.getpid()
+    assert readiness["reference_data"]["eco_openings"] > 0
+    assert set(readiness["import_ms"]) == set(worker_warmup.PRELOAD_MODULES)
+    assert worker_warmup.worker_readiness()["ready"] is True
+
+    with patch("core.worker_warmup.os.getpid", return_value=os.getpid() + 1):
+        assert worker_warmup.worker_readiness()["ready"] is False
+
+
+def test_after_fork_drops_inherited_engine_without_quitting(analyzer):
+    inherited = MagicMock()
+    analyzer._engine = inherited
+    analyzer._initialized = True
+    analyzer._owner_pid = os.getpid() - 1
+
+    StockfishAnalyzer._after_fork_in_child()
+
+    assert analyzer._engine is None
+    assert analyzer._initialized is False
+    inherited.quit.assert_not_called()
+
+
+def test_warm_up_spawns_and_pings_engine(analyzer):
+    engine = MagicMock()
+    analyzer._engine = None
+    analyzer._initialized = False
+    with patch.object(analyzer, "_viable_stockfish_paths", return_value=["stockfish"]), patch(
+        "chess.engine.SimpleEngine.popen_uci", return_value=engine
+    ):
+        assert analyzer.warm_up() is True
+
+    engine.ping.assert_called_once()
+    assert analyzer._owner_pid == os.getpid()
+
+
+@override_settings(STOCKFISH_PATH="/opt/custom/stockfish")
+def test_candidate_paths_prefer_configured_path():
+    candidates = StockfishAnalyzer._candidate_stockfish_paths()
+
+    assert candidates[0] == "/opt/custom/stockfish"
+    if os.name != "nt":
+        assert not any(path.lower().endswith(".exe") for path in candidates)
@@ -0,0 +1,158 @@
+"""
+Refresh-token blacklist with pluggable storage.
+
+simplejwt's blacklist app writes an ``OutstandingToken`` row for every issued refresh
+token and checks ``BlacklistedToken`` with SQL on every refresh. ``RefreshToken`` here
+issues tokens without the outstanding row and routes revocation and the blacklist check
+through ``JWT_BLACKLIST_BACKEND``:
+
+* ``RedisTokenBlacklist`` (default) stores revoked JTIs in Redis with a TTL equal to the
+  token's remaining lifetime, so entries disappear on their own, and falls back to the
+  SQL tables while Redis is unavailable;
+* ``SQLTokenBlacklist`` keeps simplejwt's tables.
+
+``flush_expired_tokens`` (beat task) deletes expired SQL rows, copies live SQL entries
+written during a Redis outage into Redis and then sets ``SQL_SYNCED_KEY``. A Redis miss
+is only trusted while that marker exists; without it (first deploy, Redis data loss, or
+after a process fell back to SQL) the check falls through to SQL as well.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import BlacklistMixin
+from rest_framework_simplejwt.tokens import RefreshToken as SimpleRefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_to_epoch
+
+from .redis_connection import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+BLACKLIST_KEY_PREFIX = "jwt:blacklist:"
+# Set once every live SQL entry has been copied into Redis; outlives one hourly flush.
+SQL_SYNCED_KEY = "jwt:blacklist:sql-synced"
+SQL_SYNCED_TTL = 3600
+
+
+def blacklist_key(jti: str) -> str:
+    return f"{BLACKLIST_KEY_PREFIX}{jti}"
+
+
+def remaining_lifetime(token: Any) -> int:
+    """Seconds until ``token`` expires (0 when already expired)."""
+    return max(0, int(token.payload["exp"]) - datetime_to_epoch(aware_utcnow()))
+
+
+class SQLTokenBlacklist:
+    """simplejwt's OutstandingToken/BlacklistedToken tables."""
+
+    def revoke(self, token: Any) -> None:
+        BlacklistMixin.blacklist(token)
+
+    def is_revoked(self, jti: str) -> bool:
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+class RedisTokenBlacklist(SQLTokenBlacklist):
+    """Revoked JTIs as Redis keys expiring with the token; SQL while Redis is unavailable."""
+
+    # Set in a process that revoked in SQL; its next successful Redis call drops SQL_SYNCED_KEY.
+    sql_fallback_pending = False
+
+    def revoke(self, token: Any) -> None:
+        ttl = remaining_lifetime(token)
+        if ttl <= 0:
+            return
+        client = get_redis_connection()
+        if client is not None:
+            try:
+                self._invalidate_sync_marker(client)
+                client.set(blacklist_key(token.payload[api_settings.JTI_CLAIM]), 1, ex=ttl)
+                return
+            except Exception as exc:
+                logger.warning("Redis token blacklist unavailable, revoking in SQL: %s", exc)
+        RedisTokenBlacklist.sql_fallback_pending = True
+        super().revoke(token)
+
+    def is_revoked(self, jti: str) -> bool:
+        client = get_redis_connection()
+        if client is not None:
+            try:
+                self._invalidate_sync_marker(client)
+                revoked, synced = client.mget([blacklist_key(jti), SQL_SYNCED_KEY])
+                if revoked is not None:
+                    return True
+                if synced is not None:
+                    return False
+            except Exception as exc:
+                logger.warning("Redis token blacklist unavailable, checking SQL: %s", exc)
+        return super().is_revoked(jti)
+
+    @staticmethod
+    def _invalidate_sync_marker(client: Any) -> None:
+        if RedisTokenBlacklist.sql_fallback_pending:
+            client.delete(SQL_SYNCED_KEY)
+            RedisTokenBlacklist.sql_fallback_pending = False
+
+
+def get_token_blacklist() -> SQLTokenBlacklist:
+    backend = getattr(settings, "JWT_BLACKLIST_BACKEND", "core.token_blacklist.RedisTokenBlacklist")
+    return import_string(backend)()
+
+
+class RefreshToken(SimpleRefreshToken):
+    """Refresh token whose blacklist lives in ``JWT_BLACKLIST_BACKEND``; issuing writes no SQL row."""
+
+    def check_blacklist(self) -> None:
+        if get_token_blacklist().is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self) -> None:
+        get_token_blacklist().revoke(self)
+
+    def outstand(self) -> None:
+        return None
+
+    @classmethod
+    def for_user(cls, user: Any) -> "RefreshToken":
+        # Skip BlacklistMixin.for_user, which records an OutstandingToken per issued token.
+        return super(BlacklistMixin, cls).for_user(user)
+
+
+def flush_expired_tokens() -> int:
+    """Delete expired SQL blacklist rows and copy live ones into Redis; returns rows deleted.
+
+    Once the copy succeeds, Redis misses are trusted without a SQL lookup until the marker
+    expires or a process revokes in SQL again.
+    """
+    deleted, _ = OutstandingToken.objects.filter(expires_at__lte=aware_utcnow()).delete()
+    client = get_redis_connection()
+    if client is not None and isinstance(get_token_blacklist(), RedisTokenBlacklist):
+        # Rows this process writes from here on are not in the copy below.
+        RedisTokenBlacklist.sql_fallback_pending = False
+        now = datetime_to_epoch(aware_utcnow())
+        live = BlacklistedToken.objects.filter(token__expires_at__gt=aware_utcnow()).values_list(
+            "token__jti", "token__expires_at"
+        )
+        try:
+            pipe = client.pipeline(transaction=False)
+            for jti, expires_at in live.iterator():
+                pipe.set(blacklist_key(jti), 1, ex=max(1, datetime_to_epoch(expires_at) - now))
+            pipe.set(SQL_SYNCED_KEY, 1, ex=SQL_SYNCED_TTL)
+            pipe.execute()
+        except Exception as exc:
+            logger.warning("Could not copy SQL token blacklist into Redis: %s", exc)
+    if deleted:
+        logger.info("Flushed %s expired token blacklist row(s)", deleted)
+    return deleted
@@ -26,6 +26,7 @@ from rest_framework.views import APIView
 
 from .cache import cache_get, cache_set
 from .cache_invalidation import invalidates_cache, with_cache_tags
+from .credit_ledger import credit_balance
 from .decorators import auth_csrf_exempt, validate_request
 from .error_handling import (
     api_error_handler,
@@ -432,7 +433,7 @@ def get_basic_profile(request):
             try:
                 profile = request.user.profile
                 profile_data = {
-                    "credits": getattr(profile, "credits", 0),
+                    "credits": credit_balance(request.user.id),
                     "chess_com_username": getattr(profile, "chess_com_username", ""),
                     "lichess_username": getattr(profile, "lichess_username", ""),
                     "email_verified": getattr(profile, "email_verified", False),
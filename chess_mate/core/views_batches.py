@@ -21,6 +21,7 @@ from .abuse_limits import (
 )
 from .batch_coaching import regenerate_batch_coaching
 from .batch_compare import build_compare_narrative, metric_delta, weakness_themes
+from .credit_ledger import REASON_BATCH_CHARGE, credit_balance, post_credit_entry
 from .decorators import rate_limit
 from .inbox_streak import apply_inbox_streak_freeze
 from .models import BatchAnalysisReport, Profile
@@ -158,7 +159,7 @@ def _batch_list_response(request):
     limit = max(1, min(limit, 50))
     offset = max(0, offset)
 
-    base_qs = BatchAnalysisReport.objects.filter(user=request.user).order_by("-created_at")
+    base_qs = BatchAnalysisReport.objects.summary().filter(user=request.user).order_by("-created_at")
     total = base_qs.count()
     queryset = base_qs[offset : offset + limit]
     results = BatchListItemSerializer(queryset, many=True).data
@@ -206,20 +207,19 @@ def _batch_create_response(request):
     credits_per_game = int(getattr(settings, "BATCH_CREDITS_PER_GAME", 1))
     credits_required = games_count * credits_per_game
 
-    try:
-        profile = Profile.objects.get(user=request.user)
-    except Profile.DoesNotExist:
+    if not Profile.objects.filter(user=request.user).exists():
         return Response(
             {"detail": "User profile not found."},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    if credits_required > 0 and profile.credits < credits_required:
+    available_credits = credit_balance(request.user.id)
+    if credits_required > 0 and available_credits < credits_required:
         return Response(
             {
                 "detail": "Insufficient credits for this batch.",
                 "required_credits": credits_required,
-                "available_credits": profile.credits,
+                "available_credits": available_credits,
                 "credits_per_game": credits_per_game,
             },
             status=status.HTTP_402_PAYMENT_REQUIRED,
@@ -233,10 +233,6 @@ def _batch_create_response(request):
     batch_id = str(uuid.uuid4())
 
     with transaction.atomic():
-        if credits_required > 0:
-            profile.credits -= credits_required
-            profile.save(update_fields=["credits"])
-
         batch_report = BatchAnalysisReport.objects.create(
             user=request.user,
             task_id=batch_id,
@@ -245,6 +241,8 @@ def _batch_create_response(request):
             game_ids=source_game_ids,
             credits_charged=credits_required,
         )
+        if credits_required > 0:
+            post_credit_entry(request.user.id, -credits_required, REASON_BATCH_CHARGE, batch_report.pk)
 
     # Queue the analysis task (requires Celery worker — see docker-entrypoint.sh)
     async_result = analyze_batch_task.delay(batch_id, pgn_list, request.user.id, source_game_ids)
@@ -264,7 +262,7 @@ def _batch_create_response(request):
             "status": "pending",
             "games_count": games_count,
             "credits_charged": credits_required,
-            "remaining_credits": profile.credits,
+            "remaining_credits": available_credits - credits_required,
         },
         status=status.HTTP_202_ACCEPTED,
     )
@@ -292,7 +290,7 @@ def batch_status_view(request, batch_id):
     """
     # Ownership check: batch must belong to request.user
     try:
-        batch_report = BatchAnalysisReport.objects.get(id=batch_id, user=request.user)
+        batch_report = BatchAnalysisReport.objects.summary().get(id=batch_id, user=request.user)
     except BatchAnalysisReport.DoesNotExist:
         return Response(
             {"detail": "Batch not found."},
@@ -22,6 +22,7 @@ from .credit_fulfillment import (
     fulfill_checkout_from_webhook_event,
     fulfill_checkout_session,
 )
+from .credit_ledger import credit_balance
 from .credit_packages import credit_model_for_api, get_package, list_packages_for_api
 from .decorators import rate_limit
 from .payment import PaymentProcessor
@@ -35,8 +36,8 @@ def credits_balance_view(request):
     """GET /api/v1/credits/ — current credit balance."""
     from .models import Profile
 
-    profile, _ = Profile.objects.get_or_create(user=request.user)
-    return Response({"credits": profile.credits or 0}, status=status.HTTP_200_OK)
+    Profile.objects.get_or_create(user=request.user)
+    return Response({"credits": credit_balance(request.user.id)}, status=status.HTTP_200_OK)
 
 
 @api_view(["GET"])
@@ -13,11 +13,12 @@ from django.utils import timezone
 from django.utils.html import strip_tags
 
 from .email_send_log import (
+    claim_email_send,
     coaching_email_budget_exceeded,
     digest_already_sent_this_week,
     iso_week_key,
-    log_email_send,
     received_coaching_touchpoint_today,
+    send_after_claim,
 )
 from .email_utils import (
     email_template_context,
@@ -53,19 +54,36 @@ def _activity_since(user: User, days: int = 7) -> Dict[str, int]:
     return {"new_batches": new_batches, "new_analyses": new_analyses}
 
 
-def build_weekly_digest_payload(user: User, profile: Profile) -> Dict[str, Any]:
+def build_weekly_digest_payload(
+    user: User,
+    profile: Profile,
+    *,
+    prefetched: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Digest content for one user.
+
+    ``prefetched`` (from ``email_campaigns.prefetch_weekly_digest_data``) supplies
+    ``fix_rate``, ``activity``, ``total_games`` and ``analyzed_games`` loaded for a whole
+    chunk; missing keys are queried per user.
+    """
+    prefetched = prefetched or {}
     inbox = get_priority_inbox_payload(profile)
     pending_items = inbox.get("pending_items") or []
     pending_count = len(pending_items) if isinstance(pending_items, list) else 0
 
     inbox_streak = get_inbox_streak_payload(profile.preferences)
     single_streak = get_single_game_streak(profile.preferences)
-    fix_rate = build_dashboard_fix_rate(user)
-    activity = _activity_since(user)
+    fix_rate = prefetched["fix_rate"] if "fix_rate" in prefetched else build_dashboard_fix_rate(user)
+    activity = prefetched["activity"] if "activity" in prefetched else _activity_since(user)
+    total_games = prefetched["total_games"] if "total_games" in prefetched else profile.total_games()
+    if "analyzed_games" in prefetched:
+        analyzed_games = prefetched["analyzed_games"]
+    else:
+        analyzed_games = Game.objects.filter(user=user).filter(ANALYZED_GAME_Q).count()
 
     one_thing = build_one_thing_today(
-        total_games=profile.total_games(),
-        analyzed_games=Game.objects.filter(user=user).filter(ANALYZED_GAME_Q).count(),
+        total_games=total_games,
+        analyzed_games=analyzed_games,
         priority_inbox=inbox,
     )
 
@@ -185,8 +203,31 @@ def send_weekly_digest_for_user(user: User, *, force: bool = False) -> bool:
     if not payload.get("has_content"):
         return False
 
-    week_key = iso_week_key()
+    return deliver_weekly_digest(
+        user,
+        payload,
+        week_key=iso_week_key(),
+        wants_email=wants_email,
+        wants_notification=wants_notification,
+    )
+
 
+@transaction.atomic
+def deliver_weekly_digest(
+    user: User,
+    payload: Dict[str, Any],
+    *,
+    week_key: str,
+    wants_email: bool,
+    wants_notification: bool,
+    connection=None,
+) -> bool:
+    """Seed the in-app digest and send the email; eligibility is the caller's job.
+
+    The EmailSendLog row for ``week_key`` is claimed before sending, so a digest goes out
+    at most once per user per week even when runs overlap or are resumed. The email is sent
+    after the claim commits.
+    """
     if wants_notification:
         seed_weekly_digest_notification(user, payload, week_key)
 
@@ -195,6 +236,15 @@ def send_weekly_digest_for_user(user: User, *, force: bool = False) -> bool:
             logger.error("Weekly digest not sent for %s: SMTP not configured", user.email)
             return bool(wants_notification)
 
+        claim = claim_email_send(
+            user,
+            EmailSendLog.TYPE_WEEKLY_DIGEST,
+            week_key=week_key,
+            meta={"pending_inbox": payload.get("pending_inbox_count")},
+        )
+        if claim is None:
+            return bool(wants_notification)
+
         base_url = get_frontend_base_url()
         cta_href = payload.get("cta_href") or "/dashboard"
         if cta_href.startswith("/"):
@@ -221,32 +271,27 @@ def send_weekly_digest_for_user(user: User, *, force: bool = False) -> bool:
             lines.append(f"\n{context['cta_label']}: {cta_url}")
             html_body = "\n".join(lines)
 
-        send_coaching_email(
-            subject=DIGEST_SUBJECT,
-            message=strip_tags(str(html_body)),
-            recipient_list=[user.email],
-            html_message=str(html_body),
-            preferences_url=context["preferences_url"],
-        )
-        log_email_send(
-            user,
-            EmailSendLog.TYPE_WEEKLY_DIGEST,
-            week_key=week_key,
-            meta={"pending_inbox": payload.get("pending_inbox_count")},
-        )
-        logger.info("Weekly digest sent to %s", user.email)
+        def send() -> None:
+            send_coaching_email(
+                subject=DIGEST_SUBJECT,
+                message=strip_tags(str(html_body)),
+                recipient_list=[user.email],
+                html_message=str(html_body),
+                preferences_url=context["preferences_url"],
+                connection=connection,
+            )
+            logger.info("Weekly digest sent to %s", user.email)
+
+        send_after_claim(claim, send)
 
     return True
 
 
 def send_weekly_digests() -> int:
-    """Send weekly digests to all opted-in users. Returns send count."""
-    sent = 0
-    users = User.objects.filter(email__gt="").select_related("profile")
-    for user in users:
-        try:
-            if send_weekly_digest_for_user(user):
-                sent += 1
-        except Exception as exc:
-            logger.exception("Weekly digest failed for user %s: %s", user.pk, exc)
-    return sent
+    """Send weekly digests to all opted-in users inline. Returns send count.
+
+    Beat runs ``send_weekly_digest_task``, which shards the same campaign across workers.
+    """
+    from .email_campaigns import CAMPAIGN_WEEKLY_DIGEST, run_campaign_inline
+
+    return run_campaign_inline(CAMPAIGN_WEEKLY_DIGEST)
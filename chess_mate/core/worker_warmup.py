@@ -0,0 +1,124 @@
+"""
+Warm Celery worker processes before their first task.
+
+Prefork children run ``warm_worker_process`` from ``worker_process_init``: heavy analysis
+modules are imported, the ECO tables and coaching JSON schema are loaded, and a Stockfish
+engine is spawned and handshaked in the child itself (never in the parent, since engine
+pipes must not be shared across fork). First-task latency after a deploy or a
+``worker_max_tasks_per_child`` recycle then matches steady state.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Imported by the first batch / single-game task; listed roughly by import cost.
+PRELOAD_MODULES = (
+    "openai",
+    "jsonschema",
+    "chess.engine",
+    "chess.pgn",
+    "core.analysis.stockfish_analyzer",
+    "core.analysis.stockfish_game_result",
+    "core.analysis.batch_aggregator",
+    "core.analysis.coaching_generator",
+    "core.analysis.per_game_coach_generator",
+    "core.game_analyzer",
+    "core.tasks",
+)
+
+_READINESS: Dict[str, Any] = {"ready": False, "pid": None}
+
+
+def measure_import_times(modules: Iterable[str] = PRELOAD_MODULES) -> Dict[str, Optional[float]]:
+    """Import each module in order and return wall time in ms (None when the import failed).
+
+    Modules already in ``sys.modules`` report ~0 ms, so run this in a fresh process to
+    benchmark a cold start.
+    """
+    timings: Dict[str, Optional[float]] = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as exc:
+            logger.warning("Worker warm-up could not import %s: %s", name, exc)
+            timings[name] = None
+            continue
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
+
+
+def preload_reference_data() -> Dict[str, int]:
+    """Load ECO tables and compile the coaching report schema validator."""
+    from .analysis import stockfish_game_result
+    from .analysis.coaching_generator import get_coaching_report_validator
+    from .eco_codes import ECO_OPENINGS
+
+    validator = get_coaching_report_validator()
+    return {
+        "eco_openings": len(ECO_OPENINGS),
+        "eco_prefixes": len(stockfish_game_result._ECO_MAP),
+        "coaching_schema": int(validator is not None),
+    }
+
+
+def spawn_engine() -> bool:
+    """Start and handshake this process's Stockfish engine."""
+    from .analysis.stockfish_analyzer import StockfishAnalyzer
+
+    try:
+        return StockfishAnalyzer.get_instance().warm_up()
+    except Exception as exc:
+        logger.error("Worker warm-up could not start Stockfish: %s", exc)
+        return False
+
+
+def warm_worker_process(*, spawn: bool = True) -> Dict[str, Any]:
+    """Run every warm-up step in the current (post-fork) process and record readiness."""
+    started = time.perf_counter()
+    import_ms = measure_import_times()
+    try:
+        reference_data = preload_reference_data()
+    except Exception as exc:
+        logger.warning("Worker warm-up could not preload reference data: %s", exc)
+        reference_data = {}
+    engine_ready = spawn_engine() if spawn else False
+
+    _READINESS.update(
+        {
+            "ready": True,
+            "pid": os.getpid(),
+            "engine_ready": engine_ready,
+            "import_ms": import_ms,
+            "reference_data": reference_data,
+            "warmup_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    )
+    logger.info(
+        "Worker %s ready in %.1f ms (engine_ready=%s, slowest import=%s)",
+        os.getpid(),
+        _READINESS["warmup_ms"],
+        engine_ready,
+        max(import_ms, key=lambda name: import_ms[name] or 0.0) if import_ms else None,
+    )
+    return dict(_READINESS)
+
+
+def worker_readiness() -> Dict[str, Any]:
+    """Readiness of the current worker process (``ready`` is False until warm-up ran here)."""
+    if _READINESS.get("pid") != os.getpid():
+        return {"ready": False, "pid": os.getpid()}
+    return dict(_READINESS)
+
+
+def warmup_enabled() -> bool:
+    return bool(getattr(settings, "CELERY_WORKER_WARMUP", True))
@@ -203,6 +203,16 @@ if [ "$ENABLE_CELERY" = "true" ]; then
     else
         echo "Celery worker is running."
     fi
+    # LLM calls are I/O-bound: a separate thread-pool worker keeps them off the single prefork slot.
+    echo "Starting Celery LLM worker (queue: llm; threads=${LLM_WORKER_CONCURRENCY:-8})..."
+    celery -A chess_mate worker -l info \
+        -Q llm \
+        -n "llm@%h" \
+        --concurrency="${LLM_WORKER_CONCURRENCY:-8}" \
+        --pool=threads \
+        --without-gossip --without-mingle \
+        --logfile=- &
+    echo "Celery LLM worker pid=$!"
 else
     echo "ENABLE_CELERY is not true — batch analysis tasks will queue but not run."
 fi